@@ -0,0 +1,108 @@
+from typing import Optional
+import numpy as np
+from pysics.types import IndexArray
+
+
+def color_edges(
+    first: IndexArray,
+    second: IndexArray,
+    n_nodes: int,
+    *,
+    fixed: Optional[np.ndarray] = None,
+) -> list[IndexArray]:
+    """Split the edges of a graph into groups that do not share any node.
+
+    Each group is a maximal matching of the remaining edges, grown by rounds
+    that keep the edges having the lowest index on both of their nodes, so
+    every group can be processed in a single vectorized pass.
+
+    Args:
+        first: The first node of each edge.
+        second: The second node of each edge.
+        n_nodes: The number of nodes of the graph.
+        fixed (Optional): A (n_nodes,) mask of the nodes that never conflict
+            (e.g. static bodies or pinned particles). Default to None.
+
+    Returns:
+        list[IndexArray]: The edge indices of each group.
+    """
+
+    free: np.ndarray = (
+        np.ones(n_nodes, dtype=bool) if fixed is None else ~np.asarray(fixed)
+    )
+    remaining: IndexArray = np.arange(len(first))
+    groups: list[IndexArray] = []
+    sentinel: int = len(first)
+
+    while len(remaining):
+        used: np.ndarray = np.zeros(n_nodes, dtype=bool)
+        group: list[IndexArray] = []
+        candidates: IndexArray = remaining
+
+        while len(candidates):
+            a: IndexArray = first[candidates]
+            b: IndexArray = second[candidates]
+            best: IndexArray = np.full(n_nodes, sentinel)
+            np.minimum.at(best, a[free[a]], candidates[free[a]])
+            np.minimum.at(best, b[free[b]], candidates[free[b]])
+            taken: np.ndarray = (~free[a] | (best[a] == candidates)) & (
+                ~free[b] | (best[b] == candidates)
+            )
+            group.append(candidates[taken])
+            used[a[taken]] = used[b[taken]] = True
+            used &= free
+            candidates = candidates[~taken]
+            candidates = candidates[
+                ~used[first[candidates]] & ~used[second[candidates]]
+            ]
+
+        taken_all: IndexArray = np.sort(np.concatenate(group))
+        groups.append(taken_all)
+        remaining = np.setdiff1d(remaining, taken_all, assume_unique=True)
+
+    return groups
+
+
+def connected_components(
+    first: IndexArray,
+    second: IndexArray,
+    n_nodes: int,
+    *,
+    fixed: Optional[np.ndarray] = None,
+) -> IndexArray:
+    """Label the connected components of a graph.
+
+    The labels are propagated along the edges and shortcut by pointer
+    jumping until they settle, so each round is a single vectorized pass.
+
+    Args:
+        first: The first node of each edge.
+        second: The second node of each edge.
+        n_nodes: The number of nodes of the graph.
+        fixed (Optional): A (n_nodes,) mask of the nodes that do not connect
+            their edges (e.g. static bodies). Default to None.
+
+    Returns:
+        IndexArray: The (n_nodes,) component of each node, labelled by its
+            lowest node.
+    """
+
+    labels: IndexArray = np.arange(n_nodes)
+
+    if fixed is not None:
+        kept: np.ndarray = ~fixed[first] & ~fixed[second]
+        first, second = first[kept], second[kept]
+
+    while True:
+        low: IndexArray = np.minimum(labels[first], labels[second])
+        merged: IndexArray = labels.copy()
+
+        for nodes in (first, second, labels[first], labels[second]):
+            np.minimum.at(merged, nodes, low)
+
+        merged = merged[merged]
+
+        if (merged == labels).all():
+            return labels
+
+        labels = merged
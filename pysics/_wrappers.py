@@ -1,26 +1,331 @@
-from typing import Final, TypeAlias
-from OpenGL.GL import *
-
-
-class _GLWrapper:
-    """Just a mapping of GL functions with more pythonic naming."""
-
-    viewport: Final[TypeAlias] = glViewport
-    matrix_mode: Final[TypeAlias] = glMatrixMode
-    load_identity: Final[TypeAlias] = glLoadIdentity
-    ortho: Final[TypeAlias] = glOrtho
-    clear: Final[TypeAlias] = glClear
-    clear_color: Final[TypeAlias] = glClearColor
-    color_3f: Final[TypeAlias] = glColor3f
-    color_4f: Final[TypeAlias] = glColor4f
-    point_size: Final[TypeAlias] = glPointSize
-    line_width: Final[TypeAlias] = glLineWidth
-    begin: Final[TypeAlias] = glBegin
-    end: Final[TypeAlias] = glEnd
-    flush: Final[TypeAlias] = glFlush
-    vertex_2f: Final[TypeAlias] = glVertex2f
-    enable: Final[TypeAlias] = glEnable
-    blend_func: Final[TypeAlias] = glBlendFunc
+import importlib
+import os
+from types import ModuleType
+from typing import Any, Callable, Final, Hashable
+
+# The enums used by pysics, fixed by the OpenGL specification. They are
+# defined here so the shapes can be imported without loading OpenGL. Any
+# other GL_* name is still available and loads OpenGL on first use.
+GL_BLEND: Final[int] = 0x0BE2
+GL_COLOR_ARRAY: Final[int] = 0x8076
+GL_COLOR_BUFFER_BIT: Final[int] = 0x4000
+GL_DEPTH_BUFFER_BIT: Final[int] = 0x0100
+GL_COLOR_ATTACHMENT0: Final[int] = 0x8CE0
+GL_DOUBLE: Final[int] = 0x140A
+GL_DRAW_FRAMEBUFFER: Final[int] = 0x8CA9
+GL_FLOAT: Final[int] = 0x1406
+GL_FRAMEBUFFER: Final[int] = 0x8D40
+GL_FRAMEBUFFER_COMPLETE: Final[int] = 0x8CD5
+GL_LINEAR: Final[int] = 0x2601
+GL_LINES: Final[int] = 0x0001
+GL_LINE_LOOP: Final[int] = 0x0002
+GL_LINE_STRIP: Final[int] = 0x0003
+GL_LUMINANCE: Final[int] = 0x1909
+GL_MODELVIEW: Final[int] = 0x1700
+GL_MULTISAMPLE: Final[int] = 0x809D
+GL_NEAREST: Final[int] = 0x2600
+GL_ONE_MINUS_SRC_ALPHA: Final[int] = 0x0303
+GL_POINTS: Final[int] = 0x0000
+GL_POINT_SMOOTH: Final[int] = 0x0B10
+GL_POLYGON: Final[int] = 0x0009
+GL_PROJECTION: Final[int] = 0x1701
+GL_QUADS: Final[int] = 0x0007
+GL_READ_FRAMEBUFFER: Final[int] = 0x8CA8
+GL_RENDERBUFFER: Final[int] = 0x8D41
+GL_RGB: Final[int] = 0x1907
+GL_RGBA: Final[int] = 0x1908
+GL_RGBA8: Final[int] = 0x8058
+GL_SRC_ALPHA: Final[int] = 0x0302
+GL_TEXTURE_2D: Final[int] = 0x0DE1
+GL_TEXTURE_MAG_FILTER: Final[int] = 0x2800
+GL_TEXTURE_MIN_FILTER: Final[int] = 0x2801
+GL_TRIANGLES: Final[int] = 0x0004
+GL_TRIANGLE_STRIP: Final[int] = 0x0005
+GL_UNPACK_ALIGNMENT: Final[int] = 0x0CF5
+GL_UNSIGNED_BYTE: Final[int] = 0x1401
+GL_UNSIGNED_INT: Final[int] = 0x1405
+GL_VERTEX_ARRAY: Final[int] = 0x8074
+
+PROFILE_ENV: Final[str] = "PYSICS_PROFILE"
+
+# The PyOpenGL flags of each profile, applied before OpenGL is imported.
+#   - default: The PyOpenGL defaults (error checking and logging).
+#   - performance: No error check nor array size check after each call.
+#       The references on the arrays given to the pointer functions are kept
+#       (STORE_POINTERS), since PyOpenGL only drops them with ERROR_ON_COPY.
+#   - debug: Every check, and an error when an array has to be copied to
+#       be converted (a hidden cost on each call).
+_PROFILES: Final[dict[str, dict[str, bool]]] = {
+    "default": {},
+    "performance": dict(
+        ERROR_CHECKING=False,
+        ERROR_LOGGING=False,
+        CONTEXT_CHECKING=False,
+        ARRAY_SIZE_CHECKING=False,
+    ),
+    "debug": dict(
+        ERROR_CHECKING=True,
+        ERROR_LOGGING=True,
+        CONTEXT_CHECKING=True,
+        ARRAY_SIZE_CHECKING=True,
+        ERROR_ON_COPY=True,
+    ),
+}
+
+_FUNCTIONS: Final[dict[str, str]] = dict(
+    viewport="glViewport",
+    matrix_mode="glMatrixMode",
+    load_identity="glLoadIdentity",
+    load_matrix_d="glLoadMatrixd",
+    ortho="glOrtho",
+    clear="glClear",
+    clear_color="glClearColor",
+    color_3f="glColor3f",
+    color_4f="glColor4f",
+    point_size="glPointSize",
+    line_width="glLineWidth",
+    begin="glBegin",
+    end="glEnd",
+    flush="glFlush",
+    finish="glFinish",
+    vertex_2f="glVertex2f",
+    enable="glEnable",
+    disable="glDisable",
+    blend_func="glBlendFunc",
+    enable_client_state="glEnableClientState",
+    disable_client_state="glDisableClientState",
+    vertex_pointer="glVertexPointer",
+    color_pointer="glColorPointer",
+    draw_arrays="glDrawArrays",
+    draw_elements="glDrawElements",
+    multi_draw_arrays="glMultiDrawArrays",
+    gen_textures="glGenTextures",
+    delete_textures="glDeleteTextures",
+    bind_texture="glBindTexture",
+    tex_parameter_i="glTexParameteri",
+    tex_image_2d="glTexImage2D",
+    tex_sub_image_2d="glTexSubImage2D",
+    tex_coord_2f="glTexCoord2f",
+    pixel_store_i="glPixelStorei",
+    gen_framebuffers="glGenFramebuffers",
+    delete_framebuffers="glDeleteFramebuffers",
+    bind_framebuffer="glBindFramebuffer",
+    gen_renderbuffers="glGenRenderbuffers",
+    delete_renderbuffers="glDeleteRenderbuffers",
+    bind_renderbuffer="glBindRenderbuffer",
+    renderbuffer_storage="glRenderbufferStorage",
+    renderbuffer_storage_multisample="glRenderbufferStorageMultisample",
+    framebuffer_renderbuffer="glFramebufferRenderbuffer",
+    check_framebuffer_status="glCheckFramebufferStatus",
+    blit_framebuffer="glBlitFramebuffer",
+)
+
+# The functions that only set a piece of the GL state, with the name of that
+# state. A call that would set the value the state already has is dropped.
+_SHADOWED: Final[dict[str, str]] = dict(
+    color_3f="color",
+    color_4f="color",
+    line_width="line_width",
+    point_size="point_size",
+    clear_color="clear_color",
+    blend_func="blend_func",
+    matrix_mode="matrix_mode",
+    enable="enabled",
+    disable="enabled",
+)
+# The functions after which a state is unknown (a color array changes the
+# current color).
+_INVALIDATES: Final[dict[str, tuple[str, ...]]] = dict(
+    draw_arrays=("color",),
+    draw_elements=("color",),
+    multi_draw_arrays=("color",),
+)
+
+_backend: ModuleType | None = None
+_profile: str | None = None
+
+
+def get_profile() -> str:
+    """Get the profile OpenGL is (or will be) loaded with.
+
+    Returns:
+        str: The profile set by set_profile(), else the one of the
+            PYSICS_PROFILE environment variable, else "default".
+    """
+
+    return _profile or os.environ.get(PROFILE_ENV, "default")
+
+
+def set_profile(profile: str) -> None:
+    """Choose the profile of OpenGL, before it is loaded.
+
+    Args:
+        profile: "default", "performance" or "debug".
+
+    Raises:
+        ValueError: If the profile is unknown.
+        RuntimeError: If OpenGL is already loaded with another profile.
+    """
+
+    global _profile
+
+    if profile not in _PROFILES:
+        raise ValueError(f"Expected one of {list(_PROFILES)}. {profile!r} given.")
+    if _backend is not None and profile != get_profile():
+        raise RuntimeError(
+            f"OpenGL is already loaded with the {get_profile()!r} profile."
+        )
+
+    _profile = profile
+
+
+def _load() -> ModuleType:
+    """Load OpenGL with the flags of the profile, on the first call only.
+
+    Returns:
+        ModuleType: The OpenGL.GL module.
+    """
+
+    global _backend
+
+    if _backend is None:
+        set_profile(get_profile())
+        opengl: ModuleType = importlib.import_module("OpenGL")
+
+        for flag, value in _PROFILES[get_profile()].items():
+            setattr(opengl, flag, value)
+
+        _backend = importlib.import_module("OpenGL.GL")
+
+    return _backend
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve the other GL_* names from OpenGL (loading it).
+
+    Args:
+        name: The name of the constant.
+
+    Returns:
+        Any: The OpenGL constant.
+
+    Raises:
+        AttributeError: If the name is not a GL constant.
+    """
+
+    if not name.startswith("GL_"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value: Any = getattr(_load(), name)
+    globals()[name] = value
+    return value
+
+
+def _state_of(name: str, args: tuple[Any, ...]) -> tuple[Hashable, Any]:
+    """Get the state set by a call.
+
+    Args:
+        name: The name of the shadowed function.
+        args: The arguments of the call.
+
+    Returns:
+        tuple[Hashable, Any]: The key of the state and its new value.
+    """
+
+    if name in ("enable", "disable"):
+        return ("enabled", args[0]), name == "enable"
+    if name == "color_3f":
+        return "color", (*args, 1.0)
+
+    return _SHADOWED[name], args
+
+
+def _shadow(name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a GL function with the shadow state.
+
+    Args:
+        name: The name of the function.
+        function: The function to wrap.
+
+    Returns:
+        Callable[..., Any]: The function dropping the redundant calls, or the
+            function itself if it does not touch the shadowed state.
+    """
+
+    if name in _SHADOWED:
+
+        def wrapper(*args: Any) -> Any:
+            key, value = _state_of(name, args)
+
+            if key in _GLWrapper.state and _GLWrapper.state[key] == value:
+                _GLWrapper.skipped += 1
+                return None
+
+            result: Any = function(*args)
+            _GLWrapper.state[key] = value
+            return result
+
+    elif name in _INVALIDATES:
+
+        def wrapper(*args: Any) -> Any:
+            result: Any = function(*args)
+            _GLWrapper.invalidate(*_INVALIDATES[name])
+            return result
+
+    else:
+        return function
+
+    wrapper.__wrapped__ = function
+    return wrapper
+
+
+class _GLWrapperMeta(type):
+    """Resolve the GL functions on first access (loading OpenGL)."""
+
+    def __getattr__(cls, name: str) -> Callable[..., Any]:
+        if name not in _FUNCTIONS:
+            raise AttributeError(f"{cls.__name__!r} has no attribute {name!r}")
+
+        function: Callable[..., Any] = _shadow(name, getattr(_load(), _FUNCTIONS[name]))
+        setattr(cls, name, function)
+        return function
+
+    def __dir__(cls) -> list[str]:
+        return sorted({*super().__dir__(), *_FUNCTIONS})
+
+
+class _GLWrapper(metaclass=_GLWrapperMeta):
+    """Just a mapping of GL functions with more pythonic naming.
+
+    The functions are looked up in OpenGL (which is imported) on their first
+    access, then cached on the class.
+
+    The current color, line width, point size, clear color, blend function,
+    matrix mode and enabled capabilities are shadowed: a call that would not
+    change them is not sent to OpenGL. The shadow state must be invalidated
+    when the GL state changes behind the wrapper (e.g. a new context).
+
+    Attributes:
+        state: The shadowed state known to be current.
+        skipped: The number of dropped calls.
+    """
+
+    state: dict[Hashable, Any] = {}
+    skipped: int = 0
+
+    @classmethod
+    def invalidate(cls, *keys: Hashable) -> None:
+        """Forget the shadowed state, so the next calls are all sent.
+
+        Args:
+            *keys: The states to forget (e.g. "color"). All if none is given.
+        """
+
+        if not keys:
+            cls.state.clear()
+
+        for key in keys:
+            cls.state.pop(key, None)
 
 
 # To get more coherence with glfw structure.
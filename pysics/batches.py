@@ -0,0 +1,914 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import ClassVar, Final, Optional
+import numpy as np
+from pysics.strokes import join_strips, stroke_strip
+from pysics.types import ByteInt, Color, IndexArray, PIndex, PointArray, ScalarArray
+from pysics._wrappers import (
+    gl,
+    GL_COLOR_ARRAY,
+    GL_DOUBLE,
+    GL_FLOAT,
+    GL_LINES,
+    GL_LINE_STRIP,
+    GL_POINTS,
+    GL_POINT_SMOOTH,
+    GL_TRIANGLE_STRIP,
+    GL_UNSIGNED_INT,
+    GL_VERTEX_ARRAY,
+)
+
+_SIZE_BUCKETS: Final[int] = 16
+_CACHE_SIZE: Final[int] = 8
+# The last groupings of point sizes, from the least recently used.
+_size_groups: OrderedDict[tuple, tuple[np.ndarray, np.ndarray, np.ndarray]] = (
+    OrderedDict()
+)
+
+
+def _as_gl_array(array: np.ndarray, width: int) -> tuple[np.ndarray, int]:
+    """Get an array that can be handed to OpenGL as it is.
+
+    Contiguous float32 and float64 arrays are returned without any copy,
+    anything else is converted to a contiguous float32 array.
+
+    Args:
+        array: The array to convert.
+        width: The number of components per item.
+
+    Returns:
+        tuple[np.ndarray, int]: The (n, width) array and its GL type.
+    """
+
+    array = np.asarray(array)
+
+    if array.dtype not in (np.float32, np.float64):
+        array = array.astype(np.float32)
+
+    array = np.ascontiguousarray(array).reshape(-1, width)
+    return array, GL_DOUBLE if array.dtype == np.float64 else GL_FLOAT
+
+
+def _group_sizes(sizes: ScalarArray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Group points by their size, quantized to a few pixel sizes.
+
+    The sizes are rounded to whole pixels, and spread over _SIZE_BUCKETS
+    sizes between the smallest and the largest one if there are more. The
+    small integer keys are sorted in linear time, and the groupings are
+    cached by the sizes, so unchanged sizes are only grouped once.
+
+    Args:
+        sizes: The (n,) array of the point sizes.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The size of each group,
+            the bounds of the groups in the order, and the uint32 order of
+            the points by group.
+    """
+
+    sizes = np.ravel(sizes)
+    key: tuple = (sizes.tobytes(), sizes.dtype.str)
+    groups: tuple[np.ndarray, np.ndarray, np.ndarray] | None = _size_groups.get(key)
+
+    if groups is not None:
+        _size_groups.move_to_end(key)
+        return groups
+
+    pixels: np.ndarray = np.maximum(np.rint(sizes), 1.0)
+    low: float = float(pixels.min()) if pixels.size else 1.0
+    high: float = float(pixels.max()) if pixels.size else 1.0
+    step: float = max(1.0, (high - low) / (_SIZE_BUCKETS - 1))
+    keys: np.ndarray = np.rint((pixels - low) / step).astype(np.uint8)
+    values: np.ndarray = np.rint(low + np.arange(int(keys.max(initial=0)) + 1) * step)
+    counts: np.ndarray = np.bincount(keys, minlength=values.size)
+    used: np.ndarray = counts > 0
+    bounds: np.ndarray = np.concatenate([[0], np.cumsum(counts[used])])
+    # A stable sort of 8-bit keys is a radix sort.
+    order: np.ndarray = np.argsort(keys, kind="stable").astype(np.uint32)
+    groups = (values[used], bounds, order)
+    _size_groups[key] = groups
+
+    if len(_size_groups) > _CACHE_SIZE:
+        _size_groups.popitem(last=False)
+
+    return groups
+
+
+class BaseBatch(ABC):
+    """The base of the primitives that draw a whole NumPy array in one call.
+
+    Like the shapes, a batch is rendered as soon as it is created.
+
+    Attributes:
+        fill (Optional): The filling color of the batch. Default to None.
+        stroke (Optional): The outline color of the batch. Default to None.
+        stroke_weight (Optional): The outline width of the batch. Default to 1.0.
+    """
+
+    def __init__(
+        self,
+        *,
+        fill: Optional[Color | ByteInt] = None,
+        stroke: Optional[Color | ByteInt] = None,
+        stroke_weight: Optional[int | float] = 1.0,
+    ) -> None:
+        """The constructor.
+        Automatically render the batch by calling _render() after initialized
+        the properties.
+
+        Args:
+            fill (Optional): The filling color of the batch. Default to None.
+            stroke (Optional): The outline color of the batch. Default to None.
+            stroke_weight (Optional): The outline width of the batch. Default to 1.
+        """
+
+        self.fill: Color | None = fill
+        self.stroke: Color | None = stroke
+        self.stroke_weight: float = float(stroke_weight)
+
+        if isinstance(fill, int):
+            self.fill = Color.from_unit(fill)
+        if isinstance(stroke, int):
+            self.stroke = Color.from_unit(stroke)
+
+        self._render()
+
+    @abstractmethod
+    def _render(self) -> None:
+        """The abtract method to render the batch."""
+
+        ...
+
+    @staticmethod
+    def _bind_arrays(vertices: np.ndarray, colors: Optional[np.ndarray] = None) -> None:
+        """Point the GL client state to the given arrays.
+
+        Args:
+            vertices: The (n, 2) vertex array.
+            colors (Optional): The (n, 4) color array (ratios). Default to None.
+        """
+
+        vertices, vertex_type = _as_gl_array(vertices, 2)
+        gl.enable_client_state(GL_VERTEX_ARRAY)
+        gl.vertex_pointer(2, vertex_type, 0, vertices)
+
+        if colors is not None:
+            colors, color_type = _as_gl_array(colors, 4)
+            gl.enable_client_state(GL_COLOR_ARRAY)
+            gl.color_pointer(4, color_type, 0, colors)
+
+    @staticmethod
+    def _unbind_arrays(colors: bool = False) -> None:
+        """Reset the GL client state.
+
+        Args:
+            colors (Optional): If the color array was bound. Default to False.
+        """
+
+        if colors:
+            gl.disable_client_state(GL_COLOR_ARRAY)
+
+        gl.disable_client_state(GL_VERTEX_ARRAY)
+
+
+class Lines(BaseBatch):
+    """A set of independent line segments drawn in one call.
+
+    Attributes:
+        vertices: The (n, 2) array of the segment ends.
+        indices: The (k, 2) array of the vertex indices of each segment.
+            If None, each pair of consecutive vertices is a segment.
+        stroke (Optional): The color of the segments. Default to None.
+        stroke_weight (Optional): The width of the segments. Default to 1.0.
+    """
+
+    def __init__(
+        self,
+        vertices: PointArray,
+        indices: Optional[IndexArray] = None,
+        *,
+        stroke: Optional[Color | ByteInt] = None,
+        stroke_weight: Optional[int | float] = 1.0,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            vertices: The (n, 2) array of the segment ends (or a (k, 2, 2)
+                array of segments).
+            indices (Optional): The (k, 2) array of the vertex indices of each
+                segment. Default to None (consecutive pairs of vertices).
+            stroke (Optional): The color of the segments. Default to None.
+            stroke_weight (Optional): The width of the segments. Default to 1.0.
+        """
+
+        self.vertices: PointArray = vertices
+        self.indices: IndexArray | None = indices
+        super().__init__(stroke=stroke, stroke_weight=stroke_weight)
+
+    def _render(self) -> None:
+        """Render the segments to the window."""
+
+        if not self.stroke:
+            return
+
+        gl.color_4f(*self.stroke.ratios)
+        gl.line_width(self.stroke_weight)
+        self._bind_arrays(self.vertices)
+
+        if self.indices is None:
+            gl.draw_arrays(GL_LINES, 0, np.size(self.vertices) // 2)
+        else:
+            indices: np.ndarray = np.ascontiguousarray(self.indices, dtype=np.uint32)
+            gl.draw_elements(GL_LINES, indices.size, GL_UNSIGNED_INT, indices)
+
+        self._unbind_arrays()
+
+
+class Outlines(BaseBatch):
+    """A set of thick polylines drawn as one triangle strip.
+
+    Each outline is tessellated with joined corners (see
+    strokes.tessellate()) and the strips are chained into a single call.
+    The strips are cached while the outlines and the width stay unchanged,
+    so a static scene is only tessellated once.
+
+    Attributes:
+        outlines: The (k, 2) arrays of the polyline vertices (or a (n, k, 2)
+            array).
+        join (Optional): The corners of the outlines, "miter", "bevel" or
+            "round". Default to "miter".
+        closed (Optional): Join the last vertex of each outline to its
+            first one. Default to True.
+        stroke (Optional): The color of the outlines. Default to None.
+        stroke_weight (Optional): The width of the outlines. Default to 1.0.
+    """
+
+    def __init__(
+        self,
+        outlines: list[PointArray] | PointArray,
+        *,
+        join: Optional[str] = "miter",
+        closed: Optional[bool] = True,
+        stroke: Optional[Color | ByteInt] = None,
+        stroke_weight: Optional[int | float] = 1.0,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            outlines: The (k, 2) arrays of the polyline vertices (or a
+                (n, k, 2) array).
+            join (Optional): The corners of the outlines, "miter", "bevel" or
+                "round". Default to "miter".
+            closed (Optional): Join the last vertex of each outline to its
+                first one. Default to True.
+            stroke (Optional): The color of the outlines. Default to None.
+            stroke_weight (Optional): The width of the outlines.
+                Default to 1.0.
+        """
+
+        self.outlines: list[PointArray] | PointArray = outlines
+        self.join: str = join
+        self.closed: bool = closed
+        super().__init__(stroke=stroke, stroke_weight=stroke_weight)
+
+    def _render(self) -> None:
+        """Render the outlines to the window."""
+
+        if not self.stroke:
+            return
+
+        strip: np.ndarray = join_strips(
+            [
+                stroke_strip(
+                    outline, self.stroke_weight, join=self.join, closed=self.closed
+                )
+                for outline in self.outlines
+            ]
+        )
+
+        if not len(strip):
+            return
+
+        gl.color_4f(*self.stroke.ratios)
+        self._bind_arrays(strip)
+        gl.draw_arrays(GL_TRIANGLE_STRIP, 0, len(strip))
+        self._unbind_arrays()
+
+
+class Points(BaseBatch):
+    """A set of points drawn in one call.
+
+    The positions, colors and sizes are handed to OpenGL without any copy
+    when they are contiguous float32 (or float64) arrays.
+
+    The fixed pipeline has a single point size: with per-point sizes, the
+    sizes are rounded to whole pixels and spread over at most 16 sizes, and
+    the points are drawn with one indexed call per size.
+
+    Attributes:
+        positions: The (n, 2) array of the point positions.
+        colors (Optional): The (n, 4) array of the point colors (ratios).
+            Default to None (the stroke color).
+        sizes (Optional): The (n,) array of the point sizes. Default to None
+            (the stroke weight).
+        stroke (Optional): The color of the points. Default to None.
+        stroke_weight (Optional): The size of the points. Default to 1.0.
+        smooth (Optional): Draw round points instead of squares.
+            Default to False.
+    """
+
+    def __init__(
+        self,
+        positions: PointArray,
+        colors: Optional[np.ndarray] = None,
+        sizes: Optional[ScalarArray] = None,
+        *,
+        stroke: Optional[Color | ByteInt] = None,
+        stroke_weight: Optional[int | float] = 1.0,
+        smooth: Optional[bool] = False,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            positions: The (n, 2) array of the point positions.
+            colors (Optional): The (n, 4) array of the point colors (ratios).
+                Default to None (the stroke color).
+            sizes (Optional): The (n,) array of the point sizes. Default to
+                None (the stroke weight).
+            stroke (Optional): The color of the points. Default to None.
+            stroke_weight (Optional): The size of the points. Default to 1.0.
+            smooth (Optional): Draw round points instead of squares.
+                Default to False.
+        """
+
+        self.positions: PointArray = positions
+        self.colors: np.ndarray | None = colors
+        self.sizes: ScalarArray | None = sizes
+        self.smooth: bool = smooth
+        super().__init__(stroke=stroke, stroke_weight=stroke_weight)
+
+    def _render(self) -> None:
+        """Render the points to the window."""
+
+        if self.colors is None and not self.stroke:
+            return
+
+        if self.colors is None:
+            gl.color_4f(*self.stroke.ratios)
+        if self.smooth:
+            gl.enable(GL_POINT_SMOOTH)
+
+        self._bind_arrays(self.positions, self.colors)
+        count: int = np.size(self.positions) // 2
+
+        if self.sizes is None:
+            gl.point_size(self.stroke_weight)
+            gl.draw_arrays(GL_POINTS, 0, count)
+        else:
+            values, bounds, order = _group_sizes(self.sizes)
+
+            if values.size == 1:
+                gl.point_size(float(values[0]))
+                gl.draw_arrays(GL_POINTS, 0, count)
+            else:
+                for size, start, end in zip(values, bounds[:-1], bounds[1:]):
+                    gl.point_size(float(size))
+                    gl.draw_elements(
+                        GL_POINTS, int(end - start), GL_UNSIGNED_INT, order[start:end]
+                    )
+
+        self._unbind_arrays(self.colors is not None)
+
+        if self.smooth:
+            gl.disable(GL_POINT_SMOOTH)
+
+
+class VectorField(BaseBatch):
+    """A set of arrows (e.g. a force or a velocity field) drawn in one call.
+
+    Each arrow is made of three segments (the shaft and the two sides of the
+    head) and all of them are submitted as a single line array. The length
+    of an arrow is its magnitude times the scale, and its color can go from
+    a low to a high color with the magnitude.
+
+    The arrows are thinned out to keep at most one per spacing-wide cell of
+    the screen, then to keep at most max_glyphs of them, so a dense field
+    costs the same as a sparse one. The cells are sized in world units from
+    the zoom of the view, so zooming out shows fewer arrows and zooming in
+    shows more, with the same density on the screen.
+
+    Attributes:
+        positions: The (n, 2) (or (h, w, 2) grid) array of the arrow tails.
+        vectors: The (n, 2) (or (h, w, 2) grid) array of the vectors.
+        scale (Optional): The length of an arrow per unit of magnitude.
+            Default to 1.0.
+        max_length (Optional): The length an arrow is clamped to.
+            Default to None (not clamped).
+        head (Optional): The length of the arrow heads, as a ratio of the
+            arrow lengths. Default to 0.3.
+        spacing (Optional): The minimal distance between two drawn arrows,
+            in screen pixels. Default to None (no thinning).
+        max_glyphs (Optional): The maximal number of drawn arrows.
+            Default to 10000.
+        gradient (Optional): The colors of the lowest and the highest
+            magnitudes. Default to None (the stroke color).
+        magnitude_range (Optional): The (min, max) magnitudes mapped to the
+            gradient. Default to None (fitted to the drawn arrows).
+        stroke (Optional): The color of the arrows. Default to None.
+        stroke_weight (Optional): The width of the arrows. Default to 1.0.
+        shown: The indices of the drawn arrows.
+        zoom: The number of screen pixels per world unit of every vector
+            field (set by the canvas from its camera). Default to 1.0.
+    """
+
+    zoom: ClassVar[float] = 1.0
+
+    def __init__(
+        self,
+        positions: PointArray,
+        vectors: PointArray,
+        *,
+        scale: Optional[float] = 1.0,
+        max_length: Optional[float] = None,
+        head: Optional[float] = 0.3,
+        spacing: Optional[float] = None,
+        max_glyphs: Optional[int] = 10_000,
+        gradient: Optional[tuple[Color | ByteInt, Color | ByteInt]] = None,
+        magnitude_range: Optional[tuple[float, float]] = None,
+        stroke: Optional[Color | ByteInt] = None,
+        stroke_weight: Optional[int | float] = 1.0,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            positions: The (n, 2) (or (h, w, 2) grid) array of the arrow tails.
+            vectors: The (n, 2) (or (h, w, 2) grid) array of the vectors.
+            scale (Optional): The length of an arrow per unit of magnitude.
+                Default to 1.0.
+            max_length (Optional): The length an arrow is clamped to.
+                Default to None (not clamped).
+            head (Optional): The length of the arrow heads, as a ratio of the
+                arrow lengths. Default to 0.3.
+            spacing (Optional): The minimal distance between two drawn
+                arrows, in screen pixels. Default to None (no thinning).
+            max_glyphs (Optional): The maximal number of drawn arrows.
+                Default to 10000.
+            gradient (Optional): The colors of the lowest and the highest
+                magnitudes. Default to None (the stroke color).
+            magnitude_range (Optional): The (min, max) magnitudes mapped to
+                the gradient. Default to None (fitted to the drawn arrows).
+            stroke (Optional): The color of the arrows. Default to None.
+            stroke_weight (Optional): The width of the arrows. Default to 1.0.
+        """
+
+        self.positions: PointArray = positions
+        self.vectors: PointArray = vectors
+        self.scale: float = scale
+        self.max_length: float | None = max_length
+        self.head: float = head
+        self.spacing: float | None = spacing
+        self.max_glyphs: int = max_glyphs
+        self.gradient: tuple[Color, Color] | None = gradient
+        self.magnitude_range: tuple[float, float] | None = magnitude_range
+        self.shown: IndexArray = np.empty(0, dtype=np.intp)
+
+        if gradient is not None:
+            self.gradient = tuple(
+                Color.from_unit(color) if isinstance(color, int) else color
+                for color in gradient
+            )
+
+        super().__init__(stroke=stroke, stroke_weight=stroke_weight)
+
+    def _render(self) -> None:
+        """Render the arrows to the window."""
+
+        if self.gradient is None and not self.stroke:
+            return
+
+        positions: PointArray = np.reshape(self.positions, (-1, 2))
+        vectors: PointArray = np.reshape(self.vectors, (-1, 2))
+        self.shown = self._thin(positions)
+
+        if not self.shown.size:
+            return
+
+        tails: PointArray = positions[self.shown]
+        vectors = vectors[self.shown]
+        magnitudes: ScalarArray = np.hypot(vectors[:, 0], vectors[:, 1])
+        lengths: ScalarArray = magnitudes * self.scale
+
+        if self.max_length is not None:
+            lengths = np.minimum(lengths, self.max_length)
+
+        # The unit direction of each arrow (none for the null vectors).
+        units: PointArray = np.divide(
+            vectors,
+            magnitudes[:, None],
+            out=np.zeros_like(vectors, dtype=float),
+            where=magnitudes[:, None] > 0,
+        )
+        tips: PointArray = tails + units * lengths[:, None]
+        back: PointArray = tips - units * (lengths * self.head)[:, None]
+        side: PointArray = units[:, ::-1] * (lengths * self.head / 2)[:, None]
+        side[:, 0] = -side[:, 0]
+        # The shaft, then the two sides of the head.
+        vertices: np.ndarray = np.empty((len(tails), 6, 2))
+        vertices[:, 0] = tails
+        vertices[:, [1, 2, 4]] = tips[:, None]
+        vertices[:, 3] = back + side
+        vertices[:, 5] = back - side
+        colors: np.ndarray | None = None
+
+        if self.gradient is None:
+            gl.color_4f(*self.stroke.ratios)
+        else:
+            colors = np.repeat(self._colors(magnitudes), 6, axis=0)
+
+        gl.line_width(self.stroke_weight)
+        self._bind_arrays(vertices, colors)
+        gl.draw_arrays(GL_LINES, 0, 6 * len(tails))
+        self._unbind_arrays(colors is not None)
+
+    def _thin(self, positions: PointArray) -> IndexArray:
+        """Select the arrows to draw.
+
+        Args:
+            positions: The (n, 2) array of the arrow tails.
+
+        Returns:
+            IndexArray: The indices of the kept arrows, in order.
+        """
+
+        shown: IndexArray = np.arange(len(positions))
+
+        if self.spacing is not None and len(positions):
+            # Keep the first arrow of each cell, sized in world units.
+            spacing: float = self.spacing / self.zoom
+            cells: np.ndarray = np.floor(positions / spacing).astype(np.int64)
+            cells -= cells.min(axis=0)
+            keys: np.ndarray = cells[:, 0] * (int(cells[:, 1].max()) + 1) + cells[:, 1]
+            shown = np.sort(np.unique(keys, return_index=True)[1])
+
+        if len(shown) > self.max_glyphs:
+            shown = shown[:: -(-len(shown) // self.max_glyphs)]
+
+        return shown
+
+    def _colors(self, magnitudes: ScalarArray) -> np.ndarray:
+        """Map the magnitudes to the gradient.
+
+        Args:
+            magnitudes: The (n,) array of the magnitudes.
+
+        Returns:
+            np.ndarray: The (n, 4) array of the colors (ratios).
+        """
+
+        low, high = self.magnitude_range or (magnitudes.min(), magnitudes.max())
+        ratios: ScalarArray = np.clip(
+            (magnitudes - low) / (high - low) if high > low else magnitudes * 0.0,
+            0.0,
+            1.0,
+        )
+        first: np.ndarray = np.array(self.gradient[0].ratios)
+        last: np.ndarray = np.array(self.gradient[1].ratios)
+        return first + ratios[:, None] * (last - first)
+
+
+class Trail:
+    """The last positions of one or many particles, drawn as line strips.
+
+    Unlike the batches, a trail is kept from a frame to another: append the
+    new positions each frame then draw it.
+
+    The positions are stored in a ring buffer written twice (at i and at
+    i + capacity), so the history of each particle is always a contiguous
+    slice of the buffer. Appending a position is O(1) and drawing the trails
+    hands that buffer to OpenGL as it is: one glMultiDrawArrays call draws
+    one line strip per particle, without copying the history.
+
+    The fade is a fixed color ramp indexed by the age of the positions. It
+    is aligned with the buffer by offsetting the color pointer, so it is
+    only built again when the stroke changes.
+
+    Attributes:
+        capacity: The number of positions kept per particle.
+        count: The number of particles.
+        stroke (Optional): The color of the trails. Default to None.
+        stroke_weight (Optional): The width of the trails. Default to 1.0.
+        fade (Optional): Fade the oldest positions out. Default to True.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        count: Optional[int] = 1,
+        *,
+        stroke: Optional[Color | ByteInt] = None,
+        stroke_weight: Optional[int | float] = 1.0,
+        fade: Optional[bool] = True,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            capacity: The number of positions kept per particle.
+            count (Optional): The number of particles. Default to 1.
+            stroke (Optional): The color of the trails. Default to None.
+            stroke_weight (Optional): The width of the trails. Default to 1.0.
+            fade (Optional): Fade the oldest positions out. Default to True.
+
+        Raises:
+            ValueError: If the capacity is lower than 2 or the count lower
+                than 1.
+        """
+
+        if capacity < 2:
+            raise ValueError(f"Expected a capacity >= 2. {capacity} given.")
+        if count < 1:
+            raise ValueError(f"Expected a count >= 1. {count} given.")
+
+        self.capacity: int = capacity
+        self.count: int = count
+        self.stroke: Color | None = stroke
+        self.stroke_weight: float = float(stroke_weight)
+        self.fade: bool = fade
+        self._vertices: np.ndarray = np.zeros((count, 2 * capacity, 2))
+        self._appended: int = 0
+        self._colors: np.ndarray | None = None
+        self._colors_of: tuple[float, ...] | None = None
+
+        if isinstance(stroke, int):
+            self.stroke = Color.from_unit(stroke)
+
+    def __len__(self) -> int:
+        """Get the number of positions kept per particle.
+
+        Returns:
+            int: The number of positions.
+        """
+
+        return min(self._appended, self.capacity)
+
+    @property
+    def points(self) -> np.ndarray:
+        """Get the kept positions, from the oldest to the newest.
+
+        Returns:
+            np.ndarray: A (count, len(trail), 2) view of the buffer.
+        """
+
+        end: int = self._end()
+        return self._vertices[:, end - len(self) : end]
+
+    def append(self, points: PointArray) -> None:
+        """Add the new position of each particle.
+
+        Args:
+            points: The (count, 2) array of positions (or a single (2,)
+                position for a single particle).
+        """
+
+        i: int = self._appended % self.capacity
+        points = np.reshape(points, (self.count, 2))
+        self._vertices[:, i] = points
+        self._vertices[:, i + self.capacity] = points
+        self._appended += 1
+
+    def clear(self) -> None:
+        """Forget the kept positions."""
+
+        self._appended = 0
+
+    def draw(self) -> None:
+        """Render the trails to the window."""
+
+        length: int = len(self)
+
+        if not self.stroke or length < 2:
+            return
+
+        end: int = self._end()
+        span: int = 2 * self.capacity
+        first: np.ndarray = np.arange(self.count, dtype=np.int32) * span
+        first += end - length
+        counts: np.ndarray = np.full(self.count, length, dtype=np.int32)
+        colors: np.ndarray | None = None
+
+        if self.fade:
+            # The color of the vertex i is the ramp item i + shift, which
+            # gives the vertex at the end of the slice the last ramp item.
+            colors = self._ramp()[span - end :]
+        else:
+            gl.color_4f(*self.stroke.ratios)
+
+        gl.line_width(self.stroke_weight)
+        BaseBatch._bind_arrays(self._vertices, colors)
+        gl.multi_draw_arrays(GL_LINE_STRIP, first, counts, self.count)
+        BaseBatch._unbind_arrays(colors is not None)
+
+    def _end(self) -> int:
+        """Get the end of the slice of the kept positions in the buffer.
+
+        Returns:
+            int: The index following the newest position.
+        """
+
+        return (self._appended - 1) % self.capacity + self.capacity + 1
+
+    def _ramp(self) -> np.ndarray:
+        """Get the color ramp of the fade (built again if the stroke changed).
+
+        The item r of the ramp (modulo twice the capacity) is the color of a
+        position of age 2 * capacity - 1 - r, from transparent to the stroke.
+
+        Returns:
+            np.ndarray: The (count * 2 * capacity + 2 * capacity, 4) ramp.
+        """
+
+        ratios: tuple[float, ...] = tuple(self.stroke.ratios)
+
+        if self._colors is None or self._colors_of != ratios:
+            span: int = 2 * self.capacity
+            age: np.ndarray = span - 1 - np.arange(span)
+            ramp: np.ndarray = np.tile(np.asarray(ratios), (span, 1))
+            ramp[:, 3] *= np.clip(1 - age / self.capacity, 0, 1)
+            self._colors = np.tile(ramp, (self.count + 1, 1))
+            self._colors_of = ratios
+
+        return self._colors
+
+
+class Plot:
+    """A time series overlay, decimated to one column per pixel.
+
+    The samples are kept in a ring buffer of the given capacity, and the
+    plot spans its width with the last capacity samples: each pixel column
+    covers a bucket of consecutive samples, drawn as a vertical stroke from
+    their minimum to their maximum (so no peak is lost).
+
+    The minimum and maximum of each bucket are updated as the samples are
+    appended, so drawing the plot costs O(width) whatever the capacity.
+
+    Like the trails, a plot is kept from a frame to another: append the new
+    samples then draw it.
+
+    Attributes:
+        x: The x-axis of the bottom left corner of the plot.
+        y: The y-axis of the bottom left corner of the plot.
+        width: The number of pixel columns of the plot.
+        height: The height of the plot.
+        capacity: The number of kept samples.
+        y_range (Optional): The (min, max) values at the bottom and the top of
+            the plot. Default to None (fitted to the drawn samples).
+        stroke (Optional): The color of the curve. Default to None.
+        stroke_weight (Optional): The width of the curve. Default to 1.0.
+    """
+
+    def __init__(
+        self,
+        x: PIndex,
+        y: PIndex,
+        width: int,
+        height: float,
+        *,
+        capacity: Optional[int] = 100_000,
+        y_range: Optional[tuple[float, float]] = None,
+        stroke: Optional[Color | ByteInt] = None,
+        stroke_weight: Optional[int | float] = 1.0,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            x: The x-axis of the bottom left corner of the plot.
+            y: The y-axis of the bottom left corner of the plot.
+            width: The number of pixel columns of the plot.
+            height: The height of the plot.
+            capacity (Optional): The number of kept samples. Default to 100000.
+            y_range (Optional): The (min, max) values at the bottom and the
+                top of the plot. Default to None (fitted to the drawn samples).
+            stroke (Optional): The color of the curve. Default to None.
+            stroke_weight (Optional): The width of the curve. Default to 1.0.
+
+        Raises:
+            ValueError: If the width or the capacity is lower than 1.
+        """
+
+        if width < 1 or capacity < 1:
+            raise ValueError(
+                f"Expected a width and a capacity >= 1. {width}, {capacity} given."
+            )
+
+        self.x: PIndex = x
+        self.y: PIndex = y
+        self.width: int = int(width)
+        self.height: float = height
+        self.capacity: int = capacity
+        self.y_range: tuple[float, float] | None = y_range
+        self.stroke: Color | None = stroke
+        self.stroke_weight: float = float(stroke_weight)
+        self._bucket: int = -(-capacity // self.width)
+        self._samples: np.ndarray = np.zeros(capacity)
+        self._appended: int = 0
+        # One more bucket than columns, for the one being filled.
+        self._mins: np.ndarray = np.zeros(self.width + 1)
+        self._maxs: np.ndarray = np.zeros(self.width + 1)
+        self._vertices: np.ndarray = np.zeros((2 * self.width, 2))
+
+        if isinstance(stroke, int):
+            self.stroke = Color.from_unit(stroke)
+
+    def __len__(self) -> int:
+        """Get the number of kept samples.
+
+        Returns:
+            int: The number of samples.
+        """
+
+        return min(self._appended, self.capacity)
+
+    @property
+    def samples(self) -> ScalarArray:
+        """Get a copy of the kept samples, from the oldest to the newest.
+
+        Returns:
+            ScalarArray: The (len(plot),) array of samples.
+        """
+
+        i: int = self._appended % self.capacity
+        return np.concatenate([self._samples[i:], self._samples[:i]])[-len(self) :]
+
+    def append(self, values: float | ScalarArray) -> None:
+        """Add one or many samples.
+
+        Args:
+            values: The new sample or the (n,) array of new samples.
+        """
+
+        values = np.ravel(np.asarray(values, dtype=float))
+        first: int = self._appended
+        self._appended += values.size
+
+        if not values.size:
+            return
+
+        # The first bucket may have been started by the previous samples.
+        merge: bool = bool(first % self._bucket)
+
+        # Only the last samples can still be drawn.
+        if values.size > self.capacity:
+            first += values.size - self.capacity
+            values = values[-self.capacity :]
+            merge = False
+
+        indices: np.ndarray = first + np.arange(values.size)
+        self._samples[indices % self.capacity] = values
+        buckets, starts = np.unique(indices // self._bucket, return_index=True)
+        mins: np.ndarray = np.minimum.reduceat(values, starts)
+        maxs: np.ndarray = np.maximum.reduceat(values, starts)
+
+        if merge:
+            slot: int = buckets[0] % self._mins.size
+            mins[0] = min(mins[0], self._mins[slot])
+            maxs[0] = max(maxs[0], self._maxs[slot])
+
+        slots: np.ndarray = buckets % self._mins.size
+        self._mins[slots] = mins
+        self._maxs[slots] = maxs
+
+    def clear(self) -> None:
+        """Forget the kept samples."""
+
+        self._appended = 0
+
+    def draw(self) -> None:
+        """Render the plot to the window."""
+
+        if not self.stroke or not self._appended:
+            return
+
+        last: int = (self._appended - 1) // self._bucket
+        first: int = max(0, last - self.width + 1)
+        slots: np.ndarray = np.arange(first, last + 1) % self._mins.size
+        mins: np.ndarray = self._mins[slots]
+        maxs: np.ndarray = self._maxs[slots]
+        low, high = self.y_range or (mins.min(), maxs.max())
+
+        if high == low:
+            low, high = low - 0.5, high + 0.5
+
+        scale: float = self.height / (high - low)
+
+        # A strip going from the minimum to the maximum of each column.
+        columns: int = slots.size
+        vertices: np.ndarray = self._vertices[: 2 * columns]
+        vertices[:, 0] = self.x + np.repeat(np.arange(columns), 2) + 0.5
+        vertices[0::2, 1] = mins
+        vertices[1::2, 1] = maxs
+        vertices[:, 1] = self.y + (np.clip(vertices[:, 1], low, high) - low) * scale
+
+        gl.color_4f(*self.stroke.ratios)
+        gl.line_width(self.stroke_weight)
+        BaseBatch._bind_arrays(vertices)
+        gl.draw_arrays(GL_LINE_STRIP, 0, 2 * columns)
+        BaseBatch._unbind_arrays()
@@ -0,0 +1,2 @@
+from pysics.bench.runner import compare, count_calls, make_report, run_scene
+from pysics.bench.scenes import SCENES, Scene
@@ -0,0 +1,119 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+from pysics.bench.runner import (
+    BACKENDS,
+    Report,
+    compare,
+    make_report,
+    run_scene,
+)
+from pysics.bench.scenes import SCENES
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse the command line.
+
+    Args:
+        argv (Optional): The arguments. Default to None (sys.argv).
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="python -m pysics.bench",
+        description="Run the pysics benchmark scenes and report them as JSON.",
+    )
+    parser.add_argument(
+        "scenes",
+        nargs="*",
+        help=f"The scenes among {', '.join(SCENES)} (all by default).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=[*BACKENDS, "all"],
+        default="mock",
+        help="The renderer: mock (default), real or all (real when available).",
+    )
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="The ratio of the shape counts."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the report to this file.")
+    parser.add_argument("--baseline", type=Path, help="The report to compare to.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="The relative change regarded as a regression (default to 0.1).",
+    )
+    args: argparse.Namespace = parser.parse_args(argv)
+    unknown: list[str] = [name for name in args.scenes if name not in SCENES]
+
+    if unknown:
+        parser.error(f"unknown scenes: {', '.join(unknown)}")
+
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark.
+
+    Args:
+        argv (Optional): The arguments. Default to None (sys.argv).
+
+    Returns:
+        int: The exit code, 1 if a regression was found.
+    """
+
+    args: argparse.Namespace = _parse_args(argv)
+    backends: list[str] = list(BACKENDS) if args.backend == "all" else [args.backend]
+    results: list[Report] = []
+
+    for name in args.scenes or SCENES:
+        for backend in backends:
+            try:
+                results.append(
+                    run_scene(
+                        SCENES[name],
+                        backend=backend,
+                        frames=args.frames,
+                        warmup=args.warmup,
+                        scale=args.scale,
+                        seed=args.seed,
+                    )
+                )
+            except RuntimeError as error:
+                if args.backend != "all":
+                    raise
+
+                print(f"{name} ({backend}) skipped: {error}", file=sys.stderr)
+
+    report: Report = make_report(results)
+    text: str = json.dumps(report, indent=2)
+
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions: list[str] = compare(
+            report, json.loads(args.baseline.read_text()), threshold=args.threshold
+        )
+
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+
+        return int(bool(regressions))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+import platform
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Final, Iterator, Optional
+import glfw
+import numpy as np
+from pysics.bench.scenes import Frame, Scene
+from pysics._wrappers import gl, get_profile, _FUNCTIONS, _load, _shadow
+
+Report = dict[str, Any]
+
+BACKENDS: Final[tuple[str, ...]] = ("mock", "real")
+# The metrics compared to the baseline, and if a higher value is better.
+METRICS: Final[dict[str, bool]] = dict(
+    shapes_per_sec=True,
+    frame_ms_p50=False,
+    frame_ms_p95=False,
+    gl_calls_per_frame=False,
+    peak_memory_bytes=False,
+)
+
+
+@contextmanager
+def count_calls(*, real: Optional[bool] = False) -> Iterator[Counter]:
+    """Count the calls of every gl function.
+
+    The redundant calls dropped by the shadow state are not counted, like
+    they are not sent to OpenGL. The shadow state is reset on entry.
+
+    Args:
+        real (Optional): Forward the calls to OpenGL. Else the calls do
+            nothing (a mocked renderer). Default to False.
+
+    Yields:
+        Counter: The number of calls of each function, updated live.
+    """
+
+    calls: Counter = Counter()
+    saved: dict[str, Any] = {
+        name: vars(gl)[name] for name in _FUNCTIONS if name in vars(gl)
+    }
+
+    def counter(name: str) -> Callable[..., Any]:
+        function: Callable[..., Any] | None = (
+            getattr(_load(), _FUNCTIONS[name]) if real else None
+        )
+
+        def wrapper(*args: Any) -> Any:
+            calls[name] += 1
+            return function(*args) if function else None
+
+        return _shadow(name, wrapper)
+
+    gl.invalidate()
+
+    for name in _FUNCTIONS:
+        setattr(gl, name, counter(name))
+
+    try:
+        yield calls
+    finally:
+        for name in _FUNCTIONS:
+            if name in saved:
+                setattr(gl, name, saved[name])
+            else:
+                delattr(gl, name)
+
+
+class _Window:
+    """A hidden window giving a real GL context to the benchmark."""
+
+    def __init__(self) -> None:
+        """The constructor.
+
+        Raises:
+            RuntimeError: If no window can be created (e.g. no display).
+        """
+
+        self._window: glfw._GLFWwindow | None = None
+
+        if glfw.init():
+            glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
+            self._window = glfw.create_window(800, 600, "pysics.bench", None, None)
+
+        if not self._window:
+            self.close()
+            raise RuntimeError("No OpenGL context is available.")
+
+        glfw.make_context_current(self._window)
+
+    def close(self) -> None:
+        """Destroy the window."""
+
+        if self._window:
+            glfw.destroy_window(self._window)
+            self._window = None
+
+        glfw.terminate()
+
+
+def _percentiles(times: list[float]) -> dict[str, float]:
+    """Summarize the frame times.
+
+    Args:
+        times: The frame times in seconds.
+
+    Returns:
+        dict[str, float]: The mean, p50, p95, p99 and max frame times in ms.
+    """
+
+    ms: np.ndarray = np.asarray(times) * 1e3
+    summary: dict[str, float] = dict(frame_ms_mean=float(ms.mean()))
+
+    for q in (50, 95, 99):
+        summary[f"frame_ms_p{q}"] = float(np.percentile(ms, q))
+
+    summary["frame_ms_max"] = float(ms.max())
+    return summary
+
+
+def run_scene(
+    scene: Scene,
+    *,
+    backend: Optional[str] = "mock",
+    frames: Optional[int] = 20,
+    warmup: Optional[int] = 2,
+    scale: Optional[float] = 1.0,
+    seed: Optional[int] = 0,
+) -> Report:
+    """Measure a scene.
+
+    The frames are timed first. The peak memory is measured afterwards on a
+    new build of the scene and a single frame, since tracing the allocations
+    slows the frames down.
+
+    Args:
+        scene: The scene to run.
+        backend (Optional): "mock" (gl calls do nothing) or "real" (a hidden
+            window). Default to "mock".
+        frames (Optional): The number of timed frames. Default to 20.
+        warmup (Optional): The number of frames run before the timing.
+            Default to 2.
+        scale (Optional): The ratio applied to the shape count of the scene.
+            Default to 1.0.
+        seed (Optional): The seed of the scene. Default to 0.
+
+    Returns:
+        Report: The measures of the scene.
+
+    Raises:
+        ValueError: If the backend is unknown or frames is not positive.
+        RuntimeError: If the real backend has no OpenGL context.
+    """
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Expected one of {list(BACKENDS)}. {backend!r} given.")
+    if frames < 1:
+        raise ValueError(f"Expected at least 1 frame. {frames} given.")
+
+    count: int = max(1, round(scene.count * scale))
+    window: _Window | None = _Window() if backend == "real" else None
+    times: list[float] = []
+
+    try:
+        with count_calls(real=window is not None) as calls:
+            frame: Frame = scene.setup(count, np.random.default_rng(seed))
+
+            for _ in range(warmup):
+                frame()
+
+            calls.clear()
+
+            for _ in range(frames):
+                start: float = perf_counter()
+                frame()
+
+                if window:
+                    gl.finish()
+
+                times.append(perf_counter() - start)
+
+            total_calls: int = sum(calls.values())
+            tracemalloc.start()
+
+            try:
+                scene.setup(count, np.random.default_rng(seed))()
+                peak: int = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    finally:
+        if window:
+            window.close()
+
+    return dict(
+        scene=scene.name,
+        backend=backend,
+        shapes=count,
+        frames=frames,
+        shapes_per_sec=count * frames / max(sum(times), 1e-12),
+        gl_calls_per_frame=total_calls / frames,
+        **_percentiles(times),
+        peak_memory_bytes=peak,
+    )
+
+
+def make_report(results: list[Report]) -> Report:
+    """Wrap the results of the scenes with the environment they ran in.
+
+    Args:
+        results: The results of run_scene().
+
+    Returns:
+        Report: The report to save as JSON.
+    """
+
+    return dict(
+        python=platform.python_version(),
+        numpy=np.__version__,
+        platform=platform.platform(),
+        profile=get_profile(),
+        results=results,
+    )
+
+
+def compare(
+    report: Report, baseline: Report, *, threshold: Optional[float] = 0.1
+) -> list[str]:
+    """Compare a report to a baseline.
+
+    Only the scenes measured in both reports with the same backend and the
+    same number of shapes are compared.
+
+    Args:
+        report: The current report.
+        baseline: The report to compare to.
+        threshold (Optional): The relative change of a metric regarded as a
+            regression. Default to 0.1 (10%).
+
+    Returns:
+        list[str]: The regressions, empty if there is none.
+    """
+
+    previous: dict[tuple[str, str, int], Report] = {
+        (result["scene"], result["backend"], result["shapes"]): result
+        for result in baseline["results"]
+    }
+    regressions: list[str] = []
+
+    for result in report["results"]:
+        key: tuple[str, str, int] = (
+            result["scene"],
+            result["backend"],
+            result["shapes"],
+        )
+
+        if key not in previous:
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            old: float = previous[key][metric]
+            new: float = result[metric]
+
+            if higher_is_better:
+                regressed: bool = new < old * (1 - threshold)
+            else:
+                regressed = new > old * (1 + threshold)
+
+            if regressed:
+                regressions.append(
+                    f"{key[0]} ({key[1]}): {metric} went from {old:.6g} to {new:.6g}."
+                )
+
+    return regressions
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from typing import Callable, Final
+import numpy as np
+from pysics.broadphase import UniformGrid
+from pysics.nbody import BarnesHut
+from pysics.rigid import World
+from pysics.shapes import Circle, Line, Rect
+from pysics.types import Color
+
+Frame = Callable[[], None]
+
+_WIDTH: Final[int] = 800
+_HEIGHT: Final[int] = 600
+_DT: Final[float] = 1 / 60
+
+
+@dataclass(frozen=True)
+class Scene:
+    """A standard benchmark scene.
+
+    Attributes:
+        name: The scene name.
+        count: The number of shapes (or bodies) of the scene at scale 1.
+        setup: The function building the scene from a number of shapes and a
+            random generator, and returning the function rendering a frame.
+    """
+
+    name: str
+    count: int
+    setup: Callable[[int, np.random.Generator], Frame]
+
+
+def _colors(count: int, rng: np.random.Generator) -> list[Color]:
+    """Draw random opaque colors.
+
+    Args:
+        count: The number of colors.
+        rng: The random generator.
+
+    Returns:
+        list[Color]: The colors.
+    """
+
+    return [Color(*rgb, 255) for rgb in rng.integers(0, 256, (count, 3)).tolist()]
+
+
+def _circles(count: int, rng: np.random.Generator) -> Frame:
+    """Draw filled circles at random positions."""
+
+    centers: list[list[float]] = (rng.random((count, 2)) * (_WIDTH, _HEIGHT)).tolist()
+    radii: list[float] = rng.uniform(2, 10, count).tolist()
+    fills: list[Color] = _colors(count, rng)
+
+    def frame() -> None:
+        for (x, y), radius, fill in zip(centers, radii, fills):
+            Circle(x, y, radius, fill=fill)
+
+    return frame
+
+
+def _lines(count: int, rng: np.random.Generator) -> Frame:
+    """Draw random lines."""
+
+    ends: list[list[float]] = (
+        rng.random((count, 4)) * (_WIDTH, _HEIGHT, _WIDTH, _HEIGHT)
+    ).tolist()
+    strokes: list[Color] = _colors(count, rng)
+
+    def frame() -> None:
+        for (x, y, dx, dy), stroke in zip(ends, strokes):
+            Line(x, y, dx, dy, stroke=stroke)
+
+    return frame
+
+
+def _rects(count: int, rng: np.random.Generator) -> Frame:
+    """Draw random rectangles, one over two with a stroke."""
+
+    boxes: list[list[float]] = (
+        rng.random((count, 4)) * (_WIDTH, _HEIGHT, 40, 40)
+    ).tolist()
+    fills: list[Color] = _colors(count, rng)
+    strokes: list[Color | None] = [
+        stroke if i % 2 else None for i, stroke in enumerate(_colors(count, rng))
+    ]
+
+    def frame() -> None:
+        for (x, y, w, h), fill, stroke in zip(boxes, fills, strokes):
+            Rect(x, y, w, h, fill=fill, stroke=stroke, stroke_weight=2)
+
+    return frame
+
+
+def _nbody(count: int, rng: np.random.Generator) -> Frame:
+    """Step a Barnes-Hut disc of bodies with a leapfrog scheme (no drawing)."""
+
+    radius: np.ndarray = np.sqrt(rng.random(count)) * 200
+    angle: np.ndarray = rng.random(count) * 2 * np.pi
+    positions: np.ndarray = np.column_stack(
+        (radius * np.cos(angle), radius * np.sin(angle))
+    )
+    velocities: np.ndarray = np.column_stack((-np.sin(angle), np.cos(angle))) * 5
+    masses: np.ndarray = np.full(count, 1.0)
+    solver: BarnesHut = BarnesHut(0.7, softening=1.0)
+
+    def frame() -> None:
+        velocities[:] += solver.accelerations(positions, masses) * _DT
+        positions[:] += velocities * _DT
+
+    return frame
+
+
+def _grid(count: int, rng: np.random.Generator) -> Frame:
+    """Move circles and find their overlapping pairs with a uniform grid.
+
+    The circles are spread at a constant density, so the time per body stays
+    flat from a scale to another if the broad phase is near-linear.
+    """
+
+    side: float = 4.0 * np.sqrt(count)
+    positions: np.ndarray = rng.random((count, 2)) * side
+    radii: np.ndarray = rng.uniform(0.5, 1.5, count)
+    steps: np.ndarray = rng.normal(0.0, 0.1, (count, 2))
+    grid: UniformGrid = UniformGrid()
+
+    def frame() -> None:
+        positions[:] += steps
+        grid.build(positions, radii)
+        grid.overlapping_pairs()
+
+    return frame
+
+
+def _pile(count: int, rng: np.random.Generator) -> Frame:
+    """Drop circles and boxes into a bin, then step and draw the world."""
+
+    world: World = World()
+    world.add_rect(0, 0, _WIDTH, 20, mass=0)
+    world.add_rect(0, 0, 20, _HEIGHT, mass=0)
+    world.add_rect(_WIDTH - 20, 0, 20, _HEIGHT, mass=0)
+    columns: int = (_WIDTH - 60) // 12
+
+    for i in range(count):
+        x: float = 30 + (i % columns) * 12 + rng.random()
+        y: float = 40 + (i // columns) * 12
+
+        if i % 3:
+            world.add_circle(x, y, 5)
+        else:
+            world.add_rect(x - 5, y - 5, 10, 10)
+
+    def frame() -> None:
+        world.step(_DT)
+        world.draw(fill=200)
+
+    return frame
+
+
+SCENES: Final[dict[str, Scene]] = {
+    scene.name: scene
+    for scene in (
+        Scene("circles", 10_000, _circles),
+        Scene("lines", 50_000, _lines),
+        Scene("rects", 10_000, _rects),
+        Scene("nbody", 5_000, _nbody),
+        Scene("pile", 1_000, _pile),
+        Scene("grid-10k", 10_000, _grid),
+        Scene("grid-100k", 100_000, _grid),
+        Scene("grid-1m", 1_000_000, _grid),
+    )
+}
@@ -0,0 +1,265 @@
+from typing import Final, Optional
+import numpy as np
+from pysics.types import IndexArray, PointArray, ScalarArray
+
+
+def _counting_sort(
+    keys: IndexArray, n_keys: int
+) -> tuple[IndexArray, IndexArray, IndexArray]:
+    """Group the given integer keys by value.
+
+    The counts and the start offsets come from a single bincount pass, the
+    permutation from a stable argsort (radix sort for keys that fit in 16 bits).
+
+    Args:
+        keys: The integer keys to sort (from 0 to n_keys - 1).
+        n_keys: The number of possible keys.
+
+    Returns:
+        tuple[IndexArray, IndexArray, IndexArray]: The permutation that sorts
+            the keys, the start offset and the count of each key.
+    """
+
+    counts: IndexArray = np.bincount(keys, minlength=n_keys)
+    starts: IndexArray = np.cumsum(counts) - counts
+    small: bool = n_keys <= np.iinfo(np.uint16).max + 1
+    order: IndexArray = np.argsort(
+        keys.astype(np.uint16) if small else keys, kind="stable"
+    )
+    return order, starts, counts
+
+
+def _expand_ranges(
+    owners: IndexArray, starts: IndexArray, counts: IndexArray
+) -> tuple[IndexArray, IndexArray]:
+    """Expand a list of [start, start + count) ranges into flat index arrays.
+
+    Args:
+        owners: The value to repeat for each item of a range.
+        starts: The first index of each range.
+        counts: The length of each range.
+
+    Returns:
+        tuple[IndexArray, IndexArray]: The repeated owners and the
+            expanded range indices.
+    """
+
+    total: int = int(counts.sum())
+
+    if not total:
+        empty: IndexArray = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    offsets: IndexArray = np.cumsum(counts) - counts
+    steps: IndexArray = np.arange(total) - np.repeat(offsets, counts)
+    return np.repeat(owners, counts), np.repeat(starts, counts) + steps
+
+
+class UniformGrid:
+    """A uniform grid broad phase for circular bodies.
+
+    The grid is rebuilt from scratch at each step. The bodies are bucketed by
+    cell with a counting sort, then each cell is only compared with itself
+    and with half of its neighbourhood so that every candidate pair is
+    reported once.
+
+    Attributes:
+        cell_size: The requested cell size. None to derive it from the radii.
+        max_cells: The maximum number of cells of the grid. The cell size is
+            enlarged when the bodies are too sparse to fit. Default to 4 cells
+            per body.
+    """
+
+    _MIN_CELLS: Final[int] = 64
+
+    def __init__(
+        self, cell_size: Optional[float] = None, *, max_cells: Optional[int] = None
+    ) -> None:
+        """The constructor.
+
+        Args:
+            cell_size (Optional): The cell size. Default to None (twice the
+                largest radius).
+            max_cells (Optional): The maximum number of cells of the grid.
+                Default to None (4 cells per body).
+
+        Raises:
+            ValueError: If the cell size is not strictly positive.
+        """
+
+        if cell_size is not None and cell_size <= 0:
+            raise ValueError(f"Expected a positive cell size. {cell_size} given.")
+
+        self.cell_size: float | None = cell_size
+        self.max_cells: int | None = max_cells
+        self._positions: PointArray = np.empty((0, 2))
+        self._radii: ScalarArray = np.empty(0)
+        self._lower: PointArray = np.zeros(2)
+        self._cell: float = 0.0
+        self._shape: tuple[int, int] = (0, 0)
+        self._reach: int = 1
+        self._cells: IndexArray = np.empty((0, 2), dtype=np.intp)
+        self._order: IndexArray = np.empty(0, dtype=np.intp)
+        self._starts: IndexArray = np.empty(0, dtype=np.intp)
+        self._counts: IndexArray = np.empty(0, dtype=np.intp)
+
+    @property
+    def effective_cell_size(self) -> float:
+        """Get the cell size used by the last build.
+
+        Returns:
+            float: The cell size.
+        """
+
+        return self._cell
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Get the number of columns and rows of the last build.
+
+        Returns:
+            tuple[int, int]: The grid dimensions.
+        """
+
+        return self._shape
+
+    def build(self, positions: PointArray, radii: ScalarArray | float) -> None:
+        """Bucket the bodies into the grid.
+
+        Args:
+            positions: The (n, 2) array of the body centers.
+            radii: The (n,) array of the body radii, or a single radius.
+        """
+
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        radii = np.broadcast_to(
+            np.asarray(radii, dtype=np.float64), positions.shape[:1]
+        )
+        self._positions = positions
+        self._radii = radii
+        n: int = len(positions)
+
+        if not n:
+            self._shape = (0, 0)
+            self._cells = np.empty((0, 2), dtype=np.intp)
+            self._order = self._starts = self._counts = np.empty(0, dtype=np.intp)
+            return
+
+        lower: PointArray = positions.min(axis=0)
+        extent: PointArray = positions.max(axis=0) - lower
+        diameter: float = 2.0 * float(radii.max())
+        cell: float = self.cell_size or diameter or 1.0
+        max_cells: int = self.max_cells or max(4 * n, self._MIN_CELLS)
+
+        while np.prod(np.floor(extent / cell) + 1) > max_cells:
+            cell *= 2.0
+
+        self._lower = lower
+        self._cell = cell
+        self._reach = max(1, int(np.ceil(diameter / cell)))
+        self._cells = np.floor((positions - lower) / cell).astype(np.intp)
+        cols, rows = (self._cells.max(axis=0) + 1).tolist()
+        self._shape = (cols, rows)
+        keys: IndexArray = self._cells[:, 0] * rows + self._cells[:, 1]
+        self._order, self._starts, self._counts = _counting_sort(keys, cols * rows)
+
+    def candidate_pairs(self) -> tuple[IndexArray, IndexArray]:
+        """Get every pair of bodies that share a cell neighbourhood.
+
+        Returns:
+            tuple[IndexArray, IndexArray]: The first and second body indices
+                of each candidate pair (each unordered pair appears once).
+        """
+
+        firsts: list[IndexArray] = []
+        seconds: list[IndexArray] = []
+        cols, rows = self._shape
+        sorted_cells: IndexArray = self._cells[self._order]
+        slots: IndexArray = np.arange(len(self._order))
+
+        for dx in range(0, self._reach + 1):
+            for dy in range(-self._reach, self._reach + 1):
+                if dx == 0 and dy < 0:
+                    continue
+
+                nx: IndexArray = sorted_cells[:, 0] + dx
+                ny: IndexArray = sorted_cells[:, 1] + dy
+                valid: np.ndarray = (nx < cols) & (ny >= 0) & (ny < rows)
+                keys: IndexArray = nx[valid] * rows + ny[valid]
+                owners: IndexArray = slots[valid]
+                starts: IndexArray = self._starts[keys]
+                counts: IndexArray = self._counts[keys]
+
+                if dx == 0 and dy == 0:
+                    # Only keep the bodies sorted after the owner in its own cell.
+                    counts = starts + counts - owners - 1
+                    starts = owners + 1
+
+                owners, others = _expand_ranges(owners, starts, counts)
+                firsts.append(self._order[owners])
+                seconds.append(self._order[others])
+
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def query(
+        self, positions: PointArray, radii: ScalarArray | float
+    ) -> tuple[IndexArray, IndexArray]:
+        """Get every pair between the given bodies and the built ones that
+        share a cell neighbourhood.
+
+        Args:
+            positions: The (m, 2) array of the queried body centers.
+            radii: The (m,) array of the queried body radii, or a single radius.
+
+        Returns:
+            tuple[IndexArray, IndexArray]: The queried body index and the built
+                body index of each candidate pair.
+        """
+
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        radii = np.broadcast_to(
+            np.asarray(radii, dtype=np.float64), positions.shape[:1]
+        )
+
+        if not len(positions) or not len(self._order):
+            empty: IndexArray = np.empty(0, dtype=np.intp)
+            return empty, empty
+
+        firsts: list[IndexArray] = []
+        seconds: list[IndexArray] = []
+        cols, rows = self._shape
+        reach: int = max(
+            1, int(np.ceil((radii.max() + self._radii.max()) / self._cell))
+        )
+        cells: IndexArray = np.floor((positions - self._lower) / self._cell).astype(
+            np.intp
+        )
+        queried: IndexArray = np.arange(len(positions))
+
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                nx: IndexArray = cells[:, 0] + dx
+                ny: IndexArray = cells[:, 1] + dy
+                valid: np.ndarray = (nx >= 0) & (nx < cols) & (ny >= 0) & (ny < rows)
+                keys: IndexArray = nx[valid] * rows + ny[valid]
+                owners, slots = _expand_ranges(
+                    queried[valid], self._starts[keys], self._counts[keys]
+                )
+                firsts.append(owners)
+                seconds.append(self._order[slots])
+
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def overlapping_pairs(self) -> tuple[IndexArray, IndexArray]:
+        """Get the candidate pairs whose circles actually overlap.
+
+        Returns:
+            tuple[IndexArray, IndexArray]: The first and second body indices
+                of each overlapping pair.
+        """
+
+        first, second = self.candidate_pairs()
+        delta: PointArray = self._positions[first] - self._positions[second]
+        reach: ScalarArray = self._radii[first] + self._radii[second]
+        hit: np.ndarray = np.einsum("ij,ij->i", delta, delta) < reach * reach
+        return first[hit], second[hit]
@@ -0,0 +1,208 @@
+from typing import Optional
+import numpy as np
+from pysics.types import PointArray, ScalarArray
+
+
+class Camera:
+    """A view on the world, applied by OpenGL to everything drawn.
+
+    The camera is loaded as the modelview matrix at the start of each frame,
+    so the shapes are given in world coordinates and moving the view costs
+    nothing per shape. The same mapping is available on the CPU side to
+    cull the objects out of the view or to convert the mouse coordinates.
+
+    Attributes:
+        x: The x-axis of the world point at the center of the view.
+        y: The y-axis of the world point at the center of the view.
+        zoom (Optional): The number of pixels per world unit. Default to 1.0.
+        rotation (Optional): The counterclockwise rotation of the world on
+            the screen, in radians. Default to 0.0.
+    """
+
+    def __init__(
+        self,
+        x: float = 0.0,
+        y: float = 0.0,
+        *,
+        zoom: Optional[float] = 1.0,
+        rotation: Optional[float] = 0.0,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            x (Optional): The x-axis of the world point at the center of the
+                view. Default to 0.0.
+            y (Optional): The y-axis of the world point at the center of the
+                view. Default to 0.0.
+            zoom (Optional): The number of pixels per world unit.
+                Default to 1.0.
+            rotation (Optional): The counterclockwise rotation of the world
+                on the screen, in radians. Default to 0.0.
+
+        Raises:
+            ValueError: If the zoom is not positive.
+        """
+
+        if zoom <= 0:
+            raise ValueError(f"Expected a positive zoom. {zoom} given.")
+
+        self.x: float = x
+        self.y: float = y
+        self.zoom: float = zoom
+        self.rotation: float = rotation
+
+    def matrix(self, width: float, height: float) -> np.ndarray:
+        """Get the world to screen transformation.
+
+        Args:
+            width: The width of the view.
+            height: The height of the view.
+
+        Returns:
+            np.ndarray: The (3, 3) affine matrix.
+        """
+
+        cos: float = np.cos(self.rotation) * self.zoom
+        sin: float = np.sin(self.rotation) * self.zoom
+        return np.array(
+            [
+                [cos, -sin, width / 2 - cos * self.x + sin * self.y],
+                [sin, cos, height / 2 - sin * self.x - cos * self.y],
+                [0.0, 0.0, 1.0],
+            ]
+        )
+
+    def gl_matrix(self, width: float, height: float) -> np.ndarray:
+        """Get the world to screen transformation as an OpenGL matrix.
+
+        Args:
+            width: The width of the view.
+            height: The height of the view.
+
+        Returns:
+            np.ndarray: The (16,) column-major 4x4 matrix.
+        """
+
+        matrix: np.ndarray = self.matrix(width, height)
+        result: np.ndarray = np.identity(4)
+        result[:2, :2] = matrix[:2, :2]
+        result[:2, 3] = matrix[:2, 2]
+        return result.T.ravel()
+
+    def world_to_screen(
+        self, points: PointArray, width: float, height: float
+    ) -> PointArray:
+        """Convert world positions to screen positions.
+
+        Args:
+            points: The (n, 2) array (or a single (2,) point) of world positions.
+            width: The width of the view.
+            height: The height of the view.
+
+        Returns:
+            PointArray: The screen positions, with the shape of the points.
+        """
+
+        matrix: np.ndarray = self.matrix(width, height)
+        return np.asarray(points) @ matrix[:2, :2].T + matrix[:2, 2]
+
+    def screen_to_world(
+        self, points: PointArray, width: float, height: float
+    ) -> PointArray:
+        """Convert screen positions (e.g. the mouse) to world positions.
+
+        Args:
+            points: The (n, 2) array (or a single (2,) point) of screen positions.
+            width: The width of the view.
+            height: The height of the view.
+
+        Returns:
+            PointArray: The world positions, with the shape of the points.
+        """
+
+        matrix: np.ndarray = np.linalg.inv(self.matrix(width, height))
+        return np.asarray(points) @ matrix[:2, :2].T + matrix[:2, 2]
+
+    def bounds(self, width: float, height: float) -> tuple[float, float, float, float]:
+        """Get the area of the world in the view.
+
+        Args:
+            width: The width of the view.
+            height: The height of the view.
+
+        Returns:
+            tuple[float, float, float, float]: The (left, bottom, right, top)
+                world box containing the view (larger than the view when it
+                is rotated).
+        """
+
+        corners: PointArray = self.screen_to_world(
+            [[0, 0], [width, 0], [0, height], [width, height]], width, height
+        )
+        left, bottom = corners.min(axis=0)
+        right, top = corners.max(axis=0)
+        return float(left), float(bottom), float(right), float(top)
+
+    def visible(
+        self,
+        points: PointArray,
+        width: float,
+        height: float,
+        radii: Optional[float | ScalarArray] = 0.0,
+    ) -> np.ndarray:
+        """Tell which objects overlap the view, to skip drawing the others.
+
+        Args:
+            points: The (n, 2) array of the world positions of the objects.
+            width: The width of the view.
+            height: The height of the view.
+            radii (Optional): The world radius of the objects (or a (n,)
+                array of radii). Default to 0.0.
+
+        Returns:
+            np.ndarray: The (n,) boolean mask of the visible objects.
+        """
+
+        left, bottom, right, top = self.bounds(width, height)
+        points = np.asarray(points)
+        radii = np.asarray(radii)
+        return (
+            (points[:, 0] + radii >= left)
+            & (points[:, 0] - radii <= right)
+            & (points[:, 1] + radii >= bottom)
+            & (points[:, 1] - radii <= top)
+        )
+
+    def pan(self, dx: float, dy: float) -> None:
+        """Move the view by a screen offset (e.g. a mouse drag).
+
+        Args:
+            dx: The x-axis offset in pixels.
+            dy: The y-axis offset in pixels.
+        """
+
+        cos: float = np.cos(self.rotation)
+        sin: float = np.sin(self.rotation)
+        self.x += (cos * dx + sin * dy) / self.zoom
+        self.y += (-sin * dx + cos * dy) / self.zoom
+
+    def zoom_at(
+        self, factor: float, x: float, y: float, width: float, height: float
+    ) -> None:
+        """Scale the zoom while keeping a screen point over the same world point.
+
+        Args:
+            factor: The zoom multiplier.
+            x: The x-axis of the fixed screen point (e.g. the mouse).
+            y: The y-axis of the fixed screen point.
+            width: The width of the view.
+            height: The height of the view.
+        """
+
+        anchor: PointArray = self.screen_to_world((x, y), width, height)
+        self.zoom *= factor
+        self.x, self.y = (
+            np.array([self.x, self.y])
+            + anchor
+            - self.screen_to_world((x, y), width, height)
+        ).tolist()
@@ -0,0 +1,328 @@
+from typing import Optional
+import numpy as np
+from pysics._graph import color_edges
+from pysics.batches import Lines
+from pysics.types import (
+    ByteInt,
+    Color,
+    IndexArray,
+    PointArray,
+    ScalarArray,
+    State,
+)
+
+
+class ConstraintSolver:
+    """A position based solver for particles linked by distance constraints.
+
+    The constraints are stored as index and rest length arrays. They are
+    split once (until the topology changes) into groups that do not share a
+    particle, so every group is projected in a single NumPy pass.
+
+    A constraint with a zero compliance is a rigid distance constraint, a
+    positive compliance (the inverse of the stiffness) makes it a spring,
+    following the XPBD formulation so that the stiffness does not depend on
+    the step or the number of iterations.
+
+    Attributes:
+        gravity: The (x, y) gravity acceleration. Default to (0, -9.81).
+        damping: The ratio of velocity lost per second. Default to 0.0.
+        iterations: The number of solver iterations per step. Default to 10.
+    """
+
+    def __init__(
+        self,
+        positions: PointArray,
+        *,
+        masses: Optional[ScalarArray | float] = 1.0,
+        gravity: Optional[tuple[float, float]] = (0.0, -9.81),
+        damping: Optional[float] = 0.0,
+        iterations: Optional[int] = 10,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            positions: The (n, 2) array of the particle positions.
+            masses (Optional): The (n,) array of the particle masses, or a
+                single mass. A zero mass pins the particle. Default to 1.0.
+            gravity (Optional): The (x, y) gravity acceleration.
+                Default to (0, -9.81).
+            damping (Optional): The ratio of velocity lost per second.
+                Default to 0.0.
+            iterations (Optional): The number of solver iterations per step.
+                Default to 10.
+        """
+
+        self.gravity: tuple[float, float] = gravity
+        self.damping: float = damping
+        self.iterations: int = iterations
+        self._pos: PointArray = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        self._prev: PointArray = self._pos.copy()
+        masses = np.broadcast_to(np.asarray(masses, dtype=np.float64), len(self._pos))
+        self._inv_mass: ScalarArray = np.where(
+            masses > 0, 1.0 / np.where(masses > 0, masses, 1.0), 0.0
+        )
+        self._pairs: np.ndarray = np.empty((0, 2), dtype=np.uint32)
+        self._rest: ScalarArray = np.empty(0)
+        self._compliance: ScalarArray = np.empty(0)
+        self._groups: list[tuple[IndexArray, ...]] | None = None
+
+    @property
+    def positions(self) -> PointArray:
+        """Get the particle positions (a writable view).
+
+        Returns:
+            PointArray: The (n, 2) array of the particle positions.
+        """
+
+        return self._pos
+
+    @property
+    def pairs(self) -> np.ndarray:
+        """Get the particle indices of each constraint.
+
+        Returns:
+            np.ndarray: The (k, 2) array of the constrained particles.
+        """
+
+        return self._pairs
+
+    @property
+    def group_count(self) -> int:
+        """Get the number of independent groups of constraints.
+
+        Returns:
+            int: The number of groups.
+        """
+
+        return len(self._get_groups())
+
+    def add_constraints(
+        self,
+        first: IndexArray,
+        second: IndexArray,
+        *,
+        rest: Optional[ScalarArray | float] = None,
+        compliance: Optional[ScalarArray | float] = 0.0,
+    ) -> IndexArray:
+        """Link pairs of particles.
+
+        Args:
+            first: The first particle of each constraint.
+            second: The second particle of each constraint.
+            rest (Optional): The rest length of each constraint.
+                Default to None (the current distance).
+            compliance (Optional): The compliance of each constraint (0 for a
+                rigid link). Default to 0.0.
+
+        Returns:
+            IndexArray: The indices of the new constraints.
+        """
+
+        pairs: np.ndarray = np.stack(
+            np.broadcast_arrays(np.atleast_1d(first), np.atleast_1d(second)), axis=-1
+        ).reshape(-1, 2)
+
+        if rest is None:
+            delta: PointArray = self._pos[pairs[:, 1]] - self._pos[pairs[:, 0]]
+            rest = np.hypot(delta[:, 0], delta[:, 1])
+
+        start: int = len(self._pairs)
+        self._pairs = np.concatenate((self._pairs, pairs.astype(np.uint32)))
+        self._rest = np.concatenate(
+            (
+                self._rest,
+                np.broadcast_to(np.asarray(rest, dtype=np.float64), len(pairs)),
+            )
+        )
+        self._compliance = np.concatenate(
+            (
+                self._compliance,
+                np.broadcast_to(np.asarray(compliance, dtype=np.float64), len(pairs)),
+            )
+        )
+        self._groups = None
+        return np.arange(start, len(self._pairs))
+
+    def pin(self, indices: IndexArray | int, *, mass: Optional[float] = 0.0) -> None:
+        """Pin (or release with a positive mass) some particles.
+
+        Args:
+            indices: The particles to update.
+            mass (Optional): The new mass of the particles. Default to 0.0.
+        """
+
+        self._inv_mass[indices] = 1.0 / mass if mass > 0 else 0.0
+        self._groups = None
+
+    def step(self, dt: float) -> None:
+        """Advance the simulation.
+
+        Args:
+            dt: The duration of the step.
+        """
+
+        if dt <= 0:
+            return
+
+        free: np.ndarray = self._inv_mass > 0
+        velocity: PointArray = (self._pos[free] - self._prev[free]) * max(
+            0.0, 1.0 - self.damping * dt
+        )
+        self._prev[:] = self._pos
+        self._pos[free] += velocity + np.asarray(self.gravity) * dt * dt
+        alpha: ScalarArray = self._compliance / (dt * dt)
+        batches: list[tuple[IndexArray, ...]] = [
+            (a, b, wa, wb, rest, alpha[group], np.zeros(len(group)))
+            for group, a, b, wa, wb, rest in self._get_groups()
+        ]
+
+        for _ in range(self.iterations):
+            for a, b, wa, wb, rest, compliance, lambdas in batches:
+                delta: PointArray = self._pos[b] - self._pos[a]
+                length: ScalarArray = np.hypot(delta[:, 0], delta[:, 1])
+                weight: ScalarArray = wa + wb + compliance
+                change: ScalarArray = np.where(
+                    weight > 0,
+                    (rest - length - compliance * lambdas)
+                    / np.where(weight > 0, weight, 1.0),
+                    0.0,
+                )
+                lambdas += change
+                correction: PointArray = (
+                    delta * (change / np.maximum(length, 1e-12))[:, None]
+                )
+                self._pos[a] -= correction * wa[:, None]
+                self._pos[b] += correction * wb[:, None]
+
+    def get_state(self) -> State:
+        """Get the state of the solver, to save it in a snapshot.
+
+        Returns:
+            State: The settings, particles and constraints of the solver.
+        """
+
+        return dict(
+            gravity=self.gravity,
+            damping=self.damping,
+            iterations=self.iterations,
+            positions=self._pos,
+            previous=self._prev,
+            inv_mass=self._inv_mass,
+            pairs=self._pairs,
+            rest=self._rest,
+            compliance=self._compliance,
+        )
+
+    def set_state(self, state: State) -> None:
+        """Restore a state returned by get_state().
+
+        Args:
+            state: The state to restore.
+        """
+
+        self.gravity = tuple(state["gravity"])
+        self.damping = state["damping"]
+        self.iterations = state["iterations"]
+        self._pos = state["positions"]
+        self._prev = state["previous"]
+        self._inv_mass = state["inv_mass"]
+        self._pairs = state["pairs"]
+        self._rest = state["rest"]
+        self._compliance = state["compliance"]
+        self._groups = None
+
+    def draw(
+        self,
+        *,
+        stroke: Optional[Color | ByteInt] = 255,
+        stroke_weight: Optional[int | float] = 1.0,
+    ) -> Lines:
+        """Render every constraint as one batched line set.
+
+        Args:
+            stroke (Optional): The color of the lines. Default to 255.
+            stroke_weight (Optional): The width of the lines. Default to 1.0.
+
+        Returns:
+            Lines: The rendered line set.
+        """
+
+        return Lines(self._pos, self._pairs, stroke=stroke, stroke_weight=stroke_weight)
+
+    @classmethod
+    def grid(
+        cls,
+        columns: int,
+        rows: int,
+        spacing: float,
+        *,
+        x: Optional[float] = 0.0,
+        y: Optional[float] = 0.0,
+        shear: Optional[bool] = False,
+        compliance: Optional[float] = 0.0,
+        **kwargs,
+    ) -> "ConstraintSolver":
+        """Create a cloth-like grid of particles.
+
+        The particles are indexed row by row from the (x, y) corner.
+
+        Args:
+            columns: The number of particles per row.
+            rows: The number of rows.
+            spacing: The distance between two neighbour particles.
+            x (Optional): The x-axis of the first particle. Default to 0.0.
+            y (Optional): The y-axis of the first particle. Default to 0.0.
+            shear (Optional): Also link the diagonal neighbours.
+                Default to False.
+            compliance (Optional): The compliance of the links. Default to 0.0.
+            **kwargs: The other arguments of the constructor.
+
+        Returns:
+            ConstraintSolver: The created solver.
+        """
+
+        ids: IndexArray = np.arange(columns * rows).reshape(rows, columns)
+        gx, gy = np.meshgrid(np.arange(columns), np.arange(rows))
+        positions: PointArray = np.stack((gx.ravel(), gy.ravel()), axis=1) * spacing
+        solver: ConstraintSolver = cls(positions + (x, y), **kwargs)
+        links: list[tuple[IndexArray, IndexArray]] = [
+            (ids[:, :-1], ids[:, 1:]),
+            (ids[:-1, :], ids[1:, :]),
+        ]
+
+        if shear:
+            links += [(ids[:-1, :-1], ids[1:, 1:]), (ids[:-1, 1:], ids[1:, :-1])]
+
+        for first, second in links:
+            solver.add_constraints(first.ravel(), second.ravel(), compliance=compliance)
+
+        return solver
+
+    def _get_groups(self) -> list[tuple[IndexArray, ...]]:
+        """Get the independent groups of constraints, computed on demand.
+
+        Returns:
+            list[tuple[IndexArray, ...]]: The constraint indices, the first and
+                second particles, their inverse masses and the rest lengths
+                of each group.
+        """
+
+        if self._groups is None:
+            first: IndexArray = self._pairs[:, 0].astype(np.intp)
+            second: IndexArray = self._pairs[:, 1].astype(np.intp)
+            self._groups = [
+                (
+                    group,
+                    first[group],
+                    second[group],
+                    self._inv_mass[first[group]],
+                    self._inv_mass[second[group]],
+                    self._rest[group],
+                )
+                for group in color_edges(
+                    first, second, len(self._pos), fixed=self._inv_mass == 0
+                )
+            ]
+
+        return self._groups
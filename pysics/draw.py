@@ -0,0 +1,254 @@
+from math import cos, pi, sin
+from typing import Optional
+import numpy as np
+from pysics.shapes import Ellipse, Line
+from pysics.strokes import stroke_strip
+from pysics.types import ByteInt, Color, PIndex
+from pysics._wrappers import (
+    gl,
+    GL_DOUBLE,
+    GL_FLOAT,
+    GL_LINE_LOOP,
+    GL_POLYGON,
+    GL_TRIANGLE_STRIP,
+    GL_VERTEX_ARRAY,
+)
+
+# The draw_* functions draw the same as the shapes, without creating any
+# shape, color or vertex list: the vertices are written into a preallocated
+# array drawn with glDrawArrays. They fit the hot loops drawing many shapes
+# per frame, where the allocated shapes trigger the garbage collector.
+
+# The vertices of the shape being drawn, and a flat view on them.
+_vertices: np.ndarray = np.zeros((256, 2))
+_flat: np.ndarray = _vertices.reshape(-1)
+# The unit circle of each number of segments, with the views of the
+# vertices where the x and y axes of an ellipse are written.
+_circles: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+
+def _set_color(color: Color | ByteInt) -> None:
+    """Set the current color without building its ratios.
+
+    Args:
+        color: The color or its unit RGB value.
+    """
+
+    if isinstance(color, int):
+        gl.color_4f(color / 255, color / 255, color / 255, 1.0)
+    else:
+        gl.color_4f(color.r / 255, color.g / 255, color.b / 255, color.a / 255)
+
+
+def _circle(segments: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Get the unit circle of a number of segments (computed on the first use).
+
+    The points are computed with the same rotation as Ellipse, so both draw
+    the same vertices.
+
+    Args:
+        segments: The number of segments.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The x and y
+            axes of the unit circle, then the views of the vertex array to
+            write the x and y axes of an ellipse.
+    """
+
+    global _vertices, _flat
+
+    if segments in _circles:
+        return _circles[segments]
+
+    if segments > len(_vertices):
+        _vertices = np.zeros((segments, 2))
+        _flat = _vertices.reshape(-1)
+        _circles.clear()
+
+    theta: float = 2 * pi / segments
+    cos_t: float = cos(theta)
+    sin_t: float = sin(theta)
+    unit: np.ndarray = np.zeros((segments, 2))
+    cx: float = 1.0
+    cy: float = 0.0
+
+    for i in range(segments):
+        unit[i] = cx, cy
+        cx, cy = cos_t * cx - sin_t * cy, sin_t * cx + cos_t * cy
+
+    _circles[segments] = (
+        unit[:, 0].copy(),
+        unit[:, 1].copy(),
+        _vertices[:segments, 0],
+        _vertices[:segments, 1],
+    )
+    return _circles[segments]
+
+
+def _draw(
+    count: int,
+    fill: Optional[Color | ByteInt],
+    stroke: Optional[Color | ByteInt],
+    stroke_weight: float,
+    closed: Optional[bool] = True,
+) -> None:
+    """Draw the first vertices of the vertex array as a filled polygon and
+    its outline.
+
+    Args:
+        count: The number of vertices.
+        fill: The filling color (drawn unless None or transparent).
+        stroke: The outline color (drawn unless None).
+        stroke_weight: The outline width.
+        closed (Optional): If a thick outline joins its last vertex to the
+            first one. Default to True.
+    """
+
+    gl.enable_client_state(GL_VERTEX_ARRAY)
+    gl.vertex_pointer(2, GL_DOUBLE, 0, _vertices)
+
+    if fill is not None and (isinstance(fill, int) or fill.a > 0):
+        _set_color(fill)
+        gl.draw_arrays(GL_POLYGON, 0, count)
+    if stroke is not None:
+        _set_color(stroke)
+
+        # The thick outlines are tessellated as Line.outline() does.
+        if stroke_weight > 1.0:
+            strip: np.ndarray = stroke_strip(
+                _vertices[:count], stroke_weight, join=Line.join, closed=closed
+            )
+
+            if len(strip):
+                gl.vertex_pointer(2, GL_FLOAT, 0, strip)
+                gl.draw_arrays(GL_TRIANGLE_STRIP, 0, len(strip))
+        else:
+            gl.line_width(stroke_weight)
+            gl.draw_arrays(GL_LINE_LOOP, 0, count)
+
+    gl.disable_client_state(GL_VERTEX_ARRAY)
+
+
+def draw_line(
+    x: PIndex,
+    y: PIndex,
+    dx: PIndex,
+    dy: PIndex,
+    *,
+    stroke: Optional[Color | ByteInt] = None,
+    stroke_weight: Optional[int | float] = 1.0,
+) -> None:
+    """Draw a line as Line does.
+
+    Args:
+        x: The x-axis of the line begin position.
+        y: The y-axis of the line begin position.
+        dx: The x-axis of the line end position.
+        dy: The y-axis of the line end position.
+        stroke (Optional): The color of the line. Default to None.
+        stroke_weight (Optional): The width of the line. Default to 1.0.
+    """
+
+    _flat[0] = x
+    _flat[1] = y
+    _flat[2] = dx
+    _flat[3] = dy
+    _draw(2, None, stroke, stroke_weight, closed=False)
+
+
+def draw_rect(
+    x: PIndex,
+    y: PIndex,
+    width: float,
+    height: float,
+    *,
+    fill: Optional[Color | ByteInt] = None,
+    stroke: Optional[Color | ByteInt] = None,
+    stroke_weight: Optional[int | float] = 1.0,
+) -> None:
+    """Draw a rectangle as Rect does.
+
+    Args:
+        x: The x-axis of the rectangle position.
+        y: The y-axis of the rectangle position.
+        width: The width of the rectangle.
+        height: The height of the rectangle.
+        fill (Optional): The filling color. Default to None (transparent).
+        stroke (Optional): The outline color. Default to None.
+        stroke_weight (Optional): The outline width. Default to 1.0.
+    """
+
+    _flat[0] = _flat[6] = x
+    _flat[1] = _flat[3] = y
+    _flat[2] = _flat[4] = x + width
+    _flat[5] = _flat[7] = y + height
+    _draw(4, fill, stroke, stroke_weight)
+
+
+def draw_ellipse(
+    x: PIndex,
+    y: PIndex,
+    rx: float,
+    ry: float,
+    *,
+    segments: int = 50,
+    fill: Optional[Color | ByteInt] = None,
+    stroke: Optional[Color | ByteInt] = None,
+    stroke_weight: Optional[int | float] = 1.0,
+) -> None:
+    """Draw an ellipse as Ellipse does (tessellation included).
+
+    Args:
+        x: The x-axis of the ellipse center.
+        y: The y-axis of the ellipse center.
+        rx: The x-axis radius.
+        ry: The y-axis radius.
+        segments (Optional): The number of segments of the outline.
+            Default to 50.
+        fill (Optional): The filling color. Default to None (transparent).
+        stroke (Optional): The outline color. Default to None.
+        stroke_weight (Optional): The outline width. Default to 1.0.
+    """
+
+    count: int = max(3, round(segments * Ellipse.tessellation))
+    unit_x, unit_y, xs, ys = _circle(count)
+    np.multiply(unit_x, rx, out=xs)
+    np.multiply(unit_y, ry, out=ys)
+    xs += x
+    ys += y
+    _draw(count, fill, stroke, stroke_weight)
+
+
+def draw_circle(
+    x: PIndex,
+    y: PIndex,
+    radius: float,
+    *,
+    segments: int = 50,
+    fill: Optional[Color | ByteInt] = None,
+    stroke: Optional[Color | ByteInt] = None,
+    stroke_weight: Optional[int | float] = 1.0,
+) -> None:
+    """Draw a circle as Circle does.
+
+    Args:
+        x: The x-axis of the circle center.
+        y: The y-axis of the circle center.
+        radius: The radius length.
+        segments (Optional): The number of segments of the outline.
+            Default to 50.
+        fill (Optional): The filling color. Default to None (transparent).
+        stroke (Optional): The outline color. Default to None.
+        stroke_weight (Optional): The outline width. Default to 1.0.
+    """
+
+    draw_ellipse(
+        x,
+        y,
+        radius,
+        radius,
+        segments=segments,
+        fill=fill,
+        stroke=stroke,
+        stroke_weight=stroke_weight,
+    )
@@ -0,0 +1,553 @@
+from typing import Optional
+import numpy as np
+from numpy.typing import NDArray
+from pysics.textures import Texture
+from pysics.types import ByteInt, Color, PIndex, State
+
+Field = NDArray[np.float64]  # Define a 2D grid of values, indexed as [y, x].
+
+
+class StableFluid:
+    """An Eulerian fluid on a regular grid, following the "stable fluids" scheme.
+
+    Each step diffuses and advects the velocity, projects it on a divergence
+    free field, then moves a density field along it. Every stage works on the
+    whole grid with NumPy, and the implicit solves (diffusion and pressure)
+    are red-black Gauss-Seidel relaxations bounded by an iteration budget.
+    The pressure is kept between the steps to warm start the next solve.
+
+    The velocity is stored on the cell faces (a staggered grid), so the
+    projection removes the whole divergence once the pressure solve has
+    converged. Distances are in cells and the grid is enclosed by walls.
+
+    Attributes:
+        viscosity: The velocity diffusion rate. Default to 0.0.
+        diffusion: The density diffusion rate. Default to 0.0.
+        dissipation: The ratio of density lost per second. Default to 0.0.
+        iterations: The maximum number of relaxations per solve. Default to 20.
+        tolerance: The residual under which a solve stops early. Default to 0.0.
+        relaxation: The over-relaxation factor of the solves. Default to 1.5.
+        residual: The residual of the last pressure solve.
+    """
+
+    def __init__(
+        self,
+        columns: int,
+        rows: int,
+        *,
+        viscosity: Optional[float] = 0.0,
+        diffusion: Optional[float] = 0.0,
+        dissipation: Optional[float] = 0.0,
+        iterations: Optional[int] = 20,
+        tolerance: Optional[float] = 0.0,
+        relaxation: Optional[float] = 1.5,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            columns: The number of cells on the x-axis (at least 2).
+            rows: The number of cells on the y-axis (at least 2).
+            viscosity (Optional): The velocity diffusion rate. Default to 0.0.
+            diffusion (Optional): The density diffusion rate. Default to 0.0.
+            dissipation (Optional): The ratio of density lost per second.
+                Default to 0.0.
+            iterations (Optional): The maximum number of relaxations per
+                solve. Default to 20.
+            tolerance (Optional): The residual under which a solve stops
+                early. Default to 0.0 (always use the whole budget).
+            relaxation (Optional): The over-relaxation factor of the solves,
+                between 1 (Gauss-Seidel) and 2. Default to 1.5.
+
+        Raises:
+            ValueError: If the grid is smaller than 2x2 cells.
+        """
+
+        if columns < 2 or rows < 2:
+            raise ValueError(f"Expected at least 2x2 cells. {columns}x{rows} given.")
+
+        self.viscosity: float = viscosity
+        self.diffusion: float = diffusion
+        self.dissipation: float = dissipation
+        self.iterations: int = iterations
+        self.tolerance: float = tolerance
+        self.relaxation: float = relaxation
+        self.residual: float = 0.0
+        self._density: Field = np.zeros((rows, columns))
+        self._u: Field = np.zeros((rows, columns + 1))
+        self._v: Field = np.zeros((rows + 1, columns))
+        self._pressure: Field = np.zeros((rows, columns))
+        self._texture: Texture | None = None
+        self._init_grid()
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Get the size of the grid.
+
+        Returns:
+            tuple[int, int]: The (rows, columns) of the grid.
+        """
+
+        return self._density.shape
+
+    @property
+    def density(self) -> Field:
+        """Get the density field (a writable view).
+
+        Returns:
+            Field: The (rows, columns) density grid.
+        """
+
+        return self._density
+
+    @property
+    def velocity(self) -> tuple[Field, Field]:
+        """Get the velocity on the cell faces (writable views).
+
+        Returns:
+            tuple[Field, Field]: The (rows, columns + 1) x-axis velocity on the
+                left and right faces, and the (rows + 1, columns) y-axis
+                velocity on the bottom and top faces, in cells per second.
+        """
+
+        return self._u, self._v
+
+    def velocity_at_cells(self) -> NDArray[np.float64]:
+        """Get the velocity at the cell centers.
+
+        Returns:
+            NDArray[np.float64]: The (2, rows, columns) grid of the x and y
+                velocity components.
+        """
+
+        return np.stack(
+            (
+                0.5 * (self._u[:, :-1] + self._u[:, 1:]),
+                0.5 * (self._v[:-1, :] + self._v[1:, :]),
+            )
+        )
+
+    def add_density(
+        self, x: float, y: float, amount: float, *, radius: Optional[float] = 1.0
+    ) -> None:
+        """Add some density around a point.
+
+        Args:
+            x: The x-axis of the point (in cells).
+            y: The y-axis of the point (in cells).
+            amount: The density to add to each covered cell.
+            radius (Optional): The radius of the covered disc. Default to 1.0.
+        """
+
+        self._density[self._disc(self._points[0], x, y, radius)] += amount
+
+    def add_velocity(
+        self,
+        x: float,
+        y: float,
+        vx: float,
+        vy: float,
+        *,
+        radius: Optional[float] = 1.0,
+    ) -> None:
+        """Push the fluid around a point.
+
+        Args:
+            x: The x-axis of the point (in cells).
+            y: The y-axis of the point (in cells).
+            vx: The x-axis velocity to add.
+            vy: The y-axis velocity to add.
+            radius (Optional): The radius of the covered disc. Default to 1.0.
+        """
+
+        self._u[self._disc(self._points[1], x, y, radius)] += vx
+        self._v[self._disc(self._points[2], x, y, radius)] += vy
+
+    def step(self, dt: float) -> None:
+        """Advance the simulation.
+
+        Args:
+            dt: The duration of the step.
+        """
+
+        if dt <= 0:
+            return
+
+        if self.viscosity > 0:
+            self._diffuse(self._u, self.viscosity * dt)
+            self._diffuse(self._v, self.viscosity * dt)
+
+        u_cells, v_cells = self.velocity_at_cells()
+        u: Field = self._advect(
+            self._u, self._points[1], -0.5, 0.0, self._u, self._between(v_cells, 1), dt
+        )
+        self._v = self._advect(
+            self._v, self._points[2], 0.0, -0.5, self._between(u_cells, 0), self._v, dt
+        )
+        self._u = u
+        self._project()
+
+        if self.diffusion > 0:
+            self._diffuse(self._density, self.diffusion * dt)
+
+        self._density = self._advect(
+            self._density, self._points[0], 0.0, 0.0, *self.velocity_at_cells(), dt
+        )
+
+        if self.dissipation > 0:
+            self._density *= max(0.0, 1.0 - self.dissipation * dt)
+
+    def get_state(self) -> State:
+        """Get the state of the fluid, to save it in a snapshot.
+
+        Returns:
+            State: The settings and fields of the fluid.
+        """
+
+        return dict(
+            viscosity=self.viscosity,
+            diffusion=self.diffusion,
+            dissipation=self.dissipation,
+            iterations=self.iterations,
+            tolerance=self.tolerance,
+            relaxation=self.relaxation,
+            residual=self.residual,
+            density=self._density,
+            u=self._u,
+            v=self._v,
+            pressure=self._pressure,
+        )
+
+    def set_state(self, state: State) -> None:
+        """Restore a state returned by get_state().
+
+        Args:
+            state: The state to restore.
+        """
+
+        for name in (
+            "viscosity",
+            "diffusion",
+            "dissipation",
+            "iterations",
+            "tolerance",
+            "relaxation",
+            "residual",
+        ):
+            setattr(self, name, state[name])
+
+        self._density = state["density"]
+        self._u = state["u"]
+        self._v = state["v"]
+        self._pressure = state["pressure"]
+        self._init_grid()
+
+    def draw(
+        self,
+        x: PIndex,
+        y: PIndex,
+        width: PIndex,
+        height: PIndex,
+        *,
+        field: Optional[str] = "density",
+        scale: Optional[float] = 1.0,
+        tint: Optional[Color | ByteInt] = 255,
+    ) -> Texture:
+        """Draw a field of the grid as a single textured quad.
+
+        The density is drawn in gray levels, the velocity in red (x-axis) and
+        green (y-axis) around a mid gray for a null velocity.
+
+        Args:
+            x: The x-axis of the bottom left corner.
+            y: The y-axis of the bottom left corner.
+            width: The width of the quad.
+            height: The height of the quad.
+            field (Optional): "density" or "velocity". Default to "density".
+            scale (Optional): The factor applied to the values before they
+                are clipped to [0..1]. Default to 1.0.
+            tint (Optional): The color multiplied with the pixels. Default to 255.
+
+        Returns:
+            Texture: The texture of the grid, reused by the next draws.
+
+        Raises:
+            ValueError: If the field is unknown.
+        """
+
+        if field == "density":
+            size: tuple[int, ...] = self.shape
+        elif field == "velocity":
+            size = (*self.shape, 3)
+        else:
+            raise ValueError(f"Expected 'density' or 'velocity'. {field!r} given.")
+
+        if self._image is None or self._image.shape != size:
+            self._image = np.empty(size, dtype=np.float32)
+
+        if field == "density":
+            np.multiply(self._density, scale, out=self._image)
+        else:
+            velocity: NDArray[np.float64] = self.velocity_at_cells()
+            np.multiply(
+                np.moveaxis(velocity, 0, -1), 0.5 * scale, out=self._image[..., :2]
+            )
+            self._image[..., :2] += 0.5
+            self._image[..., 2] = 0.5
+
+        np.clip(self._image, 0.0, 1.0, out=self._image)
+
+        if self._texture is None:
+            self._texture = Texture(smooth=True)
+
+        self._texture.update(self._image)
+        self._texture.draw(x, y, width, height, tint=tint)
+        return self._texture
+
+    def _init_grid(self) -> None:
+        """Prepare the sample positions and the buffers of the grid."""
+
+        self._points: tuple[Field, Field, Field] = (
+            self._sample_points(self._density.shape, 0.0, 0.0),
+            self._sample_points(self._u.shape, -0.5, 0.0),
+            self._sample_points(self._v.shape, 0.0, -0.5),
+        )
+        self._buffers: dict[tuple[int, int], tuple[Field, tuple[list, ...]]] = {}
+        self._image: NDArray[np.float32] | None = None
+
+    @staticmethod
+    def _sample_points(shape: tuple[int, int], ox: float, oy: float) -> Field:
+        """Get the position of the samples of a field.
+
+        Args:
+            shape: The (rows, columns) of the field.
+            ox: The x-axis offset of the first sample.
+            oy: The y-axis offset of the first sample.
+
+        Returns:
+            Field: The (2, rows, columns) x and y positions of the samples.
+        """
+
+        x, y = np.meshgrid(np.arange(shape[1]) + ox, np.arange(shape[0]) + oy)
+        return np.stack((x, y))
+
+    @staticmethod
+    def _disc(points: Field, x: float, y: float, radius: float) -> NDArray[np.bool_]:
+        """Get the samples covered by a disc.
+
+        Args:
+            points: The (2, rows, columns) positions of the samples.
+            x: The x-axis of the disc center.
+            y: The y-axis of the disc center.
+            radius: The radius of the disc.
+
+        Returns:
+            NDArray[np.bool_]: The (rows, columns) mask of the covered samples.
+        """
+
+        return (points[0] - x) ** 2 + (points[1] - y) ** 2 <= radius**2
+
+    @staticmethod
+    def _between(field: Field, axis: int) -> Field:
+        """Average each pair of neighbour samples along an axis.
+
+        The first and last samples are repeated, so the result has one more
+        sample than the field along the axis (e.g. the faces between cells).
+
+        Args:
+            field: The field to average.
+            axis: The axis of the neighbours.
+
+        Returns:
+            Field: The averaged field.
+        """
+
+        padded: Field = np.concatenate(
+            (field.take([0], axis), field, field.take([-1], axis)), axis
+        )
+        size: int = padded.shape[axis]
+        return 0.5 * (
+            padded.take(range(size - 1), axis) + padded.take(range(1, size), axis)
+        )
+
+    @staticmethod
+    def _interpolate(field: Field, x: Field, y: Field, ox: float, oy: float) -> Field:
+        """Interpolate a field between its four surrounding samples.
+
+        The positions outside of the field are clamped on its borders.
+
+        Args:
+            field: The field to interpolate.
+            x: The x-axis of the positions.
+            y: The y-axis of the positions.
+            ox: The x-axis position of the first sample of the field.
+            oy: The y-axis position of the first sample of the field.
+
+        Returns:
+            Field: The interpolated values.
+        """
+
+        rows, columns = field.shape
+        x = np.clip(x - ox, 0, columns - 1)
+        y = np.clip(y - oy, 0, rows - 1)
+        x0: NDArray[np.intp] = np.minimum(x.astype(np.intp), columns - 2)
+        y0: NDArray[np.intp] = np.minimum(y.astype(np.intp), rows - 2)
+        fx: Field = x - x0
+        fy: Field = y - y0
+        # Flat indices are much cheaper to gather than pairs of indices.
+        flat: Field = field.ravel()
+        index: NDArray[np.intp] = y0 * columns + x0
+        bottom: Field = flat.take(index)
+        bottom += (flat.take(index + 1) - bottom) * fx
+        index += columns
+        top: Field = flat.take(index)
+        top += (flat.take(index + 1) - top) * fx
+        return bottom + (top - bottom) * fy
+
+    def _advect(
+        self,
+        field: Field,
+        points: Field,
+        ox: float,
+        oy: float,
+        vx: Field,
+        vy: Field,
+        dt: float,
+    ) -> Field:
+        """Move a field along the velocity (semi-Lagrangian).
+
+        Each sample takes the value found where its content was one step ago.
+
+        Args:
+            field: The field to move.
+            points: The (2, rows, columns) positions of the field samples.
+            ox: The x-axis position of the first sample of the field.
+            oy: The y-axis position of the first sample of the field.
+            vx: The x-axis velocity at the field samples.
+            vy: The y-axis velocity at the field samples.
+            dt: The duration of the step.
+
+        Returns:
+            Field: The moved field.
+        """
+
+        return self._interpolate(
+            field, points[0] - dt * vx, points[1] - dt * vy, ox, oy
+        )
+
+    def _diffuse(self, field: Field, rate: float) -> None:
+        """Diffuse a field in place (implicit step).
+
+        Args:
+            field: The field to diffuse.
+            rate: The diffusion rate multiplied by the step duration.
+        """
+
+        self._relax(field, field.copy(), rate, 1 + 4 * rate)
+
+    def _divergence(self) -> Field:
+        """Compute the net flow out of each cell.
+
+        Returns:
+            Field: The (rows, columns) divergence grid.
+        """
+
+        return (self._u[:, 1:] - self._u[:, :-1]) + (self._v[1:, :] - self._v[:-1, :])
+
+    def _project(self) -> None:
+        """Remove the divergent part of the velocity in place."""
+
+        self._u[:, 0] = self._u[:, -1] = 0.0
+        self._v[0, :] = self._v[-1, :] = 0.0
+        self.residual = self._relax(self._pressure, -self._divergence(), 1.0, 4.0)
+        self._u[:, 1:-1] -= self._pressure[:, 1:] - self._pressure[:, :-1]
+        self._v[1:-1, :] -= self._pressure[1:, :] - self._pressure[:-1, :]
+
+    def _relax(self, x: Field, rhs: Field, a: float, c: float) -> float:
+        """Solve c * x - a * (sum of the 4 neighbours of x) = rhs in place.
+
+        The samples on the borders mirror their inner neighbour (no flux
+        through the walls). The current content of x is the first guess.
+
+        Args:
+            x: The unknown field, updated in place.
+            rhs: The right hand side.
+            a: The weight of the neighbours.
+            c: The weight of the sample.
+
+        Returns:
+            float: The largest residual of the last relaxation.
+        """
+
+        padded, colors = self._get_buffers(x.shape)
+        inner: Field = padded[1:-1, 1:-1]
+        inner[...] = x
+        weight: float = self.relaxation / c
+        residual: float = 0.0
+
+        for iteration in range(self.iterations):
+            check: bool = self.tolerance > 0 or iteration == self.iterations - 1
+            residual = 0.0
+
+            for color in colors:
+                padded[0, 1:-1] = padded[1, 1:-1]
+                padded[-1, 1:-1] = padded[-2, 1:-1]
+                padded[:, 0] = padded[:, 1]
+                padded[:, -1] = padded[:, -2]
+
+                for cells, up, down, left, right, (r, col) in color:
+                    error: Field = up + down
+                    error += left
+                    error += right
+                    error *= a
+                    error += rhs[r::2, col::2]
+                    error -= c * cells
+
+                    if check and error.size:
+                        residual = max(residual, float(np.abs(error).max()))
+
+                    error *= weight
+                    cells += error
+
+            if self.tolerance > 0 and residual <= self.tolerance:
+                break
+
+        x[...] = inner
+        return residual
+
+    def _get_buffers(self, shape: tuple[int, int]) -> tuple[Field, tuple[list, ...]]:
+        """Get the padded buffer of a solve and its red-black views, on demand.
+
+        Each color is made of two quarters of the samples (every other sample
+        on both axes), given as the views of the samples, of their neighbours
+        above, below, on the left and on the right, and the quarter origin.
+
+        Args:
+            shape: The (rows, columns) of the solved field.
+
+        Returns:
+            tuple[Field, tuple[list, ...]]: The padded buffer and the views of
+                the red and black samples.
+        """
+
+        if shape not in self._buffers:
+            rows, columns = shape
+            padded: Field = np.zeros((rows + 2, columns + 2))
+            colors: tuple[list, ...] = ([], [])
+
+            for r, c in ((0, 0), (1, 1), (0, 1), (1, 0)):
+                inner_rows: slice = slice(1 + r, rows + 1, 2)
+                inner_columns: slice = slice(1 + c, columns + 1, 2)
+                colors[(r + c) % 2].append(
+                    (
+                        padded[inner_rows, inner_columns],
+                        padded[r:rows:2, inner_columns],
+                        padded[2 + r : rows + 2 : 2, inner_columns],
+                        padded[inner_rows, c:columns:2],
+                        padded[inner_rows, 2 + c : columns + 2 : 2],
+                        (r, c),
+                    )
+                )
+
+            self._buffers[shape] = (padded, colors)
+
+        return self._buffers[shape]
@@ -0,0 +1,153 @@
+from typing import Optional
+import numpy as np
+from pysics._wrappers import (
+    gl,
+    GL_COLOR_ATTACHMENT0,
+    GL_COLOR_BUFFER_BIT,
+    GL_DRAW_FRAMEBUFFER,
+    GL_FRAMEBUFFER,
+    GL_FRAMEBUFFER_COMPLETE,
+    GL_LINEAR,
+    GL_NEAREST,
+    GL_READ_FRAMEBUFFER,
+    GL_RENDERBUFFER,
+    GL_RGBA8,
+)
+
+
+class RenderTarget:
+    """An offscreen framebuffer, drawn at its own resolution then upscaled.
+
+    With multisampling, the frame is rendered in a multisampled buffer which
+    is resolved into a second buffer of the same size before the upscaling
+    blit (a multisampled buffer cannot be scaled while resolved). At the
+    size of the window, it is resolved straight into the window.
+    """
+
+    def __init__(self) -> None:
+        """The constructor."""
+
+        # The ids are kept as GLuint arrays, passed to the delete functions
+        # without a conversion (a copy error with the debug profile).
+        self._framebuffers: np.ndarray = np.empty(0, dtype=np.uint32)
+        self._renderbuffers: np.ndarray = np.empty(0, dtype=np.uint32)
+        self._size: tuple[int, int, int] | None = None
+
+    @property
+    def size(self) -> tuple[int, int, int] | None:
+        """Get the size of the buffers.
+
+        Returns:
+            tuple[int, int, int] | None: The (width, height, samples) of the
+                buffers or None if they are not allocated.
+        """
+
+        return self._size
+
+    def resize(self, width: int, height: int, samples: Optional[int] = 0) -> None:
+        """Allocate the buffers (only if the size changed).
+
+        Args:
+            width: The width of the buffers.
+            height: The height of the buffers.
+            samples (Optional): The number of samples per pixel, 0 without
+                multisampling. Default to 0.
+
+        Raises:
+            RuntimeError: If the driver cannot render in the buffers.
+        """
+
+        size: tuple[int, int, int] = (width, height, samples)
+
+        if size == self._size:
+            return
+
+        self.delete()
+        count: int = 2 if samples else 1
+        self._framebuffers = np.atleast_1d(gl.gen_framebuffers(count)).astype(np.uint32)
+        self._renderbuffers = np.atleast_1d(gl.gen_renderbuffers(count)).astype(
+            np.uint32
+        )
+
+        for i, (framebuffer, renderbuffer) in enumerate(
+            zip(self._framebuffers, self._renderbuffers)
+        ):
+            gl.bind_renderbuffer(GL_RENDERBUFFER, renderbuffer)
+
+            if i == 0 and samples:
+                gl.renderbuffer_storage_multisample(
+                    GL_RENDERBUFFER, samples, GL_RGBA8, width, height
+                )
+            else:
+                gl.renderbuffer_storage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+
+            gl.bind_framebuffer(GL_FRAMEBUFFER, framebuffer)
+            gl.framebuffer_renderbuffer(
+                GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, renderbuffer
+            )
+            status: int = gl.check_framebuffer_status(GL_FRAMEBUFFER)
+
+            if status != GL_FRAMEBUFFER_COMPLETE:
+                self.delete()
+                raise RuntimeError(f"Incomplete framebuffer (status {status:#x}).")
+
+        gl.bind_renderbuffer(GL_RENDERBUFFER, 0)
+        gl.bind_framebuffer(GL_FRAMEBUFFER, 0)
+        self._size = size
+
+    def bind(self) -> None:
+        """Render the next draws in the buffers.
+
+        Raises:
+            RuntimeError: If the buffers are not allocated.
+        """
+
+        if self._size is None:
+            raise RuntimeError("The render target must be resized first.")
+
+        gl.bind_framebuffer(GL_FRAMEBUFFER, self._framebuffers[0])
+
+    def present(self, width: int, height: int) -> None:
+        """Copy the rendered frame to the window, scaled to its size.
+
+        The window framebuffer must be single-sampled.
+
+        Args:
+            width: The width of the window framebuffer.
+            height: The height of the window framebuffer.
+
+        Raises:
+            RuntimeError: If the buffers are not allocated.
+        """
+
+        if self._size is None:
+            raise RuntimeError("The render target must be resized first.")
+
+        w, h, _ = self._size
+        scaled: bool = (w, h) != (width, height)
+        source: int = self._framebuffers[0]
+
+        if len(self._framebuffers) == 2 and scaled:
+            source = self._framebuffers[1]
+            gl.bind_framebuffer(GL_READ_FRAMEBUFFER, self._framebuffers[0])
+            gl.bind_framebuffer(GL_DRAW_FRAMEBUFFER, source)
+            gl.blit_framebuffer(0, 0, w, h, 0, 0, w, h, GL_COLOR_BUFFER_BIT, GL_NEAREST)
+
+        filtering: int = GL_LINEAR if scaled else GL_NEAREST
+        gl.bind_framebuffer(GL_READ_FRAMEBUFFER, source)
+        gl.bind_framebuffer(GL_DRAW_FRAMEBUFFER, 0)
+        gl.blit_framebuffer(
+            0, 0, w, h, 0, 0, width, height, GL_COLOR_BUFFER_BIT, filtering
+        )
+        gl.bind_framebuffer(GL_FRAMEBUFFER, 0)
+
+    def delete(self) -> None:
+        """Release the buffers."""
+
+        if len(self._framebuffers):
+            gl.delete_framebuffers(len(self._framebuffers), self._framebuffers)
+            gl.delete_renderbuffers(len(self._renderbuffers), self._renderbuffers)
+
+        self._framebuffers = np.empty(0, dtype=np.uint32)
+        self._renderbuffers = np.empty(0, dtype=np.uint32)
+        self._size = None
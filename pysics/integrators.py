@@ -0,0 +1,298 @@
+from math import inf, sqrt
+from typing import Callable, Final, Optional, TypeAlias
+import numpy as np
+from numpy.typing import NDArray
+from pysics.types import PointArray
+
+StateArray: TypeAlias = NDArray[np.floating]  # Define the integrated array.
+Derivative: TypeAlias = Callable[[float, StateArray], StateArray]
+Acceleration: TypeAlias = Callable[[float, PointArray, PointArray], PointArray]
+
+
+def second_order(acceleration: Acceleration) -> Derivative:
+    """Turn an acceleration function into the derivative of a (2, n, d) state.
+
+    The state stacks the positions and the velocities of the bodies, so a
+    second order system (e.g. bodies under gravity) can be integrated.
+
+    Args:
+        acceleration: The function computing the (n, d) accelerations from the
+            time, the positions and the velocities.
+
+    Returns:
+        Derivative: The derivative of the stacked state.
+    """
+
+    def derivative(t: float, state: StateArray) -> StateArray:
+        return np.stack((state[1], acceleration(t, state[0], state[1])))
+
+    return derivative
+
+
+class AdaptiveIntegrator:
+    """An embedded Runge-Kutta integrator (Dormand-Prince 5(4)) with error control.
+
+    Each substep computes a 5th order solution and a 4th order estimate with
+    the same evaluations. Their difference measures the error, which decides
+    if the substep is accepted and scales the next step to match the
+    tolerance. The whole state (every particle) is advanced at once, and the
+    last derivative of a substep is reused as the first of the next one.
+
+    The error of each value is weighted by atol + rtol * |value|. The "rms"
+    norm averages the weighted errors over the state while the "max" norm
+    makes the worst particle drive the step size.
+
+    Attributes:
+        derivative: The function computing the derivative of the state.
+        rtol: The relative tolerance. Default to 1e-6.
+        atol: The absolute tolerance. Default to 1e-9.
+        norm: The error norm, "rms" or "max". Default to "rms".
+        min_step: The smallest allowed step. Default to 1e-12.
+        max_step: The largest allowed step. Default to inf.
+        max_substeps: The number of substeps allowed per advance() call.
+            Default to 100000.
+        step: The next step to try, kept between the calls.
+        accepted: The total number of accepted substeps.
+        rejected: The total number of rejected substeps.
+        substeps: The number of accepted substeps of the last advance() call.
+        evaluations: The total number of derivative evaluations.
+    """
+
+    _SAFETY: Final[float] = 0.9
+    _MIN_FACTOR: Final[float] = 0.2
+    _MAX_FACTOR: Final[float] = 5.0
+    _C: Final[tuple[float, ...]] = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0)
+    _A: Final[tuple[tuple[float, ...], ...]] = (
+        (),
+        (1 / 5,),
+        (3 / 40, 9 / 40),
+        (44 / 45, -56 / 15, 32 / 9),
+        (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+        (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+        (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+    )
+    _E: Final[tuple[float, ...]] = (
+        71 / 57600,
+        0.0,
+        -71 / 16695,
+        71 / 1920,
+        -17253 / 339200,
+        22 / 525,
+        -1 / 40,
+    )
+
+    def __init__(
+        self,
+        derivative: Derivative,
+        *,
+        rtol: Optional[float] = 1e-6,
+        atol: Optional[float] = 1e-9,
+        norm: Optional[str] = "rms",
+        min_step: Optional[float] = 1e-12,
+        max_step: Optional[float] = inf,
+        max_substeps: Optional[int] = 100000,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            derivative: The function computing the derivative of the state
+                from the time and the state.
+            rtol (Optional): The relative tolerance. Default to 1e-6.
+            atol (Optional): The absolute tolerance. Default to 1e-9.
+            norm (Optional): The error norm, "rms" or "max". Default to "rms".
+            min_step (Optional): The smallest allowed step. Default to 1e-12.
+            max_step (Optional): The largest allowed step. Default to inf.
+            max_substeps (Optional): The number of substeps allowed per
+                advance() call. Default to 100000.
+
+        Raises:
+            ValueError: If the norm is unknown.
+        """
+
+        if norm not in ("rms", "max"):
+            raise ValueError(f"Expected 'rms' or 'max'. {norm!r} given.")
+
+        self.derivative: Derivative = derivative
+        self.rtol: float = rtol
+        self.atol: float = atol
+        self.norm: str = norm
+        self.min_step: float = min_step
+        self.max_step: float = max_step
+        self.max_substeps: int = max_substeps
+        self.step: float | None = None
+        self.accepted: int = 0
+        self.rejected: int = 0
+        self.substeps: int = 0
+        self.evaluations: int = 0
+
+    def reset_stats(self) -> None:
+        """Reset the substep and evaluation counters."""
+
+        self.accepted = self.rejected = self.substeps = self.evaluations = 0
+
+    def advance(self, state: StateArray, t: float, duration: float) -> StateArray:
+        """Integrate the state over a duration.
+
+        The duration is covered by as many substeps as the tolerance needs,
+        the last one ending exactly at t + duration.
+
+        Args:
+            state: The state at the time t.
+            t: The current time.
+            duration: The duration to integrate.
+
+        Returns:
+            StateArray: The state at the time t + duration.
+
+        Raises:
+            RuntimeError: If the step falls under min_step or if the duration
+                needs more than max_substeps substeps.
+        """
+
+        state = np.asarray(state, dtype=np.float64)
+        end: float = t + duration
+        self.substeps = 0
+
+        if duration <= 0:
+            return state
+
+        slope: StateArray = self._evaluate(t, state)
+
+        if self.step is None:
+            self.step = self._initial_step(state, slope)
+
+        while t < end:
+            if self.substeps >= self.max_substeps:
+                raise RuntimeError(
+                    f"More than {self.max_substeps} substeps were needed."
+                )
+
+            step: float = min(self.step, self.max_step)
+            last: bool = step >= end - t
+
+            if last:
+                step = end - t
+
+            candidate, candidate_slope, error = self._try(t, state, slope, step)
+
+            if error <= 1.0:
+                t = end if last else t + step
+                state, slope = candidate, candidate_slope
+                self.accepted += 1
+                self.substeps += 1
+                factor: float = self._scale(error, self._MAX_FACTOR)
+
+                # A shortened last substep does not tell much about the step.
+                if not last or step * factor > self.step:
+                    self.step = step * factor
+            else:
+                self.rejected += 1
+                self.step = step * self._scale(error, 1.0)
+
+            if self.step < self.min_step:
+                raise RuntimeError(
+                    f"The step fell under {self.min_step} at the time {t}."
+                )
+
+        return state
+
+    def _evaluate(self, t: float, state: StateArray) -> StateArray:
+        """Evaluate the derivative and count the evaluation.
+
+        Args:
+            t: The time.
+            state: The state.
+
+        Returns:
+            StateArray: The derivative of the state.
+        """
+
+        self.evaluations += 1
+        return np.asarray(self.derivative(t, state), dtype=np.float64)
+
+    def _initial_step(self, state: StateArray, slope: StateArray) -> float:
+        """Guess a first step from the scale of the state and of its derivative.
+
+        Args:
+            state: The current state.
+            slope: The derivative of the state.
+
+        Returns:
+            float: The first step to try.
+        """
+
+        scale: StateArray = self.atol + self.rtol * np.abs(state)
+        d0: float = self._error_norm(state / scale)
+        d1: float = self._error_norm(slope / scale)
+
+        if d0 < 1e-5 or d1 < 1e-5:
+            return 1e-6
+
+        return 0.01 * d0 / d1
+
+    def _try(
+        self, t: float, state: StateArray, slope: StateArray, step: float
+    ) -> tuple[StateArray, StateArray, float]:
+        """Compute a substep and its weighted error.
+
+        Args:
+            t: The current time.
+            state: The current state.
+            slope: The derivative of the current state.
+            step: The step to try.
+
+        Returns:
+            tuple[StateArray, StateArray, float]: The new state, its derivative and the
+                error norm (accepted if not greater than 1).
+        """
+
+        slopes: list[StateArray] = [slope]
+
+        for c, row in zip(self._C[1:], self._A[1:]):
+            stage: StateArray = state + step * sum(
+                a * k for a, k in zip(row, slopes) if a
+            )
+            slopes.append(self._evaluate(t + c * step, stage))
+
+        candidate: StateArray = state + step * sum(
+            a * k for a, k in zip(self._A[-1], slopes) if a
+        )
+        slopes.append(self._evaluate(t + step, candidate))
+        error: StateArray = step * sum(e * k for e, k in zip(self._E, slopes) if e)
+        scale: StateArray = self.atol + self.rtol * np.maximum(
+            np.abs(state), np.abs(candidate)
+        )
+        return candidate, slopes[-1], self._error_norm(error / scale)
+
+    def _error_norm(self, weighted: StateArray) -> float:
+        """Reduce weighted errors to a single value.
+
+        Args:
+            weighted: The weighted errors of the state.
+
+        Returns:
+            float: The error norm.
+        """
+
+        if not weighted.size:
+            return 0.0
+        if self.norm == "max":
+            return float(np.abs(weighted).max())
+
+        return sqrt(float(np.mean(np.square(weighted))))
+
+    def _scale(self, error: float, limit: float) -> float:
+        """Get the factor to apply to the step from the error of a substep.
+
+        Args:
+            error: The error norm of the substep.
+            limit: The largest allowed factor.
+
+        Returns:
+            float: The step factor.
+        """
+
+        if error == 0:
+            return limit
+
+        return min(limit, max(self._MIN_FACTOR, self._SAFETY * error ** (-1 / 5)))
@@ -0,0 +1,313 @@
+from typing import Optional
+import numpy as np
+from pysics.broadphase import _counting_sort, _expand_ranges
+from pysics.types import IndexArray, PointArray, ScalarArray
+
+
+def minimum_image(delta: PointArray, box: PointArray | float) -> PointArray:
+    """Map displacements to their shortest periodic image.
+
+    Args:
+        delta: The (n, 2) array of displacements (or a single (2,) one).
+        box: The (width, height) of the periodic box, or a single size.
+
+    Returns:
+        PointArray: The displacements, each axis within [-box / 2, box / 2].
+    """
+
+    box = np.asarray(box, dtype=np.float64)
+    return delta - box * np.round(delta / box)
+
+
+def wrap(positions: PointArray, box: PointArray | float) -> PointArray:
+    """Bring positions back into the periodic box.
+
+    Args:
+        positions: The (n, 2) array of positions.
+        box: The (width, height) of the periodic box, or a single size.
+
+    Returns:
+        PointArray: The positions, each axis within [0, box).
+    """
+
+    return np.mod(positions, np.asarray(box, dtype=np.float64))
+
+
+class NeighbourList:
+    """A Verlet neighbour list under periodic boundaries.
+
+    The list holds every pair closer than the cutoff plus a skin distance.
+    It is built with a cell list, then kept as long as no particle has moved
+    more than half the skin since the build: until then, no pair can have
+    come within the cutoff without being listed.
+
+    Attributes:
+        cutoff: The interaction range.
+        box: The (width, height) of the periodic box.
+        skin (Optional): The margin added to the cutoff. Default to 0.3.
+        builds: The number of builds done so far.
+        first: The first particle of each listed pair.
+        second: The second particle of each listed pair.
+    """
+
+    def __init__(
+        self,
+        cutoff: float,
+        box: PointArray | float,
+        *,
+        skin: Optional[float] = 0.3,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            cutoff: The interaction range.
+            box: The (width, height) of the periodic box, or a single size.
+            skin (Optional): The margin added to the cutoff. Default to 0.3.
+
+        Raises:
+            ValueError: If the cutoff is not positive, the skin is negative,
+                or the listed range exceeds half the box.
+        """
+
+        self.box: PointArray = np.broadcast_to(
+            np.asarray(box, dtype=np.float64), (2,)
+        ).copy()
+
+        if cutoff <= 0 or skin < 0:
+            raise ValueError(
+                f"Expected a positive cutoff and skin. {cutoff}, {skin} given."
+            )
+        if 2 * (cutoff + skin) > self.box.min():
+            raise ValueError(
+                "Expected cutoff + skin <= half the box for the minimum image. "
+                f"{cutoff + skin} given for a box of {self.box.tolist()}."
+            )
+
+        self.cutoff: float = cutoff
+        self.skin: float = skin
+        self.builds: int = 0
+        self.first: IndexArray = np.empty(0, dtype=np.intp)
+        self.second: IndexArray = np.empty(0, dtype=np.intp)
+        self._reference: PointArray | None = None
+
+    def update(self, positions: PointArray) -> bool:
+        """Rebuild the list if a particle moved more than half the skin.
+
+        Args:
+            positions: The (n, 2) array of the particle positions.
+
+        Returns:
+            bool: True if the list was rebuilt.
+        """
+
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+
+        if self._reference is not None and len(self._reference) == len(positions):
+            moved: PointArray = minimum_image(positions - self._reference, self.box)
+
+            if (
+                np.einsum("ij,ij->i", moved, moved).max(initial=0.0)
+                <= (self.skin / 2) ** 2
+            ):
+                return False
+
+        self.build(positions)
+        return True
+
+    def build(self, positions: PointArray) -> None:
+        """Build the list from scratch.
+
+        The particles are bucketed in cells at least as large as the listed
+        range, so each pair is found by comparing a cell with itself and
+        with half of its periodic neighbourhood.
+
+        Args:
+            positions: The (n, 2) array of the particle positions.
+        """
+
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        reach: float = self.cutoff + self.skin
+        shape: IndexArray = np.floor(self.box / reach).astype(np.intp)
+
+        if shape.min() < 3:
+            # Too few cells for distinct neighbours: every pair is a candidate.
+            first, second = np.triu_indices(len(positions), 1)
+        else:
+            first, second = self._cell_pairs(positions, shape)
+
+        delta: PointArray = minimum_image(
+            positions[first] - positions[second], self.box
+        )
+        close: np.ndarray = np.einsum("ij,ij->i", delta, delta) < reach * reach
+        self.first = first[close].astype(np.intp)
+        self.second = second[close].astype(np.intp)
+        self._reference = positions.copy()
+        self.builds += 1
+
+    def pairs(
+        self, positions: PointArray
+    ) -> tuple[IndexArray, IndexArray, PointArray, ScalarArray]:
+        """Get the listed pairs within the cutoff (rebuilding the list if needed).
+
+        Args:
+            positions: The (n, 2) array of the particle positions.
+
+        Returns:
+            tuple[IndexArray, IndexArray, PointArray, ScalarArray]: The first
+                and second particle of each pair, the minimum image vector
+                from the second to the first and its squared length.
+        """
+
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.update(positions)
+        delta: PointArray = minimum_image(
+            positions[self.first] - positions[self.second], self.box
+        )
+        dist2: ScalarArray = np.einsum("ij,ij->i", delta, delta)
+        close: np.ndarray = dist2 < self.cutoff * self.cutoff
+        return self.first[close], self.second[close], delta[close], dist2[close]
+
+    def _cell_pairs(
+        self, positions: PointArray, shape: IndexArray
+    ) -> tuple[IndexArray, IndexArray]:
+        """Get the pairs of particles in the same or neighbouring cells.
+
+        Args:
+            positions: The (n, 2) array of the particle positions.
+            shape: The number of cells along each axis (at least 3).
+
+        Returns:
+            tuple[IndexArray, IndexArray]: The first and second particle of
+                each candidate pair (each unordered pair appears once).
+        """
+
+        cols, rows = shape.tolist()
+        cells: IndexArray = np.floor(wrap(positions, self.box) / self.box * shape)
+        cells = np.minimum(cells.astype(np.intp), shape - 1)
+        order, starts, counts = _counting_sort(
+            cells[:, 0] * rows + cells[:, 1], cols * rows
+        )
+        sorted_cells: IndexArray = cells[order]
+        slots: IndexArray = np.arange(len(order))
+        firsts: list[IndexArray] = []
+        seconds: list[IndexArray] = []
+
+        for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+            keys: IndexArray = ((sorted_cells[:, 0] + dx) % cols) * rows + (
+                sorted_cells[:, 1] + dy
+            ) % rows
+            owner_starts: IndexArray = starts[keys]
+            owner_counts: IndexArray = counts[keys]
+
+            if dx == 0 and dy == 0:
+                # Only keep the particles sorted after the owner in its own cell.
+                owner_counts = owner_starts + owner_counts - slots - 1
+                owner_starts = slots + 1
+
+            owners, others = _expand_ranges(slots, owner_starts, owner_counts)
+            firsts.append(order[owners])
+            seconds.append(order[others])
+
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+
+class LennardJones:
+    """A Lennard-Jones pair potential under periodic boundaries.
+
+    The forces are evaluated over the arrays of a Verlet neighbour list, so
+    the pairs are only searched again when the particles moved enough.
+
+    Attributes:
+        epsilon (Optional): The depth of the potential well. Default to 1.0.
+        sigma (Optional): The distance at which the potential is zero.
+            Default to 1.0.
+        cutoff: The interaction range (2.5 sigma by default).
+        shift (Optional): Shift the potential to zero at the cutoff, so the
+            energy has no jump when a pair crosses it. Default to True.
+        neighbours: The neighbour list.
+        energy: The potential energy of the last evaluated positions.
+    """
+
+    def __init__(
+        self,
+        box: PointArray | float,
+        *,
+        epsilon: Optional[float] = 1.0,
+        sigma: Optional[float] = 1.0,
+        cutoff: Optional[float] = None,
+        skin: Optional[float] = 0.3,
+        shift: Optional[bool] = True,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            box: The (width, height) of the periodic box, or a single size.
+            epsilon (Optional): The depth of the potential well. Default to 1.0.
+            sigma (Optional): The distance at which the potential is zero.
+                Default to 1.0.
+            cutoff (Optional): The interaction range. Default to None
+                (2.5 sigma).
+            skin (Optional): The margin of the neighbour list. Default to 0.3.
+            shift (Optional): Shift the potential to zero at the cutoff.
+                Default to True.
+        """
+
+        self.epsilon: float = epsilon
+        self.sigma: float = sigma
+        self.cutoff: float = 2.5 * sigma if cutoff is None else cutoff
+        self.shift: bool = shift
+        self.neighbours: NeighbourList = NeighbourList(self.cutoff, box, skin=skin)
+        self.energy: float = 0.0
+
+    def forces(self, positions: PointArray) -> PointArray:
+        """Compute the force on each particle (and the potential energy).
+
+        Args:
+            positions: The (n, 2) array of the particle positions.
+
+        Returns:
+            PointArray: The (n, 2) array of the forces.
+        """
+
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        first, second, delta, dist2 = self.neighbours.pairs(positions)
+        s6: ScalarArray = (self.sigma * self.sigma / dist2) ** 3
+        s12: ScalarArray = s6 * s6
+        # The force magnitude divided by the distance, along delta.
+        scale: ScalarArray = 24 * self.epsilon * (2 * s12 - s6) / dist2
+        energy: ScalarArray = 4 * self.epsilon * (s12 - s6)
+
+        if self.shift:
+            cut6: float = (self.sigma / self.cutoff) ** 6
+            energy -= 4 * self.epsilon * (cut6 * cut6 - cut6)
+
+        self.energy = float(energy.sum())
+        forces: PointArray = np.zeros_like(positions)
+        pair_forces: PointArray = delta * scale[:, None]
+
+        for axis in range(2):
+            forces[:, axis] += np.bincount(
+                first, pair_forces[:, axis], minlength=len(positions)
+            )
+            forces[:, axis] -= np.bincount(
+                second, pair_forces[:, axis], minlength=len(positions)
+            )
+
+        return forces
+
+    def accelerations(
+        self, positions: PointArray, masses: Optional[ScalarArray | float] = 1.0
+    ) -> PointArray:
+        """Compute the acceleration of each particle.
+
+        Args:
+            positions: The (n, 2) array of the particle positions.
+            masses (Optional): The (n,) array of the particle masses, or a
+                single mass. Default to 1.0.
+
+        Returns:
+            PointArray: The (n, 2) array of the accelerations.
+        """
+
+        masses = np.asarray(masses, dtype=np.float64)
+        return self.forces(positions) / (masses[:, None] if masses.ndim else masses)
@@ -0,0 +1,417 @@
+from typing import Final, Optional
+import numpy as np
+from pysics.broadphase import _expand_ranges
+from pysics.types import IndexArray, PointArray, ScalarArray
+
+
+def _spread_bits(values: IndexArray) -> IndexArray:
+    """Insert a zero bit between each bit of the given 32 bits integers.
+
+    Args:
+        values: The integers to spread.
+
+    Returns:
+        IndexArray: The spread integers (on 64 bits).
+    """
+
+    values = values.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+
+    for shift, mask in (
+        (16, 0x0000FFFF0000FFFF),
+        (8, 0x00FF00FF00FF00FF),
+        (4, 0x0F0F0F0F0F0F0F0F),
+        (2, 0x3333333333333333),
+        (1, 0x5555555555555555),
+    ):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+
+    return values
+
+
+class BarnesHut:
+    """A Barnes-Hut gravity solver built on an array-based quadtree.
+
+    The bodies are sorted along a Morton curve so that every node of the tree
+    owns a contiguous range of the sorted bodies. The nodes are only stored
+    as flat arrays (ranges, children, mass, center of mass and bounds).
+
+    Between two steps, the tree is refitted (masses, centers and bounds
+    recomputed on the same topology) as long as no node has grown more than
+    the rebuild slack, then rebuilt from scratch.
+
+    Attributes:
+        theta: The opening angle. A node is approximated by its center of mass
+            when its size divided by its distance is lower than theta.
+            Default to 0.5.
+        gravity: The gravitational constant. Default to 1.0.
+        softening: The softening length that avoids singular forces.
+            Default to 0.0.
+        leaf_size: The maximum number of bodies of a leaf. Default to 8.
+        max_depth: The maximum depth of the tree. Default to 20.
+        rebuild_slack: The relative growth of a node above which the tree
+            is rebuilt instead of refitted. Default to 0.25.
+        exact: Use the direct O(n²) summation instead of the tree.
+            Default to False.
+        builds: The number of tree builds done so far.
+    """
+
+    _PAIR_BUDGET: Final[int] = 1 << 20
+
+    def __init__(
+        self,
+        theta: Optional[float] = 0.5,
+        *,
+        gravity: Optional[float] = 1.0,
+        softening: Optional[float] = 0.0,
+        leaf_size: Optional[int] = 8,
+        max_depth: Optional[int] = 20,
+        rebuild_slack: Optional[float] = 0.25,
+        exact: Optional[bool] = False,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            theta (Optional): The opening angle. Default to 0.5.
+            gravity (Optional): The gravitational constant. Default to 1.0.
+            softening (Optional): The softening length. Default to 0.0.
+            leaf_size (Optional): The maximum number of bodies of a leaf.
+                Default to 8.
+            max_depth (Optional): The maximum depth of the tree (up to 32).
+                Default to 20.
+            rebuild_slack (Optional): The relative growth of a node above
+                which the tree is rebuilt. Default to 0.25.
+            exact (Optional): Use the direct summation. Default to False.
+
+        Raises:
+            ValueError: If theta is negative or the max depth out of 1..32.
+        """
+
+        if theta < 0:
+            raise ValueError(f"Expected a positive opening angle. {theta} given.")
+        if not 1 <= max_depth <= 32:
+            raise ValueError(f"Expected a depth in 1..32. {max_depth} given.")
+
+        self.theta: float = theta
+        self.gravity: float = gravity
+        self.softening: float = softening
+        self.leaf_size: int = leaf_size
+        self.max_depth: int = max_depth
+        self.rebuild_slack: float = rebuild_slack
+        self.exact: bool = exact
+        self.builds: int = 0
+        self._order: IndexArray = np.empty(0, dtype=np.intp)
+        self._rank: IndexArray = np.empty(0, dtype=np.intp)
+        self._start: IndexArray = np.empty(0, dtype=np.intp)
+        self._end: IndexArray = np.empty(0, dtype=np.intp)
+        self._depth: IndexArray = np.empty(0, dtype=np.intp)
+        self._parent: IndexArray = np.empty(0, dtype=np.intp)
+        self._children: IndexArray = np.empty((0, 4), dtype=np.intp)
+        self._is_leaf: np.ndarray = np.empty(0, dtype=bool)
+        self._leaves: IndexArray = np.empty(0, dtype=np.intp)
+        self._nominal: ScalarArray = np.empty(0)
+        self._mass: ScalarArray = np.empty(0)
+        self._com: PointArray = np.empty((0, 2))
+        self._size: ScalarArray = np.empty(0)
+        self._low: PointArray = np.empty((0, 2))
+        self._high: PointArray = np.empty((0, 2))
+
+    @property
+    def node_count(self) -> int:
+        """Get the number of nodes of the current tree.
+
+        Returns:
+            int: The number of nodes.
+        """
+
+        return len(self._start)
+
+    def accelerations(self, positions: PointArray, masses: ScalarArray) -> PointArray:
+        """Compute the gravitational acceleration of each body.
+
+        Args:
+            positions: The (n, 2) array of the body positions.
+            masses: The (n,) array of the body masses.
+
+        Returns:
+            PointArray: The (n, 2) array of the accelerations.
+        """
+
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        masses = np.asarray(masses, dtype=np.float64).reshape(-1)
+
+        if self.exact:
+            return self._direct(positions, masses)
+        if len(positions) != len(self._order) or not self.refit(positions, masses):
+            self.build(positions, masses)
+
+        return self._traverse(positions, masses)
+
+    def build(self, positions: PointArray, masses: ScalarArray) -> None:
+        """Build the tree from scratch.
+
+        Args:
+            positions: The (n, 2) array of the body positions.
+            masses: The (n,) array of the body masses.
+        """
+
+        n: int = len(positions)
+        self.builds += 1
+
+        if not n:
+            self._order = self._rank = np.empty(0, dtype=np.intp)
+            self._start = self._end = self._depth = self._parent = self._order
+            self._children = np.empty((0, 4), dtype=np.intp)
+            self._is_leaf = np.empty(0, dtype=bool)
+            self._leaves = self._order
+            self._nominal = self._mass = self._size = np.empty(0)
+            self._com = self._low = self._high = np.empty((0, 2))
+            return
+
+        lower: PointArray = positions.min(axis=0)
+        side: float = float((positions.max(axis=0) - lower).max()) or 1.0
+        depth: int = self.max_depth
+        cells: float = float(2**depth)
+        quantized: IndexArray = np.minimum(
+            ((positions - lower) / side * cells).astype(np.int64), 2**depth - 1
+        )
+        codes: IndexArray = _spread_bits(quantized[:, 0]) | (
+            _spread_bits(quantized[:, 1]) << np.uint64(1)
+        )
+        self._order = np.argsort(codes, kind="stable")
+        self._rank = np.empty(n, dtype=np.intp)
+        self._rank[self._order] = np.arange(n)
+        codes = codes[self._order]
+
+        starts: list[IndexArray] = [np.array([0])]
+        ends: list[IndexArray] = [np.array([n])]
+        depths: list[IndexArray] = [np.array([0])]
+        parents: list[IndexArray] = [np.array([-1])]
+        children: list[IndexArray] = []
+        level_first: int = 0
+        level_start: IndexArray = starts[0]
+        level_end: IndexArray = ends[0]
+        total: int = 1
+
+        for level in range(depth):
+            split: np.ndarray = level_end - level_start > self.leaf_size
+            level_children: IndexArray = np.full((len(level_start), 4), -1)
+            children.append(level_children)
+
+            if not split.any():
+                break
+
+            owners: IndexArray = np.flatnonzero(split)
+            owner_of, bodies = _expand_ranges(
+                np.arange(len(owners)),
+                level_start[owners],
+                level_end[owners] - level_start[owners],
+            )
+            shift: np.uint64 = np.uint64(2 * (depth - level - 1))
+            digits: IndexArray = ((codes[bodies] >> shift) & np.uint64(3)).astype(
+                np.intp
+            )
+            counts: IndexArray = np.bincount(
+                owner_of * 4 + digits, minlength=4 * len(owners)
+            ).reshape(-1, 4)
+            offsets: IndexArray = (
+                level_start[owners, None] + np.cumsum(counts, axis=1) - counts
+            )
+            used: np.ndarray = counts > 0
+            child_ids: IndexArray = total + np.cumsum(used.ravel()) - 1
+            level_children[owners] = np.where(used, child_ids.reshape(-1, 4), -1)
+            level_start = offsets[used]
+            level_end = level_start + counts[used]
+            starts.append(level_start)
+            ends.append(level_end)
+            depths.append(np.full(len(level_start), level + 1))
+            parents.append(np.repeat(level_first + owners, used.sum(axis=1)))
+            level_first = total
+            total += len(level_start)
+        else:
+            children.append(np.full((len(level_start), 4), -1))
+
+        self._start = np.concatenate(starts)
+        self._end = np.concatenate(ends)
+        self._depth = np.concatenate(depths)
+        self._parent = np.concatenate(parents)
+        self._children = np.concatenate(children)
+        self._nominal = side / 2.0**self._depth
+        self._is_leaf = (self._children < 0).all(axis=1)
+        leaves: IndexArray = np.flatnonzero(self._is_leaf)
+        self._leaves = leaves[np.argsort(self._start[leaves])]
+        self.refit(positions, masses)
+
+    def refit(self, positions: PointArray, masses: ScalarArray) -> bool:
+        """Update the masses, centers and bounds of the nodes in place.
+
+        Args:
+            positions: The (n, 2) array of the body positions.
+            masses: The (n,) array of the body masses.
+
+        Returns:
+            bool: False if a node has grown beyond the rebuild slack, else True.
+        """
+
+        if len(positions) != len(self._order):
+            return False
+        if not len(positions):
+            return True
+
+        pos: PointArray = positions[self._order]
+        mass: ScalarArray = masses[self._order]
+        prefix_mass: ScalarArray = np.concatenate(([0.0], np.cumsum(mass)))
+        prefix_moment: PointArray = np.concatenate(
+            (np.zeros((1, 2)), np.cumsum(pos * mass[:, None], axis=0))
+        )
+        self._mass = prefix_mass[self._end] - prefix_mass[self._start]
+        moment: PointArray = prefix_moment[self._end] - prefix_moment[self._start]
+        safe: ScalarArray = np.where(self._mass != 0, self._mass, 1.0)
+        self._com = moment / safe[:, None]
+
+        # The leaves tile the sorted bodies, so their bounds come from one
+        # reduceat pass, then they are propagated upward level by level.
+        leaves: IndexArray = self._leaves
+        low: PointArray = np.full((self.node_count, 2), np.inf)
+        high: PointArray = np.full((self.node_count, 2), -np.inf)
+        low[leaves] = np.minimum.reduceat(pos, self._start[leaves])
+        high[leaves] = np.maximum.reduceat(pos, self._start[leaves])
+
+        for level in range(int(self._depth.max()), 0, -1):
+            nodes: IndexArray = np.flatnonzero(self._depth == level)
+            np.minimum.at(low, self._parent[nodes], low[nodes])
+            np.maximum.at(high, self._parent[nodes], high[nodes])
+
+        self._low, self._high = low, high
+        self._size = (high - low).max(axis=1)
+        return bool((self._size <= self._nominal * (1 + self.rebuild_slack)).all())
+
+    def _traverse(self, positions: PointArray, masses: ScalarArray) -> PointArray:
+        """Walk the tree for all the leaves at once.
+
+        The bodies of a leaf share the same walk: a node is approximated when
+        it is far enough from the whole leaf bounds, then the accepted nodes
+        and the touched leaves are expanded to the bodies of the leaf.
+
+        Args:
+            positions: The (n, 2) array of the body positions.
+            masses: The (n,) array of the body masses.
+
+        Returns:
+            PointArray: The (n, 2) array of the accelerations.
+        """
+
+        acc: PointArray = np.zeros((len(positions), 2))
+        eps2: float = self.softening**2
+        theta2: float = self.theta**2
+        groups: IndexArray = self._leaves
+        nodes: IndexArray = np.zeros(len(groups), dtype=np.intp)
+
+        while len(groups):
+            com: PointArray = self._com[nodes]
+            gap: PointArray = com - np.clip(com, self._low[groups], self._high[groups])
+            inside: np.ndarray = (self._start[groups] >= self._start[nodes]) & (
+                self._start[groups] < self._end[nodes]
+            )
+            leaf: np.ndarray = self._is_leaf[nodes]
+            far: np.ndarray = (
+                ~leaf
+                & ~inside
+                & (self._size[nodes] ** 2 < theta2 * np.einsum("ij,ij->i", gap, gap))
+            )
+
+            pairs, slots = self._expand(groups[far])
+            bodies: IndexArray = self._order[slots]
+            targets: IndexArray = nodes[far][pairs]
+            delta: PointArray = self._com[targets] - positions[bodies]
+            self._accumulate(acc, bodies, delta, self._mass[targets], eps2)
+
+            pairs, slots = self._expand(groups[leaf])
+            owners, others = _expand_ranges(
+                self._order[slots],
+                self._start[nodes[leaf][pairs]],
+                self._end[nodes[leaf][pairs]] - self._start[nodes[leaf][pairs]],
+            )
+            others = self._order[others]
+            distinct: np.ndarray = owners != others
+            owners, others = owners[distinct], others[distinct]
+            delta = positions[others] - positions[owners]
+            self._accumulate(acc, owners, delta, masses[others], eps2)
+
+            opened: np.ndarray = ~leaf & ~far
+            groups = np.repeat(groups[opened], 4)
+            nodes = self._children[nodes[opened]].ravel()
+            groups, nodes = groups[nodes >= 0], nodes[nodes >= 0]
+
+        return acc * self.gravity
+
+    def _expand(self, nodes: IndexArray) -> tuple[IndexArray, IndexArray]:
+        """Expand the given nodes to the sorted slots of their bodies.
+
+        Args:
+            nodes: The nodes to expand.
+
+        Returns:
+            tuple[IndexArray, IndexArray]: The position of the owner node in
+                the given array and the sorted slot of each body.
+        """
+
+        return _expand_ranges(
+            np.arange(len(nodes)),
+            self._start[nodes],
+            self._end[nodes] - self._start[nodes],
+        )
+
+    def _direct(self, positions: PointArray, masses: ScalarArray) -> PointArray:
+        """Compute the exact accelerations by direct summation.
+
+        The pairwise interactions are evaluated by chunks of bodies to bound
+        the memory usage.
+
+        Args:
+            positions: The (n, 2) array of the body positions.
+            masses: The (n,) array of the body masses.
+
+        Returns:
+            PointArray: The (n, 2) array of the accelerations.
+        """
+
+        n: int = len(positions)
+        acc: PointArray = np.zeros((n, 2))
+        eps2: float = self.softening**2
+        chunk: int = max(1, self._PAIR_BUDGET // max(n, 1))
+
+        for first in range(0, n, chunk):
+            rows: slice = slice(first, first + chunk)
+            delta: np.ndarray = positions[None, :] - positions[rows, None]
+            dist2: np.ndarray = np.einsum("ijk,ijk->ij", delta, delta) + eps2
+            np.fill_diagonal(dist2[:, first:], np.inf)
+            weights: np.ndarray = masses[None, :] * dist2**-1.5
+            acc[rows] = np.einsum("ij,ijk->ik", weights, delta)
+
+        return acc * self.gravity
+
+    @staticmethod
+    def _accumulate(
+        acc: PointArray,
+        bodies: IndexArray,
+        delta: PointArray,
+        masses: ScalarArray,
+        eps2: float,
+    ) -> None:
+        """Add the attraction of point masses to the given bodies.
+
+        Args:
+            acc: The (n, 2) accelerations to update.
+            bodies: The attracted body of each interaction.
+            delta: The vector from the attracted body to the attracting mass.
+            masses: The attracting mass of each interaction.
+            eps2: The squared softening length.
+        """
+
+        dist2: ScalarArray = np.einsum("ij,ij->i", delta, delta) + eps2
+        weights: ScalarArray = masses * dist2**-1.5
+
+        for axis in range(2):
+            acc[:, axis] += np.bincount(
+                bodies, weights * delta[:, axis], minlength=len(acc)
+            )
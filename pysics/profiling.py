@@ -0,0 +1,441 @@
+import gc
+import sys
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Final, Optional
+from pysics.batches import BaseBatch
+from pysics.shapes import BaseShape
+
+
+@dataclass(frozen=True)
+class LineAllocation:
+    """The memory allocated by a source line during a frame.
+
+    Attributes:
+        filename: The file of the line.
+        lineno: The line number.
+        size: The allocated bytes still alive at the end of the frame.
+        count: The number of allocated blocks still alive.
+    """
+
+    filename: str
+    lineno: int
+    size: int
+    count: int
+
+
+@dataclass(frozen=True)
+class FrameMemory:
+    """The memory usage of a frame.
+
+    Attributes:
+        frame: The frame number.
+        size: The allocated bytes still alive at the end of the frame.
+        count: The number of allocated blocks still alive.
+        peak: The peak of the traced memory above its level at the start of
+            the frame (the temporary allocations included).
+        lines: The lines that allocated the most, from the largest.
+        classes: The allocated bytes per shape (or batch) class.
+        collections: The number of GC collections per generation.
+        gc_time: The time spent in the GC collections, in seconds.
+        rss: The peak resident set size of the process in bytes, or None if
+            unknown on the platform.
+    """
+
+    frame: int
+    size: int
+    count: int
+    peak: int
+    lines: tuple[LineAllocation, ...]
+    classes: dict[str, int]
+    collections: tuple[int, int, int]
+    gc_time: float
+    rss: int | None
+
+
+class MemoryProfiler:
+    """Record the allocations and the GC runs of each frame.
+
+    The allocations are traced with tracemalloc: a snapshot taken at the
+    start of a frame is compared to the one taken at its end. Each
+    allocation is attributed to the line that called into the library (the
+    caller of the outermost shape or batch code, e.g. a line of the drawing
+    callback), and to the class of that code. The shape objects themselves
+    are allocated by the calling line, so a class only gathers what its
+    code allocates (vertices, colors, arrays...).
+
+    Only the allocations still alive at the end of a frame are attributed:
+    the temporary ones show up in the peak and in the GC collections.
+
+    The GC collections and the time they take are counted with gc.callbacks.
+
+    The shape and batch classes defined after the start are located on the
+    next frame.
+
+    The profiling slows the frames down a lot, since every allocation of the
+    frame is traced: give it to Pysics.run_loop() only to investigate the
+    frame time spikes (the governor is not fed meanwhile).
+
+    Attributes:
+        top (Optional): The number of recorded lines per frame. Default to 10.
+        depth (Optional): The number of traced stack frames per allocation.
+            Default to 16.
+        frames: The memory usage of the last frames (up to history).
+    """
+
+    _BASES: Final[frozenset[str]] = frozenset(("BaseShape", "BaseBatch"))
+
+    def __init__(
+        self,
+        *,
+        top: Optional[int] = 10,
+        depth: Optional[int] = 16,
+        history: Optional[int] = 600,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            top (Optional): The number of recorded lines per frame.
+                Default to 10.
+            depth (Optional): The number of traced stack frames per
+                allocation. Default to 16.
+            history (Optional): The number of kept frames. Default to 600.
+        """
+
+        self.top: int = top
+        self.depth: int = depth
+        self.frames: deque[FrameMemory] = deque(maxlen=history)
+        self._started: bool = False
+        self._owns_tracing: bool = False
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._frame: int = 0
+        self._traced: int = 0
+        self._classes: dict[str, list[tuple[int, int, str]]] = {}
+        self._located: frozenset[type] = frozenset()
+        self._owners: dict[tuple[str, int], str | None] = {}
+        self._collections: list[int] = [0, 0, 0]
+        self._gc_time: float = 0.0
+        self._gc_start: float | None = None
+
+    def __enter__(self) -> "MemoryProfiler":
+        """Start the profiling.
+
+        Returns:
+            MemoryProfiler: The profiler.
+        """
+
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Stop the profiling."""
+
+        self.stop()
+
+    def start(self) -> None:
+        """Start tracing the allocations (if not already) and the GC runs."""
+
+        if self._started:
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.depth)
+            self._owns_tracing = True
+
+        self._locate_classes()
+        # Warm up the caches of the snapshot filters, out of the frames.
+        self._take_snapshot()
+        gc.callbacks.append(self._on_gc)
+        self._started = True
+
+    def stop(self) -> None:
+        """Stop the tracing started by the profiler."""
+
+        if not self._started:
+            return
+
+        gc.callbacks.remove(self._on_gc)
+
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+        self._snapshot = None
+        self._started = False
+
+    def begin_frame(self, frame: int) -> None:
+        """Mark the start of a frame.
+
+        Args:
+            frame: The frame number.
+        """
+
+        self.start()
+
+        if self._subclasses() != self._located:
+            self._locate_classes()
+
+        self._frame = frame
+        self._snapshot = self._take_snapshot()
+        self._collections = [0, 0, 0]
+        self._gc_time = 0.0
+        tracemalloc.reset_peak()
+        self._traced = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self) -> FrameMemory:
+        """Mark the end of a frame and record its memory usage.
+
+        Returns:
+            FrameMemory: The memory usage of the frame.
+
+        Raises:
+            RuntimeError: If no frame was begun.
+        """
+
+        if self._snapshot is None:
+            raise RuntimeError("end_frame() called without begin_frame().")
+
+        peak: int = tracemalloc.get_traced_memory()[1] - self._traced
+        differences: list[tracemalloc.StatisticDiff] = self._take_snapshot().compare_to(
+            self._snapshot, "traceback"
+        )
+        self._snapshot = None
+        lines: dict[tuple[str, int], list[int]] = {}
+        classes: dict[str, int] = {}
+
+        for difference in differences:
+            if difference.size_diff <= 0:
+                continue
+
+            line, owner = self._attribute(difference.traceback)
+            allocated: list[int] = lines.setdefault(line, [0, 0])
+            allocated[0] += difference.size_diff
+            allocated[1] += max(difference.count_diff, 0)
+
+            if owner is not None:
+                classes[owner] = classes.get(owner, 0) + difference.size_diff
+
+        ranked: list[LineAllocation] = sorted(
+            (
+                LineAllocation(filename, lineno, size, count)
+                for (filename, lineno), (size, count) in lines.items()
+            ),
+            key=lambda allocation: allocation.size,
+            reverse=True,
+        )
+        memory: FrameMemory = FrameMemory(
+            frame=self._frame,
+            size=sum(allocation.size for allocation in ranked),
+            count=sum(allocation.count for allocation in ranked),
+            peak=max(peak, 0),
+            lines=tuple(ranked[: self.top]),
+            classes=dict(sorted(classes.items(), key=lambda item: -item[1])),
+            collections=tuple(self._collections),
+            gc_time=self._gc_time,
+            rss=self._peak_rss(),
+        )
+        self.frames.append(memory)
+        return memory
+
+    def summary(self) -> dict[str, Any]:
+        """Aggregate the recorded frames.
+
+        Returns:
+            dict[str, Any]: The number of frames, the mean and the largest
+                allocated bytes and peaks per frame, the GC collections per
+                generation and their total time, the largest peak RSS, and
+                the allocated bytes per class and per line (from the largest).
+        """
+
+        frames: list[FrameMemory] = list(self.frames)
+        classes: dict[str, int] = {}
+        lines: dict[str, int] = {}
+
+        for memory in frames:
+            for name, size in memory.classes.items():
+                classes[name] = classes.get(name, 0) + size
+            for allocation in memory.lines:
+                key: str = f"{allocation.filename}:{allocation.lineno}"
+                lines[key] = lines.get(key, 0) + allocation.size
+
+        rss: list[int] = [memory.rss for memory in frames if memory.rss is not None]
+        return dict(
+            frames=len(frames),
+            mean_size=sum(m.size for m in frames) / len(frames) if frames else 0.0,
+            max_size=max((m.size for m in frames), default=0),
+            max_peak=max((m.peak for m in frames), default=0),
+            collections=tuple(
+                sum(m.collections[generation] for m in frames)
+                for generation in range(3)
+            ),
+            gc_time=sum(m.gc_time for m in frames),
+            rss=max(rss, default=None),
+            classes=dict(sorted(classes.items(), key=lambda item: -item[1])),
+            lines=dict(sorted(lines.items(), key=lambda item: -item[1])[: self.top]),
+        )
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        """Take a snapshot of the traced allocations, without the profiler's.
+
+        Returns:
+            tracemalloc.Snapshot: The snapshot.
+        """
+
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+
+    def _attribute(
+        self, traceback: tracemalloc.Traceback
+    ) -> tuple[tuple[str, int], str | None]:
+        """Find the line and the class an allocation is attributed to.
+
+        Args:
+            traceback: The stack of the allocation, from the oldest frame.
+
+        Returns:
+            tuple[tuple[str, int], str | None]: The line calling the outermost
+                shape or batch code (or the allocating line if none), and
+                the class of that code (or None).
+        """
+
+        found: tuple[tuple[str, int], str | None] | None = None
+
+        for i, frame in enumerate(traceback):
+            owner: str | None = self._owner(frame.filename, frame.lineno)
+
+            if owner is None:
+                continue
+
+            caller: tracemalloc.Frame = traceback[max(i - 1, 0)]
+            found = found or ((caller.filename, caller.lineno), owner)
+
+            # The code of the base classes runs for any subclass: prefer the
+            # code of the subclass it calls, if any.
+            if owner not in self._BASES:
+                return found[0], owner
+
+        if found is not None:
+            return found
+
+        return (traceback[-1].filename, traceback[-1].lineno), None
+
+    def _owner(self, filename: str, lineno: int) -> str | None:
+        """Find the shape or batch class whose code holds a line.
+
+        Args:
+            filename: The file of the line.
+            lineno: The line number.
+
+        Returns:
+            str | None: The class name, or None if the line is not in any.
+        """
+
+        key: tuple[str, int] = (filename, lineno)
+
+        if key not in self._owners:
+            self._owners[key] = next(
+                (
+                    name
+                    for first, last, name in self._classes.get(filename, ())
+                    if first <= lineno <= last
+                ),
+                None,
+            )
+
+        return self._owners[key]
+
+    def _locate_classes(self) -> None:
+        """Locate the code of the current shape and batch classes."""
+
+        self._located = self._subclasses()
+        self._classes = self._class_ranges()
+        self._owners.clear()
+
+    @staticmethod
+    def _subclasses() -> frozenset[type]:
+        """Get the shape and batch classes (subclasses included).
+
+        Returns:
+            frozenset[type]: The classes.
+        """
+
+        classes: set[type] = set()
+        pending: list[type] = [BaseShape, BaseBatch]
+
+        while pending:
+            cls: type = pending.pop()
+            classes.add(cls)
+            pending.extend(cls.__subclasses__())
+
+        return frozenset(classes)
+
+    @staticmethod
+    def _class_ranges() -> dict[str, list[tuple[int, int, str]]]:
+        """Locate the methods of the shape and batch classes (subclasses
+        included).
+
+        Returns:
+            dict[str, list[tuple[int, int, str]]]: The first line, the last
+                line and the class name of each method, per file.
+        """
+
+        ranges: dict[str, list[tuple[int, int, str]]] = {}
+
+        for cls in MemoryProfiler._subclasses():
+            for value in vars(cls).values():
+                # Unwrap the static and class methods and the properties.
+                function: Any = getattr(
+                    value, "__func__", getattr(value, "fget", value)
+                )
+                code: Any = getattr(function, "__code__", None)
+
+                if code is None:
+                    continue
+
+                last: int = max(
+                    (line for *_, line in code.co_lines() if line is not None),
+                    default=code.co_firstlineno,
+                )
+                ranges.setdefault(code.co_filename, []).append(
+                    (code.co_firstlineno, last, cls.__name__)
+                )
+
+        return ranges
+
+    def _on_gc(self, phase: str, info: dict[str, Any]) -> None:
+        """Count the GC collections and their time (a gc.callbacks callback).
+
+        Args:
+            phase: "start" or "stop".
+            info: The details of the collection.
+        """
+
+        if phase == "start":
+            self._gc_start = perf_counter()
+        elif self._gc_start is not None:
+            self._gc_time += perf_counter() - self._gc_start
+            self._collections[info["generation"]] += 1
+            self._gc_start = None
+
+    @staticmethod
+    def _peak_rss() -> int | None:
+        """Get the peak resident set size of the process.
+
+        Returns:
+            int | None: The size in bytes, or None if unknown on the platform.
+        """
+
+        try:
+            import resource
+        except ImportError:  # Not available on Windows.
+            return None
+
+        rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux gives kilobytes, macOS gives bytes.
+        return rss if sys.platform == "darwin" else rss * 1024
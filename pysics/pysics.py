@@ -1,10 +1,32 @@
-from time import time
-from typing import Final, Optional
+import os
+from pathlib import Path
+from time import perf_counter, time
+from typing import Final, Hashable, Optional
 import glfw
 from glfw.GLFW import GLFW_SAMPLES
-from pysics.types import ByteInt, Color, DrawCallback, Duration, Timestamp
+import numpy as np
+from pysics.batches import VectorField
+from pysics.camera import Camera
+from pysics.framebuffers import RenderTarget
+from pysics.profiling import MemoryProfiler
+from pysics.quality import QualityChange, QualityGovernor
+from pysics.recording import Player
+from pysics.sharing import FrameSubscriber
+from pysics.shapes import Ellipse
+from pysics.snapshots import read_snapshot, write_snapshot
+from pysics.spatial import ShapeIndex
+from pysics.types import (
+    ByteInt,
+    Color,
+    DrawCallback,
+    Duration,
+    State,
+    Stateful,
+    Timestamp,
+)
 from pysics._wrappers import (
     gl,
+    set_profile,
     GL_COLOR_BUFFER_BIT,
     GL_DEPTH_BUFFER_BIT,
     GL_PROJECTION,
@@ -23,13 +45,25 @@ class Canvas:
         width: The window width.
         height: The windw height.
         background: The window background color. Default to 0.
+        render_scale: The ratio of the window resolution the frames are
+            rendered at. Default to 1.0.
+        samples: The number of MSAA samples per pixel of the offscreen
+            buffer the frames are rendered in. Default to 4.
+        camera (Optional): The view on the world. Default to None (the world
+            coordinates are the window pixels).
     """
 
     _WINDOW_TITLE: Final[str] = "Sketch"
     _SAMPLES: Final[int] = 4
 
     def __init__(
-        self, width: int, height: int, *, background: Optional[Color | ByteInt] = 0
+        self,
+        width: int,
+        height: int,
+        *,
+        background: Optional[Color | ByteInt] = 0,
+        profile: Optional[str] = None,
+        camera: Optional[Camera] = None,
     ) -> None:
         """The constructor that's also init the OpenGL components.
 
@@ -37,9 +71,23 @@ class Canvas:
             width: The window width.
             height: The window height.
             background (Optional): The window background color. Default to 0.
+            profile (Optional): The OpenGL profile, "default", "performance"
+                (no error check after each GL call) or "debug" (every check).
+                Default to None (the PYSICS_PROFILE environment variable or
+                "default"). It must be chosen before OpenGL is loaded.
+            camera (Optional): The view on the world. Default to None (the
+                world coordinates are the window pixels).
         """
 
+        if profile is not None:
+            set_profile(profile)
+
         self._window: glfw._GLFWwindow | None = None
+        self._resized: bool = True
+        self._target: RenderTarget | None = None
+        self.render_scale: float = 1.0
+        self.samples: int = self._SAMPLES
+        self.camera: Camera | None = camera
         self.width: int = width
         self.height: int = height
         self.background: Color = (
@@ -59,7 +107,10 @@ class Canvas:
         if not glfw.init():
             raise RuntimeError("Error on the OpenGL initialization.")
 
-        glfw.window_hint(GLFW_SAMPLES, self._SAMPLES)
+        # The window is single-sampled: the frames are rendered with MSAA in
+        # an offscreen buffer, then resolved into the window framebuffer (a
+        # blit cannot write into a multisampled framebuffer).
+        glfw.window_hint(GLFW_SAMPLES, 0)
         self._window = glfw.create_window(
             self.width, self.height, self._WINDOW_TITLE, None, None
         )
@@ -69,25 +120,124 @@ class Canvas:
 
         self.width, self.height = glfw.get_framebuffer_size(self._window)
         glfw.make_context_current(self._window)
+        glfw.set_framebuffer_size_callback(self._window, self._on_resize)
+        gl.invalidate()
         gl.enable(GL_BLEND)
         gl.enable(GL_MULTISAMPLE)
         gl.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
+    def _on_resize(self, window: glfw._GLFWwindow, width: int, height: int) -> None:
+        """The framebuffer size callback.
+        Store the new dimensions, the projection is updated on the next frame.
+
+        Args:
+            window: The resized window.
+            width: The new framebuffer width.
+            height: The new framebuffer height.
+        """
+
+        self.width, self.height = width, height
+        self._resized = True
+
+    def set_quality(
+        self, render_scale: Optional[float] = None, samples: Optional[int] = None
+    ) -> None:
+        """Change the rendering quality from the next frame.
+
+        The frames are rendered in an offscreen buffer of this resolution
+        and samples, then resolved and upscaled into the window.
+
+        Args:
+            render_scale (Optional): The ratio of the window resolution.
+                Default to None (unchanged).
+            samples (Optional): The number of MSAA samples per pixel.
+                Default to None (unchanged).
+        """
+
+        if render_scale is not None:
+            self.render_scale = render_scale
+        if samples is not None:
+            self.samples = samples
+
+        self._resized = True
+
+    def mouse(self) -> tuple[float, float]:
+        """Get the mouse position in the world coordinates.
+
+        Returns:
+            tuple[float, float]: The (x, y) position, through the camera if
+                there is one.
+        """
+
+        x, y = glfw.get_cursor_pos(self._window)
+        width, height = glfw.get_window_size(self._window)
+        # The cursor is given in screen coordinates, from the top left corner.
+        x *= self.width / max(width, 1)
+        y = self.height - y * self.height / max(height, 1)
+
+        if self.camera is not None:
+            x, y = self.camera.screen_to_world((x, y), self.width, self.height)
+
+        return float(x), float(y)
+
+    def pick(
+        self, index: ShapeIndex, x: Optional[float] = None, y: Optional[float] = None
+    ) -> Hashable | None:
+        """Get the topmost item of an index under a point.
+
+        Args:
+            index: The index of the pickable items.
+            x (Optional): The x-axis of the point in the world coordinates.
+                Default to None (the mouse).
+            y (Optional): The y-axis of the point in the world coordinates.
+                Default to None (the mouse).
+
+        Returns:
+            Hashable | None: The last inserted item whose box contains the
+                point, or None.
+        """
+
+        if x is None or y is None:
+            x, y = self.mouse()
+
+        items: list[Hashable] = index.query_point(x, y)
+        return items[0] if items else None
+
     def _clear_window(self) -> None:
         """Reset the window state.
-        Erase all the rendered pixels and updated the width and height dimensions.
+        Erase all the rendered pixels of the offscreen buffer, and update the
+        projection if the window was resized (or the quality changed) since
+        the last frame.
         """
 
-        self.width, self.height = glfw.get_framebuffer_size(self._window)
+        width: int = max(1, round(self.width * self.render_scale))
+        height: int = max(1, round(self.height * self.render_scale))
+        self._target = self._target or RenderTarget()
+        self._target.resize(width, height, self.samples)
+        self._target.bind()
+
         gl.clear_color(*self.background.ratios)
         gl.clear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        gl.load_identity()
-        gl.viewport(0, 0, self.width, self.height)
-        gl.matrix_mode(GL_PROJECTION)
-        gl.load_identity()
-        gl.ortho(0, self.width, 0, self.height, 0, 1)
-        gl.matrix_mode(GL_MODELVIEW)
-        gl.load_identity()
+
+        if self._resized:
+            gl.viewport(0, 0, width, height)
+            gl.matrix_mode(GL_PROJECTION)
+            gl.load_identity()
+            gl.ortho(0, self.width, 0, self.height, 0, 1)
+            gl.matrix_mode(GL_MODELVIEW)
+            self._resized = False
+
+        if self.camera is None:
+            gl.load_identity()
+            VectorField.zoom = 1.0
+        else:
+            gl.load_matrix_d(self.camera.gl_matrix(self.width, self.height))
+            VectorField.zoom = self.camera.zoom
+
+    def _present(self) -> None:
+        """Copy the offscreen frame to the window."""
+
+        self._target.present(self.width, self.height)
 
     def _swap_buffers(self) -> None:
         """Swap the window buffers."""
@@ -101,23 +251,52 @@ class Pysics:
     Attributes:
         canvas: The window. If no canvas is given in the constructor, we
             have to call the create_canvas() method to create it.
+        rng: The random generator of the simulation, saved in the snapshots.
+        frame_count: The number of rendered frames.
+        governor: The quality governor fed with the frame times, if any.
     """
 
-    def __init__(self, canvas: Optional[Canvas] = None) -> None:
+    # The checkpoints are named by write sequence, then by frame.
+    _CHECKPOINT_NAME: Final[str] = "checkpoint-{:010d}-{:010d}.snapshot"
+    _CHECKPOINT_GLOB: Final[str] = "checkpoint-*-*.snapshot"
+
+    def __init__(
+        self,
+        canvas: Optional[Canvas] = None,
+        *,
+        seed: Optional[int] = None,
+        governor: Optional[QualityGovernor] = None,
+    ) -> None:
         """The constructor.
 
         Args:
             canvas (Optional): The canvas to manage. Default to None.
                 If None, we need to call the create_canvas() method instead.
+            seed (Optional): The seed of the random generator. Default to None.
+            governor (Optional): The quality governor that adapts the render
+                scale, the MSAA samples and the ellipse tessellation to the
+                frame times. Default to None.
         """
 
         self.canvas: Canvas | None = canvas
+        self.governor: QualityGovernor | None = governor
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+        self.frame_count: int = 0
         self._loop: bool = False
         self._delay: Duration = 0.0
         self._tref: Timestamp | None = None
+        self._tracked: dict[str, Stateful] = {}
+        self._checkpoints: tuple[Path, int, int] | None = None
+        self._checkpoint_sequence: int = 0
 
     def create_canvas(
-        self, width: int, height: int, *, background: Optional[Color | ByteInt] = 0
+        self,
+        width: int,
+        height: int,
+        *,
+        background: Optional[Color | ByteInt] = 0,
+        profile: Optional[str] = None,
+        camera: Optional[Camera] = None,
     ) -> Canvas:
         """Create and returns a new canvas.
 
@@ -125,15 +304,25 @@ class Pysics:
             width: The canvas width.
             height: The canvas height.
             background (Optional): The canvas background color. Default to 0.
+            profile (Optional): The OpenGL profile. Default to None.
+            camera (Optional): The view on the world. Default to None.
 
         Returns:
             Canvas: The created canvas.
         """
 
-        self.canvas = Canvas(width, height, background=background)
+        self.canvas = Canvas(
+            width, height, background=background, profile=profile, camera=camera
+        )
         return self.canvas
 
-    def run_loop(self, callback: DrawCallback) -> None:
+    def run_loop(
+        self,
+        callback: DrawCallback,
+        *,
+        playback: Optional[Player | FrameSubscriber] = None,
+        profiler: Optional[MemoryProfiler] = None,
+    ) -> None:
         """Loop through the rendering process 'til the window close event is triggered.
 
         Notice that the window rendering is depending of:
@@ -142,8 +331,23 @@ class Pysics:
 
         Also notice that the event listener is not blocked by these mechanisms.
 
+        In playback mode, the callback receives the current frame of the
+        player, which then advances by its speed, so a recording is reviewed
+        without running the simulation again. With a frame subscriber, the
+        callback receives the newest frame published by a simulation running
+        in another process (the frames are skipped until one is readable).
+
+        With a memory profiler, the allocations and the GC runs of each frame
+        are recorded into the profiler, which is stopped when the loop ends.
+        The tracing slows the frames down, so the governor is not fed while
+        profiling (the quality stays as it is).
+
         Args:
             callback: The drawing function which will be called at each iteration.
+            playback (Optional): The recording to play, or the subscriber of
+                the frames to view. Default to None.
+            profiler (Optional): The memory profiler recording the frames.
+                Default to None.
 
         Raises:
             RuntimeError: If the canvas is not initialized.
@@ -160,15 +364,55 @@ class Pysics:
 
         while not glfw.window_should_close(self.canvas._window):
             if self._loop and self._time_elapsed():
+                if profiler is not None:
+                    profiler.begin_frame(self.frame_count)
+
+                start: float = perf_counter()
                 self.canvas._clear_window()
-                callback()
+
+                if playback is None:
+                    callback()
+                elif len(playback) and (frame := playback.current()) is not None:
+                    callback(frame)
+                    playback.advance()
+
+                self.canvas._present()
+
+                if profiler is None:
+                    self._govern(perf_counter() - start)
+
+                if profiler is not None:
+                    profiler.end_frame()
+
                 self.canvas._swap_buffers()
                 self._reset_timer()
+                self.frame_count += 1
+                self._auto_checkpoint()
 
             glfw.poll_events()
 
+        if profiler is not None:
+            profiler.stop()
+
         glfw.terminate()
 
+    def _govern(self, frame_time: float) -> None:
+        """Feed the governor and apply its changes of quality.
+
+        Args:
+            frame_time: The time spent rendering the frame (before the buffer
+                swap, which waits for the vertical sync).
+        """
+
+        if self.governor is None:
+            return
+
+        change: QualityChange | None = self.governor.record(frame_time)
+
+        if change:
+            self.canvas.set_quality(change.level.render_scale, change.level.samples)
+            Ellipse.tessellation = change.level.tessellation
+
     def no_loop(self) -> None:
         """Tell to the rendering loop to stop refreshing the window."""
 
@@ -183,6 +427,134 @@ class Pysics:
 
         self._delay = delay
 
+    def track(self, name: str, obj: Stateful) -> None:
+        """Add an object to the snapshots.
+
+        Args:
+            name: The unique name of the object in the snapshots.
+            obj: The object to save and restore.
+
+        Raises:
+            TypeError: If the object has no get_state() and set_state() methods.
+        """
+
+        if not isinstance(obj, Stateful):
+            raise TypeError(f"{obj!r} must implement get_state() and set_state().")
+
+        self._tracked[name] = obj
+
+    def snapshot(self, path: str | os.PathLike) -> None:
+        """Save the simulation in a snapshot file.
+
+        The snapshot holds the scheduler state (loop flag, delay and elapsed
+        time of the timer, frame count), the random generator state and the
+        state of every tracked object.
+
+        Args:
+            path: The path of the file.
+        """
+
+        elapsed: Duration | None = None if self._tref is None else time() - self._tref
+        state: State = dict(
+            loop=self._loop,
+            delay=self._delay,
+            elapsed=elapsed,
+            frame_count=self.frame_count,
+            rng=self.rng.bit_generator.state,
+            objects={name: obj.get_state() for name, obj in self._tracked.items()},
+        )
+        write_snapshot(path, state)
+
+    def restore(self, path: str | os.PathLike) -> None:
+        """Restore the simulation from a snapshot file.
+
+        The arrays of the tracked objects are memory-mapped from the file,
+        so restoring does not depend on the size of the simulation.
+
+        Args:
+            path: The path of the file.
+
+        Raises:
+            KeyError: If a tracked object is missing from the snapshot.
+        """
+
+        state: State = read_snapshot(path)
+        missing: set[str] = self._tracked.keys() - state["objects"].keys()
+
+        if missing:
+            raise KeyError(f"Objects missing from the snapshot: {sorted(missing)}.")
+
+        for name, obj in self._tracked.items():
+            obj.set_state(state["objects"][name])
+
+        self._loop = state["loop"]
+        self._delay = state["delay"]
+        self._tref = None if state["elapsed"] is None else time() - state["elapsed"]
+        self.frame_count = state["frame_count"]
+        self.rng.bit_generator.state = state["rng"]
+
+    def checkpoint_every(
+        self, frames: int, directory: str | os.PathLike, *, keep: Optional[int] = 3
+    ) -> None:
+        """Save a snapshot periodically while the rendering loop runs.
+
+        Only the most recently written checkpoints are kept, so the disk
+        usage is bounded by keep snapshots. The checkpoints are ordered by
+        write, not by frame, so the ones saved after a restore() to an
+        earlier frame are not pruned in favor of older ones. The sequence
+        resumes after the checkpoints already in the directory.
+
+        Args:
+            frames: The number of frames between two checkpoints (0 to stop).
+            directory: The directory of the checkpoints, created if needed.
+            keep (Optional): The number of checkpoints to keep. Default to 3.
+        """
+
+        if frames <= 0:
+            self._checkpoints = None
+            return
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self._checkpoints = (directory, frames, max(1, keep))
+        self._checkpoint_sequence = max(
+            (int(path.name.split("-")[1]) + 1 for path in self.checkpoints()),
+            default=0,
+        )
+
+    def checkpoints(self) -> list[Path]:
+        """Get the saved checkpoints.
+
+        Returns:
+            list[Path]: The checkpoint files, from the first written to the
+                last written.
+        """
+
+        if self._checkpoints is None:
+            return []
+
+        return sorted(self._checkpoints[0].glob(self._CHECKPOINT_GLOB))
+
+    def _auto_checkpoint(self) -> None:
+        """Save a checkpoint if it is due and remove the oldest ones."""
+
+        if self._checkpoints is None:
+            return
+
+        directory, frames, keep = self._checkpoints
+
+        if self.frame_count % frames:
+            return
+
+        name: str = self._CHECKPOINT_NAME.format(
+            self._checkpoint_sequence, self.frame_count
+        )
+        self.snapshot(directory / name)
+        self._checkpoint_sequence += 1
+
+        for path in self.checkpoints()[:-keep]:
+            path.unlink()
+
     def _reset_timer(self) -> None:
         """Reset the reference timestamp for the timer."""
 
@@ -0,0 +1,214 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Final, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """A set of quality settings.
+
+    Attributes:
+        render_scale: The ratio of the window resolution the frames are
+            rendered at before being upscaled. Default to 1.0.
+        samples: The number of MSAA samples per pixel (0 to disable it).
+            Default to 4.
+        tessellation: The multiplier of the ellipse segments. Default to 1.0.
+    """
+
+    render_scale: float = 1.0
+    samples: int = 4
+    tessellation: float = 1.0
+
+
+@dataclass(frozen=True)
+class QualityChange:
+    """A change of quality published by the governor.
+
+    Attributes:
+        frame: The number of frames recorded when the change happened.
+        previous: The previous level.
+        level: The new level.
+        frame_time: The mean frame time (in seconds) that triggered the change.
+    """
+
+    frame: int
+    previous: QualityLevel
+    level: QualityLevel
+    frame_time: float
+
+
+class QualityGovernor:
+    """Adapt the quality to keep the frame times within a budget.
+
+    The governor averages the last frame times. When the average exceeds
+    the budget by the downgrade ratio, the quality steps down to the next
+    level. When it falls under the upgrade ratio of the budget, and the
+    cooldown has elapsed since the last change, the quality steps back up.
+
+    The gap between both ratios, the cooldown and the window reset after
+    each change keep the quality from oscillating. An upgrade reverted
+    within its cooldown also doubles the cooldown (up to max_cooldown).
+
+    Attributes:
+        target_fps: The targeted frame rate.
+        levels: The levels from the best to the cheapest.
+        downgrade: The ratio of the budget above which the quality is
+            lowered. Default to 1.1.
+        upgrade: The ratio of the budget under which the quality is raised.
+            Default to 0.7.
+        cooldown: The number of frames to wait before raising the quality.
+            Default to 120.
+        max_cooldown: The limit of the doubled cooldown. Default to 1920.
+        index: The index of the current level.
+        history: The published changes.
+    """
+
+    LEVELS: Final[tuple[QualityLevel, ...]] = (
+        QualityLevel(1.0, 4, 1.0),
+        QualityLevel(1.0, 2, 1.0),
+        QualityLevel(1.0, 0, 0.75),
+        QualityLevel(0.75, 0, 0.5),
+        QualityLevel(0.5, 0, 0.25),
+    )
+
+    def __init__(
+        self,
+        target_fps: Optional[float] = 60.0,
+        *,
+        levels: Optional[Sequence[QualityLevel]] = None,
+        window: Optional[int] = 30,
+        downgrade: Optional[float] = 1.1,
+        upgrade: Optional[float] = 0.7,
+        cooldown: Optional[int] = 120,
+        max_cooldown: Optional[int] = 1920,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            target_fps (Optional): The targeted frame rate. Default to 60.
+            levels (Optional): The levels from the best to the cheapest.
+                Default to None (the LEVELS).
+            window (Optional): The number of averaged frame times. Default to 30.
+            downgrade (Optional): The ratio of the budget above which the
+                quality is lowered. Default to 1.1.
+            upgrade (Optional): The ratio of the budget under which the
+                quality is raised. Default to 0.7.
+            cooldown (Optional): The number of frames to wait before raising
+                the quality. Default to 120.
+            max_cooldown (Optional): The limit of the doubled cooldown.
+                Default to 1920.
+
+        Raises:
+            ValueError: If there is no level or if upgrade is not lower than
+                downgrade.
+        """
+
+        levels = tuple(self.LEVELS if levels is None else levels)
+
+        if not levels:
+            raise ValueError("Expected at least one quality level.")
+        if upgrade >= downgrade:
+            raise ValueError(
+                f"Expected upgrade < downgrade. {upgrade} >= {downgrade} given."
+            )
+
+        self.target_fps: float = target_fps
+        self.levels: tuple[QualityLevel, ...] = levels
+        self.downgrade: float = downgrade
+        self.upgrade: float = upgrade
+        self.cooldown: int = cooldown
+        self.max_cooldown: int = max_cooldown
+        self.index: int = 0
+        self.history: list[QualityChange] = []
+        self._times: deque[float] = deque(maxlen=window)
+        self._frames: int = 0
+        self._since_change: int = 0
+        self._raised: bool = False
+        self._listeners: list[Callable[[QualityChange], None]] = []
+
+    @property
+    def budget(self) -> float:
+        """Get the frame time budget.
+
+        Returns:
+            float: The budget in seconds.
+        """
+
+        return 1.0 / self.target_fps
+
+    @property
+    def level(self) -> QualityLevel:
+        """Get the current level.
+
+        Returns:
+            QualityLevel: The current level.
+        """
+
+        return self.levels[self.index]
+
+    def subscribe(self, callback: Callable[[QualityChange], None]) -> None:
+        """Call a function on each change of quality.
+
+        Args:
+            callback: The function receiving the change.
+        """
+
+        self._listeners.append(callback)
+
+    def record(self, frame_time: float) -> QualityChange | None:
+        """Record the duration of a frame and adapt the quality.
+
+        Args:
+            frame_time: The duration of the frame in seconds.
+
+        Returns:
+            QualityChange | None: The change of quality, if any.
+        """
+
+        self._frames += 1
+        self._since_change += 1
+        self._times.append(frame_time)
+
+        if len(self._times) < self._times.maxlen:
+            return None
+
+        mean: float = sum(self._times) / len(self._times)
+
+        if mean > self.budget * self.downgrade and self.index < len(self.levels) - 1:
+            if self._raised and self._since_change <= self.cooldown:
+                self.cooldown = min(2 * self.cooldown, self.max_cooldown)
+
+            return self._change(self.index + 1, mean)
+        if (
+            mean < self.budget * self.upgrade
+            and self.index > 0
+            and self._since_change >= self.cooldown
+        ):
+            return self._change(self.index - 1, mean)
+
+        return None
+
+    def _change(self, index: int, frame_time: float) -> QualityChange:
+        """Switch to another level and publish the change.
+
+        Args:
+            index: The index of the new level.
+            frame_time: The mean frame time that triggered the change.
+
+        Returns:
+            QualityChange: The published change.
+        """
+
+        change: QualityChange = QualityChange(
+            self._frames, self.level, self.levels[index], frame_time
+        )
+        self._raised = index < self.index
+        self.index = index
+        self._since_change = 0
+        self._times.clear()
+        self.history.append(change)
+
+        for listener in self._listeners:
+            listener(change)
+
+        return change
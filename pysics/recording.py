@@ -0,0 +1,582 @@
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import zlib
+from bisect import bisect_right
+from typing import Any, BinaryIO, Final, Optional
+import numpy as np
+
+_MAGIC: Final[bytes] = b"PYSR"
+_VERSION: Final[int] = 1
+_FILE_HEADER: Final[struct.Struct] = struct.Struct("<4sI")
+_CHUNK_HEADER: Final[struct.Struct] = struct.Struct("<I")
+_FOOTER: Final[struct.Struct] = struct.Struct("<Q4s")
+Frame = dict[str, np.ndarray]  # Define the named arrays of a recorded step.
+
+
+def _smallest_int(values: np.ndarray) -> np.dtype:
+    """Get the smallest signed integer type that holds some values.
+
+    Args:
+        values: The integer values.
+
+    Returns:
+        np.dtype: The integer type.
+    """
+
+    low, high = (int(values.min()), int(values.max())) if values.size else (0, 0)
+
+    for dtype in (np.int8, np.int16, np.int32):
+        info: np.iinfo = np.iinfo(dtype)
+
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+
+    return np.dtype(np.int64)
+
+
+def _encode_column(
+    arrays: list[np.ndarray], step: float | None, level: int
+) -> tuple[dict[str, Any], bytes]:
+    """Encode the values of a column for a chunk of frames.
+
+    Floats are quantized on a grid of the given step if any. When every frame
+    has the same number of rows, each frame is stored as its difference with
+    the previous one: a subtraction for integers (and quantized floats), which
+    are then narrowed to the smallest integer type, and a bitwise XOR for
+    lossless floats. The bytes are finally grouped by significance and
+    compressed.
+
+    Args:
+        arrays: The values of the column for each frame.
+        step (Optional): The quantization step of the floats.
+        level: The zlib compression level.
+
+    Returns:
+        tuple[dict[str, Any], bytes]: The description and payload of the column.
+    """
+
+    first: np.ndarray = arrays[0]
+    rows: list[int] = [len(array) for array in arrays]
+    uniform: bool = len(set(rows)) == 1
+    values: np.ndarray = np.concatenate(arrays)
+    quantized: bool = step is not None and first.dtype.kind == "f"
+    delta: str | None = None
+
+    if quantized:
+        values = np.round(values / step).astype(np.int64)
+
+    if uniform and values.dtype.kind in "iu":
+        delta = "sub"
+        values = values.astype(np.int64).reshape(len(arrays), -1)
+        values[1:] = np.diff(values, axis=0)
+        values = values.astype(_smallest_int(values))
+    elif uniform and values.dtype.kind == "f":
+        delta = "xor"
+        values = values.view(f"u{values.itemsize}").reshape(len(arrays), -1)
+        values[1:] ^= values[:-1].copy()
+    elif values.dtype.kind in "iu":
+        values = values.astype(_smallest_int(values))
+
+    description: dict[str, Any] = dict(
+        dtype=first.dtype.str,
+        shape=first.shape[1:],
+        rows=rows[0] if uniform else rows,
+        step=step if quantized else None,
+        delta=delta,
+        stored=values.dtype.str,
+    )
+    shuffled: np.ndarray = values.reshape(-1).view(np.uint8)
+    shuffled = shuffled.reshape(-1, values.itemsize).T
+    payload: bytes = zlib.compress(np.ascontiguousarray(shuffled).tobytes(), level)
+    description["size"] = len(payload)
+    return description, payload
+
+
+def _decode_column(
+    description: dict[str, Any], frames: int, payload: bytes
+) -> list[np.ndarray]:
+    """Decode the values of a column for a chunk of frames.
+
+    Args:
+        description: The description given by the encoding.
+        frames: The number of frames of the chunk.
+        payload: The encoded bytes.
+
+    Returns:
+        list[np.ndarray]: The values of the column for each frame.
+    """
+
+    rows: list[int] = (
+        [description["rows"]] * frames
+        if isinstance(description["rows"], int)
+        else description["rows"]
+    )
+    stored: np.dtype = np.dtype(description["stored"])
+    shuffled: np.ndarray = np.frombuffer(zlib.decompress(payload), dtype=np.uint8)
+    values: np.ndarray = (
+        shuffled.reshape(stored.itemsize, -1).T.copy().view(stored).reshape(-1)
+    )
+
+    if description["delta"] == "sub":
+        values = np.cumsum(values.reshape(frames, -1), axis=0, dtype=np.int64)
+    elif description["delta"] == "xor":
+        values = np.bitwise_xor.accumulate(values.reshape(frames, -1), axis=0)
+        values = values.view(description["dtype"])
+
+    if description["step"] is not None:
+        values = values * description["step"]
+
+    values = values.astype(description["dtype"], copy=False)
+    values = values.reshape(sum(rows), *description["shape"])
+    return np.split(values, np.cumsum(rows)[:-1])
+
+
+class Recorder:
+    """Record the state of each simulated step in an append-only file.
+
+    The frames are grouped in chunks of columns (one column per named array)
+    which are encoded and written by a background thread, so recording costs
+    the rendering loop a copy of the arrays.
+
+    Each chunk describes itself and is flushed once written, so a file is
+    still readable while recording or if the recorder was not closed. A
+    closed file also ends with an index of the chunks.
+
+    Attributes:
+        chunk_frames: The number of frames per chunk. Default to 64.
+        precision: The quantization step of the float columns, as a single
+            step or a step per column. Default to None (lossless).
+        level: The zlib compression level. Default to 1.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        *,
+        chunk_frames: Optional[int] = 64,
+        precision: Optional[float | dict[str, float]] = None,
+        level: Optional[int] = 1,
+        max_pending: Optional[int] = 4,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            path: The path of the file (overwritten).
+            chunk_frames (Optional): The number of frames per chunk.
+                Default to 64.
+            precision (Optional): The quantization step of the float
+                columns, as a single step or a step per column.
+                Default to None (lossless).
+            level (Optional): The zlib compression level. Default to 1.
+            max_pending (Optional): The number of chunks waiting to be
+                written before record() blocks. Default to 4.
+        """
+
+        self.chunk_frames: int = chunk_frames
+        self.precision: float | dict[str, float] | None = precision
+        self.level: int = level
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(_FILE_HEADER.pack(_MAGIC, _VERSION))
+        self._frames: list[Frame] = []
+        self._frame_count: int = 0
+        self._index: list[tuple[int, int, int]] = []
+        self._error: BaseException | None = None
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._thread: threading.Thread = threading.Thread(
+            target=self._write_loop, daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "Recorder":
+        """Enter a context that closes the recorder.
+
+        Returns:
+            Recorder: The recorder.
+        """
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the recorder when leaving the context."""
+
+        self.close()
+
+    def __len__(self) -> int:
+        """Get the number of recorded frames.
+
+        Returns:
+            int: The number of frames.
+        """
+
+        return self._frame_count
+
+    def record(self, **columns: np.ndarray) -> None:
+        """Record the state of a step.
+
+        The arrays are copied, so they can be updated right after the call.
+        A change of the column names starts a new chunk.
+
+        Args:
+            **columns: The named arrays of the step (e.g. positions=...).
+
+        Raises:
+            RuntimeError: If the recorder is closed or failed to write.
+        """
+
+        self._check()
+        frame: Frame = {
+            name: np.array(values, copy=True, ndmin=1)
+            for name, values in columns.items()
+        }
+
+        if self._frames and self._frames[0].keys() != frame.keys():
+            self._flush()
+
+        self._frames.append(frame)
+        self._frame_count += 1
+
+        if len(self._frames) >= self.chunk_frames:
+            self._flush()
+
+    def close(self) -> None:
+        """Write the pending frames and the index, then close the file.
+
+        Raises:
+            RuntimeError: If the recorder failed to write.
+        """
+
+        if self._file.closed:
+            return
+
+        self._flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+        if self._error:
+            raise RuntimeError("The recording failed.") from self._error
+
+    def _check(self) -> None:
+        """Check that the recorder can still record.
+
+        Raises:
+            RuntimeError: If the recorder is closed or failed to write.
+        """
+
+        if self._error:
+            raise RuntimeError("The recording failed.") from self._error
+        if self._file.closed:
+            raise RuntimeError("The recorder is closed.")
+
+    def _flush(self) -> None:
+        """Send the buffered frames to the writer thread."""
+
+        if self._frames:
+            first: int = self._frame_count - len(self._frames)
+            self._queue.put((first, self._frames))
+            self._frames = []
+
+    def _write_loop(self) -> None:
+        """Encode and write the chunks until the end of the recording."""
+
+        while (item := self._queue.get()) is not None:
+            if self._error is None:
+                try:
+                    self._write_chunk(*item)
+                except BaseException as error:
+                    self._error = error
+
+        if self._error is None:
+            footer: bytes = json.dumps(self._index, separators=(",", ":")).encode()
+            self._file.write(footer)
+            self._file.write(_FOOTER.pack(len(footer), _MAGIC))
+
+    def _write_chunk(self, first: int, frames: list[Frame]) -> None:
+        """Encode and write a chunk of frames.
+
+        Args:
+            first: The index of the first frame of the chunk.
+            frames: The frames of the chunk.
+        """
+
+        columns: dict[str, dict[str, Any]] = {}
+        payloads: list[bytes] = []
+
+        for name in frames[0]:
+            step: float | None = (
+                self.precision.get(name)
+                if isinstance(self.precision, dict)
+                else self.precision
+            )
+            description, payload = _encode_column(
+                [frame[name] for frame in frames], step, self.level
+            )
+            columns[name] = description
+            payloads.append(payload)
+
+        header: bytes = json.dumps(
+            dict(frame=first, frames=len(frames), columns=columns),
+            separators=(",", ":"),
+        ).encode()
+        self._index.append((first, len(frames), self._file.tell()))
+        self._file.write(_CHUNK_HEADER.pack(len(header)))
+        self._file.write(header)
+
+        for payload in payloads:
+            self._file.write(payload)
+
+        self._file.flush()
+
+
+class Player:
+    """Stream the frames of a recording back, without running the simulation.
+
+    The file is memory-mapped and only the chunk of the requested frame is
+    decoded (the last one is kept), so opening a long recording and seeking
+    in it are cheap.
+
+    Attributes:
+        speed: The number of frames the cursor moves by on each advance().
+            Negative values play backward. Default to 1.0.
+        loop: Restart from the other end when the cursor leaves the
+            recording. Default to False.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        *,
+        speed: Optional[float] = 1.0,
+        loop: Optional[bool] = False,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            path: The path of the recording.
+            speed (Optional): The number of frames the cursor moves by on each
+                advance(). Default to 1.0.
+            loop (Optional): Restart from the other end when the cursor leaves
+                the recording. Default to False.
+
+        Raises:
+            ValueError: If the file is not a recording.
+        """
+
+        self.speed: float = speed
+        self.loop: bool = loop
+        self._position: float = 0.0
+
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < _FILE_HEADER.size:
+                raise ValueError(f"{path} is too short to be a recording.")
+
+            self._buffer: mmap.mmap = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        magic, version = _FILE_HEADER.unpack_from(self._buffer)
+
+        if magic != _MAGIC or version != _VERSION:
+            self._buffer.close()
+            raise ValueError(f"{path} is not a recording (version {_VERSION}).")
+
+        self._index: list[tuple[int, int, int]] = self._read_index()
+        self._starts: list[int] = [first for first, _, _ in self._index]
+        self._cache: tuple[int, list[Frame]] | None = None
+
+    def __enter__(self) -> "Player":
+        """Enter a context that closes the player.
+
+        Returns:
+            Player: The player.
+        """
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the player when leaving the context."""
+
+        self.close()
+
+    def __len__(self) -> int:
+        """Get the number of recorded frames.
+
+        Returns:
+            int: The number of frames.
+        """
+
+        if not self._index:
+            return 0
+
+        first, frames, _ = self._index[-1]
+        return first + frames
+
+    def __getitem__(self, index: int) -> Frame:
+        """Get a recorded frame.
+
+        Args:
+            index: The index of the frame (negative values count from the end).
+
+        Returns:
+            Frame: The named arrays of the frame (read-only).
+
+        Raises:
+            IndexError: If the index is out of the recording.
+        """
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Frame {index} is out of the recording.")
+
+        chunk: int = bisect_right(self._starts, index) - 1
+
+        if self._cache is None or self._cache[0] != chunk:
+            self._cache = (chunk, self._read_chunk(self._index[chunk][2]))
+
+        return self._cache[1][index - self._starts[chunk]]
+
+    @property
+    def position(self) -> int:
+        """Get the index of the current frame.
+
+        Returns:
+            int: The index of the current frame.
+        """
+
+        return int(self._position)
+
+    @property
+    def finished(self) -> bool:
+        """Check if the cursor reached the end of the recording.
+
+        Returns:
+            bool: True if the cursor cannot move anymore, else False.
+        """
+
+        if not len(self):
+            return True
+        if self.loop:
+            return False
+        if self.speed >= 0:
+            return self._position >= len(self) - 1
+
+        return self._position <= 0
+
+    def seek(self, index: int) -> None:
+        """Move the cursor to a frame.
+
+        Args:
+            index: The index of the frame (clamped into the recording).
+        """
+
+        self._position = float(min(max(index, 0), max(len(self) - 1, 0)))
+
+    def current(self) -> Frame:
+        """Get the frame under the cursor.
+
+        Returns:
+            Frame: The named arrays of the frame.
+        """
+
+        return self[self.position]
+
+    def advance(self) -> None:
+        """Move the cursor by speed frames."""
+
+        position: float = self._position + self.speed
+
+        if self.loop and len(self):
+            self._position = position % len(self)
+        else:
+            self._position = min(max(position, 0.0), max(len(self) - 1, 0))
+
+    def close(self) -> None:
+        """Release the mapped file."""
+
+        self._cache = None
+        self._buffer.close()
+
+    def _read_index(self) -> list[tuple[int, int, int]]:
+        """Read the index of the chunks.
+
+        The index written at the end of a closed recording is used if any,
+        else the chunks are scanned from the start of the file.
+
+        Returns:
+            list[tuple[int, int, int]]: The first frame, number of frames and
+                offset of each chunk.
+        """
+
+        buffer: mmap.mmap = self._buffer
+        end: int = len(buffer)
+
+        if end >= _FILE_HEADER.size + _FOOTER.size:
+            size, magic = _FOOTER.unpack_from(buffer, end - _FOOTER.size)
+            start: int = end - _FOOTER.size - size
+
+            if magic == _MAGIC and start >= _FILE_HEADER.size:
+                try:
+                    footer: list = json.loads(buffer[start : end - _FOOTER.size])
+                    return [tuple(chunk) for chunk in footer]
+                except ValueError:
+                    pass
+
+        index: list[tuple[int, int, int]] = []
+        offset: int = _FILE_HEADER.size
+
+        # Scan an unclosed recording, stopping at a truncated chunk.
+        while offset + _CHUNK_HEADER.size <= end:
+            (size,) = _CHUNK_HEADER.unpack_from(buffer, offset)
+            start = offset + _CHUNK_HEADER.size
+
+            try:
+                header: dict[str, Any] = json.loads(buffer[start : start + size])
+            except ValueError:
+                break
+
+            payload: int = sum(column["size"] for column in header["columns"].values())
+
+            if start + size + payload > end:
+                break
+
+            index.append((header["frame"], header["frames"], offset))
+            offset = start + size + payload
+
+        return index
+
+    def _read_chunk(self, offset: int) -> list[Frame]:
+        """Decode a chunk of frames.
+
+        Args:
+            offset: The offset of the chunk in the file.
+
+        Returns:
+            list[Frame]: The frames of the chunk.
+        """
+
+        (size,) = _CHUNK_HEADER.unpack_from(self._buffer, offset)
+        start: int = offset + _CHUNK_HEADER.size
+        header: dict[str, Any] = json.loads(self._buffer[start : start + size])
+        start += size
+        frames: list[Frame] = [{} for _ in range(header["frames"])]
+
+        for name, description in header["columns"].items():
+            payload: memoryview = memoryview(self._buffer)[
+                start : start + description["size"]
+            ]
+            start += description["size"]
+
+            for frame, values in zip(
+                frames, _decode_column(description, header["frames"], payload)
+            ):
+                values.flags.writeable = False
+                frame[name] = values
+
+            payload.release()
+
+        return frames
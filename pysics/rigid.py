@@ -0,0 +1,729 @@
+from enum import IntEnum
+from typing import Final, Optional
+import numpy as np
+from pysics._graph import color_edges, connected_components
+from pysics.broadphase import UniformGrid
+from pysics.shapes import Circle, Rect
+from pysics.types import (
+    ByteInt,
+    Color,
+    IndexArray,
+    PointArray,
+    ScalarArray,
+    State,
+)
+
+
+class BodyKind(IntEnum):
+    """The collision shape of a rigid body."""
+
+    CIRCLE = 0
+    BOX = 1
+
+
+class World:
+    """A rigid body world made of circles and axis-aligned boxes.
+
+    The bodies are stored as flat arrays and only translate (the boxes stay
+    axis-aligned like the Rect shape). Each step integrates the gravity,
+    generates the contacts, solves them with an iterative impulse solver and
+    integrates the positions.
+
+    The solver is warm started with the impulses of the previous step and
+    processes the contacts by groups that do not share any dynamic body, so
+    each group is solved in a single vectorized pass.
+
+    The bodies in contact form islands, which fall asleep together once all
+    their bodies stayed slow for sleep_time seconds: they are no longer
+    integrated, behave as static bodies for the others and are kept in a
+    separate broad phase grid that is only rebuilt when an island falls
+    asleep or wakes up. A sleeping island is woken up when an awake body
+    hits one of its bodies faster than sleep_velocity or pushes it (with any
+    normal impulse), or by wake() and apply_impulse().
+
+    Attributes:
+        gravity: The (x, y) gravity acceleration. Default to (0, -9.81).
+        iterations: The number of solver iterations per step. Default to 8.
+        sleep_velocity: The speed under which a body is considered at rest.
+            Default to 0.05.
+        sleep_time: The time a body must stay at rest to fall asleep.
+            Default to 0.5.
+        baumgarte: The ratio of the penetration corrected at each step.
+            Default to 0.2.
+        slop: The allowed penetration depth. Default to 0.01.
+    """
+
+    _INITIAL_CAPACITY: Final[int] = 64
+    _BODY_ARRAYS: Final[tuple[str, ...]] = (
+        "kind",
+        "pos",
+        "vel",
+        "half",
+        "bound",
+        "inv_mass",
+        "restitution",
+        "friction",
+        "timer",
+        "island",
+        "static",
+        "awake",
+    )
+    _RESTITUTION_THRESHOLD: Final[float] = 1.0
+
+    def __init__(
+        self,
+        *,
+        gravity: Optional[tuple[float, float]] = (0.0, -9.81),
+        iterations: Optional[int] = 8,
+        sleep_velocity: Optional[float] = 0.05,
+        sleep_time: Optional[float] = 0.5,
+        baumgarte: Optional[float] = 0.2,
+        slop: Optional[float] = 0.01,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            gravity (Optional): The (x, y) gravity acceleration.
+                Default to (0, -9.81).
+            iterations (Optional): The number of solver iterations per step.
+                Default to 8.
+            sleep_velocity (Optional): The speed under which a body is
+                considered at rest. Default to 0.05.
+            sleep_time (Optional): The time a body must stay at rest to fall
+                asleep. Default to 0.5.
+            baumgarte (Optional): The ratio of the penetration corrected at
+                each step. Default to 0.2.
+            slop (Optional): The allowed penetration depth. Default to 0.01.
+        """
+
+        self.gravity: tuple[float, float] = gravity
+        self.iterations: int = iterations
+        self.sleep_velocity: float = sleep_velocity
+        self.sleep_time: float = sleep_time
+        self.baumgarte: float = baumgarte
+        self.slop: float = slop
+        self._count: int = 0
+        self._allocate(self._INITIAL_CAPACITY)
+        self._sleeping_grid: UniformGrid = UniformGrid()
+        self._sleeping_ids: IndexArray = np.empty(0, dtype=np.intp)
+        self._sleeping_dirty: bool = True
+        self._cache_keys: IndexArray = np.empty(0, dtype=np.int64)
+        self._cache_impulses: PointArray = np.empty((0, 2))
+
+    def __len__(self) -> int:
+        """Get the number of bodies.
+
+        Returns:
+            int: The number of bodies.
+        """
+
+        return self._count
+
+    @property
+    def positions(self) -> PointArray:
+        """Get the body centers (a writable view).
+
+        Returns:
+            PointArray: The (n, 2) array of the body centers.
+        """
+
+        return self._pos[: self._count]
+
+    @property
+    def velocities(self) -> PointArray:
+        """Get the body velocities (a writable view).
+
+        Returns:
+            PointArray: The (n, 2) array of the body velocities.
+        """
+
+        return self._vel[: self._count]
+
+    @property
+    def awake(self) -> np.ndarray:
+        """Get the mask of the bodies that are simulated.
+
+        Returns:
+            np.ndarray: The (n,) mask of the awake bodies.
+        """
+
+        return self._awake[: self._count].copy()
+
+    def add_circle(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        *,
+        mass: Optional[float] = 1.0,
+        restitution: Optional[float] = 0.2,
+        friction: Optional[float] = 0.5,
+    ) -> int:
+        """Add a circular body.
+
+        Args:
+            x: The x-axis of the circle center.
+            y: The y-axis of the circle center.
+            radius: The circle radius.
+            mass (Optional): The body mass. 0 for a static body. Default to 1.0.
+            restitution (Optional): The bounciness (from 0 to 1). Default to 0.2.
+            friction (Optional): The friction coefficient. Default to 0.5.
+
+        Returns:
+            int: The body index.
+        """
+
+        return self._add(
+            BodyKind.CIRCLE,
+            (x, y),
+            (radius, radius),
+            radius,
+            mass,
+            restitution,
+            friction,
+        )
+
+    def add_rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        *,
+        mass: Optional[float] = 1.0,
+        restitution: Optional[float] = 0.2,
+        friction: Optional[float] = 0.5,
+    ) -> int:
+        """Add an axis-aligned box body.
+
+        Args:
+            x: The x-axis of the box position (like the Rect shape).
+            y: The y-axis of the box position (like the Rect shape).
+            width: The width of the box.
+            height: The height of the box.
+            mass (Optional): The body mass. 0 for a static body. Default to 1.0.
+            restitution (Optional): The bounciness (from 0 to 1). Default to 0.2.
+            friction (Optional): The friction coefficient. Default to 0.5.
+
+        Returns:
+            int: The body index.
+        """
+
+        half: tuple[float, float] = (width / 2, height / 2)
+        return self._add(
+            BodyKind.BOX,
+            (x + half[0], y + half[1]),
+            half,
+            float(np.hypot(*half)),
+            mass,
+            restitution,
+            friction,
+        )
+
+    def wake(self, index: int) -> None:
+        """Wake up a sleeping body and its island (static bodies stay static).
+
+        Args:
+            index: The body index.
+        """
+
+        self._wake_islands(np.array([index]))
+        self._timer[index] = 0.0
+
+    def apply_impulse(self, index: int, impulse: tuple[float, float]) -> None:
+        """Change the velocity of a body by the given impulse and wake it up.
+
+        Args:
+            index: The body index.
+            impulse: The (x, y) impulse.
+        """
+
+        self.wake(index)
+        self._vel[index] += np.asarray(impulse) * self._inv_mass[index]
+
+    def step(self, dt: float) -> None:
+        """Advance the simulation.
+
+        Args:
+            dt: The duration of the step.
+        """
+
+        if not self._count or dt <= 0:
+            return
+
+        n: int = self._count
+        self._wake_touched()
+        awake: np.ndarray = self._awake[:n]
+        self._vel[:n][awake] += np.asarray(self.gravity) * dt
+        a, b, normal, depth, feature = self._contacts()
+        pushed: ScalarArray = self._solve(a, b, normal, depth, feature, dt)
+        awake = self._awake[:n]
+        self._pos[:n][awake] += self._vel[:n][awake] * dt
+        self._wake_pushed(a, b, pushed)
+        self._update_sleep(dt, a, b)
+
+    def get_state(self) -> State:
+        """Get the state of the world, to save it in a snapshot.
+
+        Returns:
+            State: The settings, bodies and contact cache of the world.
+        """
+
+        return dict(
+            gravity=self.gravity,
+            iterations=self.iterations,
+            sleep_velocity=self.sleep_velocity,
+            sleep_time=self.sleep_time,
+            baumgarte=self.baumgarte,
+            slop=self.slop,
+            bodies={
+                name: getattr(self, f"_{name}")[: self._count]
+                for name in self._BODY_ARRAYS
+            },
+            cache_keys=self._cache_keys,
+            cache_impulses=self._cache_impulses,
+        )
+
+    def set_state(self, state: State) -> None:
+        """Restore a state returned by get_state().
+
+        The body arrays are used as they are, they are only copied when a
+        body is added.
+
+        Args:
+            state: The state to restore.
+        """
+
+        self.gravity = tuple(state["gravity"])
+        self.iterations = state["iterations"]
+        self.sleep_velocity = state["sleep_velocity"]
+        self.sleep_time = state["sleep_time"]
+        self.baumgarte = state["baumgarte"]
+        self.slop = state["slop"]
+        self._count = len(state["bodies"]["pos"])
+
+        for name in self._BODY_ARRAYS:
+            setattr(self, f"_{name}", state["bodies"][name])
+
+        if not self._count:
+            self._allocate(self._INITIAL_CAPACITY)
+
+        self._cache_keys = state["cache_keys"]
+        self._cache_impulses = state["cache_impulses"]
+        self._sleeping_dirty = True
+
+    def draw(
+        self,
+        *,
+        fill: Optional[Color | ByteInt] = Color(0, 0, 0, 0),
+        stroke: Optional[Color | ByteInt] = None,
+        stroke_weight: Optional[int | float] = 1.0,
+    ) -> None:
+        """Render every body with the Circle and Rect shapes.
+
+        Args:
+            fill (Optional): The filling color of the shapes. Default to
+                transparent.
+            stroke (Optional): The outline color of the shapes. Default to None.
+            stroke_weight (Optional): The outline width of the shapes.
+                Default to 1.0.
+        """
+
+        for kind, (x, y), (hw, hh) in zip(
+            self._kind[: self._count].tolist(),
+            self.positions.tolist(),
+            self._half[: self._count].tolist(),
+        ):
+            if kind == BodyKind.CIRCLE:
+                Circle(x, y, hw, fill=fill, stroke=stroke, stroke_weight=stroke_weight)
+            else:
+                Rect(
+                    x - hw,
+                    y - hh,
+                    2 * hw,
+                    2 * hh,
+                    fill=fill,
+                    stroke=stroke,
+                    stroke_weight=stroke_weight,
+                )
+
+    def _allocate(self, capacity: int) -> None:
+        """Grow the body arrays to the given capacity.
+
+        Args:
+            capacity: The new capacity.
+        """
+
+        n: int = self._count
+
+        def grow(name: str, shape: tuple[int, ...], dtype: type, fill: float) -> None:
+            array: np.ndarray = np.full(shape, fill, dtype=dtype)
+
+            if hasattr(self, name):
+                array[:n] = getattr(self, name)[:n]
+
+            setattr(self, name, array)
+
+        grow("_kind", (capacity,), np.int8, 0)
+        grow("_pos", (capacity, 2), np.float64, 0.0)
+        grow("_vel", (capacity, 2), np.float64, 0.0)
+        grow("_half", (capacity, 2), np.float64, 0.0)
+        grow("_bound", (capacity,), np.float64, 0.0)
+        grow("_inv_mass", (capacity,), np.float64, 0.0)
+        grow("_restitution", (capacity,), np.float64, 0.0)
+        grow("_friction", (capacity,), np.float64, 0.0)
+        grow("_timer", (capacity,), np.float64, 0.0)
+        grow("_island", (capacity,), np.intp, -1)
+        grow("_static", (capacity,), bool, False)
+        grow("_awake", (capacity,), bool, False)
+
+    def _add(
+        self,
+        kind: BodyKind,
+        center: tuple[float, float],
+        half: tuple[float, float],
+        bound: float,
+        mass: float,
+        restitution: float,
+        friction: float,
+    ) -> int:
+        """Append a body to the arrays.
+
+        Args:
+            kind: The body shape.
+            center: The body center.
+            half: The half extents of the body (the radius for circles).
+            bound: The radius of the bounding circle.
+            mass: The body mass (0 for a static body).
+            restitution: The bounciness.
+            friction: The friction coefficient.
+
+        Returns:
+            int: The body index.
+        """
+
+        if self._count == len(self._pos):
+            self._allocate(2 * len(self._pos))
+
+        index: int = self._count
+        self._count += 1
+        self._kind[index] = kind
+        self._pos[index] = center
+        self._vel[index] = 0.0
+        self._half[index] = half
+        self._bound[index] = bound
+        self._inv_mass[index] = 1.0 / mass if mass > 0 else 0.0
+        self._restitution[index] = restitution
+        self._friction[index] = friction
+        self._timer[index] = 0.0
+        self._island[index] = -1
+        self._static[index] = mass <= 0
+        self._awake[index] = mass > 0
+        self._sleeping_dirty = True
+        return index
+
+    def _candidates(self) -> tuple[IndexArray, IndexArray]:
+        """Get the candidate pairs that involve at least one awake body.
+
+        Returns:
+            tuple[IndexArray, IndexArray]: The body indices of each pair.
+        """
+
+        self._refresh_sleeping()
+        awake_ids: IndexArray = np.flatnonzero(self._awake[: self._count])
+        grid: UniformGrid = UniformGrid()
+        grid.build(self._pos[awake_ids], self._bound[awake_ids])
+        first, second = grid.candidate_pairs()
+        queried, built = self._sleeping_grid.query(
+            self._pos[awake_ids], self._bound[awake_ids]
+        )
+        a: IndexArray = np.concatenate((awake_ids[first], awake_ids[queried]))
+        b: IndexArray = np.concatenate((awake_ids[second], self._sleeping_ids[built]))
+        return np.minimum(a, b), np.maximum(a, b)
+
+    def _refresh_sleeping(self) -> None:
+        """Rebuild the grid of the sleeping and static bodies if needed."""
+
+        if self._sleeping_dirty:
+            self._sleeping_ids = np.flatnonzero(~self._awake[: self._count])
+            self._sleeping_grid.build(
+                self._pos[self._sleeping_ids], self._bound[self._sleeping_ids]
+            )
+            self._sleeping_dirty = False
+
+    def _contacts(
+        self,
+    ) -> tuple[IndexArray, IndexArray, PointArray, ScalarArray, IndexArray]:
+        """Generate the contacts of the current positions.
+
+        The normals point from the first body to the second one, and the first
+        body always has the lowest index.
+
+        Returns:
+            tuple[IndexArray, IndexArray, PointArray, ScalarArray, IndexArray]:
+                The bodies, the normal, the penetration depth and the feature
+                (the separating axis for boxes) of each contact.
+        """
+
+        a, b = self._candidates()
+        kind_a: IndexArray = self._kind[a]
+        kind_b: IndexArray = self._kind[b]
+        normal: PointArray = np.zeros((len(a), 2))
+        depth: ScalarArray = np.full(len(a), -1.0)
+        feature: IndexArray = np.zeros(len(a), dtype=np.int64)
+
+        both: np.ndarray = (kind_a == BodyKind.CIRCLE) & (kind_b == BodyKind.CIRCLE)
+        delta: PointArray = self._pos[b[both]] - self._pos[a[both]]
+        dist: ScalarArray = np.hypot(delta[:, 0], delta[:, 1])
+        safe: ScalarArray = np.where(dist > 0, dist, 1.0)
+        normal[both] = np.where(
+            dist[:, None] > 0, delta / safe[:, None], np.array([0.0, 1.0])
+        )
+        depth[both] = self._half[a[both], 0] + self._half[b[both], 0] - dist
+
+        boxes: np.ndarray = (kind_a == BodyKind.BOX) & (kind_b == BodyKind.BOX)
+        delta = self._pos[b[boxes]] - self._pos[a[boxes]]
+        overlap: PointArray = (
+            self._half[a[boxes]] + self._half[b[boxes]] - np.abs(delta)
+        )
+        axis: IndexArray = np.argmin(overlap, axis=1)
+        rows: IndexArray = np.arange(len(axis))
+        box_normal: PointArray = np.zeros((len(axis), 2))
+        box_normal[rows, axis] = np.where(delta[rows, axis] < 0, -1.0, 1.0)
+        normal[boxes] = box_normal
+        depth[boxes] = np.where((overlap > 0).all(axis=1), overlap[rows, axis], -1.0)
+        feature[boxes] = axis
+
+        mixed: np.ndarray = ~both & ~boxes
+        flip: np.ndarray = kind_a[mixed] == BodyKind.BOX
+        circles: IndexArray = np.where(flip, b[mixed], a[mixed])
+        rects: IndexArray = np.where(flip, a[mixed], b[mixed])
+        mixed_normal, mixed_depth, mixed_feature = self._circle_box(circles, rects)
+        normal[mixed] = np.where(flip[:, None], -mixed_normal, mixed_normal)
+        depth[mixed] = mixed_depth
+        feature[mixed] = mixed_feature
+
+        hit: np.ndarray = depth > 0
+        return a[hit], b[hit], normal[hit], depth[hit], feature[hit]
+
+    def _circle_box(
+        self, circles: IndexArray, boxes: IndexArray
+    ) -> tuple[PointArray, ScalarArray, IndexArray]:
+        """Collide circles against boxes.
+
+        Args:
+            circles: The circle of each pair.
+            boxes: The box of each pair.
+
+        Returns:
+            tuple[PointArray, ScalarArray, IndexArray]: The normal (from the
+                circle to the box), the penetration depth and the feature
+                (0 for a face or corner contact, 1 when the center is inside).
+        """
+
+        delta: PointArray = self._pos[circles] - self._pos[boxes]
+        half: PointArray = self._half[boxes]
+        radius: ScalarArray = self._half[circles, 0]
+        gap: PointArray = delta - np.clip(delta, -half, half)
+        dist: ScalarArray = np.hypot(gap[:, 0], gap[:, 1])
+        safe: ScalarArray = np.where(dist > 0, dist, 1.0)
+        normal: PointArray = -gap / safe[:, None]
+        depth: ScalarArray = radius - dist
+
+        inside: np.ndarray = dist == 0
+        inner: PointArray = half[inside] - np.abs(delta[inside])
+        axis: IndexArray = np.argmin(inner, axis=1)
+        rows: IndexArray = np.arange(len(axis))
+        inside_normal: PointArray = np.zeros((len(axis), 2))
+        inside_normal[rows, axis] = np.where(delta[inside][rows, axis] < 0, 1.0, -1.0)
+        normal[inside] = inside_normal
+        depth[inside] = radius[inside] + inner[rows, axis]
+        return normal, depth, inside.astype(np.int64)
+
+    def _solve(
+        self,
+        a: IndexArray,
+        b: IndexArray,
+        normal: PointArray,
+        depth: ScalarArray,
+        feature: IndexArray,
+        dt: float,
+    ) -> ScalarArray:
+        """Solve the contacts with warm-started sequential impulses.
+
+        Args:
+            a: The first body of each contact.
+            b: The second body of each contact.
+            normal: The normal of each contact (from a to b).
+            depth: The penetration depth of each contact.
+            feature: The feature of each contact.
+            dt: The duration of the step.
+
+        Returns:
+            ScalarArray: The normal impulse of each contact.
+        """
+
+        keys: IndexArray = (a.astype(np.int64) << 32) | (b << 1) | feature
+        impulses: PointArray = np.zeros((len(a), 2))
+
+        if len(self._cache_keys) and len(keys):
+            found: IndexArray = np.minimum(
+                np.searchsorted(self._cache_keys, keys), len(self._cache_keys) - 1
+            )
+            hit: np.ndarray = self._cache_keys[found] == keys
+            impulses[hit] = self._cache_impulses[found[hit]]
+
+        vel: PointArray = self._vel
+        inv_a: ScalarArray = np.where(self._awake[a], self._inv_mass[a], 0.0)
+        inv_b: ScalarArray = np.where(self._awake[b], self._inv_mass[b], 0.0)
+        inv_sum: ScalarArray = inv_a + inv_b
+        solvable: np.ndarray = inv_sum > 0
+        mass: ScalarArray = np.where(
+            solvable, 1.0 / np.where(solvable, inv_sum, 1.0), 0.0
+        )
+        tangent: PointArray = np.stack((-normal[:, 1], normal[:, 0]), axis=1)
+        friction: ScalarArray = np.sqrt(self._friction[a] * self._friction[b])
+        restitution: ScalarArray = np.maximum(
+            self._restitution[a], self._restitution[b]
+        )
+        approach: ScalarArray = np.einsum("ij,ij->i", vel[b] - vel[a], normal)
+        bias: ScalarArray = self.baumgarte / dt * np.maximum(depth - self.slop, 0.0)
+        bias = np.maximum(
+            bias,
+            np.where(
+                approach < -self._RESTITUTION_THRESHOLD, -restitution * approach, 0.0
+            ),
+        )
+
+        warm: PointArray = impulses[:, :1] * normal + impulses[:, 1:] * tangent
+        np.subtract.at(vel, a, warm * inv_a[:, None])
+        np.add.at(vel, b, warm * inv_b[:, None])
+        groups: list[IndexArray] = color_edges(
+            a, b, self._count, fixed=~self._awake[: self._count]
+        )
+
+        for _ in range(self.iterations):
+            for group in groups:
+                ga: IndexArray = a[group]
+                gb: IndexArray = b[group]
+                relative: PointArray = vel[gb] - vel[ga]
+                n: PointArray = normal[group]
+                t: PointArray = tangent[group]
+                old: PointArray = impulses[group]
+                pn: ScalarArray = np.maximum(
+                    old[:, 0]
+                    + mass[group] * (bias[group] - np.einsum("ij,ij->i", relative, n)),
+                    0.0,
+                )
+                limit: ScalarArray = friction[group] * pn
+                pt: ScalarArray = np.clip(
+                    old[:, 1] - mass[group] * np.einsum("ij,ij->i", relative, t),
+                    -limit,
+                    limit,
+                )
+                change: PointArray = (pn - old[:, 0])[:, None] * n + (pt - old[:, 1])[
+                    :, None
+                ] * t
+                impulses[group, 0] = pn
+                impulses[group, 1] = pt
+                vel[ga] -= change * inv_a[group, None]
+                vel[gb] += change * inv_b[group, None]
+
+        pushed: ScalarArray = impulses[:, 0].copy()
+        # The impulses of the sleeping pairs are kept to warm start them
+        # when they wake up.
+        first: IndexArray = (self._cache_keys >> 32).astype(np.intp)
+        second: IndexArray = ((self._cache_keys >> 1) & 0x7FFFFFFF).astype(np.intp)
+        kept: np.ndarray = ~self._awake[first] & ~self._awake[second]
+        keys = np.concatenate((keys, self._cache_keys[kept]))
+        impulses = np.concatenate((impulses, self._cache_impulses[kept]))
+        order: IndexArray = np.argsort(keys)
+        self._cache_keys = keys[order]
+        self._cache_impulses = impulses[order]
+        return pushed
+
+    def _wake_touched(self) -> None:
+        """Wake up the islands touched by a fast awake body."""
+
+        n: int = self._count
+        self._refresh_sleeping()
+
+        speed2: ScalarArray = np.einsum("ij,ij->i", self._vel[:n], self._vel[:n])
+        fast: IndexArray = np.flatnonzero(
+            self._awake[:n] & (speed2 > self.sleep_velocity**2)
+        )
+        queried, built = self._sleeping_grid.query(self._pos[fast], self._bound[fast])
+        others: IndexArray = self._sleeping_ids[built]
+        delta: PointArray = self._pos[others] - self._pos[fast[queried]]
+        reach: ScalarArray = self._bound[others] + self._bound[fast[queried]]
+        self._wake_islands(others[np.einsum("ij,ij->i", delta, delta) < reach**2])
+
+    def _wake_pushed(self, a: IndexArray, b: IndexArray, pushed: ScalarArray) -> None:
+        """Wake up the islands pushed by an awake body, however slow.
+
+        Args:
+            a: The first body of each contact.
+            b: The second body of each contact.
+            pushed: The normal impulse of each contact.
+        """
+
+        awake: np.ndarray = self._awake
+        contact: np.ndarray = pushed > 0
+        self._wake_islands(
+            np.concatenate(
+                (
+                    a[contact & ~awake[a] & awake[b]],
+                    b[contact & awake[a] & ~awake[b]],
+                )
+            )
+        )
+
+    def _wake_islands(self, bodies: IndexArray) -> None:
+        """Wake up the islands of the given bodies (static bodies excluded).
+
+        Args:
+            bodies: The body indices.
+        """
+
+        n: int = self._count
+        sleeping: IndexArray = bodies[~self._awake[bodies] & ~self._static[bodies]]
+
+        if not len(sleeping):
+            return
+
+        woken: np.ndarray = ~self._awake[:n] & np.isin(
+            self._island[:n], self._island[sleeping]
+        )
+        woken[sleeping] = True
+        self._awake[:n][woken] = True
+        self._timer[:n][woken] = 0.0
+        self._island[:n][woken] = -1
+        self._sleeping_dirty = True
+
+    def _update_sleep(self, dt: float, a: IndexArray, b: IndexArray) -> None:
+        """Update the rest timers and put the resting islands to sleep.
+
+        Args:
+            dt: The duration of the step.
+            a: The first body of each contact.
+            b: The second body of each contact.
+        """
+
+        n: int = self._count
+        awake: np.ndarray = self._awake[:n]
+        speed2: ScalarArray = np.einsum("ij,ij->i", self._vel[:n], self._vel[:n])
+        resting: np.ndarray = awake & (speed2 < self.sleep_velocity**2)
+        self._timer[:n] = np.where(resting, self._timer[:n] + dt, 0.0)
+        # An island sleeps when its least rested body does.
+        islands: IndexArray = connected_components(
+            a, b, n, fixed=self._static[:n] | ~awake
+        )
+        rested: ScalarArray = np.full(n, np.inf)
+        np.minimum.at(rested, islands, self._timer[:n])
+        asleep: np.ndarray = awake & (rested[islands] >= self.sleep_time)
+
+        if asleep.any():
+            self._awake[:n][asleep] = False
+            self._vel[:n][asleep] = 0.0
+            self._island[:n][asleep] = islands[asleep]
+            self._sleeping_dirty = True
@@ -1,8 +1,18 @@
 from abc import ABC, abstractmethod
 from math import cos, pi, sin
-from typing import Optional
+from typing import ClassVar, Optional
+import numpy as np
+from pysics.strokes import stroke_strip
 from pysics.types import Color, ByteInt, PIndex, Vertex
-from pysics._wrappers import gl, GL_QUADS, GL_LINE_LOOP, GL_POLYGON
+from pysics._wrappers import (
+    gl,
+    GL_FLOAT,
+    GL_QUADS,
+    GL_LINE_LOOP,
+    GL_POLYGON,
+    GL_TRIANGLE_STRIP,
+    GL_VERTEX_ARRAY,
+)
 
 
 class BaseShape(ABC):
@@ -67,8 +77,12 @@ class Line(BaseShape):
         dy: The y-axis of the shape end position.
         stroke (Optional): The outline color of the shape. Default to None.
         stroke_weight (Optional): The outline width of the shape. Default to 1.0.
+        join: The corners of the thick outlines of every shape ("miter",
+            "bevel" or "round"). Default to "miter".
     """
 
+    join: ClassVar[str] = "miter"
+
     def __init__(
         self,
         x: PIndex,
@@ -100,6 +114,17 @@ class Line(BaseShape):
 
         if self.stroke:
             gl.color_4f(*self.stroke.ratios)
+
+            if self.stroke_weight > 1.0:
+                Line._draw_strip(
+                    stroke_strip(
+                        [(self.x, self.y), (self.dx, self.dy)],
+                        self.stroke_weight,
+                        closed=False,
+                    )
+                )
+                return
+
             gl.line_width(self.stroke_weight)
             gl.begin(GL_LINE_LOOP)
             gl.vertex_2f(self.x, self.y)
@@ -113,19 +138,32 @@ class Line(BaseShape):
         *,
         stroke: Color | ByteInt,
         stroke_weight: Optional[int | float] = 1.0,
+        join: Optional[str] = None,
     ) -> None:
         """Create an outile from the given vertices.
+        The outlines thicker than 1 are drawn as a triangle strip with joined
+        corners (the line widths are clamped by most drivers), tessellated
+        once while the vertices and the width stay unchanged.
 
         Args:
             vertices: The list of x, y coordinates that define the line shape.
             stoke: The color of the outline.
             stroke_weight (Optional): The outline width. Default to 1.0.
+            join (Optional): The corners of a thick outline ("miter", "bevel"
+                or "round"). Default to None (Line.join).
         """
 
         if isinstance(stroke, int):
             stroke = Color.from_unit(stroke)
 
         gl.color_4f(*stroke.ratios)
+
+        if stroke_weight > 1.0:
+            cls._draw_strip(
+                stroke_strip(vertices, stroke_weight, join=join or cls.join)
+            )
+            return
+
         gl.line_width(stroke_weight)
         gl.begin(GL_LINE_LOOP)
 
@@ -134,6 +172,22 @@ class Line(BaseShape):
 
         gl.end()
 
+    @staticmethod
+    def _draw_strip(strip: np.ndarray) -> None:
+        """Draw a tessellated stroke.
+
+        Args:
+            strip: The (n, 2) float32 array of the triangle strip vertices.
+        """
+
+        if not len(strip):
+            return
+
+        gl.enable_client_state(GL_VERTEX_ARRAY)
+        gl.vertex_pointer(2, GL_FLOAT, 0, strip)
+        gl.draw_arrays(GL_TRIANGLE_STRIP, 0, len(strip))
+        gl.disable_client_state(GL_VERTEX_ARRAY)
+
 
 class Rect(BaseShape):
     """A rectangural shape.
@@ -213,8 +267,12 @@ class Ellipse(BaseShape):
         fill (Optional): The filling color of the shape. Default to transparent.
         stroke (Optional): The outline color of the shape. Default to None.
         stroke_weight (Optional): The outline width of the shape. Default to 1.0.
+        tessellation: The multiplier applied to the segments of every
+            ellipse (e.g. lowered by the quality governor). Default to 1.0.
     """
 
+    tessellation: ClassVar[float] = 1.0
+
     def __init__(
         self,
         x: PIndex,
@@ -253,7 +311,8 @@ class Ellipse(BaseShape):
         color exists.
         """
 
-        theta: float = 2 * pi / self.segments
+        segments: int = max(3, round(self.segments * Ellipse.tessellation))
+        theta: float = 2 * pi / segments
         cos_t: float = cos(theta)
         sin_t: float = sin(theta)
         transform: float = 0.0
@@ -261,7 +320,7 @@ class Ellipse(BaseShape):
         cy: float = 0.0
         vertices: list[Vertex] = []
 
-        for _ in range(self.segments):
+        for _ in range(segments):
             vertices.append((cx * self.rx + self.x, cy * self.ry + self.y))
             transform = cx
             cx = cos_t * cx - sin_t * cy
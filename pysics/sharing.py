@@ -0,0 +1,336 @@
+import json
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Final, Optional
+import numpy as np
+from pysics.recording import Frame
+
+_MAGIC: Final[bytes] = b"PYSF"
+_HEADER: Final[struct.Struct] = struct.Struct("<4sII")
+_ALIGN: Final[int] = 64
+# The blocks created by the publishers of this process.
+_created: set[str] = set()
+# Define the shape and the dtype of each named array of a frame.
+Layout = dict[str, tuple[tuple[int, ...], str]]
+
+
+def _aligned(size: int) -> int:
+    """Round a size up to the alignment of the arrays.
+
+    Args:
+        size: The size in bytes.
+
+    Returns:
+        int: The aligned size.
+    """
+
+    return -(-size // _ALIGN) * _ALIGN
+
+
+class _SharedFrames:
+    """The memory layout shared by the publisher and the subscribers.
+
+    The block starts with a header (magic, number of slots, size of the
+    layout) and the JSON layout. Then come the counters: the number of
+    published frames and the sequence number of each slot. Then come the
+    slots, each one holding every array of a frame.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory) -> None:
+        """The constructor.
+
+        Args:
+            memory: The shared memory block (already initialized).
+
+        Raises:
+            ValueError: If the block does not hold shared frames.
+        """
+
+        magic, slots, size = _HEADER.unpack_from(memory.buf)
+
+        if magic != _MAGIC:
+            raise ValueError(f"{memory.name!r} does not hold shared frames.")
+
+        start: int = _HEADER.size
+        self.memory: shared_memory.SharedMemory = memory
+        self.layout: Layout = {
+            name: (tuple(shape), dtype)
+            for name, (shape, dtype) in json.loads(
+                bytes(memory.buf[start : start + size])
+            ).items()
+        }
+        offset: int = _aligned(start + size)
+        self.counters: np.ndarray = np.ndarray(slots + 1, np.uint64, memory.buf, offset)
+        offset = _aligned(offset + self.counters.nbytes)
+        self.slots: list[dict[str, np.ndarray]] = []
+
+        for _ in range(slots):
+            arrays: dict[str, np.ndarray] = {}
+
+            for name, (shape, dtype) in self.layout.items():
+                arrays[name] = np.ndarray(shape, dtype, memory.buf, offset)
+                offset = _aligned(offset + arrays[name].nbytes)
+
+            self.slots.append(arrays)
+
+    @staticmethod
+    def size(layout: Layout, slots: int) -> tuple[bytes, int]:
+        """Get the size of a block.
+
+        Args:
+            layout: The shape and the dtype of each array.
+            slots: The number of slots.
+
+        Returns:
+            tuple[bytes, int]: The encoded layout and the size of the block.
+        """
+
+        encoded: bytes = json.dumps(layout).encode()
+        size: int = _aligned(_HEADER.size + len(encoded))
+        size += _aligned(8 * (slots + 1))
+
+        for shape, dtype in layout.values():
+            size += slots * _aligned(int(np.prod(shape)) * np.dtype(dtype).itemsize)
+
+        return encoded, size
+
+    def release(self) -> None:
+        """Drop the views on the block (required before closing it)."""
+
+        self.counters = None
+        self.slots = []
+
+
+class FramePublisher:
+    """Publish the frames of a simulation into shared memory.
+
+    The frames are written into a ring of slots, and the last published one
+    is read by the FrameSubscriber of another process (e.g. a viewer). The
+    publisher never waits for the readers: each slot is guarded by a
+    sequence number (a seqlock), odd while the slot is written, so a reader
+    detects and drops a frame overwritten while it was copied.
+
+    Attributes:
+        name: The name of the shared memory block, to give to the subscribers.
+        layout: The shape and the dtype of each array of a frame.
+    """
+
+    def __init__(
+        self,
+        layout: dict[str, tuple[tuple[int, ...], Any]],
+        *,
+        name: Optional[str] = None,
+        slots: Optional[int] = 3,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            layout: The shape and the dtype of each array of a frame.
+            name (Optional): The name of the shared memory block.
+                Default to None (a random name).
+            slots (Optional): The number of frames of the ring. Default to 3.
+
+        Raises:
+            ValueError: If there is less than 2 slots.
+        """
+
+        if slots < 2:
+            raise ValueError(f"Expected at least 2 slots. {slots} given.")
+
+        layout = {
+            column: ([int(n) for n in shape], np.dtype(dtype).str)
+            for column, (shape, dtype) in layout.items()
+        }
+        encoded, size = _SharedFrames.size(layout, slots)
+        memory: shared_memory.SharedMemory = shared_memory.SharedMemory(
+            name, create=True, size=size
+        )
+        _created.add(memory._name)
+        _HEADER.pack_into(memory.buf, 0, _MAGIC, slots, len(encoded))
+        memory.buf[_HEADER.size : _HEADER.size + len(encoded)] = encoded
+        self._frames: _SharedFrames = _SharedFrames(memory)
+        self._published: int = 0
+        self.name: str = memory.name
+        self.layout: Layout = self._frames.layout
+
+    def __enter__(self) -> "FramePublisher":
+        """Enter a context that closes the publisher.
+
+        Returns:
+            FramePublisher: The publisher.
+        """
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the publisher."""
+
+        self.close()
+
+    def __len__(self) -> int:
+        """Get the number of published frames.
+
+        Returns:
+            int: The number of frames.
+        """
+
+        return self._published
+
+    def publish(self, **columns: np.ndarray) -> None:
+        """Publish a frame.
+
+        Args:
+            columns: The arrays of the frame, one per name of the layout.
+
+        Raises:
+            ValueError: If the arrays do not match the layout.
+        """
+
+        if columns.keys() != self.layout.keys():
+            raise ValueError(
+                f"Expected the columns {sorted(self.layout)}. "
+                f"{sorted(columns)} given."
+            )
+
+        counters: np.ndarray = self._frames.counters
+        frame: int = self._published
+        slot: int = frame % (len(counters) - 1)
+        arrays: dict[str, np.ndarray] = self._frames.slots[slot]
+        counters[slot + 1] = 2 * frame + 1
+
+        for name, array in columns.items():
+            arrays[name][...] = array
+
+        counters[slot + 1] = 2 * frame + 2
+        self._published += 1
+        counters[0] = self._published
+
+    def close(self) -> None:
+        """Release and destroy the shared memory block."""
+
+        if self._frames.counters is not None:
+            self._frames.release()
+            self._frames.memory.close()
+            self._frames.memory.unlink()
+            _created.discard(self._frames.memory._name)
+
+
+class FrameSubscriber:
+    """Read the last frame published by a FramePublisher of another process.
+
+    The reads never lock: the newest complete frame is copied, and copied
+    again if the publisher overwrote it meanwhile. The frames published
+    between two reads are dropped, so a slow reader never slows the
+    publisher down.
+
+    A subscriber can be played by Pysics.run_loop() like a Player: the
+    callback then receives the newest frame at each rendered frame.
+
+    Attributes:
+        name: The name of the shared memory block.
+        layout: The shape and the dtype of each array of a frame.
+        dropped: The number of published frames never read.
+    """
+
+    _RETRIES: Final[int] = 16
+
+    def __init__(self, name: str) -> None:
+        """The constructor.
+
+        Args:
+            name: The name of the shared memory block of the publisher.
+
+        Raises:
+            FileNotFoundError: If there is no such block.
+            ValueError: If the block does not hold shared frames.
+        """
+
+        memory: shared_memory.SharedMemory = shared_memory.SharedMemory(name)
+
+        # The block belongs to the publisher, which destroys it: a block of
+        # another process must not be destroyed by the tracker of this one
+        # when it exits, while the block of a publisher of this process is
+        # tracked once for both.
+        if memory._name not in _created:
+            resource_tracker.unregister(memory._name, "shared_memory")
+
+        try:
+            self._frames: _SharedFrames = _SharedFrames(memory)
+        except ValueError:
+            memory.close()
+            raise
+
+        self.name: str = name
+        self.layout: Layout = self._frames.layout
+        self.dropped: int = 0
+        self._frame: Frame | None = None
+        self._read: int = 0
+
+    def __enter__(self) -> "FrameSubscriber":
+        """Enter a context that closes the subscriber.
+
+        Returns:
+            FrameSubscriber: The subscriber.
+        """
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the subscriber."""
+
+        self.close()
+
+    def __len__(self) -> int:
+        """Get the number of frames published so far.
+
+        Returns:
+            int: The number of frames.
+        """
+
+        return int(self._frames.counters[0])
+
+    def current(self) -> Frame | None:
+        """Get the newest complete frame.
+
+        Returns:
+            Frame | None: A copy of the named arrays of the frame (the last
+                read one if no new frame is readable), or None if nothing
+                was read yet.
+        """
+
+        counters: np.ndarray = self._frames.counters
+
+        for _ in range(self._RETRIES):
+            published: int = int(counters[0])
+
+            if published == self._read:
+                break
+
+            frame: int = published - 1
+            slot: int = frame % (len(counters) - 1)
+            sequence: int = int(counters[slot + 1])
+
+            if sequence != 2 * frame + 2:
+                continue
+
+            copy: Frame = {
+                name: array.copy() for name, array in self._frames.slots[slot].items()
+            }
+
+            if int(counters[slot + 1]) == sequence:
+                self.dropped += published - self._read - 1
+                self._read = published
+                self._frame = copy
+                break
+
+        return self._frame
+
+    def advance(self) -> None:
+        """Do nothing: the newest frame is read by current()."""
+
+    def close(self) -> None:
+        """Release the shared memory block."""
+
+        if self._frames.counters is not None:
+            self._frames.release()
+            self._frames.memory.close()
@@ -0,0 +1,148 @@
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Final
+import numpy as np
+from pysics.types import State
+
+_MAGIC: Final[bytes] = b"PYSX"
+_VERSION: Final[int] = 1
+_PREFIX: Final[struct.Struct] = struct.Struct("<4sIQ")
+_ALIGNMENT: Final[int] = 64
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the array alignment.
+
+    Args:
+        offset: The offset to align.
+
+    Returns:
+        int: The aligned offset.
+    """
+
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_snapshot(path: str | os.PathLike, state: State) -> None:
+    """Write a state to a snapshot file.
+
+    The file starts with a JSON header that holds the values of the state
+    and the description of its arrays. The arrays follow as raw aligned
+    bytes so they can be memory-mapped back. The file is written next to
+    its destination then renamed, so a snapshot is never left half written.
+
+    Args:
+        path: The path of the file.
+        state: The nested dicts, lists, JSON values and NumPy arrays to save.
+
+    Raises:
+        TypeError: If the state holds a value that cannot be saved.
+    """
+
+    arrays: list[np.ndarray] = []
+    descriptions: list[dict[str, Any]] = []
+    offset: int = 0
+
+    def encode(value: Any) -> Any:
+        nonlocal offset
+
+        if isinstance(value, np.ndarray):
+            if value.dtype.hasobject:
+                raise TypeError("Arrays of Python objects cannot be saved.")
+
+            arrays.append(np.ascontiguousarray(value))
+            descriptions.append(
+                dict(dtype=value.dtype.str, shape=value.shape, offset=offset)
+            )
+            offset = _align(offset + value.nbytes)
+            return {"__array__": len(arrays) - 1}
+        if isinstance(value, dict):
+            return {str(key): encode(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [encode(item) for item in value]
+        if isinstance(value, np.generic):
+            return value.item()
+
+        return value
+
+    header: bytes = json.dumps(
+        dict(state=encode(state), arrays=descriptions), separators=(",", ":")
+    ).encode()
+    start: int = _align(_PREFIX.size + len(header))
+    path = Path(path)
+    temporary: Path = path.with_name(f".{path.name}.tmp")
+
+    with open(temporary, "wb") as file:
+        file.write(_PREFIX.pack(_MAGIC, _VERSION, len(header)))
+        file.write(header)
+
+        for array, description in zip(arrays, descriptions):
+            file.seek(start + description["offset"])
+            file.write(array.reshape(-1).view(np.uint8))
+
+    os.replace(temporary, path)
+
+
+def read_snapshot(path: str | os.PathLike) -> State:
+    """Read a state from a snapshot file.
+
+    The arrays are memory-mapped in copy-on-write mode: nothing is read
+    until it is used, and the restored arrays can be modified without
+    changing the file.
+
+    Args:
+        path: The path of the file.
+
+    Returns:
+        State: The saved state (tuples are read as lists).
+
+    Raises:
+        ValueError: If the file is not a snapshot.
+    """
+
+    with open(path, "rb") as file:
+        prefix: bytes = file.read(_PREFIX.size)
+
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"{path} is not a snapshot.")
+
+        magic, version, size = _PREFIX.unpack(prefix)
+
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a snapshot (version {_VERSION}).")
+
+        header: dict[str, Any] = json.loads(file.read(size))
+
+    start: int = _align(_PREFIX.size + size)
+    arrays: list[np.ndarray] = []
+
+    for description in header["arrays"]:
+        dtype: np.dtype = np.dtype(description["dtype"])
+        shape: tuple[int, ...] = tuple(description["shape"])
+
+        if 0 in shape:
+            arrays.append(np.empty(shape, dtype=dtype))
+        else:
+            mapped: np.memmap = np.memmap(
+                path,
+                dtype=dtype,
+                mode="c",
+                offset=start + description["offset"],
+                shape=shape,
+            )
+            arrays.append(np.asarray(mapped))
+
+    def decode(value: Any) -> Any:
+        if isinstance(value, dict):
+            if "__array__" in value:
+                return arrays[value["__array__"]]
+
+            return {key: decode(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [decode(item) for item in value]
+
+        return value
+
+    return decode(header["state"])
@@ -0,0 +1,395 @@
+import heapq
+from math import floor, hypot
+from typing import Hashable, Iterator, Optional, TypeAlias
+from pysics.shapes import BaseShape, Ellipse, Line, Rect
+
+# Define a (left, bottom, right, top) box.
+Box: TypeAlias = tuple[float, float, float, float]
+Span: TypeAlias = tuple[int, int, int, int]  # Define the cells covered by a box.
+
+
+def bounds_of(shape: BaseShape) -> Box:
+    """Get the bounding box of a shape.
+
+    Args:
+        shape: The line, rectangle, ellipse or circle.
+
+    Returns:
+        Box: The (left, bottom, right, top) box of the shape.
+
+    Raises:
+        TypeError: If the shape is not supported.
+    """
+
+    if isinstance(shape, Ellipse):
+        return (
+            shape.x - shape.rx,
+            shape.y - shape.ry,
+            shape.x + shape.rx,
+            shape.y + shape.ry,
+        )
+    if isinstance(shape, Rect):
+        return (
+            min(shape.x, shape.x + shape.width),
+            min(shape.y, shape.y + shape.height),
+            max(shape.x, shape.x + shape.width),
+            max(shape.y, shape.y + shape.height),
+        )
+    if isinstance(shape, Line):
+        return (
+            min(shape.x, shape.dx),
+            min(shape.y, shape.dy),
+            max(shape.x, shape.dx),
+            max(shape.y, shape.dy),
+        )
+
+    raise TypeError(f"No bounding box for {type(shape).__name__!r}.")
+
+
+class ShapeIndex:
+    """A spatial index of bounding boxes, to find what is under a point or in
+    an area without scanning every item.
+
+    The boxes are bucketed in a sparse grid (a dictionary of cells). Unlike
+    the UniformGrid broad phase, the index is kept from a frame to another:
+    moving an item only touches the cells it leaves and enters, and nothing
+    at all when it stays in the same cells.
+
+    The items are any hashable keys (e.g. the body indices or the shapes),
+    and the queries return them from the last inserted to the first one,
+    which is the drawing order from the top.
+
+    Attributes:
+        cell_size (Optional): The size of the grid cells, ideally about the
+            size of the items. Default to 64.0.
+    """
+
+    def __init__(self, cell_size: Optional[float] = 64.0) -> None:
+        """The constructor.
+
+        Args:
+            cell_size (Optional): The size of the grid cells. Default to 64.0.
+
+        Raises:
+            ValueError: If the cell size is not strictly positive.
+        """
+
+        if cell_size <= 0:
+            raise ValueError(f"Expected a positive cell size. {cell_size} given.")
+
+        self.cell_size: float = cell_size
+        self._boxes: dict[Hashable, Box] = {}
+        self._spans: dict[Hashable, Span] = {}
+        self._ranks: dict[Hashable, int] = {}
+        self._cells: dict[tuple[int, int], set[Hashable]] = {}
+        self._inserted: int = 0
+
+    def __len__(self) -> int:
+        """Get the number of indexed items.
+
+        Returns:
+            int: The number of items.
+        """
+
+        return len(self._boxes)
+
+    def __contains__(self, item: Hashable) -> bool:
+        """Tell if an item is indexed.
+
+        Args:
+            item: The item key.
+
+        Returns:
+            bool: True if the item is indexed.
+        """
+
+        return item in self._boxes
+
+    def bounds(self, item: Hashable) -> Box:
+        """Get the indexed box of an item.
+
+        Args:
+            item: The item key.
+
+        Returns:
+            Box: The (left, bottom, right, top) box.
+
+        Raises:
+            KeyError: If the item is not indexed.
+        """
+
+        return self._boxes[item]
+
+    def insert(self, item: Hashable | BaseShape, box: Optional[Box] = None) -> None:
+        """Index an item, or move it if it is already indexed.
+
+        Args:
+            item: The item key.
+            box (Optional): The (left, bottom, right, top) box of the item.
+                Default to None (the bounding box of the item, if a shape).
+        """
+
+        if box is None:
+            box = bounds_of(item)
+
+        span: Span = self._span(box)
+        previous: Span | None = self._spans.get(item)
+        self._boxes[item] = box
+
+        if item not in self._ranks:
+            self._ranks[item] = self._inserted
+            self._inserted += 1
+        if span == previous:
+            return
+        if previous is not None:
+            self._unlink(item, previous)
+
+        self._spans[item] = span
+
+        for cell in self._cells_of(span):
+            self._cells.setdefault(cell, set()).add(item)
+
+    def remove(self, item: Hashable) -> None:
+        """Remove an item from the index.
+
+        Args:
+            item: The item key.
+
+        Raises:
+            KeyError: If the item is not indexed.
+        """
+
+        del self._boxes[item]
+        del self._ranks[item]
+        self._unlink(item, self._spans.pop(item))
+
+    def clear(self) -> None:
+        """Remove every item."""
+
+        self._boxes.clear()
+        self._spans.clear()
+        self._ranks.clear()
+        self._cells.clear()
+
+    def query_point(self, x: float, y: float) -> list[Hashable]:
+        """Get the items whose box contains a point.
+
+        Args:
+            x: The x-axis of the point.
+            y: The y-axis of the point.
+
+        Returns:
+            list[Hashable]: The items, from the last inserted.
+        """
+
+        cell: tuple[int, int] = (floor(x / self.cell_size), floor(y / self.cell_size))
+        found: list[Hashable] = []
+
+        for item in self._cells.get(cell, ()):
+            left, bottom, right, top = self._boxes[item]
+
+            if left <= x <= right and bottom <= y <= top:
+                found.append(item)
+
+        return self._sorted(found)
+
+    def query_rect(
+        self, left: float, bottom: float, right: float, top: float
+    ) -> list[Hashable]:
+        """Get the items whose box overlaps a rectangle.
+
+        Args:
+            left: The x-axis of the left side.
+            bottom: The y-axis of the bottom side.
+            right: The x-axis of the right side.
+            top: The y-axis of the top side.
+
+        Returns:
+            list[Hashable]: The items, from the last inserted.
+        """
+
+        x0, y0, x1, y1 = self._span((left, bottom, right, top))
+
+        # A rectangle wider than the occupied cells only visits the latter.
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._cells):
+            cells: Iterator[set[Hashable]] = (
+                items
+                for (cx, cy), items in self._cells.items()
+                if x0 <= cx <= x1 and y0 <= cy <= y1
+            )
+        else:
+            cells = (
+                self._cells[cell]
+                for cell in self._cells_of((x0, y0, x1, y1))
+                if cell in self._cells
+            )
+
+        found: set[Hashable] = set()
+
+        for items in cells:
+            for item in items:
+                if item in found:
+                    continue
+
+                box: Box = self._boxes[item]
+
+                if (
+                    box[0] <= right
+                    and box[2] >= left
+                    and box[1] <= top
+                    and box[3] >= bottom
+                ):
+                    found.add(item)
+
+        return self._sorted(found)
+
+    def nearest(self, x: float, y: float, k: Optional[int] = 1) -> list[Hashable]:
+        """Get the items whose box is the closest to a point.
+
+        The cells are visited by rings around the point, until no unvisited
+        cell can hold an item closer than the k-th found one.
+
+        Args:
+            x: The x-axis of the point.
+            y: The y-axis of the point.
+            k (Optional): The number of items. Default to 1.
+
+        Returns:
+            list[Hashable]: The k (or less) closest items, from the closest
+                (0 inside a box, ties broken by the last inserted).
+        """
+
+        if k < 1:
+            return []
+
+        cx: int = floor(x / self.cell_size)
+        cy: int = floor(y / self.cell_size)
+        distances: dict[Hashable, float] = {}
+        ring: int = 0
+
+        def key(item: Hashable) -> tuple[float, int]:
+            return distances[item], -self._ranks[item]
+
+        while len(distances) < len(self._boxes):
+            # Far from the items, scanning them all is cheaper than the rings.
+            if 8 * ring > len(self._cells):
+                for item in self._boxes.keys() - distances.keys():
+                    distances[item] = self._distance(item, x, y)
+                break
+
+            for cell in self._ring(cx, cy, ring):
+                for item in self._cells.get(cell, ()):
+                    if item not in distances:
+                        distances[item] = self._distance(item, x, y)
+
+            # The cells of the next rings are at least that far.
+            if len(distances) >= k:
+                best: list[Hashable] = heapq.nsmallest(k, distances, key=key)
+
+                if distances[best[-1]] <= ring * self.cell_size:
+                    return best
+
+            ring += 1
+
+        return heapq.nsmallest(k, distances, key=key)
+
+    def _span(self, box: Box) -> Span:
+        """Get the cells covered by a box.
+
+        Args:
+            box: The (left, bottom, right, top) box.
+
+        Returns:
+            Span: The first and last columns and rows of the cells.
+        """
+
+        left, bottom, right, top = box
+        return (
+            floor(left / self.cell_size),
+            floor(bottom / self.cell_size),
+            floor(right / self.cell_size),
+            floor(top / self.cell_size),
+        )
+
+    @staticmethod
+    def _cells_of(span: Span) -> Iterator[tuple[int, int]]:
+        """Iterate over the cells of a span.
+
+        Args:
+            span: The first and last columns and rows of the cells.
+
+        Yields:
+            tuple[int, int]: The cell coordinates.
+        """
+
+        x0, y0, x1, y1 = span
+
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield cx, cy
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int) -> Iterator[tuple[int, int]]:
+        """Iterate over the cells at a Chebyshev distance from a cell.
+
+        Args:
+            cx: The column of the center cell.
+            cy: The row of the center cell.
+            ring: The distance in cells.
+
+        Yields:
+            tuple[int, int]: The cell coordinates.
+        """
+
+        if not ring:
+            yield cx, cy
+            return
+
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
+
+    def _unlink(self, item: Hashable, span: Span) -> None:
+        """Remove an item from the cells of a span (and drop the empty cells).
+
+        Args:
+            item: The item key.
+            span: The cells of the item.
+        """
+
+        for cell in self._cells_of(span):
+            items: set[Hashable] = self._cells[cell]
+            items.discard(item)
+
+            if not items:
+                del self._cells[cell]
+
+    def _distance(self, item: Hashable, x: float, y: float) -> float:
+        """Get the distance from a point to the box of an item.
+
+        Args:
+            item: The item key.
+            x: The x-axis of the point.
+            y: The y-axis of the point.
+
+        Returns:
+            float: The distance, 0 inside the box.
+        """
+
+        left, bottom, right, top = self._boxes[item]
+        return hypot(max(left - x, 0.0, x - right), max(bottom - y, 0.0, y - top))
+
+    def _sorted(self, items: Iterator[Hashable]) -> list[Hashable]:
+        """Sort items from the last inserted.
+
+        Args:
+            items: The item keys.
+
+        Returns:
+            list[Hashable]: The sorted items.
+        """
+
+        return sorted(items, key=self._ranks.__getitem__, reverse=True)
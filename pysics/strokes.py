@@ -0,0 +1,176 @@
+from collections import OrderedDict
+from typing import Final, Optional
+import numpy as np
+from pysics.types import PointArray
+
+JOINS: Final[tuple[str, ...]] = ("miter", "bevel", "round")
+_CACHE_SIZE: Final[int] = 1024
+# The last tessellated strips, from the least recently used.
+_strips: OrderedDict[tuple, np.ndarray] = OrderedDict()
+
+
+def tessellate(
+    points: PointArray,
+    weight: float,
+    *,
+    join: Optional[str] = "miter",
+    closed: Optional[bool] = True,
+    miter_limit: Optional[float] = 4.0,
+    segments: Optional[int] = 8,
+) -> np.ndarray:
+    """Tessellate a thick polyline into a triangle strip.
+
+    Each vertex gets pairs of points offset on both sides of the line: one
+    pair along the miter, two pairs along the normals of its segments for a
+    bevel, or a fan of pairs rotating from a normal to the other for a round
+    join. The ends of an open polyline are cut square.
+
+    Args:
+        points: The (n, 2) array of the polyline vertices.
+        weight: The width of the stroke.
+        join (Optional): The shape of the corners, "miter", "bevel" or
+            "round". Default to "miter".
+        closed (Optional): Join the last vertex to the first one.
+            Default to True.
+        miter_limit (Optional): The longest miter, as a ratio of the half
+            width, beyond which a corner is beveled. Default to 4.0.
+        segments (Optional): The number of segments of a round join.
+            Default to 8.
+
+    Returns:
+        np.ndarray: The (m, 2) float32 array of the strip vertices (empty if
+            the polyline has less than two distinct vertices).
+
+    Raises:
+        ValueError: If the join is unknown.
+    """
+
+    if join not in JOINS:
+        raise ValueError(f"Expected a join in {JOINS}. {join!r} given.")
+
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    # The repeated vertices would make null segments.
+    points = points[(np.diff(points, axis=0, prepend=np.nan) != 0).any(axis=1)]
+
+    if closed and len(points) > 1 and (points[0] == points[-1]).all():
+        points = points[:-1]
+    if len(points) < 2:
+        return np.empty((0, 2), dtype=np.float32)
+
+    ends: PointArray = np.roll(points, -1, axis=0) if closed else points[1:]
+    directions: PointArray = ends - points[: len(ends)]
+    directions /= np.hypot(directions[:, 0], directions[:, 1])[:, None]
+    normals: PointArray = np.column_stack([-directions[:, 1], directions[:, 0]])
+
+    # The normals of the segments entering and leaving each vertex.
+    if closed:
+        incoming: PointArray = np.roll(normals, 1, axis=0)
+        outgoing: PointArray = normals
+    else:
+        incoming = np.concatenate([normals[:1], normals])
+        outgoing = np.concatenate([normals, normals[-1:]])
+
+    offsets: np.ndarray
+
+    if join == "round":
+        turns: np.ndarray = np.arctan2(
+            incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0],
+            (incoming * outgoing).sum(axis=1),
+        )
+        starts: np.ndarray = np.arctan2(incoming[:, 1], incoming[:, 0])
+        angles: np.ndarray = starts[:, None] + turns[:, None] * np.linspace(
+            0.0, 1.0, segments + 1
+        )
+        offsets = np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+    else:
+        offsets = np.stack([incoming, outgoing], axis=1)
+
+        if join == "miter":
+            cosines: np.ndarray = 1.0 + (incoming * outgoing).sum(axis=1)
+            # The miter is 1 / cos(turn / 2) long, i.e. sqrt(2 / cosines).
+            mitered: np.ndarray = cosines * miter_limit**2 >= 2.0
+            offsets[mitered] = (
+                (incoming + outgoing)[mitered] / cosines[mitered, None]
+            )[:, None]
+
+    half: np.ndarray = offsets * (weight / 2)
+    strip: np.ndarray = np.stack(
+        [points[:, None] + half, points[:, None] - half], axis=2
+    ).reshape(-1, 2)
+
+    if closed:
+        strip = np.concatenate([strip, strip[:2]])
+
+    return strip.astype(np.float32)
+
+
+def stroke_strip(
+    points: PointArray,
+    weight: float,
+    *,
+    join: Optional[str] = "miter",
+    closed: Optional[bool] = True,
+) -> np.ndarray:
+    """Get the triangle strip of a stroke, tessellating it if not cached.
+
+    The strips are cached by their vertices, weight, join and closure, so
+    the outlines drawn again each frame are only tessellated once while they
+    stay unchanged.
+
+    Args:
+        points: The (n, 2) array of the polyline vertices.
+        weight: The width of the stroke.
+        join (Optional): The shape of the corners, "miter", "bevel" or
+            "round". Default to "miter".
+        closed (Optional): Join the last vertex to the first one.
+            Default to True.
+
+    Returns:
+        np.ndarray: The (m, 2) float32 array of the strip vertices. It is
+            shared by the cache: do not modify it.
+    """
+
+    vertices: np.ndarray = np.asarray(points, dtype=float)
+    key: tuple = (vertices.tobytes(), weight, join, closed)
+    strip: np.ndarray | None = _strips.get(key)
+
+    if strip is None:
+        strip = tessellate(vertices, weight, join=join, closed=closed)
+        _strips[key] = strip
+
+        if len(_strips) > _CACHE_SIZE:
+            _strips.popitem(last=False)
+    else:
+        _strips.move_to_end(key)
+
+    return strip
+
+
+def join_strips(strips: list[np.ndarray]) -> np.ndarray:
+    """Chain triangle strips into a single one.
+
+    The strips are linked by repeating the last vertex of a strip and the
+    first vertex of the next one, which only makes null triangles. Every
+    strip has an even length, so the winding of the triangles is kept.
+
+    Args:
+        strips: The (m, 2) arrays of the strips.
+
+    Returns:
+        np.ndarray: The (k, 2) float32 array of the chained strip.
+    """
+
+    parts: list[np.ndarray] = []
+
+    for strip in strips:
+        if not len(strip):
+            continue
+        if parts:
+            parts.extend((parts[-1][-1:], strip[:1]))
+
+        parts.append(strip)
+
+    if not parts:
+        return np.empty((0, 2), dtype=np.float32)
+
+    return np.concatenate(parts).astype(np.float32, copy=False)
@@ -0,0 +1,452 @@
+from typing import Final, Optional
+import numpy as np
+from pysics.types import ByteInt, Color, PIndex
+from pysics._wrappers import (
+    gl,
+    GL_FLOAT,
+    GL_LINEAR,
+    GL_LUMINANCE,
+    GL_NEAREST,
+    GL_QUADS,
+    GL_RGB,
+    GL_RGBA,
+    GL_TEXTURE_2D,
+    GL_TEXTURE_MAG_FILTER,
+    GL_TEXTURE_MIN_FILTER,
+    GL_UNPACK_ALIGNMENT,
+    GL_UNSIGNED_BYTE,
+)
+
+
+class Texture:
+    """An image kept on the GPU and drawn as a single quad.
+
+    The GL texture is created on the first upload and reused by the next
+    ones: uploading an image of the same size only replaces the pixels
+    (glTexSubImage2D) instead of reallocating the texture.
+
+    The first row of the image is drawn at the bottom of the quad, so a grid
+    indexed as [y, x] is drawn the same way as the canvas coordinates.
+
+    Attributes:
+        smooth (Optional): Interpolate the pixels when the texture is scaled.
+            Default to False.
+    """
+
+    _FORMATS: Final[dict[int, int]] = {1: GL_LUMINANCE, 3: GL_RGB, 4: GL_RGBA}
+
+    def __init__(
+        self, data: Optional[np.ndarray] = None, *, smooth: Optional[bool] = False
+    ) -> None:
+        """The constructor.
+
+        Args:
+            data (Optional): The first image to upload. Default to None.
+            smooth (Optional): Interpolate the pixels when the texture is
+                scaled. Default to False.
+        """
+
+        self.smooth: bool = smooth
+        self._id: int | None = None
+        self._size: tuple[int, int, int, int] | None = None
+
+        if data is not None:
+            self.update(data)
+
+    @property
+    def shape(self) -> tuple[int, int] | None:
+        """Get the size of the uploaded image.
+
+        Returns:
+            tuple[int, int] | None: The (height, width) of the image or None
+                if nothing was uploaded yet.
+        """
+
+        return self._size[:2] if self._size else None
+
+    def update(self, data: np.ndarray) -> None:
+        """Upload a new image.
+
+        The image is a (h, w) array of luminance or a (h, w, 3|4) array of RGB
+        or RGBA colors, either as uint8 values or as float ratios in [0..1].
+        Contiguous uint8 and float32 arrays are uploaded without any copy.
+
+        Args:
+            data: The image to upload.
+
+        Raises:
+            ValueError: If the array is not an image.
+        """
+
+        data, gl_format, gl_type = self._prepare(data)
+        size: tuple[int, int, int, int] = (*data.shape[:2], gl_format, gl_type)
+        height, width = size[:2]
+
+        if self._id is None:
+            self._id = gl.gen_textures(1)
+
+        gl.bind_texture(GL_TEXTURE_2D, self._id)
+        gl.pixel_store_i(GL_UNPACK_ALIGNMENT, 1)
+
+        if size == self._size:
+            gl.tex_sub_image_2d(
+                GL_TEXTURE_2D, 0, 0, 0, width, height, gl_format, gl_type, data
+            )
+        else:
+            gl.tex_image_2d(
+                GL_TEXTURE_2D, 0, gl_format, width, height, 0, gl_format, gl_type, data
+            )
+            self._size = size
+
+    def update_region(self, data: np.ndarray, x: int, y: int) -> None:
+        """Replace a region of the uploaded image.
+
+        Only the pixels of the region are sent to the GPU, which is much
+        cheaper than a whole upload when a small part of the image changes.
+
+        Args:
+            data: The (h, w[, 1|3|4]) pixels of the region, in the format and
+                the type of the uploaded image.
+            x: The column of the first pixel of the region.
+            y: The row of the first pixel of the region.
+
+        Raises:
+            RuntimeError: If no image was uploaded.
+            ValueError: If the pixels are not an image, do not match the
+                uploaded image or overflow it.
+        """
+
+        if self._id is None:
+            raise RuntimeError("No image was uploaded to the texture.")
+
+        data, gl_format, gl_type = self._prepare(data)
+        height, width = data.shape[:2]
+
+        if (gl_format, gl_type) != self._size[2:]:
+            raise ValueError("Expected a region in the format of the image.")
+        if x < 0 or y < 0 or x + width > self._size[1] or y + height > self._size[0]:
+            raise ValueError(
+                f"The {height}x{width} region at ({x}, {y}) overflows the "
+                f"{self._size[0]}x{self._size[1]} image."
+            )
+
+        gl.bind_texture(GL_TEXTURE_2D, self._id)
+        gl.pixel_store_i(GL_UNPACK_ALIGNMENT, 1)
+        gl.tex_sub_image_2d(
+            GL_TEXTURE_2D, 0, x, y, width, height, gl_format, gl_type, data
+        )
+
+    def draw(
+        self,
+        x: PIndex,
+        y: PIndex,
+        width: PIndex,
+        height: PIndex,
+        *,
+        tint: Optional[Color | ByteInt] = 255,
+    ) -> None:
+        """Draw the texture.
+
+        Args:
+            x: The x-axis of the bottom left corner.
+            y: The y-axis of the bottom left corner.
+            width: The width of the quad.
+            height: The height of the quad.
+            tint (Optional): The color multiplied with the pixels. Default to 255.
+
+        Raises:
+            RuntimeError: If no image was uploaded.
+        """
+
+        if self._id is None:
+            raise RuntimeError("No image was uploaded to the texture.")
+
+        tint = Color.from_unit(tint) if isinstance(tint, int) else tint
+        filtering: int = GL_LINEAR if self.smooth else GL_NEAREST
+        gl.enable(GL_TEXTURE_2D)
+        gl.bind_texture(GL_TEXTURE_2D, self._id)
+        gl.tex_parameter_i(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, filtering)
+        gl.tex_parameter_i(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, filtering)
+        gl.color_4f(*tint.ratios)
+        gl.begin(GL_QUADS)
+
+        for u, v in ((0, 0), (1, 0), (1, 1), (0, 1)):
+            gl.tex_coord_2f(u, v)
+            gl.vertex_2f(x + u * width, y + v * height)
+
+        gl.end()
+        gl.disable(GL_TEXTURE_2D)
+
+    def delete(self) -> None:
+        """Release the GL texture."""
+
+        if self._id is not None:
+            # A GLuint array, passed without a conversion.
+            gl.delete_textures(np.array([self._id], dtype=np.uint32))
+            self._id = None
+            self._size = None
+
+    @classmethod
+    def _prepare(cls, data: np.ndarray) -> tuple[np.ndarray, int, int]:
+        """Get the pixels of an image as they are uploaded.
+
+        Args:
+            data: The image.
+
+        Returns:
+            tuple[np.ndarray, int, int]: The contiguous uint8 or float32
+                pixels, their GL format and their GL type.
+
+        Raises:
+            ValueError: If the array is not an image.
+        """
+
+        data = np.asarray(data)
+        channels: int = data.shape[2] if data.ndim == 3 else 1
+
+        if data.ndim not in (2, 3) or channels not in cls._FORMATS:
+            raise ValueError(f"Expected a (h, w[, 1|3|4]) image. {data.shape} given.")
+
+        if data.dtype != np.uint8 and data.dtype != np.float32:
+            data = data.astype(np.float32)
+
+        data = np.ascontiguousarray(data)
+        gl_type: int = GL_UNSIGNED_BYTE if data.dtype == np.uint8 else GL_FLOAT
+        return data, cls._FORMATS[channels], gl_type
+
+
+def colormap(*stops: Color | ByteInt, size: Optional[int] = 256) -> np.ndarray:
+    """Build a colormap going linearly through the given colors.
+
+    Args:
+        stops: The colors of the lowest to the highest values (at least 2).
+        size (Optional): The number of colors of the map. Default to 256.
+
+    Returns:
+        np.ndarray: The (size, 4) uint8 array of the RGBA colors.
+
+    Raises:
+        ValueError: If there is less than 2 colors.
+    """
+
+    if len(stops) < 2:
+        raise ValueError(f"Expected at least 2 colors. {len(stops)} given.")
+
+    values: np.ndarray = np.array(
+        [
+            Color.from_unit(stop).values if isinstance(stop, int) else stop.values
+            for stop in stops
+        ],
+        dtype=float,
+    )
+    positions: np.ndarray = np.linspace(0.0, 1.0, len(stops))
+    samples: np.ndarray = np.linspace(0.0, 1.0, size)
+    return (
+        np.stack(
+            [np.interp(samples, positions, values[:, i]) for i in range(4)], axis=1
+        )
+        .round()
+        .astype(np.uint8)
+    )
+
+
+# Define a black, red, yellow and white colormap.
+HEAT: Final[np.ndarray] = colormap(
+    Color(0, 0, 0), Color(255, 0, 0), Color(255, 255, 0), Color(255, 255, 255)
+)
+
+
+class Heatmap:
+    """A 2D scalar field (e.g. a temperature grid) drawn as a single quad.
+
+    The values are turned into colors through a colormap (a lookup table
+    indexed by the quantized values) and uploaded into a texture. The
+    uploaded values are kept: an update only recolors and uploads the
+    bounding box of the changed values, and nothing when none changed.
+
+    As for the textures, the grid is indexed as [y, x], its first row
+    being drawn at the bottom of the quad.
+
+    Attributes:
+        colormap (Optional): The (n, 4) uint8 array of the RGBA colors from
+            the lowest to the highest value. Default to HEAT.
+        value_range (Optional): The (min, max) values mapped to the first
+            and the last colors. Default to None (fitted to the values, and
+            only grown afterward).
+        texture: The texture of the colored values.
+    """
+
+    def __init__(
+        self,
+        values: Optional[np.ndarray] = None,
+        *,
+        colormap: Optional[np.ndarray] = HEAT,
+        value_range: Optional[tuple[float, float]] = None,
+        smooth: Optional[bool] = False,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            values (Optional): The first (h, w) values to upload.
+                Default to None.
+            colormap (Optional): The (n, 4) uint8 array of the RGBA colors
+                from the lowest to the highest value. Default to HEAT.
+            value_range (Optional): The (min, max) values mapped to the
+                first and the last colors. Default to None (fitted to the
+                first values, then grown to hold the new ones).
+            smooth (Optional): Interpolate the colors when the heatmap is
+                scaled. Default to False.
+        """
+
+        self.colormap: np.ndarray = colormap
+        self.value_range: tuple[float, float] | None = value_range
+        self.texture: Texture = Texture(smooth=smooth)
+        self._values: np.ndarray | None = None
+        # The range and the colormap the uploaded colors were computed with.
+        self._range: tuple[float, float] | None = None
+        self._colormap: np.ndarray | None = None
+
+        if values is not None:
+            self.update(values)
+
+    @property
+    def shape(self) -> tuple[int, int] | None:
+        """Get the size of the uploaded grid.
+
+        Returns:
+            tuple[int, int] | None: The (height, width) of the grid or None
+                if nothing was uploaded yet.
+        """
+
+        return self.texture.shape
+
+    def update(self, values: np.ndarray) -> None:
+        """Upload new values.
+
+        Everything is uploaded on the first update, or when the size of the
+        grid, the range of the values or the colormap changed. Otherwise,
+        only the bounding box of the changed values is.
+
+        Without a value_range, the fitted range only grows: the values that
+        stay in it keep the partial uploads, and it is fitted again only for
+        a grid of another size.
+
+        Args:
+            values: The (h, w) array of values.
+
+        Raises:
+            ValueError: If the array is not a 2D grid.
+        """
+
+        values = np.asarray(values, dtype=float)
+
+        if values.ndim != 2:
+            raise ValueError(f"Expected a (h, w) grid. {values.shape} given.")
+
+        value_range: tuple[float, float] = self.value_range or (
+            float(values.min()),
+            float(values.max()),
+        )
+
+        if (
+            self.value_range is None
+            and self._values is not None
+            and values.shape == self._values.shape
+        ):
+            low, high = self._range
+            value_range = (min(value_range[0], low), max(value_range[1], high))
+
+        if (
+            self._values is None
+            or values.shape != self._values.shape
+            or value_range != self._range
+            or self.colormap is not self._colormap
+        ):
+            self._range = value_range
+            self._colormap = self.colormap
+            self._values = values.copy()
+            self.texture.update(self._colors(values))
+            return
+
+        changed: np.ndarray = values != self._values
+        rows: np.ndarray = np.flatnonzero(changed.any(axis=1))
+
+        if rows.size:
+            cols: np.ndarray = np.flatnonzero(
+                changed[rows[0] : rows[-1] + 1].any(axis=0)
+            )
+            self.update_region(
+                values[rows[0] : rows[-1] + 1, cols[0] : cols[-1] + 1],
+                int(cols[0]),
+                int(rows[0]),
+            )
+
+    def update_region(self, values: np.ndarray, x: int, y: int) -> None:
+        """Upload the values of a region of the grid.
+
+        The region is colored with the range of the last whole upload, so it
+        fits the solvers that know which cells they touched.
+
+        Args:
+            values: The (h, w) array of the values of the region.
+            x: The column of the first value of the region.
+            y: The row of the first value of the region.
+
+        Raises:
+            RuntimeError: If no values were uploaded.
+            ValueError: If the region overflows the grid.
+        """
+
+        if self._values is None:
+            raise RuntimeError("No values were uploaded to the heatmap.")
+
+        values = np.asarray(values, dtype=float)
+        self.texture.update_region(self._colors(values), x, y)
+        self._values[y : y + values.shape[0], x : x + values.shape[1]] = values
+
+    def draw(
+        self,
+        x: PIndex,
+        y: PIndex,
+        width: PIndex,
+        height: PIndex,
+        *,
+        tint: Optional[Color | ByteInt] = 255,
+    ) -> None:
+        """Draw the heatmap.
+
+        Args:
+            x: The x-axis of the bottom left corner.
+            y: The y-axis of the bottom left corner.
+            width: The width of the quad.
+            height: The height of the quad.
+            tint (Optional): The color multiplied with the colors.
+                Default to 255.
+
+        Raises:
+            RuntimeError: If no values were uploaded.
+        """
+
+        self.texture.draw(x, y, width, height, tint=tint)
+
+    def delete(self) -> None:
+        """Release the texture."""
+
+        self.texture.delete()
+        self._values = None
+
+    def _colors(self, values: np.ndarray) -> np.ndarray:
+        """Map values to the colormap.
+
+        Args:
+            values: The (h, w) array of values.
+
+        Returns:
+            np.ndarray: The (h, w, 4) uint8 array of the colors.
+        """
+
+        low, high = self._range
+        last: int = len(self._colormap) - 1
+        scale: float = last / (high - low) if high > low else 0.0
+        indices: np.ndarray = np.clip((values - low) * scale, 0, last)
+        return self._colormap[np.nan_to_num(indices).astype(np.intp)]
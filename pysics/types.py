@@ -1,6 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Callable, TypeAlias
+from typing import Any, Callable, Protocol, TypeAlias, runtime_checkable
+import numpy as np
+from numpy.typing import NDArray
 
 Ratio: TypeAlias = float  # Define a ratio between 0 to 1.
 DrawCallback: TypeAlias = Callable[..., None]
@@ -8,6 +10,10 @@ PIndex: TypeAlias = int  # Define a pixel axial coordinate.
 Vertex: TypeAlias = tuple[PIndex, PIndex]  # Define a (x, y) coordinate.
 Timestamp: TypeAlias = float
 Duration: TypeAlias = float
+PointArray: TypeAlias = NDArray[np.floating]  # Define a (n, 2) array of points.
+ScalarArray: TypeAlias = NDArray[np.floating]  # Define a (n,) array of values.
+IndexArray: TypeAlias = NDArray[np.intp]  # Define a (n,) array of indices.
+State: TypeAlias = dict[str, Any]  # Define nested values and arrays to snapshot.
 
 
 class ByteInt(int):
@@ -77,3 +83,30 @@ class Color:
         """
 
         return cls(*[value] * 3)
+
+
+@runtime_checkable
+class Stateful(Protocol):
+    """An object whose state can be saved in a snapshot and restored.
+
+    The arrays of a state are not copied: get_state() may return views of the
+    live arrays and set_state() adopts the given arrays as they are.
+    """
+
+    def get_state(self) -> State:
+        """Get the state of the object.
+
+        Returns:
+            State: The nested JSON values and NumPy arrays of the state.
+        """
+
+        ...
+
+    def set_state(self, state: State) -> None:
+        """Restore the state of the object.
+
+        Args:
+            state: A state previously returned by get_state().
+        """
+
+        ...
@@ -0,0 +1,449 @@
+import json
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from math import floor, pi
+from typing import Any, Final, Iterator, Optional
+import numpy as np
+from pysics.batches import BaseBatch
+from pysics.spatial import Box
+from pysics.types import ByteInt, Color
+from pysics._wrappers import gl, GL_TRIANGLES
+
+_MAGIC: Final[bytes] = b"PYSW"
+_VERSION: Final[int] = 1
+_HEADER: Final[struct.Struct] = struct.Struct("<4sII")
+_ALIGN: Final[int] = 64
+Chunk = tuple[int, int]  # Define the (column, row) of a chunk.
+
+
+def _aligned(size: int) -> int:
+    """Round a size up to the alignment of the arrays.
+
+    Args:
+        size: The size in bytes.
+
+    Returns:
+        int: The aligned size.
+    """
+
+    return -(-size // _ALIGN) * _ALIGN
+
+
+def _group(centers: np.ndarray, chunk_size: float) -> tuple[np.ndarray, dict]:
+    """Sort obstacles by chunk.
+
+    Args:
+        centers: The (n, 2) array of the obstacle centers.
+        chunk_size: The size of the chunks.
+
+    Returns:
+        tuple[np.ndarray, dict]: The permutation that sorts the obstacles, and
+            the first sorted obstacle and the count of each chunk.
+    """
+
+    keys: np.ndarray = np.floor(centers / chunk_size).astype(np.int64)
+    order: np.ndarray = np.lexsort((keys[:, 1], keys[:, 0]))
+
+    if not len(order):
+        return order, {}
+
+    keys = keys[order]
+    starts: np.ndarray = np.flatnonzero(
+        np.concatenate([[True], (keys[1:] != keys[:-1]).any(axis=1)])
+    )
+    counts: np.ndarray = np.diff(np.append(starts, len(keys)))
+    return order, {
+        (int(cx), int(cy)): (int(start), int(count))
+        for (cx, cy), start, count in zip(keys[starts], starts, counts)
+    }
+
+
+def write_world(
+    path: str | os.PathLike,
+    chunk_size: float,
+    *,
+    circles: Optional[np.ndarray] = None,
+    rects: Optional[np.ndarray] = None,
+) -> int:
+    """Write static obstacles into a chunked world file.
+
+    The obstacles are bucketed into square chunks by their center and stored
+    as float32 arrays sorted by chunk, so a WorldStore maps the file and only
+    reads the chunks near the view.
+
+    Args:
+        path: The path of the file.
+        chunk_size: The size of the chunks, in world units.
+        circles (Optional): The (n, 3) array of the (x, y, radius) of the
+            circles. Default to None.
+        rects (Optional): The (n, 4) array of the (x, y, width, height) of the
+            rectangles. Default to None.
+
+    Returns:
+        int: The number of chunks.
+
+    Raises:
+        ValueError: If the chunk size is not positive or an array is malformed.
+    """
+
+    if chunk_size <= 0:
+        raise ValueError(f"Expected a positive chunk size. {chunk_size} given.")
+
+    circles = np.zeros((0, 3)) if circles is None else np.asarray(circles)
+    rects = np.zeros((0, 4)) if rects is None else np.asarray(rects)
+
+    if circles.ndim != 2 or circles.shape[1] != 3:
+        raise ValueError(f"Expected (n, 3) circles. {circles.shape} given.")
+    if rects.ndim != 2 or rects.shape[1] != 4:
+        raise ValueError(f"Expected (n, 4) rectangles. {rects.shape} given.")
+
+    circles = circles.astype(np.float32)
+    rects = rects.astype(np.float32)
+    circle_order, circle_chunks = _group(circles[:, :2], chunk_size)
+    rect_order, rect_chunks = _group(rects[:, :2] + rects[:, 2:] / 2, chunk_size)
+    # How far an obstacle reaches out of the chunk holding its center.
+    reach: float = float(
+        max(
+            np.abs(circles[:, 2]).max(initial=0.0),
+            np.abs(rects[:, 2:] / 2).max(initial=0.0),
+        )
+    )
+    chunks: list[list[int]] = [
+        [
+            *chunk,
+            *circle_chunks.get(chunk, (0, 0)),
+            *rect_chunks.get(chunk, (0, 0)),
+        ]
+        for chunk in sorted(circle_chunks.keys() | rect_chunks.keys())
+    ]
+    header: dict[str, Any] = dict(
+        chunk_size=chunk_size,
+        reach=reach,
+        circles=len(circles),
+        rects=len(rects),
+        chunks=chunks,
+    )
+    encoded: bytes = json.dumps(header, separators=(",", ":")).encode()
+
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, len(encoded)))
+        file.write(encoded)
+
+        for array in (circles[circle_order], rects[rect_order]):
+            file.write(b"\0" * (_aligned(file.tell()) - file.tell()))
+            file.write(np.ascontiguousarray(array).tobytes())
+
+    return len(chunks)
+
+
+class WorldChunk:
+    """A chunk loaded in memory.
+
+    Attributes:
+        circles: The (n, 3) array of the circles.
+        rects: The (n, 4) array of the rectangles.
+        vertices: The (n, 2) array of the triangles filling the obstacles.
+        nbytes: The memory used by the arrays.
+    """
+
+    def __init__(
+        self, circles: np.ndarray, rects: np.ndarray, unit: np.ndarray
+    ) -> None:
+        """The constructor.
+
+        Args:
+            circles: The (n, 3) array of the circles.
+            rects: The (n, 4) array of the rectangles.
+            unit: The (segments + 1, 2) closed unit circle.
+        """
+
+        segments: int = len(unit) - 1
+        # A fan of triangles from the center of each circle.
+        fans: np.ndarray = np.empty((len(circles), segments, 3, 2), dtype=np.float32)
+        fans[:, :, 0] = circles[:, None, :2]
+        fans[:, :, 1] = circles[:, None, :2] + unit[None, :-1] * circles[:, None, 2:]
+        fans[:, :, 2] = circles[:, None, :2] + unit[None, 1:] * circles[:, None, 2:]
+        # Two triangles per rectangle.
+        corners: np.ndarray = np.array(
+            [[0, 0], [1, 0], [1, 1], [0, 0], [1, 1], [0, 1]], dtype=np.float32
+        )
+        quads: np.ndarray = rects[:, None, :2] + corners * rects[:, None, 2:]
+        self.circles: np.ndarray = circles
+        self.rects: np.ndarray = rects
+        self.vertices: np.ndarray = np.concatenate(
+            [fans.reshape(-1, 2), quads.reshape(-1, 2)]
+        )
+        self.nbytes: int = circles.nbytes + rects.nbytes + self.vertices.nbytes
+
+
+class WorldStore:
+    """A world of static obstacles far larger than the memory, read by chunks.
+
+    The obstacles of a file written by write_world() are mapped, not read:
+    update() loads the chunks around the view (as arrays and ready-to-draw
+    triangles, never as shapes) and evicts the least recently used ones
+    when the resident chunks exceed the memory budget. draw() submits the
+    resident chunks in the view, one call per chunk.
+
+    Attributes:
+        chunk_size: The size of the chunks, in world units.
+        budget (Optional): The memory allowed to the resident chunks, in
+            bytes. The chunks in the view are kept even over the budget.
+            Default to 64 MiB.
+        margin (Optional): The distance around the view where the chunks are
+            loaded ahead. Default to 0.0.
+        fill (Optional): The color of the obstacles. Default to 255.
+        loads: The number of chunk loads.
+        evictions: The number of evicted chunks.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        *,
+        budget: Optional[int] = 64 << 20,
+        margin: Optional[float] = 0.0,
+        segments: Optional[int] = 16,
+        fill: Optional[Color | ByteInt] = 255,
+    ) -> None:
+        """The constructor.
+
+        Args:
+            path: The path of the world file.
+            budget (Optional): The memory allowed to the resident chunks, in
+                bytes. Default to 64 MiB.
+            margin (Optional): The distance around the view where the chunks
+                are loaded ahead. Default to 0.0.
+            segments (Optional): The number of segments of the circles.
+                Default to 16.
+            fill (Optional): The color of the obstacles. Default to 255.
+
+        Raises:
+            ValueError: If the file is not a world.
+        """
+
+        with open(path, "rb") as file:
+            self._buffer: mmap.mmap = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        magic, version, size = _HEADER.unpack_from(
+            self._buffer.read(_HEADER.size).ljust(_HEADER.size, b"\0")
+        )
+
+        if magic != _MAGIC or version != _VERSION:
+            self._buffer.close()
+            raise ValueError(f"{path} is not a world (version {_VERSION}).")
+
+        header: dict[str, Any] = json.loads(
+            self._buffer[_HEADER.size : _HEADER.size + size]
+        )
+        self.chunk_size: float = header["chunk_size"]
+        self.budget: int = budget
+        self.margin: float = margin
+        self.fill: Color = Color.from_unit(fill) if isinstance(fill, int) else fill
+        self.loads: int = 0
+        self.evictions: int = 0
+        self._reach: float = header["reach"]
+        # The first circle, circle count, first rectangle and rectangle
+        # count of each chunk.
+        self._chunks: dict[Chunk, tuple[int, int, int, int]] = {
+            (cx, cy): tuple(ranges) for cx, cy, *ranges in header["chunks"]
+        }
+        self._circles: int = _aligned(_HEADER.size + size)
+        self._rects: int = _aligned(self._circles + header["circles"] * 3 * 4)
+        self._resident: OrderedDict[Chunk, WorldChunk] = OrderedDict()
+        self._nbytes: int = 0
+        angles: np.ndarray = np.linspace(0.0, 2 * pi, segments + 1)
+        self._unit: np.ndarray = np.stack(
+            [np.cos(angles), np.sin(angles)], axis=1
+        ).astype(np.float32)
+        self._unit[-1] = self._unit[0]
+
+    def __enter__(self) -> "WorldStore":
+        """Enter a context that closes the store.
+
+        Returns:
+            WorldStore: The store.
+        """
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the store when leaving the context."""
+
+        self.close()
+
+    def __len__(self) -> int:
+        """Get the number of chunks of the world.
+
+        Returns:
+            int: The number of chunks.
+        """
+
+        return len(self._chunks)
+
+    @property
+    def resident(self) -> list[Chunk]:
+        """Get the loaded chunks, from the least recently used.
+
+        Returns:
+            list[Chunk]: The (column, row) of the chunks.
+        """
+
+        return list(self._resident)
+
+    @property
+    def nbytes(self) -> int:
+        """Get the memory used by the loaded chunks.
+
+        Returns:
+            int: The size in bytes.
+        """
+
+        return self._nbytes
+
+    def update(self, view: Box) -> None:
+        """Load the chunks around the view and evict the unused ones.
+
+        Args:
+            view: The (left, bottom, right, top) world box of the view (e.g.
+                Camera.bounds()).
+        """
+
+        needed: list[Chunk] = list(self._near(view, self.margin))
+
+        for chunk in needed:
+            self.load(chunk)
+
+        kept: set[Chunk] = set(needed)
+
+        for chunk in list(self._resident):
+            if self._nbytes <= self.budget:
+                break
+            if chunk not in kept:
+                self._evict(chunk)
+
+    def load(self, chunk: Chunk) -> WorldChunk | None:
+        """Get a chunk, loading it if it is not resident.
+
+        Args:
+            chunk: The (column, row) of the chunk.
+
+        Returns:
+            WorldChunk | None: The chunk, or None if it holds no obstacle.
+        """
+
+        if chunk in self._resident:
+            self._resident.move_to_end(chunk)
+            return self._resident[chunk]
+        if chunk not in self._chunks:
+            return None
+
+        circle_start, circle_count, rect_start, rect_count = self._chunks[chunk]
+        resident: WorldChunk = WorldChunk(
+            self._read(self._circles, circle_start, circle_count, 3),
+            self._read(self._rects, rect_start, rect_count, 4),
+            self._unit,
+        )
+        self._resident[chunk] = resident
+        self._nbytes += resident.nbytes
+        self.loads += 1
+        return resident
+
+    def draw(self, view: Box) -> None:
+        """Draw the resident chunks in the view (nothing is loaded).
+
+        Args:
+            view: The (left, bottom, right, top) world box of the view.
+        """
+
+        chunks: list[WorldChunk] = [
+            self._resident[chunk]
+            for chunk in self._near(view, 0.0)
+            if chunk in self._resident
+        ]
+
+        if not chunks:
+            return
+
+        gl.color_4f(*self.fill.ratios)
+
+        for chunk in chunks:
+            BaseBatch._bind_arrays(chunk.vertices)
+            gl.draw_arrays(GL_TRIANGLES, 0, len(chunk.vertices))
+
+        BaseBatch._unbind_arrays()
+
+    def close(self) -> None:
+        """Drop the resident chunks and release the mapped file."""
+
+        self._resident.clear()
+        self._nbytes = 0
+        self._buffer.close()
+
+    def _near(self, view: Box, margin: float) -> Iterator[Chunk]:
+        """Iterate over the chunks of the world overlapping a view.
+
+        Args:
+            view: The (left, bottom, right, top) world box of the view.
+            margin: The distance added around the view.
+
+        Yields:
+            Chunk: The (column, row) of the chunks.
+        """
+
+        # The obstacles reach out of their chunk by up to the reach.
+        pad: float = margin + self._reach
+        left, bottom, right, top = view
+        x0: int = floor((left - pad) / self.chunk_size)
+        y0: int = floor((bottom - pad) / self.chunk_size)
+        x1: int = floor((right + pad) / self.chunk_size)
+        y1: int = floor((top + pad) / self.chunk_size)
+
+        # A view wider than the world only visits its chunks.
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._chunks):
+            for cx, cy in self._chunks:
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    yield cx, cy
+        else:
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    if (cx, cy) in self._chunks:
+                        yield cx, cy
+
+    def _read(self, base: int, start: int, count: int, width: int) -> np.ndarray:
+        """Copy obstacles out of the mapped file.
+
+        Args:
+            base: The offset of the obstacle array in the file.
+            start: The index of the first obstacle.
+            count: The number of obstacles.
+            width: The number of values per obstacle.
+
+        Returns:
+            np.ndarray: The (count, width) float32 array.
+        """
+
+        return (
+            np.frombuffer(
+                self._buffer,
+                dtype=np.float32,
+                count=count * width,
+                offset=base + start * width * 4,
+            )
+            .reshape(count, width)
+            .copy()
+        )
+
+    def _evict(self, chunk: Chunk) -> None:
+        """Unload a resident chunk.
+
+        Args:
+            chunk: The (column, row) of the chunk.
+        """
+
+        self._nbytes -= self._resident.pop(chunk).nbytes
+        self.evictions += 1
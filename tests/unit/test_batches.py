@@ -0,0 +1,661 @@
+from abc import ABC
+from typing import Any, Callable
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics.types import Color
+from pysics._wrappers import (
+    gl,
+    GL_COLOR_ARRAY,
+    GL_DOUBLE,
+    GL_FLOAT,
+    GL_LINES,
+    GL_LINE_STRIP,
+    GL_POINTS,
+    GL_POINT_SMOOTH,
+    GL_TRIANGLE_STRIP,
+    GL_UNSIGNED_INT,
+    GL_VERTEX_ARRAY,
+)
+from pysics.batches import (
+    BaseBatch,
+    Lines,
+    Outlines,
+    Plot,
+    Points,
+    Trail,
+    VectorField,
+    _SIZE_BUCKETS,
+    _as_gl_array,
+    _group_sizes,
+)
+
+
+@pytest.fixture
+def gl_mocks(mocker: MockerFixture) -> dict[str, MagicMock]:
+    names: list[str] = [
+        "color_4f",
+        "line_width",
+        "enable_client_state",
+        "disable_client_state",
+        "vertex_pointer",
+        "color_pointer",
+        "draw_arrays",
+        "draw_elements",
+        "multi_draw_arrays",
+        "point_size",
+        "enable",
+        "disable",
+    ]
+    return {name: mocker.patch.object(gl, name) for name in names}
+
+
+@pytest.mark.unit
+class TestAsGLArray:
+    @pytest.mark.parametrize(
+        "dtype, exp_type, copied",
+        [
+            (np.float32, GL_FLOAT, False),
+            (np.float64, GL_DOUBLE, False),
+            (np.int64, GL_FLOAT, True),
+        ],
+    )
+    def test_as_gl_array(self, dtype: type, exp_type: int, copied: bool) -> None:
+        array: np.ndarray = np.arange(8, dtype=dtype).reshape(4, 2)
+        result, gl_type = _as_gl_array(array, 2)
+        assert gl_type == exp_type
+        assert np.shares_memory(result, array) is not copied
+        assert result.tolist() == array.tolist()
+
+    def test_non_contiguous(self) -> None:
+        array: np.ndarray = np.arange(16, dtype=np.float32).reshape(4, 4)[:, :2]
+        result, _ = _as_gl_array(array, 2)
+        assert result.flags.c_contiguous
+        assert result.tolist() == array.tolist()
+
+
+@pytest.mark.unit
+class TestBaseBatch:
+    @pytest.fixture(autouse=True)
+    def setup(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(BaseBatch, "__abstractmethods__", set())
+
+    def test_inheritance(self) -> None:
+        assert issubclass(BaseBatch, ABC)
+
+    @pytest.mark.parametrize(
+        "kwargs, expected",
+        [
+            (
+                dict(),
+                dict(fill=(..., None), stroke=(..., None), stroke_weight=(..., 1.0)),
+            ),
+            (
+                dict(fill=255, stroke=Color(1, 2, 3), stroke_weight=2),
+                dict(
+                    fill=(..., Color.from_unit(255)),
+                    stroke=(..., Color(1, 2, 3)),
+                    stroke_weight=(float, 2.0),
+                ),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        kwargs: Any,
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        batch: BaseBatch = BaseBatch(**kwargs)
+        assert_getattr(batch, expected)
+
+    def test_bind_arrays(self, gl_mocks: dict[str, MagicMock]) -> None:
+        vertices: np.ndarray = np.zeros((3, 2))
+        colors: np.ndarray = np.ones((3, 4), dtype=np.float32)
+        BaseBatch._bind_arrays(vertices, colors)
+        BaseBatch._unbind_arrays(colors=True)
+        assert gl_mocks["vertex_pointer"].call_args.args[:3] == (2, GL_DOUBLE, 0)
+        assert gl_mocks["vertex_pointer"].call_args.args[3].base is vertices
+        assert gl_mocks["color_pointer"].call_args.args[:3] == (4, GL_FLOAT, 0)
+        assert gl_mocks["color_pointer"].call_args.args[3].base is colors
+        assert [c.args for c in gl_mocks["enable_client_state"].call_args_list] == [
+            (GL_VERTEX_ARRAY,),
+            (GL_COLOR_ARRAY,),
+        ]
+        assert [c.args for c in gl_mocks["disable_client_state"].call_args_list] == [
+            (GL_COLOR_ARRAY,),
+            (GL_VERTEX_ARRAY,),
+        ]
+
+
+@pytest.mark.unit
+class TestLines:
+    def test_inheritance(self) -> None:
+        assert issubclass(Lines, BaseBatch)
+
+    def test_render_pairs(self, gl_mocks: dict[str, MagicMock]) -> None:
+        segments: np.ndarray = np.zeros((5, 2, 2), dtype=np.float32)
+        shape: Lines = Lines(segments, stroke=100, stroke_weight=3)
+        gl_mocks["color_4f"].assert_called_once_with(*shape.stroke.ratios)
+        gl_mocks["line_width"].assert_called_once_with(3.0)
+        gl_mocks["draw_arrays"].assert_called_once_with(GL_LINES, 0, 10)
+        gl_mocks["draw_elements"].assert_not_called()
+        vertices: np.ndarray = gl_mocks["vertex_pointer"].call_args.args[3]
+        assert np.shares_memory(vertices, segments)
+
+    def test_render_indices(self, gl_mocks: dict[str, MagicMock]) -> None:
+        vertices: np.ndarray = np.zeros((4, 2))
+        Lines(vertices, np.array([[0, 1], [1, 2], [2, 3]]), stroke=255)
+        mode, count, gl_type, indices = gl_mocks["draw_elements"].call_args.args
+        assert (mode, count, gl_type) == (GL_LINES, 6, GL_UNSIGNED_INT)
+        assert indices.dtype == np.uint32
+        gl_mocks["draw_arrays"].assert_not_called()
+
+    def test_render_no_stroke(self, gl_mocks: dict[str, MagicMock]) -> None:
+        Lines(np.zeros((4, 2)))
+
+        for mock in gl_mocks.values():
+            mock.assert_not_called()
+
+
+@pytest.mark.unit
+class TestOutlines:
+    def test_inheritance(self) -> None:
+        assert issubclass(Outlines, BaseBatch)
+
+    def test_render(self, gl_mocks: dict[str, MagicMock]) -> None:
+        square: np.ndarray = np.array([[0, 0], [10, 0], [10, 10], [0, 10]])
+        shape: Outlines = Outlines(
+            [square, square + 20], stroke=100, stroke_weight=4, join="bevel"
+        )
+        gl_mocks["color_4f"].assert_called_once_with(*shape.stroke.ratios)
+        gl_mocks["line_width"].assert_not_called()
+        # Two strips of 4 corners of 2 pairs, closed, and linked by 2 vertices.
+        gl_mocks["draw_arrays"].assert_called_once_with(GL_TRIANGLE_STRIP, 0, 38)
+        vertices: np.ndarray = gl_mocks["vertex_pointer"].call_args.args[3]
+        assert vertices[:2].tolist() == [[2, 0], [-2, 0]]
+        assert vertices[17:20].tolist() == [[-2, 0], [-2, 0], [22, 20]]
+        gl_mocks["disable_client_state"].assert_called_once_with(GL_VERTEX_ARRAY)
+
+    def test_render_open(self, gl_mocks: dict[str, MagicMock]) -> None:
+        Outlines(np.zeros((3, 2, 2)) + [[0, 0], [5, 0]], closed=False, stroke=255)
+        gl_mocks["draw_arrays"].assert_called_once_with(GL_TRIANGLE_STRIP, 0, 28)
+
+    @pytest.mark.parametrize("stroke", [None, 255])
+    def test_render_nothing(
+        self, stroke: int | None, gl_mocks: dict[str, MagicMock]
+    ) -> None:
+        Outlines([np.zeros((3, 2))], stroke=stroke)
+
+        for mock in gl_mocks.values():
+            mock.assert_not_called()
+
+
+@pytest.mark.unit
+class TestPoints:
+    def test_inheritance(self) -> None:
+        assert issubclass(Points, BaseBatch)
+
+    def test_render(self, gl_mocks: dict[str, MagicMock]) -> None:
+        positions: np.ndarray = np.zeros((6, 2), dtype=np.float32)
+        shape: Points = Points(positions, stroke=100, stroke_weight=3)
+        gl_mocks["color_4f"].assert_called_once_with(*shape.stroke.ratios)
+        gl_mocks["point_size"].assert_called_once_with(3.0)
+        gl_mocks["draw_arrays"].assert_called_once_with(GL_POINTS, 0, 6)
+        gl_mocks["color_pointer"].assert_not_called()
+        gl_mocks["enable"].assert_not_called()
+        assert gl_mocks["vertex_pointer"].call_args.args[3].base is positions
+
+    def test_render_colors(self, gl_mocks: dict[str, MagicMock]) -> None:
+        positions: np.ndarray = np.zeros((3, 2), dtype=np.float32)
+        colors: np.ndarray = np.ones((3, 4), dtype=np.float32)
+        Points(positions, colors, smooth=True)
+        gl_mocks["color_4f"].assert_not_called()
+        assert gl_mocks["color_pointer"].call_args.args[3].base is colors
+        gl_mocks["enable"].assert_called_once_with(GL_POINT_SMOOTH)
+        gl_mocks["disable"].assert_called_once_with(GL_POINT_SMOOTH)
+        gl_mocks["draw_arrays"].assert_called_once_with(GL_POINTS, 0, 3)
+        gl_mocks["disable_client_state"].assert_any_call(GL_COLOR_ARRAY)
+
+    def test_render_sizes(self, gl_mocks: dict[str, MagicMock]) -> None:
+        positions: np.ndarray = np.zeros((5, 2))
+        Points(positions, sizes=np.array([2, 1, 2, 4, 1]), stroke=255)
+        assert [c.args for c in gl_mocks["point_size"].call_args_list] == [
+            (1.0,),
+            (2.0,),
+            (4.0,),
+        ]
+        calls: list = gl_mocks["draw_elements"].call_args_list
+        assert [c.args[:3] for c in calls] == [
+            (GL_POINTS, 2, GL_UNSIGNED_INT),
+            (GL_POINTS, 2, GL_UNSIGNED_INT),
+            (GL_POINTS, 1, GL_UNSIGNED_INT),
+        ]
+        assert [c.args[3].tolist() for c in calls] == [[1, 4], [0, 2], [3]]
+        gl_mocks["draw_arrays"].assert_not_called()
+
+    def test_render_continuous_sizes(self, gl_mocks: dict[str, MagicMock]) -> None:
+        sizes: np.ndarray = np.random.default_rng(0).uniform(0.2, 40.0, 10_000)
+        Points(np.zeros((10_000, 2)), sizes=sizes, stroke=255)
+        drawn: list[float] = [c.args[0] for c in gl_mocks["point_size"].call_args_list]
+        assert len(drawn) == _SIZE_BUCKETS
+        assert drawn == sorted(drawn)
+        assert all(size == round(size) for size in drawn)
+        assert (drawn[0], drawn[-1]) == (1.0, 40.0)
+        # Every point is drawn once, with a size close to its own.
+        calls: list = gl_mocks["draw_elements"].call_args_list
+        order: np.ndarray = np.concatenate([c.args[3] for c in calls])
+        assert np.array_equal(np.sort(order), np.arange(10_000))
+        quantized: np.ndarray = np.repeat(drawn, [c.args[1] for c in calls])
+        assert np.abs(quantized - np.maximum(sizes[order], 1)).max() < 2.0
+
+    def test_group_sizes_cache(self) -> None:
+        sizes: np.ndarray = np.array([3.0, 1.2, 2.9])
+        groups: tuple[np.ndarray, ...] = _group_sizes(sizes)
+        assert groups[0].tolist() == [1.0, 3.0]
+        assert groups[1].tolist() == [0, 1, 3]
+        assert groups[2].tolist() == [1, 0, 2]
+        assert _group_sizes(sizes.copy()) is groups
+        assert _group_sizes(np.array([]))[0].size == 0
+
+        for size in range(10):
+            _group_sizes(np.full(2, size))
+
+        assert _group_sizes(sizes) is not groups
+
+    def test_render_single_size(self, gl_mocks: dict[str, MagicMock]) -> None:
+        Points(np.zeros((3, 2)), sizes=np.full(3, 5.0), stroke=255)
+        gl_mocks["point_size"].assert_called_once_with(5.0)
+        gl_mocks["draw_arrays"].assert_called_once_with(GL_POINTS, 0, 3)
+        gl_mocks["draw_elements"].assert_not_called()
+
+    def test_render_no_stroke(self, gl_mocks: dict[str, MagicMock]) -> None:
+        Points(np.zeros((4, 2)))
+
+        for mock in gl_mocks.values():
+            mock.assert_not_called()
+
+
+@pytest.mark.unit
+class TestVectorField:
+    def test_inheritance(self) -> None:
+        assert issubclass(VectorField, BaseBatch)
+
+    def test_render(self, gl_mocks: dict[str, MagicMock]) -> None:
+        positions: np.ndarray = np.array([[0.0, 0.0], [10.0, 5.0], [3.0, 3.0]])
+        vectors: np.ndarray = np.array([[2.0, 0.0], [0.0, -4.0], [0.0, 0.0]])
+        field: VectorField = VectorField(
+            positions, vectors, scale=5.0, head=0.5, stroke=255, stroke_weight=2
+        )
+        gl_mocks["color_4f"].assert_called_once_with(*field.stroke.ratios)
+        gl_mocks["line_width"].assert_called_once_with(2.0)
+        gl_mocks["draw_arrays"].assert_called_once_with(GL_LINES, 0, 18)
+        gl_mocks["color_pointer"].assert_not_called()
+        vertices: np.ndarray = gl_mocks["vertex_pointer"].call_args.args[3]
+        assert vertices.reshape(3, 6, 2).tolist() == [
+            [[0, 0], [10, 0], [10, 0], [5, 2.5], [10, 0], [5, -2.5]],
+            [[10, 5], [10, -15], [10, -15], [15, -5], [10, -15], [5, -5]],
+            [[3, 3]] * 6,
+        ]
+        assert field.shown.tolist() == [0, 1, 2]
+
+    def test_render_grid(self, gl_mocks: dict[str, MagicMock]) -> None:
+        positions: np.ndarray = np.stack(
+            np.meshgrid(np.arange(4.0), np.arange(3.0)), axis=-1
+        )
+        VectorField(positions, np.ones((3, 4, 2)), max_length=1.0, stroke=255)
+        gl_mocks["draw_arrays"].assert_called_once_with(GL_LINES, 0, 72)
+        vertices: np.ndarray = gl_mocks["vertex_pointer"].call_args.args[3]
+        shafts: np.ndarray = vertices.reshape(12, 6, 2)[:, 1] - positions.reshape(-1, 2)
+        assert np.hypot(shafts[:, 0], shafts[:, 1]) == pytest.approx(np.ones(12))
+
+    def test_render_gradient(self, gl_mocks: dict[str, MagicMock]) -> None:
+        vectors: np.ndarray = np.array([[1.0, 0.0], [3.0, 0.0], [0.0, 5.0]])
+        VectorField(np.zeros((3, 2)), vectors, gradient=(0, Color(255, 0, 0, 255)))
+        gl_mocks["color_4f"].assert_not_called()
+        colors: np.ndarray = gl_mocks["color_pointer"].call_args.args[3]
+        assert colors.shape == (18, 4)
+        assert colors[::6] == pytest.approx(
+            np.array([[0, 0, 0, 1], [0.5, 0, 0, 1], [1, 0, 0, 1]])
+        )
+        assert (colors[:6] == colors[0]).all()
+        gl_mocks["disable_client_state"].assert_any_call(GL_COLOR_ARRAY)
+
+    @pytest.mark.parametrize(
+        "magnitude_range, expected",
+        [((0.0, 10.0), [0.2, 0.2]), ((5.0, 5.0), [0.0, 0.0]), (None, [0.0, 0.0])],
+    )
+    def test_render_magnitude_range(
+        self,
+        magnitude_range: tuple[float, float] | None,
+        expected: list[float],
+        gl_mocks: dict[str, MagicMock],
+    ) -> None:
+        VectorField(
+            np.zeros((2, 2)),
+            np.full((2, 2), [0.0, 2.0]),
+            gradient=(0, 255),
+            magnitude_range=magnitude_range,
+        )
+        colors: np.ndarray = gl_mocks["color_pointer"].call_args.args[3]
+        assert colors[::6, 0] == pytest.approx(expected)
+
+    def test_thin(self, gl_mocks: dict[str, MagicMock]) -> None:
+        positions: np.ndarray = np.array(
+            [[0.5, 0.5], [0.6, 0.9], [-0.5, 0.2], [1.5, 0.5], [0.2, 0.1], [1.1, 1.1]]
+        )
+        field: VectorField = VectorField(
+            positions, np.ones((6, 2)), spacing=1.0, stroke=255
+        )
+        assert field.shown.tolist() == [0, 2, 3, 5]
+        gl_mocks["draw_arrays"].assert_called_once_with(GL_LINES, 0, 24)
+
+    @pytest.mark.parametrize("zoom, expected", [(1.0, 4), (0.5, 1), (5.0, 100)])
+    def test_thin_zoom(
+        self,
+        zoom: float,
+        expected: int,
+        gl_mocks: dict[str, MagicMock],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        # A 10x10 grid with a unit step, thinned every 5 screen pixels.
+        monkeypatch.setattr(VectorField, "zoom", zoom)
+        positions: np.ndarray = np.stack(np.mgrid[0:10, 0:10], axis=-1) + 0.5
+        field: VectorField = VectorField(
+            positions, np.ones((10, 10, 2)), spacing=5.0, max_glyphs=100, stroke=255
+        )
+        assert field.shown.size == expected
+
+    @pytest.mark.parametrize(
+        "count, max_glyphs, expected", [(10, 4, [0, 3, 6, 9]), (6, 3, [0, 2, 4])]
+    )
+    def test_max_glyphs(
+        self,
+        count: int,
+        max_glyphs: int,
+        expected: list[int],
+        gl_mocks: dict[str, MagicMock],
+    ) -> None:
+        field: VectorField = VectorField(
+            np.zeros((count, 2)), np.ones((count, 2)), max_glyphs=max_glyphs, stroke=255
+        )
+        assert field.shown.tolist() == expected
+
+    def test_render_no_stroke(self, gl_mocks: dict[str, MagicMock]) -> None:
+        VectorField(np.zeros((4, 2)), np.ones((4, 2)))
+
+        for mock in gl_mocks.values():
+            mock.assert_not_called()
+
+    def test_render_empty(self, gl_mocks: dict[str, MagicMock]) -> None:
+        field: VectorField = VectorField(
+            np.empty((0, 2)), np.empty((0, 2)), spacing=1.0, stroke=255
+        )
+        assert field.shown.size == 0
+        gl_mocks["draw_arrays"].assert_not_called()
+
+
+@pytest.mark.unit
+class TestTrail:
+    @pytest.mark.parametrize(
+        "args, kwargs, expected",
+        [
+            (
+                (3,),
+                dict(),
+                dict(
+                    capacity=(int, 3),
+                    count=(int, 1),
+                    stroke=(..., None),
+                    stroke_weight=(float, 1.0),
+                    fade=(bool, True),
+                ),
+            ),
+            (
+                (4, 2),
+                dict(stroke=255, stroke_weight=2, fade=False),
+                dict(
+                    count=(int, 2),
+                    stroke=(Color, Color.from_unit(255)),
+                    stroke_weight=(float, 2.0),
+                    fade=(bool, False),
+                ),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        args: Any,
+        kwargs: dict[str, Any],
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        trail: Trail = Trail(*args, **kwargs)
+        assert_getattr(trail, expected)
+        assert len(trail) == 0
+        assert trail.points.shape == (trail.count, 0, 2)
+
+    @pytest.mark.parametrize("args", [(1,), (3, 0)])
+    def test_init_errors(self, args: tuple[int, ...]) -> None:
+        with pytest.raises(ValueError):
+            Trail(*args)
+
+    def test_append(self) -> None:
+        trail: Trail = Trail(3, 2)
+        trail.append([[0, 0], [0, 1]])
+        trail.append([[1, 0], [1, 1]])
+        assert len(trail) == 2
+        assert trail.points.tolist() == [[[0, 0], [1, 0]], [[0, 1], [1, 1]]]
+
+        for i in range(2, 5):
+            trail.append([[i, 0], [i, 1]])
+
+        # Only the last positions are kept, still in order and without copy.
+        assert len(trail) == 3
+        assert trail.points.tolist() == [
+            [[2, 0], [3, 0], [4, 0]],
+            [[2, 1], [3, 1], [4, 1]],
+        ]
+        assert np.shares_memory(trail.points, trail._vertices)
+
+        trail.clear()
+        assert len(trail) == 0
+        trail.append([[5, 0], [5, 1]])
+        assert trail.points.tolist() == [[[5, 0]], [[5, 1]]]
+
+    def test_append_single(self) -> None:
+        trail: Trail = Trail(2)
+        trail.append((1, 2))
+        assert trail.points.tolist() == [[[1, 2]]]
+
+    def test_draw(self, gl_mocks: dict[str, MagicMock]) -> None:
+        trail: Trail = Trail(3, 2, stroke=Color(255, 0, 0), stroke_weight=2)
+        trail.append([[0, 0], [0, 1]])
+        trail.draw()
+        gl_mocks["multi_draw_arrays"].assert_not_called()
+
+        for i in range(1, 5):
+            trail.append([[i, 0], [i, 1]])
+
+        trail.draw()
+        gl_mocks["line_width"].assert_called_once_with(2.0)
+        gl_mocks["color_4f"].assert_not_called()
+        mode, first, counts, count = gl_mocks["multi_draw_arrays"].call_args.args
+        assert (mode, count) == (GL_LINE_STRIP, 2)
+        assert counts.tolist() == [3, 3]
+        vertices: np.ndarray = gl_mocks["vertex_pointer"].call_args.args[3]
+        colors: np.ndarray = gl_mocks["color_pointer"].call_args.args[3]
+        assert np.shares_memory(vertices, trail._vertices)
+
+        # Each strip is the trail, from the oldest to the newest position,
+        # faded by the age of the positions.
+        for k, start in enumerate(first):
+            strip: np.ndarray = vertices[start : start + 3]
+            assert strip.tolist() == trail.points[k].tolist()
+            assert colors[start : start + 3, 3].tolist() == pytest.approx(
+                [1 / 3, 2 / 3, 1]
+            )
+            assert colors[start : start + 3, :3].tolist() == [[1, 0, 0]] * 3
+
+    def test_draw_ramp_cache(self, gl_mocks: dict[str, MagicMock]) -> None:
+        trail: Trail = Trail(2, stroke=255)
+        trail.append((0, 0))
+        trail.append((1, 1))
+        trail.draw()
+        ramp: np.ndarray = trail._colors
+        trail.draw()
+        assert trail._colors is ramp
+        trail.stroke = Color(0, 0, 255)
+        trail.draw()
+        assert trail._colors is not ramp
+
+    def test_draw_no_fade(self, gl_mocks: dict[str, MagicMock]) -> None:
+        trail: Trail = Trail(2, stroke=255, fade=False)
+        trail.append((0, 0))
+        trail.append((1, 1))
+        trail.draw()
+        gl_mocks["color_4f"].assert_called_once_with(*trail.stroke.ratios)
+        gl_mocks["color_pointer"].assert_not_called()
+        gl_mocks["multi_draw_arrays"].assert_called_once()
+
+    def test_draw_no_stroke(self, gl_mocks: dict[str, MagicMock]) -> None:
+        trail: Trail = Trail(2)
+        trail.append((0, 0))
+        trail.append((1, 1))
+        trail.draw()
+
+        for mock in gl_mocks.values():
+            mock.assert_not_called()
+
+
+@pytest.mark.unit
+class TestPlot:
+    @pytest.mark.parametrize(
+        "kwargs, expected",
+        [
+            (
+                dict(),
+                dict(
+                    capacity=(int, 100_000),
+                    y_range=(..., None),
+                    stroke=(..., None),
+                    stroke_weight=(float, 1.0),
+                    _bucket=(int, 1000),
+                ),
+            ),
+            (
+                dict(capacity=250, y_range=(-1, 1), stroke=255, stroke_weight=2),
+                dict(
+                    capacity=(int, 250),
+                    y_range=(tuple, (-1, 1)),
+                    stroke=(Color, Color.from_unit(255)),
+                    stroke_weight=(float, 2.0),
+                    _bucket=(int, 3),
+                ),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        kwargs: dict[str, Any],
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        plot: Plot = Plot(10, 20, 100, 50, **kwargs)
+        assert_getattr(
+            plot, dict(x=(int, 10), y=(int, 20), width=(int, 100), height=(int, 50))
+        )
+        assert_getattr(plot, expected)
+        assert len(plot) == 0
+
+    @pytest.mark.parametrize("width, capacity", [(0, 10), (10, 0)])
+    def test_init_errors(self, width: int, capacity: int) -> None:
+        with pytest.raises(ValueError):
+            Plot(0, 0, width, 10, capacity=capacity)
+
+    def test_append(self) -> None:
+        plot: Plot = Plot(0, 0, 4, 10, capacity=8)
+        plot.append(1.0)
+        plot.append([2.0, 3.0])
+        plot.append([])
+        assert len(plot) == 3
+        assert plot.samples.tolist() == [1, 2, 3]
+
+        plot.append(np.arange(4, 11))
+        assert len(plot) == 8
+        assert plot.samples.tolist() == [3, 4, 5, 6, 7, 8, 9, 10]
+
+        # More samples than the capacity: only the last ones are kept.
+        plot.append(np.arange(11, 31))
+        assert plot.samples.tolist() == list(range(23, 31))
+        assert plot._mins[(np.arange(11, 15) % 5)].tolist() == [23, 25, 27, 29]
+        assert plot._maxs[(np.arange(11, 15) % 5)].tolist() == [24, 26, 28, 30]
+
+        plot.clear()
+        assert len(plot) == 0
+        plot.append(5.0)
+        assert plot.samples.tolist() == [5]
+
+    def test_buckets(self) -> None:
+        rng: np.random.Generator = np.random.default_rng(0)
+        plot: Plot = Plot(0, 0, 16, 10, capacity=100)
+        history: np.ndarray = rng.normal(size=1000)
+        bounds: np.ndarray = np.sort(rng.choice(np.arange(1, 1000), 80, False))
+
+        for chunk in np.split(history, bounds):
+            plot.append(chunk)
+
+        # The buckets updated along the samples match the whole history.
+        last: int = (len(history) - 1) // plot._bucket
+
+        for bucket in range(last - plot.width + 1, last + 1):
+            values: np.ndarray = history[bucket * 7 : (bucket + 1) * 7]
+            slot: int = bucket % len(plot._mins)
+            assert plot._mins[slot] == values.min()
+            assert plot._maxs[slot] == values.max()
+
+    def test_draw(self, gl_mocks: dict[str, MagicMock]) -> None:
+        plot: Plot = Plot(10, 20, 3, 100, capacity=6, stroke=255, stroke_weight=2)
+        plot.draw()
+        gl_mocks["draw_arrays"].assert_not_called()
+
+        plot.append([0, 1, 4, 2])
+        plot.draw()
+        gl_mocks["color_4f"].assert_called_once_with(*plot.stroke.ratios)
+        gl_mocks["line_width"].assert_called_once_with(2.0)
+        gl_mocks["draw_arrays"].assert_called_once_with(GL_LINE_STRIP, 0, 4)
+        vertices: np.ndarray = gl_mocks["vertex_pointer"].call_args.args[3]
+        assert vertices.tolist() == [[10.5, 20], [10.5, 45], [11.5, 70], [11.5, 120]]
+
+        # The oldest buckets scroll out of the plot.
+        plot.append([3, 3, 8, 9])
+        plot.draw()
+        gl_mocks["draw_arrays"].assert_called_with(GL_LINE_STRIP, 0, 6)
+        vertices = gl_mocks["vertex_pointer"].call_args.args[3]
+        assert vertices[:, 0].tolist() == [10.5, 10.5, 11.5, 11.5, 12.5, 12.5]
+        assert vertices[:, 1].tolist() == pytest.approx(
+            [20 + 100 * (v - 2) / 7 for v in (2, 4, 3, 3, 8, 9)]
+        )
+
+    def test_draw_y_range(self, gl_mocks: dict[str, MagicMock]) -> None:
+        plot: Plot = Plot(0, 0, 2, 10, capacity=2, y_range=(0, 1), stroke=255)
+        plot.append([-1, 2])
+        plot.draw()
+        vertices: np.ndarray = gl_mocks["vertex_pointer"].call_args.args[3]
+        assert vertices[:, 1].tolist() == [0, 0, 10, 10]
+
+    def test_draw_flat(self, gl_mocks: dict[str, MagicMock]) -> None:
+        plot: Plot = Plot(0, 0, 2, 10, capacity=2, stroke=255)
+        plot.append([3, 3])
+        plot.draw()
+        vertices: np.ndarray = gl_mocks["vertex_pointer"].call_args.args[3]
+        assert vertices[:, 1].tolist() == [5, 5, 5, 5]
+
+    def test_draw_no_stroke(self, gl_mocks: dict[str, MagicMock]) -> None:
+        plot: Plot = Plot(0, 0, 2, 10)
+        plot.append([1, 2])
+        plot.draw()
+
+        for mock in gl_mocks.values():
+            mock.assert_not_called()
@@ -0,0 +1,273 @@
+import json
+import runpy
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics.bench import SCENES, Scene, compare, count_calls, make_report, run_scene
+from pysics.bench import runner
+from pysics.bench.__main__ import main
+from pysics.broadphase import UniformGrid
+from pysics._wrappers import gl
+
+
+def _report(**metrics: float) -> dict[str, Any]:
+    result: dict[str, Any] = dict(
+        scene="lines",
+        backend="mock",
+        shapes=10,
+        shapes_per_sec=1000.0,
+        frame_ms_p50=10.0,
+        frame_ms_p95=12.0,
+        gl_calls_per_frame=60.0,
+        peak_memory_bytes=1000,
+    )
+    return dict(results=[{**result, **metrics}])
+
+
+@pytest.mark.unit
+class TestScenes:
+    @pytest.mark.parametrize(
+        "name, count, calls",
+        [
+            ("circles", 3, 2 * 3 * 53),
+            # The line width is only set by the first line.
+            ("lines", 5, 2 * 5 * 5 + 1),
+            # The thick outlines are one triangle strip each.
+            ("rects", 4, 2 * (4 * 7 + 2 * 5)),
+            ("nbody", 50, 0),
+            ("grid-10k", 500, 0),
+            ("pile", 6, None),
+        ],
+    )
+    def test_scene(self, name: str, count: int, calls: int | None) -> None:
+        scene: Scene = SCENES[name]
+
+        with count_calls() as counter:
+            frame = scene.setup(count, np.random.default_rng(0))
+            frame()
+            frame()
+
+        if calls is not None:
+            assert sum(counter.values()) == calls
+        else:
+            assert counter["begin"] == 2 * (count + 3)
+
+    def test_grid_scales(self) -> None:
+        # The same broad phase scene at 10k, 100k and 1M bodies.
+        scenes: list[Scene] = [SCENES[f"grid-{size}"] for size in ("10k", "100k", "1m")]
+        assert [scene.count for scene in scenes] == [10_000, 100_000, 1_000_000]
+        assert len({scene.setup for scene in scenes}) == 1
+
+    def test_grid_pairs(self, mocker: MockerFixture) -> None:
+        build: MagicMock = mocker.spy(UniformGrid, "build")
+        overlapping: MagicMock = mocker.spy(UniformGrid, "overlapping_pairs")
+        candidates: list[float] = []
+
+        for count in (500, 4_000):
+            SCENES["grid-10k"].setup(count, np.random.default_rng(0))()
+            grid: UniformGrid = build.call_args.args[0]
+            positions, radii = build.call_args.args[1:]
+            first, second = overlapping.spy_return
+            candidates.append(len(grid.candidate_pairs()[0]) / count)
+
+            if count == 500:
+                # The same pairs as a brute force search.
+                delta: np.ndarray = positions[:, None] - positions[None]
+                reach: np.ndarray = radii[:, None] + radii[None]
+                hit: np.ndarray = np.triu((delta**2).sum(axis=-1) < reach**2, 1)
+                assert set(zip(*np.nonzero(hit))) == {
+                    tuple(sorted(pair)) for pair in zip(first, second)
+                }
+                assert hit.sum() == len(first) > 0
+
+        # At a constant density, the work per body does not grow with the scale.
+        assert candidates[1] == pytest.approx(candidates[0], rel=0.25)
+
+
+@pytest.mark.unit
+class TestCountCalls:
+    def test_mock(self, mocker: MockerFixture) -> None:
+        enable_mock: MagicMock = mocker.patch.object(gl, "enable")
+
+        with count_calls() as calls:
+            assert gl.enable(1) is None
+            gl.enable(2)
+            gl.vertex_2f(0, 0)
+
+        assert calls == Counter(enable=2, vertex_2f=1)
+        enable_mock.assert_not_called()
+        assert gl.enable is enable_mock
+
+    def test_real(self, mocker: MockerFixture) -> None:
+        enable_mock: MagicMock = MagicMock(return_value=3)
+        mocker.patch.object(
+            runner, "_load", return_value=MagicMock(glEnable=enable_mock)
+        )
+
+        with count_calls(real=True) as calls:
+            assert gl.enable(1) == 3
+            assert gl.enable(1) is None
+
+        assert calls == Counter(enable=1)
+        enable_mock.assert_called_once_with(1)
+
+    def test_shadowed(self) -> None:
+        with count_calls() as calls:
+            gl.color_4f(1, 0, 0, 1)
+            gl.color_3f(1, 0, 0)
+            gl.draw_arrays(0, 0, 0)
+            gl.color_4f(1, 0, 0, 1)
+
+        assert calls == Counter(color_4f=2, draw_arrays=1)
+
+
+@pytest.mark.unit
+class TestWindow:
+    def test_window(self, mocker: MockerFixture) -> None:
+        glfw_mock: MagicMock = mocker.patch.object(runner, "glfw")
+        window: runner._Window = runner._Window()
+        glfw_mock.make_context_current.assert_called_once_with(
+            glfw_mock.create_window.return_value
+        )
+        window.close()
+        window.close()
+        glfw_mock.destroy_window.assert_called_once()
+        assert glfw_mock.terminate.call_count == 2
+
+    @pytest.mark.parametrize("init, created", [(False, None), (True, None)])
+    def test_no_context(self, init: bool, created: Any, mocker: MockerFixture) -> None:
+        glfw_mock: MagicMock = mocker.patch.object(runner, "glfw")
+        glfw_mock.init.return_value = init
+        glfw_mock.create_window.return_value = created
+
+        with pytest.raises(RuntimeError):
+            runner._Window()
+
+        glfw_mock.terminate.assert_called_once()
+
+
+@pytest.mark.unit
+class TestRunScene:
+    def test_mock(self) -> None:
+        result: dict[str, Any] = run_scene(
+            SCENES["lines"], frames=3, warmup=1, scale=0.0004
+        )
+        assert result["scene"] == "lines"
+        assert result["backend"] == "mock"
+        assert result["shapes"] == 20
+        assert result["frames"] == 3
+        # The line width is only set once.
+        assert result["gl_calls_per_frame"] == 20 * 5
+        assert result["shapes_per_sec"] > 0
+        assert 0 < result["frame_ms_p50"] <= result["frame_ms_p99"]
+        assert result["frame_ms_p99"] <= result["frame_ms_max"]
+        assert result["peak_memory_bytes"] > 0
+        json.dumps(result)
+
+    def test_real(self, mocker: MockerFixture) -> None:
+        window_mock: MagicMock = mocker.patch.object(runner, "_Window")
+        load_mock: MagicMock = mocker.patch.object(runner, "_load")
+        result: dict[str, Any] = run_scene(
+            SCENES["nbody"], backend="real", frames=2, scale=0.01
+        )
+        assert result["backend"] == "real"
+        assert result["gl_calls_per_frame"] == 1
+        assert load_mock.return_value.glFinish.call_count == 2
+        window_mock.return_value.close.assert_called_once()
+
+    @pytest.mark.parametrize("kwargs", [dict(backend="vulkan"), dict(frames=0)])
+    def test_bad_args(self, kwargs: dict[str, Any]) -> None:
+        with pytest.raises(ValueError):
+            run_scene(SCENES["lines"], **kwargs)
+
+    def test_make_report(self) -> None:
+        report: dict[str, Any] = make_report([dict(scene="lines")])
+        assert report["results"] == [dict(scene="lines")]
+        assert {"python", "numpy", "platform", "profile"} <= set(report)
+
+
+@pytest.mark.unit
+class TestCompare:
+    @pytest.mark.parametrize(
+        "metrics, expected",
+        [
+            (dict(), []),
+            (dict(shapes_per_sec=950.0, frame_ms_p50=10.5), []),
+            (dict(shapes_per_sec=800.0), ["shapes_per_sec"]),
+            (dict(frame_ms_p50=12.0, peak_memory_bytes=2000), ["frame_ms_p50", "peak"]),
+            (dict(gl_calls_per_frame=70.0, shapes=20), []),
+        ],
+    )
+    def test_compare(self, metrics: dict[str, float], expected: list[str]) -> None:
+        regressions: list[str] = compare(_report(**metrics), _report(), threshold=0.1)
+        assert len(regressions) == len(expected)
+
+        for regression, metric in zip(regressions, expected):
+            assert regression.startswith("lines (mock):")
+            assert metric in regression
+
+
+@pytest.mark.unit
+class TestMain:
+    def test_stdout(self, capsys: pytest.CaptureFixture) -> None:
+        assert main(["lines", "--frames", "1", "--scale", "0.0001"]) == 0
+        report: dict[str, Any] = json.loads(capsys.readouterr().out)
+        assert [result["scene"] for result in report["results"]] == ["lines"]
+
+    def test_baseline(self, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+        output: Path = tmp_path / "report.json"
+        args: list[str] = ["lines", "rects", "--frames", "1", "--scale", "0.0001"]
+        assert main([*args, "--output", str(output)]) == 0
+        assert capsys.readouterr().out == ""
+        baseline: dict[str, Any] = json.loads(output.read_text())
+        assert len(baseline["results"]) == 2
+        assert main([*args, "--baseline", str(output), "--threshold", "1e9"]) == 0
+
+        for result in baseline["results"]:
+            result.update(
+                shapes_per_sec=0.0,
+                frame_ms_p50=1e9,
+                frame_ms_p95=1e9,
+                peak_memory_bytes=1e12,
+                gl_calls_per_frame=0.5,
+            )
+
+        output.write_text(json.dumps(baseline))
+        assert main([*args, "--baseline", str(output)]) == 1
+        assert capsys.readouterr().err.count("Regression:") == 2
+
+    def test_all_backends(
+        self, mocker: MockerFixture, capsys: pytest.CaptureFixture
+    ) -> None:
+        mocker.patch.object(runner, "_Window", side_effect=RuntimeError("no display"))
+        assert (
+            main(["nbody", "--backend", "all", "--frames", "1", "--scale", "0.01"]) == 0
+        )
+        captured = capsys.readouterr()
+        assert "nbody (real) skipped: no display" in captured.err
+        assert len(json.loads(captured.out)["results"]) == 1
+
+        with pytest.raises(RuntimeError):
+            main(["nbody", "--backend", "real"])
+
+    def test_unknown_scene(self) -> None:
+        with pytest.raises(SystemExit):
+            main(["teapot"])
+
+    def test_module(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(
+            sys, "argv", ["pysics.bench", "nbody", "--frames", "1", "--scale", "0.01"]
+        )
+        mocker.patch("builtins.print")
+        mocker.patch.dict(sys.modules)
+        sys.modules.pop("pysics.bench.__main__")
+
+        with pytest.raises(SystemExit) as error:
+            runpy.run_module("pysics.bench", run_name="__main__")
+
+        assert error.value.code == 0
@@ -0,0 +1,142 @@
+from typing import Any, Callable
+import numpy as np
+import pytest
+from pysics.broadphase import UniformGrid, _counting_sort, _expand_ranges
+
+
+def _brute_force_pairs(
+    positions: np.ndarray, radii: np.ndarray
+) -> set[tuple[int, int]]:
+    delta: np.ndarray = positions[:, None] - positions[None]
+    dist: np.ndarray = np.linalg.norm(delta, axis=-1)
+    hit: np.ndarray = np.triu(dist < radii[:, None] + radii[None], 1)
+    return set(zip(*map(np.ndarray.tolist, np.nonzero(hit))))
+
+
+@pytest.mark.unit
+class TestHelpers:
+    def test_counting_sort(self) -> None:
+        keys: np.ndarray = np.array([2, 0, 2, 1, 0])
+        order, starts, counts = _counting_sort(keys, 4)
+        assert keys[order].tolist() == [0, 0, 1, 2, 2]
+        assert order.tolist() == [1, 4, 3, 0, 2]
+        assert starts.tolist() == [0, 2, 3, 5]
+        assert counts.tolist() == [2, 1, 2, 0]
+
+    @pytest.mark.parametrize(
+        "owners, starts, counts, expected",
+        [
+            ([7, 8], [0, 10], [2, 3], ([7, 7, 8, 8, 8], [0, 1, 10, 11, 12])),
+            ([7, 8], [0, 10], [0, 1], ([8], [10])),
+            ([7], [3], [0], ([], [])),
+        ],
+    )
+    def test_expand_ranges(
+        self,
+        owners: list[int],
+        starts: list[int],
+        counts: list[int],
+        expected: tuple[list[int], list[int]],
+    ) -> None:
+        rep, idx = _expand_ranges(np.array(owners), np.array(starts), np.array(counts))
+        assert (rep.tolist(), idx.tolist()) == expected
+
+
+@pytest.mark.unit
+class TestUniformGrid:
+    @pytest.mark.parametrize(
+        "args, kwargs, expected",
+        [
+            ((), dict(), dict(cell_size=(..., None), max_cells=(..., None))),
+            (
+                (2.0,),
+                dict(max_cells=10),
+                dict(cell_size=(..., 2.0), max_cells=(..., 10)),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        args: Any,
+        kwargs: Any,
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        grid: UniformGrid = UniformGrid(*args, **kwargs)
+        assert_getattr(grid, expected)
+
+    @pytest.mark.parametrize("cell_size", [0, -1.0])
+    def test_init_invalid(self, cell_size: float) -> None:
+        with pytest.raises(ValueError):
+            UniformGrid(cell_size)
+
+    @pytest.mark.parametrize(
+        "cell_size, max_cells, expected",
+        [
+            (None, 1000, 4.0),
+            (1.0, 10000, 1.0),
+            (None, None, 8.0),
+            (1.0, 4, 32.0),
+        ],
+    )
+    def test_build_cell_size(
+        self, cell_size: float | None, max_cells: int | None, expected: float
+    ) -> None:
+        positions: np.ndarray = np.array([[0.0, 0.0], [40.0, 40.0], [20.0, 5.0]])
+        grid: UniformGrid = UniformGrid(cell_size, max_cells=max_cells)
+        grid.build(positions, np.array([1.0, 2.0, 0.5]))
+        assert grid.effective_cell_size == expected
+        assert np.prod(grid.shape) <= (max_cells or 64)
+
+    @pytest.mark.parametrize("cell_size", [None, 0.7, 25.0])
+    def test_overlapping_pairs(self, cell_size: float | None) -> None:
+        rng: np.random.Generator = np.random.default_rng(42)
+        positions: np.ndarray = rng.random((300, 2)) * 100
+        radii: np.ndarray = rng.random(300) * 3 + 0.5
+        grid: UniformGrid = UniformGrid(cell_size)
+        grid.build(positions, radii)
+        first, second = grid.overlapping_pairs()
+        pairs: set[tuple[int, int]] = {
+            (min(i, j), max(i, j)) for i, j in zip(first.tolist(), second.tolist())
+        }
+        assert len(pairs) == len(first)
+        assert pairs == _brute_force_pairs(positions, radii)
+
+    def test_candidate_pairs(self) -> None:
+        positions: np.ndarray = np.array([[0.0, 0.0], [1.5, 0.0], [100.0, 100.0]])
+        grid: UniformGrid = UniformGrid()
+        grid.build(positions, 1.0)
+        first, second = grid.candidate_pairs()
+        assert sorted(zip(first.tolist(), second.tolist())) in ([(0, 1)], [(1, 0)])
+
+    def test_query(self) -> None:
+        rng: np.random.Generator = np.random.default_rng(5)
+        built: np.ndarray = rng.random((200, 2)) * 50
+        queried: np.ndarray = rng.random((40, 2)) * 60 - 5
+        grid: UniformGrid = UniformGrid()
+        grid.build(built, 1.0)
+        first, second = grid.query(queried, 2.0)
+        dist: np.ndarray = np.linalg.norm(queried[first] - built[second], axis=1)
+        found: set[tuple[int, int]] = {
+            pair
+            for pair, hit in zip(zip(first.tolist(), second.tolist()), dist < 3.0)
+            if hit
+        }
+        delta: np.ndarray = queried[:, None] - built[None]
+        expected: np.ndarray = np.linalg.norm(delta, axis=-1) < 3.0
+        assert len(set(zip(first.tolist(), second.tolist()))) == len(first)
+        assert found == set(zip(*map(np.ndarray.tolist, np.nonzero(expected))))
+
+    @pytest.mark.parametrize("built, queried", [(0, 3), (3, 0)])
+    def test_query_empty(self, built: int, queried: int) -> None:
+        grid: UniformGrid = UniformGrid()
+        grid.build(np.zeros((built, 2)), 1.0)
+        first, second = grid.query(np.zeros((queried, 2)), 1.0)
+        assert len(first) == len(second) == 0
+
+    def test_empty(self) -> None:
+        grid: UniformGrid = UniformGrid()
+        grid.build(np.empty((0, 2)), np.empty(0))
+        first, second = grid.overlapping_pairs()
+        assert grid.shape == (0, 0)
+        assert len(first) == len(second) == 0
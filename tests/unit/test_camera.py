@@ -0,0 +1,109 @@
+from typing import Any, Callable
+import numpy as np
+import pytest
+from pysics.camera import Camera
+
+
+@pytest.mark.unit
+class TestCamera:
+    @pytest.mark.parametrize(
+        "args, kwargs, expected",
+        [
+            (
+                (),
+                dict(),
+                dict(
+                    x=(float, 0.0),
+                    y=(float, 0.0),
+                    zoom=(float, 1.0),
+                    rotation=(float, 0.0),
+                ),
+            ),
+            (
+                (1.0, 2.0),
+                dict(zoom=3.0, rotation=0.5),
+                dict(
+                    x=(float, 1.0),
+                    y=(float, 2.0),
+                    zoom=(float, 3.0),
+                    rotation=(float, 0.5),
+                ),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        args: Any,
+        kwargs: dict[str, Any],
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        camera: Camera = Camera(*args, **kwargs)
+        assert_getattr(camera, expected)
+
+    @pytest.mark.parametrize("zoom", [0.0, -1.0])
+    def test_init_error(self, zoom: float) -> None:
+        with pytest.raises(ValueError):
+            Camera(zoom=zoom)
+
+    def test_world_to_screen(self) -> None:
+        camera: Camera = Camera(10, 20, zoom=2)
+        # The camera position is at the center of the view.
+        assert camera.world_to_screen((10, 20), 200, 100).tolist() == [100, 50]
+        assert camera.world_to_screen([[11, 20], [10, 21]], 200, 100).tolist() == [
+            [102, 50],
+            [100, 52],
+        ]
+
+        camera.rotation = np.pi / 2
+        assert camera.world_to_screen((11, 20), 200, 100) == pytest.approx([100, 52])
+
+    def test_screen_to_world(self) -> None:
+        rng: np.random.Generator = np.random.default_rng(0)
+        camera: Camera = Camera(-5, 3, zoom=1.5, rotation=0.3)
+        points: np.ndarray = rng.uniform(-100, 100, (10, 2))
+        screen: np.ndarray = camera.world_to_screen(points, 640, 480)
+        assert camera.screen_to_world(screen, 640, 480) == pytest.approx(points)
+
+    def test_gl_matrix(self) -> None:
+        camera: Camera = Camera(4, -2, zoom=3, rotation=0.7)
+        matrix: np.ndarray = camera.gl_matrix(320, 240).reshape(4, 4).T
+        point: np.ndarray = np.array([1.0, 2.0, 0.0, 1.0])
+        assert (matrix @ point)[:2] == pytest.approx(
+            camera.world_to_screen(point[:2], 320, 240)
+        )
+        assert matrix[2:].tolist() == [[0, 0, 1, 0], [0, 0, 0, 1]]
+
+    def test_bounds(self) -> None:
+        camera: Camera = Camera(10, 20, zoom=2)
+        assert camera.bounds(200, 100) == (-40, -5, 60, 45)
+        camera.rotation = np.pi / 2
+        assert camera.bounds(200, 100) == pytest.approx((-15, -30, 35, 70))
+
+    def test_visible(self) -> None:
+        camera: Camera = Camera(zoom=2)
+        points: np.ndarray = np.array([[0, 0], [60, 0], [0, -40], [-51, 0]])
+        assert camera.visible(points, 200, 100).tolist() == [True, False, False, False]
+        assert camera.visible(points, 200, 100, 15).tolist() == [True, True, True, True]
+        radii: np.ndarray = np.array([0, 10, 20, 0])
+        assert camera.visible(points, 200, 100, radii).tolist() == [
+            True,
+            True,
+            True,
+            False,
+        ]
+
+    def test_pan(self) -> None:
+        camera: Camera = Camera(zoom=2)
+        camera.pan(10, -4)
+        assert (camera.x, camera.y) == (5, -2)
+        camera.rotation = np.pi / 2
+        camera.pan(0, 2)
+        assert (camera.x, camera.y) == pytest.approx((6, -2))
+
+    def test_zoom_at(self) -> None:
+        camera: Camera = Camera(3, 4, zoom=1.5, rotation=0.2)
+        anchor: np.ndarray = camera.screen_to_world((30, 70), 200, 100)
+        camera.zoom_at(2, 30, 70, 200, 100)
+        assert camera.zoom == 3
+        assert camera.screen_to_world((30, 70), 200, 100) == pytest.approx(anchor)
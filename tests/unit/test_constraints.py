@@ -0,0 +1,159 @@
+from copy import deepcopy
+from typing import Any, Callable
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics import constraints
+from pysics.constraints import ConstraintSolver
+
+
+def _lengths(solver: ConstraintSolver) -> np.ndarray:
+    pairs: np.ndarray = solver.pairs.astype(np.intp)
+    delta: np.ndarray = solver.positions[pairs[:, 1]] - solver.positions[pairs[:, 0]]
+    return np.hypot(delta[:, 0], delta[:, 1])
+
+
+@pytest.mark.unit
+class TestConstraintSolver:
+    @pytest.mark.parametrize(
+        "kwargs, expected",
+        [
+            (
+                dict(),
+                dict(
+                    gravity=(..., (0.0, -9.81)),
+                    damping=(..., 0.0),
+                    iterations=(..., 10),
+                ),
+            ),
+            (
+                dict(gravity=(0, 0), damping=0.5, iterations=3),
+                dict(gravity=(..., (0, 0)), damping=(..., 0.5), iterations=(..., 3)),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        kwargs: Any,
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        solver: ConstraintSolver = ConstraintSolver(np.zeros((3, 2)), **kwargs)
+        assert_getattr(solver, expected)
+        assert solver.positions.shape == (3, 2)
+        assert solver.pairs.shape == (0, 2)
+
+    def test_masses(self) -> None:
+        solver: ConstraintSolver = ConstraintSolver(
+            np.zeros((3, 2)), masses=np.array([0.0, 2.0, 4.0])
+        )
+        assert solver._inv_mass.tolist() == [0.0, 0.5, 0.25]
+
+    def test_add_constraints(self) -> None:
+        solver: ConstraintSolver = ConstraintSolver([[0, 0], [3, 4], [3, 0]])
+        ids: np.ndarray = solver.add_constraints([0, 1], [1, 2])
+        more: np.ndarray = solver.add_constraints(0, 2, rest=1.0, compliance=0.1)
+        assert ids.tolist() == [0, 1]
+        assert more.tolist() == [2]
+        assert solver.pairs.tolist() == [[0, 1], [1, 2], [0, 2]]
+        assert solver._rest.tolist() == [5.0, 4.0, 1.0]
+        assert solver._compliance.tolist() == [0.0, 0.0, 0.1]
+
+    def test_groups(self) -> None:
+        solver: ConstraintSolver = ConstraintSolver.grid(4, 3, 1.0)
+        assert solver.group_count == 4
+        solver.pin(np.arange(4))
+        assert solver._groups is None
+        groups: list[tuple[np.ndarray, ...]] = solver._get_groups()
+        assert sum(len(group[0]) for group in groups) == len(solver.pairs)
+
+        for _, a, b, *_ in groups:
+            nodes: np.ndarray = np.concatenate((a, b))
+            nodes = nodes[solver._inv_mass[nodes] > 0]
+            assert len(np.unique(nodes)) == len(nodes)
+
+    @pytest.mark.parametrize(
+        "kwargs, links",
+        [(dict(), 3 * 2 + 2 * 3), (dict(shear=True), 3 * 2 + 2 * 3 + 2 * 2 * 2)],
+    )
+    def test_grid(self, kwargs: Any, links: int) -> None:
+        solver: ConstraintSolver = ConstraintSolver.grid(
+            3, 3, 2.0, x=10, y=20, **kwargs
+        )
+        assert solver.positions[0].tolist() == [10, 20]
+        assert solver.positions[-1].tolist() == [14, 24]
+        assert len(solver.pairs) == links
+
+    def test_free_fall(self) -> None:
+        solver: ConstraintSolver = ConstraintSolver([[0, 0]])
+
+        for _ in range(60):
+            solver.step(1 / 60)
+
+        assert solver.positions[0, 1] == pytest.approx(-9.81 / 2, rel=0.05)
+
+    def test_rope(self) -> None:
+        positions: np.ndarray = np.stack((np.arange(10.0), np.zeros(10)), axis=1)
+        solver: ConstraintSolver = ConstraintSolver(positions, damping=1.0)
+        solver.add_constraints(np.arange(9), np.arange(1, 10))
+        solver.pin(0)
+
+        for _ in range(300):
+            solver.step(1 / 60)
+
+        assert solver.positions[0].tolist() == [0, 0]
+        assert _lengths(solver) == pytest.approx(1.0, abs=0.02)
+        assert solver.positions[-1, 1] < -5
+
+    def test_spring(self) -> None:
+        solver: ConstraintSolver = ConstraintSolver([[0, 0], [0, -1]], damping=2.0)
+        solver.add_constraints(0, 1, compliance=0.01)
+        solver.pin(0)
+
+        for _ in range(600):
+            solver.step(1 / 60)
+
+        # At rest the spring stretch balances the weight: k * x = m * g.
+        assert _lengths(solver)[0] == pytest.approx(1.0 + 9.81 * 0.01, rel=0.02)
+
+    def test_cloth(self) -> None:
+        solver: ConstraintSolver = ConstraintSolver.grid(
+            10, 10, 1.0, shear=True, damping=1.0
+        )
+        solver.pin(np.arange(90, 100))
+
+        for _ in range(120):
+            solver.step(1 / 60)
+
+        assert _lengths(solver) == pytest.approx(solver._rest, abs=0.05)
+
+    @pytest.mark.parametrize("dt", [0.0, -1.0])
+    def test_step_noop(self, dt: float) -> None:
+        solver: ConstraintSolver = ConstraintSolver([[1, 2]])
+        solver.step(dt)
+        assert solver.positions.tolist() == [[1, 2]]
+
+    def test_draw(self, mocker: MockerFixture) -> None:
+        lines_mock: MagicMock = mocker.patch.object(constraints, "Lines")
+        solver: ConstraintSolver = ConstraintSolver.grid(2, 2, 1.0)
+        solver.draw(stroke=100, stroke_weight=2)
+        lines_mock.assert_called_once_with(
+            solver.positions, solver.pairs, stroke=100, stroke_weight=2
+        )
+
+    def test_state(self) -> None:
+        solver: ConstraintSolver = ConstraintSolver.grid(3, 3, 1.0, damping=0.5)
+        solver.pin(0)
+        solver.step(1 / 60)
+        state: dict[str, Any] = deepcopy(solver.get_state())
+        restored: ConstraintSolver = ConstraintSolver([[0, 0]])
+        restored.set_state(state)
+        assert restored.damping == 0.5
+        assert restored.group_count == solver.group_count
+
+        for _ in range(5):
+            solver.step(1 / 60)
+            restored.step(1 / 60)
+
+        assert np.array_equal(restored.positions, solver.positions)
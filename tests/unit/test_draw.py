@@ -0,0 +1,136 @@
+from typing import Any, Callable
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics import draw
+from pysics.draw import draw_circle, draw_ellipse, draw_line, draw_rect
+from pysics.shapes import Circle, Ellipse, Line, Rect
+from pysics.types import Color
+from pysics._wrappers import gl, GL_DOUBLE, GL_FLOAT, GL_LINE_LOOP, GL_POLYGON
+
+
+class _Recorder:
+    """Record the primitives sent by the shapes (glBegin/glVertex) and by
+    the draw functions (glDrawArrays), in the same format."""
+
+    def __init__(self, mocker: MockerFixture) -> None:
+        self.calls: list[tuple[Any, ...]] = []
+        self._vertices: list[tuple[float, float]] = []
+        self._pointer: np.ndarray | None = None
+        self._mode: int | None = None
+        mocker.patch.object(gl, "color_4f", side_effect=self._color)
+        mocker.patch.object(gl, "line_width", side_effect=self._width)
+        mocker.patch.object(gl, "begin", side_effect=self._begin)
+        mocker.patch.object(gl, "vertex_2f", side_effect=self._vertex)
+        mocker.patch.object(gl, "end", side_effect=self._end)
+        mocker.patch.object(gl, "vertex_pointer", side_effect=self._set_pointer)
+        mocker.patch.object(gl, "draw_arrays", side_effect=self._draw_arrays)
+        mocker.patch.object(gl, "enable_client_state")
+        mocker.patch.object(gl, "disable_client_state")
+
+    def _color(self, *ratios: float) -> None:
+        self.calls.append(("color", ratios))
+
+    def _width(self, width: float) -> None:
+        self.calls.append(("width", width))
+
+    def _begin(self, mode: int) -> None:
+        self._mode = mode
+        self._vertices = []
+
+    def _vertex(self, x: float, y: float) -> None:
+        self._vertices.append((x, y))
+
+    def _end(self) -> None:
+        self.calls.append((self._mode, self._vertices))
+
+    def _set_pointer(self, size: int, gl_type: int, stride: int, array: Any) -> None:
+        assert (size, stride) == (2, 0)
+        assert gl_type == (GL_FLOAT if array.dtype == np.float32 else GL_DOUBLE)
+        self._pointer = array
+
+    def _draw_arrays(self, mode: int, first: int, count: int) -> None:
+        vertices: list = [
+            tuple(v.tolist()) for v in self._pointer[first : first + count]
+        ]
+        self.calls.append((mode, vertices))
+
+
+@pytest.fixture
+def recorder(mocker: MockerFixture) -> _Recorder:
+    return _Recorder(mocker)
+
+
+@pytest.mark.unit
+class TestDraw:
+    @pytest.mark.parametrize(
+        "shape, function, args, kwargs",
+        [
+            (Line, draw_line, (1, 2, 30, 40), dict(stroke=Color(255, 0, 0))),
+            (Line, draw_line, (1, 2, 30, 40), dict(stroke=128, stroke_weight=3)),
+            (Line, draw_line, (1, 2, 30, 40), dict()),
+            (Rect, draw_rect, (1, 2, 30, 40), dict(fill=Color(0, 255, 0))),
+            (
+                Rect,
+                draw_rect,
+                (1.5, 2, 30, 40),
+                dict(fill=20, stroke=Color(1, 2, 3, 4), stroke_weight=2),
+            ),
+            (Ellipse, draw_ellipse, (10, 20, 5, 8), dict(fill=Color(0, 0, 255))),
+            (
+                Ellipse,
+                draw_ellipse,
+                (10, 20, 5, 8),
+                dict(segments=7, stroke=255, stroke_weight=4),
+            ),
+            (Circle, draw_circle, (10, 20, 5), dict(fill=0, stroke=100)),
+            (Circle, draw_circle, (10, 20, 5), dict(segments=300, stroke=100)),
+            (Circle, draw_circle, (10, 20, 5), dict()),
+        ],
+    )
+    def test_same_as_shape(
+        self,
+        shape: type,
+        function: Callable[..., None],
+        args: tuple[float, ...],
+        kwargs: dict[str, Any],
+        recorder: _Recorder,
+    ) -> None:
+        shape(*args, **kwargs)
+        expected: list[tuple[Any, ...]] = recorder.calls
+        recorder.calls = []
+        function(*args, **kwargs)
+        # The shapes draw a transparent rectangle, which changes nothing.
+        transparent: tuple[Any, ...] = ("color", (0.0, 0.0, 0.0, 0.0))
+
+        if shape is Rect and "fill" not in kwargs:
+            expected = expected[1:]
+
+        assert transparent not in recorder.calls
+        assert recorder.calls == expected
+
+    def test_transparent(self, recorder: _Recorder) -> None:
+        draw_circle(10, 20, 5, fill=Color(0, 0, 0, 0))
+        draw_rect(10, 20, 5, 5, fill=Color(0, 0, 0, 0))
+        assert recorder.calls == []
+
+    def test_tessellation(
+        self, recorder: _Recorder, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(Ellipse, "tessellation", 0.1)
+        draw_circle(0, 0, 5, stroke=255)
+        assert len(recorder.calls[-1][1]) == 5
+
+    def test_circle_cache(self, recorder: _Recorder) -> None:
+        draw_circle(0, 0, 5, segments=12, stroke=255)
+        cached: tuple[np.ndarray, ...] = draw._circles[12]
+        draw_circle(1, 1, 2, segments=12, stroke=255)
+        assert draw._circles[12] is cached
+        assert np.shares_memory(cached[2], draw._vertices)
+
+        # A larger circle grows the vertex array and drops the cached views.
+        draw_circle(0, 0, 5, segments=len(draw._vertices) + 1, stroke=255)
+        assert 12 not in draw._circles
+        draw_circle(0, 0, 5, segments=12, stroke=255)
+        assert np.shares_memory(draw._circles[12][2], draw._vertices)
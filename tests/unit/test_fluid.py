@@ -0,0 +1,204 @@
+from copy import deepcopy
+from typing import Any, Callable
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics import fluid
+from pysics.fluid import StableFluid
+
+
+def _swirl(solver: StableFluid) -> None:
+    u, _ = solver.velocity
+    x, y = solver._points[1]
+    rows, columns = solver.shape
+    u[:] = 10 * np.sin(np.pi * x / columns) * np.sin(np.pi * y / rows)
+
+
+@pytest.mark.unit
+class TestStableFluid:
+    @pytest.mark.parametrize(
+        "kwargs, expected",
+        [
+            (
+                dict(),
+                dict(
+                    viscosity=(..., 0.0),
+                    diffusion=(..., 0.0),
+                    dissipation=(..., 0.0),
+                    iterations=(..., 20),
+                    tolerance=(..., 0.0),
+                    relaxation=(..., 1.5),
+                    residual=(..., 0.0),
+                ),
+            ),
+            (
+                dict(viscosity=0.1, iterations=5, tolerance=1e-3),
+                dict(
+                    viscosity=(..., 0.1),
+                    iterations=(..., 5),
+                    tolerance=(..., 1e-3),
+                ),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        kwargs: Any,
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        solver: StableFluid = StableFluid(8, 4, **kwargs)
+        assert_getattr(solver, expected)
+        assert solver.shape == (4, 8)
+        assert [field.shape for field in solver.velocity] == [(4, 9), (5, 8)]
+
+    @pytest.mark.parametrize("size", [(1, 4), (4, 1)])
+    def test_init_too_small(self, size: tuple[int, int]) -> None:
+        with pytest.raises(ValueError):
+            StableFluid(*size)
+
+    def test_add(self) -> None:
+        solver: StableFluid = StableFluid(8, 8)
+        solver.add_density(3, 4, 2.0, radius=1.0)
+        solver.add_velocity(3, 4, 1.0, -1.0, radius=0.5)
+        u, v = solver.velocity
+        assert solver.density.sum() == 2.0 * 5
+        assert np.argwhere(u).tolist() == [[4, 3], [4, 4]]
+        assert np.argwhere(v).tolist() == [[4, 3], [5, 3]]
+        assert solver.velocity_at_cells()[:, 4, 3].tolist() == [1.0, -1.0]
+
+    def test_interpolate(self) -> None:
+        field: np.ndarray = np.arange(12.0).reshape(3, 4)
+        x: np.ndarray = np.array([0.0, 1.5, 3.0, -5.0, 2.0])
+        y: np.ndarray = np.array([0.0, 0.5, 2.0, 1.0, 10.0])
+        values: np.ndarray = StableFluid._interpolate(field, x, y, 0.0, 0.0)
+        assert values.tolist() == [0.0, 3.5, 11.0, 4.0, 10.0]
+
+    @pytest.mark.parametrize(
+        "axis, expected",
+        [(0, [[0, 1], [1, 2], [2, 3]]), (1, [[0, 0.5, 1], [2, 2.5, 3]])],
+    )
+    def test_between(self, axis: int, expected: list[list[float]]) -> None:
+        field: np.ndarray = np.arange(4.0).reshape(2, 2)
+        assert StableFluid._between(field, axis).tolist() == expected
+
+    def test_project(self) -> None:
+        solver: StableFluid = StableFluid(32, 32, iterations=500, relaxation=1.9)
+        _swirl(solver)
+        before: float = np.abs(solver._divergence()).max()
+        solver._project()
+        assert np.abs(solver._divergence()).max() < before * 1e-6
+        assert solver.residual < 1e-6
+
+    def test_warm_start(self) -> None:
+        solver: StableFluid = StableFluid(32, 32, iterations=10)
+        _swirl(solver)
+        u, v = (field.copy() for field in solver.velocity)
+        residuals: list[float] = []
+
+        for _ in range(5):
+            solver._u, solver._v = u.copy(), v.copy()
+            solver._project()
+            residuals.append(solver.residual)
+
+        assert residuals == sorted(residuals, reverse=True)
+        assert residuals[-1] < residuals[0] / 2
+
+    def test_tolerance(self, mocker: MockerFixture) -> None:
+        solver: StableFluid = StableFluid(16, 16, iterations=1000, tolerance=1e-3)
+        _swirl(solver)
+        u, v = (field.copy() for field in solver.velocity)
+        solver._project()
+        assert solver.residual <= 1e-3
+        spy: MagicMock = mocker.spy(np, "abs")
+        solver._u, solver._v = u, v
+        solver._project()
+        # The warm start is already a solution: one relaxation (4 quarters).
+        assert spy.call_count == 4
+
+    def test_step(self) -> None:
+        solver: StableFluid = StableFluid(32, 32, iterations=40)
+        solver.add_density(8, 16, 1.0, radius=3)
+        solver.add_velocity(8, 16, 20.0, 0.0, radius=3)
+        mass: float = solver.density.sum()
+        x: np.ndarray = solver._points[0][0]
+        start: float = (solver.density * x).sum() / mass
+
+        for _ in range(10):
+            solver.step(1 / 60)
+
+        assert solver.density.sum() == pytest.approx(mass, rel=0.05)
+        assert (solver.density * x).sum() / solver.density.sum() > start + 1
+        assert np.abs(solver._divergence()).max() < 1.0
+
+    def test_diffusion(self) -> None:
+        solver: StableFluid = StableFluid(16, 16, diffusion=5.0, dissipation=0.5)
+        solver.add_density(8, 8, 1.0, radius=0)
+        solver.step(0.1)
+        assert solver.density.max() < 0.5
+        assert solver.density.sum() == pytest.approx(0.95, abs=1e-4)
+
+    def test_viscosity(self) -> None:
+        solver: StableFluid = StableFluid(16, 16, viscosity=5.0)
+        solver.add_velocity(8, 8, 10.0, 0.0, radius=0.5)
+        solver.step(0.1)
+        assert np.abs(solver.velocity[0]).max() < 5.0
+
+    @pytest.mark.parametrize("dt", [0.0, -1.0])
+    def test_step_noop(self, dt: float) -> None:
+        solver: StableFluid = StableFluid(4, 4)
+        solver.add_velocity(2, 2, 1.0, 1.0)
+        solver.step(dt)
+        assert solver.residual == 0.0
+        assert solver.velocity[0].sum() == 2.0
+
+    @pytest.mark.parametrize(
+        "field, scale, exp_shape, exp_pixel",
+        [
+            ("density", 0.5, (4, 6), 1.0),
+            ("velocity", 0.1, (4, 6, 3), [1.0, 0.4, 0.5]),
+        ],
+    )
+    def test_draw(
+        self,
+        field: str,
+        scale: float,
+        exp_shape: tuple[int, ...],
+        exp_pixel: Any,
+        mocker: MockerFixture,
+    ) -> None:
+        texture_mock: MagicMock = mocker.patch.object(fluid, "Texture")
+        solver: StableFluid = StableFluid(6, 4)
+        solver.density[1, 2] = 4.0
+        solver.velocity[0][1, 2:4] = 20.0
+        solver.velocity[1][1:3, 2] = -2.0
+        texture: MagicMock = solver.draw(1, 2, 3, 4, field=field, scale=scale, tint=100)
+        assert solver.draw(1, 2, 3, 4, field=field, scale=scale) is texture
+        texture_mock.assert_called_once_with(smooth=True)
+        image: np.ndarray = texture.update.call_args.args[0]
+        assert image.shape == exp_shape
+        assert image.dtype == np.float32
+        assert image[1, 2].tolist() == pytest.approx(exp_pixel)
+        texture.draw.assert_any_call(1, 2, 3, 4, tint=100)
+
+    def test_draw_unknown(self) -> None:
+        with pytest.raises(ValueError):
+            StableFluid(4, 4).draw(0, 0, 1, 1, field="pressure")
+
+    def test_state(self) -> None:
+        solver: StableFluid = StableFluid(16, 8, viscosity=0.1)
+        solver.add_density(8, 4, 1.0, radius=2)
+        solver.add_velocity(8, 4, 5.0, 1.0, radius=2)
+        solver.step(1 / 60)
+        restored: StableFluid = StableFluid(4, 4)
+        restored.set_state(deepcopy(solver.get_state()))
+        assert restored.shape == (8, 16)
+        assert restored.viscosity == 0.1
+
+        for _ in range(3):
+            solver.step(1 / 60)
+            restored.step(1 / 60)
+
+        assert np.array_equal(restored.density, solver.density)
+        assert np.array_equal(restored.velocity[0], solver.velocity[0])
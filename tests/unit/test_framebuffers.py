@@ -0,0 +1,170 @@
+from unittest.mock import MagicMock, call
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics.framebuffers import RenderTarget
+from pysics._wrappers import (
+    gl,
+    GL_COLOR_ATTACHMENT0,
+    GL_COLOR_BUFFER_BIT,
+    GL_DRAW_FRAMEBUFFER,
+    GL_FRAMEBUFFER,
+    GL_FRAMEBUFFER_COMPLETE,
+    GL_LINEAR,
+    GL_NEAREST,
+    GL_READ_FRAMEBUFFER,
+    GL_RENDERBUFFER,
+    GL_RGBA8,
+)
+
+
+@pytest.fixture
+def gl_mocks(mocker: MockerFixture) -> dict[str, MagicMock]:
+    mocks: dict[str, MagicMock] = {
+        name: mocker.patch.object(gl, name)
+        for name in (
+            "gen_framebuffers",
+            "gen_renderbuffers",
+            "delete_framebuffers",
+            "delete_renderbuffers",
+            "bind_framebuffer",
+            "bind_renderbuffer",
+            "renderbuffer_storage",
+            "renderbuffer_storage_multisample",
+            "framebuffer_renderbuffer",
+            "check_framebuffer_status",
+            "blit_framebuffer",
+        )
+    }
+    mocks["gen_framebuffers"].side_effect = lambda n: 1 if n == 1 else np.array([1, 2])
+    mocks["gen_renderbuffers"].side_effect = lambda n: 5 if n == 1 else np.array([5, 6])
+    mocks["check_framebuffer_status"].return_value = GL_FRAMEBUFFER_COMPLETE
+    return mocks
+
+
+def _assert_deleted(mock: MagicMock, ids: list[int]) -> None:
+    mock.assert_called_once()
+    count, array = mock.call_args.args
+    assert count == len(ids)
+    assert array.dtype == np.uint32
+    assert array.tolist() == ids
+
+
+@pytest.mark.unit
+class TestRenderTarget:
+    def test_init(self) -> None:
+        target: RenderTarget = RenderTarget()
+        assert target.size is None
+
+    def test_resize(self, gl_mocks: dict[str, MagicMock]) -> None:
+        target: RenderTarget = RenderTarget()
+        target.resize(100, 50)
+        assert target.size == (100, 50, 0)
+        assert target._framebuffers.tolist() == [1]
+        assert target._renderbuffers.tolist() == [5]
+        gl_mocks["renderbuffer_storage"].assert_called_once_with(
+            GL_RENDERBUFFER, GL_RGBA8, 100, 50
+        )
+        gl_mocks["framebuffer_renderbuffer"].assert_called_once_with(
+            GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, 5
+        )
+        assert gl_mocks["bind_framebuffer"].call_args == call(GL_FRAMEBUFFER, 0)
+
+        # Same size: nothing is reallocated.
+        target.resize(100, 50)
+        gl_mocks["gen_framebuffers"].assert_called_once()
+        gl_mocks["delete_framebuffers"].assert_not_called()
+
+    def test_resize_multisample(self, gl_mocks: dict[str, MagicMock]) -> None:
+        target: RenderTarget = RenderTarget()
+        target.resize(100, 50)
+        target.resize(80, 40, 4)
+        _assert_deleted(gl_mocks["delete_framebuffers"], [1])
+        _assert_deleted(gl_mocks["delete_renderbuffers"], [5])
+        assert target.size == (80, 40, 4)
+        assert target._framebuffers.tolist() == [1, 2]
+        gl_mocks["renderbuffer_storage_multisample"].assert_called_once_with(
+            GL_RENDERBUFFER, 4, GL_RGBA8, 80, 40
+        )
+        assert gl_mocks["renderbuffer_storage"].call_args == call(
+            GL_RENDERBUFFER, GL_RGBA8, 80, 40
+        )
+
+    def test_resize_incomplete(self, gl_mocks: dict[str, MagicMock]) -> None:
+        gl_mocks["check_framebuffer_status"].return_value = 0
+        target: RenderTarget = RenderTarget()
+
+        with pytest.raises(RuntimeError):
+            target.resize(100, 50)
+
+        assert target.size is None
+        _assert_deleted(gl_mocks["delete_framebuffers"], [1])
+
+    @pytest.mark.parametrize("method, args", [("bind", ()), ("present", (1, 1))])
+    def test_not_allocated(self, method: str, args: tuple[int, ...]) -> None:
+        with pytest.raises(RuntimeError):
+            getattr(RenderTarget(), method)(*args)
+
+    def test_bind(self, gl_mocks: dict[str, MagicMock]) -> None:
+        target: RenderTarget = RenderTarget()
+        target.resize(100, 50)
+        target.bind()
+        assert gl_mocks["bind_framebuffer"].call_args == call(GL_FRAMEBUFFER, 1)
+
+    @pytest.mark.parametrize(
+        "size, window, blits",
+        [
+            (
+                (100, 50, 0),
+                (100, 50),
+                [call(0, 0, 100, 50, 0, 0, 100, 50, GL_COLOR_BUFFER_BIT, GL_NEAREST)],
+            ),
+            (
+                (50, 25, 0),
+                (100, 50),
+                [call(0, 0, 50, 25, 0, 0, 100, 50, GL_COLOR_BUFFER_BIT, GL_LINEAR)],
+            ),
+            (
+                (50, 25, 2),
+                (100, 50),
+                [
+                    call(0, 0, 50, 25, 0, 0, 50, 25, GL_COLOR_BUFFER_BIT, GL_NEAREST),
+                    call(0, 0, 50, 25, 0, 0, 100, 50, GL_COLOR_BUFFER_BIT, GL_LINEAR),
+                ],
+            ),
+            (
+                (100, 50, 4),
+                (100, 50),
+                [call(0, 0, 100, 50, 0, 0, 100, 50, GL_COLOR_BUFFER_BIT, GL_NEAREST)],
+            ),
+        ],
+    )
+    def test_present(
+        self,
+        size: tuple[int, int, int],
+        window: tuple[int, int],
+        blits: list,
+        gl_mocks: dict[str, MagicMock],
+    ) -> None:
+        target: RenderTarget = RenderTarget()
+        target.resize(*size)
+        gl_mocks["bind_framebuffer"].reset_mock()
+        target.present(*window)
+        assert gl_mocks["blit_framebuffer"].call_args_list == blits
+        # The multisampled buffer is resolved into the window without scaling.
+        source: int = target._framebuffers[-1 if window != size[:2] else 0]
+        assert gl_mocks["bind_framebuffer"].call_args_list[-3:] == [
+            call(GL_READ_FRAMEBUFFER, source),
+            call(GL_DRAW_FRAMEBUFFER, 0),
+            call(GL_FRAMEBUFFER, 0),
+        ]
+
+    def test_delete(self, gl_mocks: dict[str, MagicMock]) -> None:
+        target: RenderTarget = RenderTarget()
+        target.delete()
+        gl_mocks["delete_framebuffers"].assert_not_called()
+        target.resize(10, 10, 2)
+        target.delete()
+        _assert_deleted(gl_mocks["delete_framebuffers"], [1, 2])
+        _assert_deleted(gl_mocks["delete_renderbuffers"], [5, 6])
+        assert target.size is None
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from pysics._graph import color_edges, connected_components
+
+
+@pytest.mark.unit
+class TestColorEdges:
+    @pytest.mark.parametrize(
+        "first, second, n_nodes, fixed, expected",
+        [
+            ([], [], 3, None, []),
+            ([0, 1, 2], [1, 2, 3], 4, None, [[0, 2], [1]]),
+            ([0, 0, 0], [1, 2, 3], 4, None, [[0], [1], [2]]),
+            ([0, 0, 0], [1, 2, 3], 4, [True, False, False, False], [[0, 1, 2]]),
+        ],
+    )
+    def test_color_edges(
+        self,
+        first: list[int],
+        second: list[int],
+        n_nodes: int,
+        fixed: list[bool] | None,
+        expected: list[list[int]],
+    ) -> None:
+        groups: list[np.ndarray] = color_edges(
+            np.array(first, dtype=np.intp),
+            np.array(second, dtype=np.intp),
+            n_nodes,
+            fixed=None if fixed is None else np.array(fixed),
+        )
+        assert [group.tolist() for group in groups] == expected
+
+    def test_independent_groups(self) -> None:
+        rng: np.random.Generator = np.random.default_rng(3)
+        first: np.ndarray = rng.integers(0, 50, 400)
+        second: np.ndarray = (first + rng.integers(1, 50, 400)) % 50
+        fixed: np.ndarray = np.zeros(50, dtype=bool)
+        fixed[:5] = True
+        groups: list[np.ndarray] = color_edges(first, second, 50, fixed=fixed)
+        assert sorted(np.concatenate(groups).tolist()) == list(range(400))
+
+        for group in groups:
+            nodes: np.ndarray = np.concatenate((first[group], second[group]))
+            nodes = nodes[~fixed[nodes]]
+            assert len(np.unique(nodes)) == len(nodes)
+
+
+@pytest.mark.unit
+class TestConnectedComponents:
+    @pytest.mark.parametrize(
+        "first, second, n_nodes, fixed, expected",
+        [
+            ([], [], 3, None, [0, 1, 2]),
+            ([5, 3, 1, 0], [4, 4, 2, 6], 8, None, [0, 1, 1, 3, 3, 3, 0, 7]),
+            # A fixed node does not join its neighbours.
+            ([0, 1], [1, 2], 3, [False, True, False], [0, 1, 2]),
+        ],
+    )
+    def test_connected_components(
+        self,
+        first: list[int],
+        second: list[int],
+        n_nodes: int,
+        fixed: list[bool] | None,
+        expected: list[int],
+    ) -> None:
+        labels: np.ndarray = connected_components(
+            np.array(first, dtype=np.intp),
+            np.array(second, dtype=np.intp),
+            n_nodes,
+            fixed=None if fixed is None else np.array(fixed),
+        )
+        assert labels.tolist() == expected
+
+    def test_chain(self) -> None:
+        nodes: np.ndarray = np.random.default_rng(0).permutation(500)
+        labels: np.ndarray = connected_components(nodes[:-1], nodes[1:], 500)
+        assert (labels == 0).all()
@@ -0,0 +1,201 @@
+from math import inf
+from typing import Any, Callable
+import numpy as np
+import pytest
+from pysics.integrators import AdaptiveIntegrator, second_order
+
+
+def _decay(t: float, state: np.ndarray) -> np.ndarray:
+    return -state
+
+
+def _kepler(t: float, positions: np.ndarray, velocities: np.ndarray) -> np.ndarray:
+    distances: np.ndarray = np.linalg.norm(positions, axis=1, keepdims=True)
+    return -positions / distances**3
+
+
+def _orbit(eccentricity: float) -> np.ndarray:
+    """A unit orbit (period of 2 pi) around the origin, starting at the periapsis."""
+
+    speed: float = np.sqrt((1 + eccentricity) / (1 - eccentricity))
+    return np.array([[[1 - eccentricity, 0.0]], [[0.0, speed]]])
+
+
+def _energy(state: np.ndarray) -> float:
+    return float(0.5 * np.sum(state[1] ** 2) - 1 / np.linalg.norm(state[0]))
+
+
+@pytest.mark.unit
+class TestSecondOrder:
+    def test_derivative(self) -> None:
+        derivative: Callable[..., np.ndarray] = second_order(
+            lambda t, positions, velocities: positions * t
+        )
+        state: np.ndarray = np.array([[[1.0, 2.0]], [[3.0, 4.0]]])
+        assert derivative(2.0, state).tolist() == [[[3.0, 4.0]], [[2.0, 4.0]]]
+
+
+@pytest.mark.unit
+class TestAdaptiveIntegrator:
+    @pytest.mark.parametrize(
+        "kwargs, expected",
+        [
+            (
+                dict(),
+                dict(
+                    rtol=(float, 1e-6),
+                    atol=(float, 1e-9),
+                    norm=(str, "rms"),
+                    min_step=(float, 1e-12),
+                    max_step=(float, inf),
+                    max_substeps=(int, 100000),
+                    step=(type(None), None),
+                    accepted=(int, 0),
+                    rejected=(int, 0),
+                    substeps=(int, 0),
+                    evaluations=(int, 0),
+                ),
+            ),
+            (
+                dict(rtol=1e-3, atol=1e-4, norm="max", max_step=0.5),
+                dict(
+                    rtol=(float, 1e-3),
+                    atol=(float, 1e-4),
+                    norm=(str, "max"),
+                    max_step=(float, 0.5),
+                ),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        kwargs: dict[str, Any],
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(_decay, **kwargs)
+        assert_getattr(integrator, expected)
+        assert integrator.derivative is _decay
+
+    def test_init_bad_norm(self) -> None:
+        with pytest.raises(ValueError):
+            AdaptiveIntegrator(_decay, norm="l1")
+
+    @pytest.mark.parametrize("norm", ["rms", "max"])
+    def test_advance_decay(self, norm: str) -> None:
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(
+            _decay, rtol=1e-8, atol=1e-10, norm=norm
+        )
+        state: np.ndarray = np.array([1.0, 2.0, -3.0])
+        result: np.ndarray = integrator.advance(state, 0.0, 2.0)
+        assert np.allclose(result, state * np.exp(-2.0), rtol=1e-6)
+        assert integrator.substeps == integrator.accepted > 1
+        # 6 new evaluations per substep plus the first one (FSAL).
+        assert integrator.evaluations == 1 + 6 * (
+            integrator.accepted + integrator.rejected
+        )
+
+    def test_advance_kepler(self) -> None:
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(
+            second_order(_kepler), rtol=1e-9, atol=1e-12
+        )
+        state: np.ndarray = _orbit(0.7)
+        result: np.ndarray = state
+        period: float = 2 * np.pi
+        t: float = 0.0
+
+        for _ in range(10):
+            result = integrator.advance(result, t, period / 10)
+            t += period / 10
+
+        assert np.allclose(result, state, atol=1e-5)
+        assert _energy(result) == pytest.approx(_energy(state), rel=1e-7)
+
+    def test_advance_keeps_step(self) -> None:
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(
+            second_order(_kepler), rtol=1e-6
+        )
+        state: np.ndarray = integrator.advance(_orbit(0.5), 0.0, 1.0)
+        step: float = integrator.step
+        integrator.advance(state, 1.0, 1e-3)
+        # The shortened last substep does not shrink the step.
+        assert integrator.substeps == 1
+        assert integrator.step >= step
+
+    def test_tolerance_tradeoff(self) -> None:
+        counts: list[int] = []
+
+        for rtol in (1e-3, 1e-6, 1e-9):
+            integrator: AdaptiveIntegrator = AdaptiveIntegrator(
+                second_order(_kepler), rtol=rtol, atol=rtol * 1e-3
+            )
+            integrator.advance(_orbit(0.95), 0.0, 10.0)
+            counts.append(integrator.accepted)
+
+        assert counts == sorted(counts)
+        assert counts[0] < counts[-1]
+
+    def test_rejections(self) -> None:
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(
+            second_order(_kepler), rtol=1e-6
+        )
+        integrator.step = 1.0
+        integrator.advance(_orbit(0.95), 0.0, 5.0)
+        assert integrator.rejected > 0
+        integrator.reset_stats()
+        assert (
+            integrator.accepted,
+            integrator.rejected,
+            integrator.substeps,
+            integrator.evaluations,
+        ) == (0, 0, 0, 0)
+
+    def test_stiff_spring(self) -> None:
+        stiffness: float = 1e4
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(
+            second_order(lambda t, positions, velocities: -stiffness * positions),
+            rtol=1e-6,
+            atol=1e-9,
+        )
+        state: np.ndarray = np.array([[[1.0, 0.0], [0.0, 0.5]], [[0.0] * 2] * 2])
+        energy: float = float(np.sum(stiffness * state[0] ** 2 + state[1] ** 2))
+
+        for frame in range(10):
+            state = integrator.advance(state, frame / 60, 1 / 60)
+
+        assert np.all(np.isfinite(state))
+        assert float(
+            np.sum(stiffness * state[0] ** 2 + state[1] ** 2)
+        ) == pytest.approx(energy, rel=1e-4)
+
+    def test_max_step(self) -> None:
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(_decay, max_step=0.1)
+        integrator.advance(np.ones(3), 0.0, 1.0)
+        assert integrator.substeps >= 10
+
+    @pytest.mark.parametrize("duration", [0.0, -1.0])
+    def test_advance_nothing(self, duration: float) -> None:
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(_decay)
+        assert integrator.advance([1.0, 2.0], 0.0, duration).tolist() == [1.0, 2.0]
+        assert integrator.evaluations == 0
+
+    def test_advance_zero_state(self) -> None:
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(_decay)
+        assert integrator.advance(np.zeros(2), 0.0, 1.0).tolist() == [0.0, 0.0]
+        assert integrator.advance(np.empty(0), 1.0, 1.0).shape == (0,)
+
+    def test_advance_max_substeps(self) -> None:
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(_decay, max_substeps=2)
+        integrator.step = 0.1
+
+        with pytest.raises(RuntimeError):
+            integrator.advance(np.ones(2), 0.0, 1.0)
+
+    def test_advance_min_step(self) -> None:
+        integrator: AdaptiveIntegrator = AdaptiveIntegrator(
+            lambda t, state: np.full_like(state, np.nan), min_step=1e-3
+        )
+        integrator.step = 0.1
+
+        with pytest.raises(RuntimeError):
+            integrator.advance(np.ones(2), 0.0, 1.0)
@@ -0,0 +1,208 @@
+from typing import Any, Callable
+import numpy as np
+import pytest
+from pysics.molecular import LennardJones, NeighbourList, minimum_image, wrap
+
+
+@pytest.fixture
+def particles() -> np.ndarray:
+    # A jittered lattice, so no two particles start too close.
+    rng: np.random.Generator = np.random.default_rng(3)
+    grid: np.ndarray = np.stack(
+        np.meshgrid(np.arange(20), np.arange(16), indexing="ij"), axis=-1
+    ).reshape(-1, 2)
+    return (grid + 0.5) * 1.1 + rng.uniform(-0.15, 0.15, size=grid.shape)
+
+
+def _brute_pairs(positions: np.ndarray, box: np.ndarray, reach: float) -> set:
+    first, second = np.triu_indices(len(positions), 1)
+    delta: np.ndarray = minimum_image(positions[first] - positions[second], box)
+    close: np.ndarray = np.hypot(delta[:, 0], delta[:, 1]) < reach
+    return set(zip(first[close].tolist(), second[close].tolist()))
+
+
+def _listed(neighbours: NeighbourList) -> set:
+    pairs: set = set()
+
+    for i, j in zip(neighbours.first.tolist(), neighbours.second.tolist()):
+        assert i != j
+        pairs.add((min(i, j), max(i, j)))
+
+    assert len(pairs) == len(neighbours.first)
+    return pairs
+
+
+@pytest.mark.unit
+class TestHelpers:
+    def test_minimum_image(self) -> None:
+        delta: np.ndarray = np.array([[4.0, -4.0], [6.0, 1.0], [-9.0, 11.0]])
+        assert minimum_image(delta, (10.0, 20.0)) == pytest.approx(
+            np.array([[4.0, -4.0], [-4.0, 1.0], [1.0, -9.0]])
+        )
+        assert minimum_image(np.array([7.0, -7.0]), 10.0) == pytest.approx([-3.0, 3.0])
+
+    def test_wrap(self) -> None:
+        positions: np.ndarray = np.array([[-1.0, 25.0], [3.0, 4.0]])
+        assert wrap(positions, (10.0, 20.0)) == pytest.approx(
+            np.array([[9.0, 5.0], [3.0, 4.0]])
+        )
+
+
+@pytest.mark.unit
+class TestNeighbourList:
+    @pytest.mark.parametrize(
+        "args, kwargs, expected",
+        [
+            (
+                (2.5, 10.0),
+                dict(),
+                dict(
+                    cutoff=(..., 2.5),
+                    skin=(..., 0.3),
+                    builds=(int, 0),
+                ),
+            ),
+            (
+                (1.0, (8.0, 12.0)),
+                dict(skin=0.0),
+                dict(cutoff=(..., 1.0), skin=(..., 0.0)),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        args: Any,
+        kwargs: Any,
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        neighbours: NeighbourList = NeighbourList(*args, **kwargs)
+        assert_getattr(neighbours, expected)
+        assert neighbours.box.tolist() == list(np.broadcast_to(args[1], (2,)))
+
+    @pytest.mark.parametrize(
+        "args, kwargs",
+        [
+            ((0.0, 10.0), dict()),
+            ((1.0, 10.0), dict(skin=-0.1)),
+            ((2.5, (10.0, 5.0)), dict()),
+        ],
+    )
+    def test_init_invalid(self, args: Any, kwargs: Any) -> None:
+        with pytest.raises(ValueError):
+            NeighbourList(*args, **kwargs)
+
+    @pytest.mark.parametrize("cutoff, skin", [(2.5, 0.3), (1.2, 0.0), (5.0, 0.5)])
+    def test_build(self, cutoff: float, skin: float, particles: np.ndarray) -> None:
+        box: np.ndarray = np.array([22.0, 17.6])
+        neighbours: NeighbourList = NeighbourList(cutoff, box, skin=skin)
+        # Some particles out of the box, which is periodic.
+        positions: np.ndarray = particles + np.where(
+            np.arange(len(particles))[:, None] % 7 == 0, box, 0.0
+        )
+        neighbours.build(positions)
+        assert neighbours.builds == 1
+        assert _listed(neighbours) == _brute_pairs(positions, box, cutoff + skin)
+
+    def test_build_small(self) -> None:
+        positions: np.ndarray = np.array([[0.5, 0.5], [4.5, 4.5], [2.0, 4.0]])
+        neighbours: NeighbourList = NeighbourList(1.5, 5.0, skin=0.5)
+        neighbours.build(positions)
+        assert _listed(neighbours) == {(0, 1)}
+
+    def test_build_empty(self) -> None:
+        neighbours: NeighbourList = NeighbourList(1.0, 10.0)
+        neighbours.build(np.empty((0, 2)))
+        assert len(neighbours.first) == len(neighbours.second) == 0
+
+    def test_update(self, particles: np.ndarray) -> None:
+        neighbours: NeighbourList = NeighbourList(2.5, (22.0, 17.6), skin=0.4)
+        assert neighbours.update(particles)
+        # Moving by less than half the skin keeps the list.
+        assert not neighbours.update(particles + [0.19, 0.0])
+        assert neighbours.update(particles + [0.21, 0.0])
+        assert neighbours.builds == 2
+        # Crossing the periodic boundary is not a large move.
+        assert not neighbours.update(particles + [22.21, -17.6])
+        assert neighbours.update(particles[:-1])
+        assert neighbours.builds == 3
+
+    def test_pairs(self, particles: np.ndarray) -> None:
+        box: np.ndarray = np.array([22.0, 17.6])
+        neighbours: NeighbourList = NeighbourList(2.5, box, skin=0.4)
+        neighbours.build(particles)
+        moved: np.ndarray = particles + np.random.default_rng(1).uniform(
+            -0.1, 0.1, size=particles.shape
+        )
+        first, second, delta, dist2 = neighbours.pairs(moved)
+        assert neighbours.builds == 1
+        assert set(
+            zip(np.minimum(first, second).tolist(), np.maximum(first, second).tolist())
+        ) == _brute_pairs(moved, box, 2.5)
+        assert delta == pytest.approx(minimum_image(moved[first] - moved[second], box))
+        assert dist2 == pytest.approx((delta**2).sum(axis=1))
+
+
+@pytest.mark.unit
+class TestLennardJones:
+    def test_init(self, assert_getattr: Callable[..., None]) -> None:
+        potential: LennardJones = LennardJones(20.0, sigma=2.0)
+        assert_getattr(
+            potential,
+            dict(
+                epsilon=(..., 1.0),
+                sigma=(..., 2.0),
+                cutoff=(..., 5.0),
+                shift=(..., True),
+                energy=(..., 0.0),
+                neighbours=(NeighbourList, ...),
+            ),
+        )
+        assert potential.neighbours.cutoff == 5.0
+
+    @pytest.mark.parametrize("shift", [True, False])
+    def test_pair(self, shift: bool) -> None:
+        potential: LennardJones = LennardJones(10.0, epsilon=2.0, shift=shift)
+        minimum: float = 2 ** (1 / 6)
+        forces: np.ndarray = potential.forces(
+            np.array([[1.0, 1.0], [1.0 + minimum, 1.0]])
+        )
+        assert forces == pytest.approx(np.zeros((2, 2)), abs=1e-12)
+        cut6: float = 2.5**-6
+        offset: float = 8.0 * (cut6 * cut6 - cut6) if shift else 0.0
+        assert potential.energy == pytest.approx(-2.0 - offset)
+        # Repelled at sigma, across the periodic boundary.
+        forces = potential.forces(np.array([[0.5, 3.0], [9.5, 3.0]]))
+        assert forces == pytest.approx(np.array([[48.0, 0.0], [-48.0, 0.0]]))
+
+    def test_forces(self, particles: np.ndarray) -> None:
+        potential: LennardJones = LennardJones((22.0, 17.6))
+        forces: np.ndarray = potential.forces(particles)
+        assert forces.sum(axis=0) == pytest.approx([0.0, 0.0], abs=1e-9)
+
+        # The forces are the negative gradient of the energy.
+        step: float = 1e-6
+
+        for particle in (0, 17, 200):
+            for axis in range(2):
+                moved: np.ndarray = particles.copy()
+                moved[particle, axis] += step
+                potential.forces(moved)
+                high: float = potential.energy
+                moved[particle, axis] -= 2 * step
+                potential.forces(moved)
+                low: float = potential.energy
+                assert forces[particle, axis] == pytest.approx(
+                    (low - high) / (2 * step), rel=1e-4, abs=1e-6
+                )
+
+    @pytest.mark.parametrize("masses", [2.0, np.full(320, 2.0)])
+    def test_accelerations(self, masses: Any, particles: np.ndarray) -> None:
+        potential: LennardJones = LennardJones((22.0, 17.6))
+        forces: np.ndarray = potential.forces(particles)
+        assert potential.accelerations(particles, masses) == pytest.approx(forces / 2)
+
+    def test_empty(self) -> None:
+        potential: LennardJones = LennardJones(10.0)
+        assert potential.forces(np.empty((0, 2))).shape == (0, 2)
+        assert potential.energy == 0.0
@@ -0,0 +1,157 @@
+from typing import Any, Callable
+import numpy as np
+import pytest
+from pysics.nbody import BarnesHut, _spread_bits
+
+
+@pytest.fixture
+def bodies() -> tuple[np.ndarray, np.ndarray]:
+    rng: np.random.Generator = np.random.default_rng(7)
+    return rng.normal(size=(500, 2)) * 100, rng.random(500) + 0.5
+
+
+@pytest.mark.unit
+class TestHelpers:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [(0, 0), (1, 1), (0b11, 0b101), (0b1011, 0b1000101), (0xFFFF, 0x55555555)],
+    )
+    def test_spread_bits(self, value: int, expected: int) -> None:
+        assert _spread_bits(np.array([value]))[0] == expected
+
+
+@pytest.mark.unit
+class TestBarnesHut:
+    @pytest.mark.parametrize(
+        "args, kwargs, expected",
+        [
+            (
+                (),
+                dict(),
+                dict(
+                    theta=(..., 0.5),
+                    gravity=(..., 1.0),
+                    softening=(..., 0.0),
+                    leaf_size=(..., 8),
+                    max_depth=(..., 20),
+                    exact=(..., False),
+                    builds=(..., 0),
+                ),
+            ),
+            (
+                (0.8,),
+                dict(gravity=2.0, softening=0.1, leaf_size=1, exact=True),
+                dict(
+                    theta=(..., 0.8),
+                    gravity=(..., 2.0),
+                    softening=(..., 0.1),
+                    leaf_size=(..., 1),
+                    exact=(..., True),
+                ),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        args: Any,
+        kwargs: Any,
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        solver: BarnesHut = BarnesHut(*args, **kwargs)
+        assert_getattr(solver, expected)
+
+    @pytest.mark.parametrize(
+        "args, kwargs",
+        [((-0.1,), dict()), ((), dict(max_depth=0)), ((), dict(max_depth=33))],
+    )
+    def test_init_invalid(self, args: Any, kwargs: Any) -> None:
+        with pytest.raises(ValueError):
+            BarnesHut(*args, **kwargs)
+
+    def test_exact(self) -> None:
+        positions: np.ndarray = np.array([[0.0, 0.0], [2.0, 0.0], [0.0, 1.0]])
+        masses: np.ndarray = np.array([1.0, 4.0, 2.0])
+        acc: np.ndarray = BarnesHut(exact=True, gravity=2.0).accelerations(
+            positions, masses
+        )
+        assert acc[0] == pytest.approx([2.0 * 4.0 / 4.0, 2.0 * 2.0])
+        assert (acc * masses[:, None]).sum(axis=0) == pytest.approx([0.0, 0.0])
+
+    @pytest.mark.parametrize(
+        "theta, leaf_size, tolerance",
+        [(0.0, 8, 1e-12), (0.0, 1, 1e-12), (0.3, 4, 1e-2), (0.6, 8, 3e-2)],
+    )
+    def test_accuracy(
+        self,
+        theta: float,
+        leaf_size: int,
+        tolerance: float,
+        bodies: tuple[np.ndarray, np.ndarray],
+    ) -> None:
+        positions, masses = bodies
+        reference: np.ndarray = BarnesHut(exact=True, softening=1.0).accelerations(
+            positions, masses
+        )
+        acc: np.ndarray = BarnesHut(
+            theta, softening=1.0, leaf_size=leaf_size
+        ).accelerations(positions, masses)
+        errors: np.ndarray = np.linalg.norm(acc - reference, axis=1) / np.linalg.norm(
+            reference, axis=1
+        )
+        assert np.median(errors) < tolerance
+
+    def test_build(self, bodies: tuple[np.ndarray, np.ndarray]) -> None:
+        positions, masses = bodies
+        solver: BarnesHut = BarnesHut(leaf_size=4)
+        solver.build(positions, masses)
+        counts: np.ndarray = solver._end - solver._start
+        assert solver.builds == 1
+        assert solver._mass[0] == pytest.approx(masses.sum())
+        assert counts[solver._is_leaf].sum() == len(positions)
+        assert (counts[solver._is_leaf] <= 4).all()
+        assert sorted(solver._order.tolist()) == list(range(len(positions)))
+
+        for node in np.flatnonzero(~solver._is_leaf):
+            children: np.ndarray = solver._children[node]
+            children = children[children >= 0]
+            assert counts[children].sum() == counts[node]
+            assert (solver._parent[children] == node).all()
+
+    def test_reuse(self, bodies: tuple[np.ndarray, np.ndarray]) -> None:
+        positions, masses = bodies
+        solver: BarnesHut = BarnesHut()
+        solver.accelerations(positions, masses)
+        solver.accelerations(positions + 0.01, masses)
+        assert solver.builds == 1
+        solver.accelerations(positions * 3, masses)
+        assert solver.builds == 2
+        solver.accelerations(positions[:-1], masses[:-1])
+        assert solver.builds == 3
+
+    def test_refit(self, bodies: tuple[np.ndarray, np.ndarray]) -> None:
+        positions, masses = bodies
+        solver: BarnesHut = BarnesHut()
+        solver.build(positions, masses)
+        assert solver.refit(positions + 5.0, masses)
+        assert solver._com[0] == pytest.approx(
+            (positions + 5.0).T @ masses / masses.sum()
+        )
+        assert not solver.refit(positions[:-1], masses[:-1])
+
+    def test_empty(self) -> None:
+        solver: BarnesHut = BarnesHut()
+        acc: np.ndarray = solver.accelerations(np.empty((0, 2)), np.empty(0))
+        assert acc.shape == (0, 2)
+        solver.build(np.empty((0, 2)), np.empty(0))
+        assert solver.node_count == 0
+
+    def test_max_depth(self, bodies: tuple[np.ndarray, np.ndarray]) -> None:
+        positions, masses = bodies
+        solver: BarnesHut = BarnesHut(0.0, max_depth=2, softening=1.0)
+        acc: np.ndarray = solver.accelerations(positions, masses)
+        reference: np.ndarray = BarnesHut(exact=True, softening=1.0).accelerations(
+            positions, masses
+        )
+        assert solver.node_count <= 1 + 4 + 16
+        assert acc == pytest.approx(reference)
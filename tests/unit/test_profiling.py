@@ -0,0 +1,161 @@
+import gc
+import sys
+import tracemalloc
+from typing import Any, Iterator
+import pytest
+from pytest_mock import MockerFixture
+from pysics import profiling
+from pysics.profiling import FrameMemory, LineAllocation, MemoryProfiler
+from pysics.shapes import BaseShape
+
+
+class _Blob(BaseShape):
+    def _render(self) -> None:
+        self.data: bytearray = bytearray(20_000)
+
+
+@pytest.fixture
+def profiler() -> Iterator[MemoryProfiler]:
+    profiler: MemoryProfiler = MemoryProfiler(top=3, history=2)
+    yield profiler
+    profiler.stop()
+
+
+@pytest.mark.unit
+class TestMemoryProfiler:
+    def test_init(self) -> None:
+        profiler: MemoryProfiler = MemoryProfiler()
+        assert profiler.top == 10
+        assert profiler.depth == 16
+        assert profiler.frames.maxlen == 600
+        assert not tracemalloc.is_tracing()
+
+    def test_start_stop(self, profiler: MemoryProfiler) -> None:
+        callbacks: int = len(gc.callbacks)
+
+        with profiler:
+            profiler.start()
+            assert tracemalloc.is_tracing()
+            assert tracemalloc.get_traceback_limit() == 16
+            assert len(gc.callbacks) == callbacks + 1
+
+        assert not tracemalloc.is_tracing()
+        assert len(gc.callbacks) == callbacks
+        profiler.stop()
+
+    def test_start_tracing(self, profiler: MemoryProfiler) -> None:
+        tracemalloc.start()
+        profiler.start()
+        profiler.stop()
+        assert tracemalloc.is_tracing()
+        tracemalloc.stop()
+
+    def test_frame(self, profiler: MemoryProfiler) -> None:
+        kept: list[Any] = []
+        profiler.begin_frame(7)
+        kept.append(_Blob(0, 0))
+        kept.append(bytearray(5_000))
+        bytearray(100_000)
+        kept.append(_Blob(0, 0, stroke=128))
+        memory: FrameMemory = profiler.end_frame()
+        assert memory.frame == 7
+        assert list(profiler.frames) == [memory]
+        assert memory.classes["_Blob"] >= 40_000
+        # The color built by the base constructor.
+        assert memory.classes["BaseShape"] > 0
+        assert memory.size >= 25_000
+        assert memory.count >= 2
+        assert memory.peak >= 100_000
+        assert len(memory.lines) == 3
+        blob, other = sorted(memory.lines[:3], key=lambda line: line.lineno)[:2]
+        assert isinstance(blob, LineAllocation)
+        assert blob.filename == other.filename == __file__
+        assert 20_000 <= blob.size < 25_000
+        assert 5_000 <= other.size < 20_000
+        assert other.lineno == blob.lineno + 1
+
+    def test_late_class(self, profiler: MemoryProfiler) -> None:
+        profiler.start()
+
+        class _Late(BaseShape):
+            def _render(self) -> None:
+                self.data: bytearray = bytearray(10_000)
+
+        kept: list[Any] = []
+        profiler.begin_frame(0)
+        kept.append(_Late(0, 0))
+        memory: FrameMemory = profiler.end_frame()
+        assert memory.classes["_Late"] >= 10_000
+        assert _Late in profiler._located
+
+    def test_gc(self, profiler: MemoryProfiler) -> None:
+        profiler.begin_frame(0)
+        gc.collect()
+        memory: FrameMemory = profiler.end_frame()
+        assert memory.collections[2] >= 1
+        assert memory.gc_time > 0.0
+        profiler.begin_frame(1)
+        assert profiler._collections == [0, 0, 0]
+        assert profiler._gc_time == 0.0
+
+    def test_gc_interrupted(self, profiler: MemoryProfiler) -> None:
+        profiler._on_gc("stop", dict(generation=0))
+        assert profiler._collections == [0, 0, 0]
+
+    def test_end_frame_invalid(self, profiler: MemoryProfiler) -> None:
+        with pytest.raises(RuntimeError):
+            profiler.end_frame()
+
+    @pytest.mark.parametrize(
+        "platform, module, expected",
+        [("linux", True, 1024 * 50), ("darwin", True, 50), ("win32", False, None)],
+    )
+    def test_rss(
+        self,
+        platform: str,
+        module: bool,
+        expected: int | None,
+        mocker: MockerFixture,
+    ) -> None:
+        resource: Any = None
+
+        if module:
+            resource = mocker.MagicMock()
+            resource.getrusage.return_value.ru_maxrss = 50
+
+        mocker.patch.dict(sys.modules, resource=resource)
+        mocker.patch.object(profiling.sys, "platform", platform)
+        assert MemoryProfiler._peak_rss() == expected
+
+    def test_class_ranges(self) -> None:
+        ranges: dict[str, list[tuple[int, int, str]]] = MemoryProfiler._class_ranges()
+        names: set[str] = {name for spans in ranges.values() for *_, name in spans}
+        assert {"BaseShape", "Circle", "BaseBatch", "Points", "_Blob"} <= names
+        first: int = _Blob._render.__code__.co_firstlineno
+        assert (first, first + 1, "_Blob") in ranges[__file__]
+
+    def test_summary(self, profiler: MemoryProfiler) -> None:
+        assert profiler.summary() == dict(
+            frames=0,
+            mean_size=0.0,
+            max_size=0,
+            max_peak=0,
+            collections=(0, 0, 0),
+            gc_time=0.0,
+            rss=None,
+            classes={},
+            lines={},
+        )
+        kept: list[Any] = []
+
+        for frame in range(3):
+            profiler.begin_frame(frame)
+            kept.append(_Blob(0, 0))
+            profiler.end_frame()
+
+        summary: dict[str, Any] = profiler.summary()
+        assert summary["frames"] == 2
+        assert summary["classes"]["_Blob"] >= 40_000
+        assert summary["max_size"] >= 20_000
+        assert summary["rss"] > 0
+        assert next(iter(summary["lines"])).startswith(f"{__file__}:")
@@ -1,13 +1,22 @@
 from datetime import datetime
+from pathlib import Path
 from time import time
 from typing import Any, Callable, ClassVar
 from unittest.mock import ANY, MagicMock
+import numpy as np
 import pytest
 from pytest_mock import MockerFixture
 from freezegun import freeze_time
 import glfw
 from glfw.GLFW import GLFW_SAMPLES
+from pysics.batches import VectorField
+from pysics.constraints import ConstraintSolver
+from pysics.camera import Camera
+from pysics.profiling import MemoryProfiler
 from pysics.pysics import Pysics, Canvas
+from pysics.quality import QualityGovernor, QualityLevel
+from pysics.shapes import Ellipse
+from pysics.spatial import ShapeIndex
 from pysics.types import Color
 from pysics._wrappers import (
     gl,
@@ -73,6 +82,15 @@ class TestCanvas:
         assert_getattr(canvas, expected)
         init_window_mock.assert_called_once()
 
+    @pytest.mark.parametrize("profile, called", [(None, False), ("debug", True)])
+    def test_init_profile(
+        self, profile: str | None, called: bool, mocker: MockerFixture
+    ) -> None:
+        mocker.patch.object(Canvas, "_init_window")
+        set_profile_mock: MagicMock = mocker.patch("pysics.pysics.set_profile")
+        Canvas(200, 200, profile=profile)
+        assert set_profile_mock.called is called
+
     @pytest.mark.parametrize(
         "init_ret, crw_ret, throwable",
         [
@@ -95,6 +113,10 @@ class TestCanvas:
         mocker.patch.object(glfw, "get_framebuffer_size", lambda _: (400, 400))
         glfw_fsize_spy: MagicMock = mocker.spy(glfw, "get_framebuffer_size")
         glfw_ctx_mock: MagicMock = mocker.patch.object(glfw, "make_context_current")
+        glfw_resize_mock: MagicMock = mocker.patch.object(
+            glfw, "set_framebuffer_size_callback"
+        )
+        gl_invalidate_mock: MagicMock = mocker.patch.object(gl, "invalidate")
         gl_enable_mock: MagicMock = mocker.patch.object(gl, "enable")
         gl_blend_mock: MagicMock = mocker.patch.object(gl, "blend_func")
         glfw_wh_mock: MagicMock = mocker.patch.object(glfw, "window_hint")
@@ -115,16 +137,18 @@ class TestCanvas:
             )
             glfw_fsize_spy.assert_called_once()
             glfw_ctx_mock.assert_called_once()
+            glfw_resize_mock.assert_called_once_with(canvas._window, canvas._on_resize)
+            gl_invalidate_mock.assert_called_once_with()
             gl_enable_mock.assert_called()
-            glfw_wh_mock.assert_called_once_with(GLFW_SAMPLES, canvas._SAMPLES)
+            # The window framebuffer is never multisampled, so it can be blitted in.
+            glfw_wh_mock.assert_called_once_with(GLFW_SAMPLES, 0)
             gl_blend_mock.assert_called_once_with(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
             assert isinstance(canvas._window, self._FakeWindow)
             assert canvas.width, canvas.height == (400, 400)
 
     def test_clear_window(self, mocker: MockerFixture) -> None:
         mocker.patch.object(Canvas, "_init_window")
-        mocker.patch.object(glfw, "get_framebuffer_size", lambda _: (400, 400))
-        glfw_fsize_spy: MagicMock = mocker.spy(glfw, "get_framebuffer_size")
+        mocker.patch("pysics.pysics.RenderTarget")
         gl_clearc_mock: MagicMock = mocker.patch.object(gl, "clear_color")
         gl_viewport_mock: MagicMock = mocker.patch.object(gl, "viewport")
         gl_matrix_mock: MagicMock = mocker.patch.object(gl, "matrix_mode")
@@ -133,14 +157,104 @@ class TestCanvas:
         gl_clear_mock: MagicMock = mocker.patch.object(gl, "clear")
         canvas: Canvas = Canvas(200, 200)
         canvas._clear_window()
-        glfw_fsize_spy.assert_called_once_with(canvas._window)
         gl_clearc_mock.assert_called_once_with(*canvas.background.ratios)
-        gl_viewport_mock.assert_called_once_with(0, 0, canvas.width, canvas.height)
-        gl_matrix_mock.call_count == 2
-        gl_load_mock.call_count == 3
-        gl_ortho_mock.assert_called_once_with(0, canvas.width, 0, canvas.height, 0, 1)
+        gl_viewport_mock.assert_called_once_with(0, 0, 200, 200)
+        assert gl_matrix_mock.call_count == 2
+        assert gl_load_mock.call_count == 2
+        gl_ortho_mock.assert_called_once_with(0, 200, 0, 200, 0, 1)
         gl_clear_mock.assert_called_once_with(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        assert canvas.width, canvas.height == (400, 400)
+
+        # Nothing changed, the projection is kept.
+        canvas._clear_window()
+        assert gl_clear_mock.call_count == 2
+        assert gl_viewport_mock.call_count == 1
+        assert gl_load_mock.call_count == 3
+
+        canvas._on_resize(canvas._window, 400, 300)
+        canvas._clear_window()
+        assert (canvas.width, canvas.height) == (400, 300)
+        gl_viewport_mock.assert_called_with(0, 0, 400, 300)
+        gl_ortho_mock.assert_called_with(0, 400, 0, 300, 0, 1)
+
+    def test_clear_window_camera(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(Canvas, "_init_window")
+        mocker.patch("pysics.pysics.RenderTarget")
+        for name in ("clear_color", "clear", "viewport", "matrix_mode", "ortho"):
+            mocker.patch.object(gl, name)
+        gl_load_mock: MagicMock = mocker.patch.object(gl, "load_identity")
+        gl_matrix_mock: MagicMock = mocker.patch.object(gl, "load_matrix_d")
+        camera: Camera = Camera(10, 20, zoom=2)
+        canvas: Canvas = Canvas(200, 100, camera=camera)
+        assert canvas.camera is camera
+        canvas._clear_window()
+        # The identity is only loaded for the projection.
+        assert gl_load_mock.call_count == 1
+        matrix: np.ndarray = gl_matrix_mock.call_args.args[0]
+        assert matrix.tolist() == camera.gl_matrix(200, 100).tolist()
+        # The vector fields are thinned for the zoom of the camera.
+        assert VectorField.zoom == 2
+        canvas.camera = None
+        canvas._clear_window()
+        assert VectorField.zoom == 1.0
+
+    def test_mouse(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(Canvas, "_init_window")
+        mocker.patch.object(glfw, "get_cursor_pos", return_value=(50.0, 25.0))
+        mocker.patch.object(glfw, "get_window_size", return_value=(100, 50))
+        canvas: Canvas = Canvas(200, 100)
+        # The cursor is in window coordinates, from the top left corner.
+        assert canvas.mouse() == (100.0, 50.0)
+        canvas.camera = Camera(10, 20, zoom=2)
+        assert canvas.mouse() == (10.0, 20.0)
+
+    def test_pick(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(Canvas, "_init_window")
+        mocker.patch.object(Canvas, "mouse", return_value=(5.0, 5.0))
+        canvas: Canvas = Canvas(200, 100)
+        index: ShapeIndex = ShapeIndex()
+        index.insert("bottom", (0, 0, 10, 10))
+        index.insert("top", (4, 4, 6, 6))
+        assert canvas.pick(index) == "top"
+        assert canvas.pick(index, 1, 1) == "bottom"
+        assert canvas.pick(index, 50, 50) is None
+
+    def test_set_quality(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(Canvas, "_init_window")
+        canvas: Canvas = Canvas(200, 200)
+        assert (canvas.render_scale, canvas.samples) == (1.0, canvas._SAMPLES)
+        canvas._resized = False
+        canvas.set_quality(0.5)
+        assert (canvas.render_scale, canvas.samples) == (0.5, canvas._SAMPLES)
+        assert canvas._resized
+        canvas.set_quality(samples=0)
+        assert (canvas.render_scale, canvas.samples) == (0.5, 0)
+
+    def test_clear_window_offscreen(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(Canvas, "_init_window")
+        for name in ("clear_color", "clear", "matrix_mode", "load_identity", "ortho"):
+            mocker.patch.object(gl, name)
+        gl_viewport_mock: MagicMock = mocker.patch.object(gl, "viewport")
+        target_mock: MagicMock = mocker.patch("pysics.pysics.RenderTarget")
+        canvas: Canvas = Canvas(200, 100)
+        canvas.set_quality(0.5, 0)
+        canvas._clear_window()
+        target_mock.return_value.resize.assert_called_once_with(100, 50, 0)
+        target_mock.return_value.bind.assert_called_once()
+        gl_viewport_mock.assert_called_once_with(0, 0, 100, 50)
+
+        canvas._present()
+        target_mock.return_value.present.assert_called_once_with(200, 100)
+
+        # The native quality is also rendered offscreen with the MSAA samples,
+        # then resolved into the single-sampled window.
+        canvas.set_quality(1.0, canvas._SAMPLES)
+        canvas._clear_window()
+        target_mock.assert_called_once()
+        target_mock.return_value.resize.assert_called_with(200, 100, canvas._SAMPLES)
+        target_mock.return_value.delete.assert_not_called()
+        gl_viewport_mock.assert_called_with(0, 0, 200, 100)
+        canvas._present()
+        assert target_mock.return_value.present.call_count == 2
 
     def test_swap_buffers(self, mocker: MockerFixture) -> None:
         mocker.patch.object(Canvas, "_init_window")
@@ -165,9 +279,13 @@ class TestPysics:
                 (),
                 dict(
                     canvas=(..., None),
+                    frame_count=(..., 0),
                     _loop=(..., False),
                     _delay=(..., 0.0),
                     _tref=(..., None),
+                    _tracked=(..., {}),
+                    _checkpoints=(..., None),
+                    _checkpoint_sequence=(..., 0),
                 ),
             ),
             (
@@ -194,19 +312,19 @@ class TestPysics:
                 (200, 200),
                 dict(),
                 (200, 200),
-                dict(background=0),
+                dict(background=0, profile=None, camera=None),
             ),
             (
                 (200, 200),
                 dict(background=255),
                 (200, 200),
-                dict(background=255),
+                dict(background=255, profile=None, camera=None),
             ),
             (
                 (200, 200),
                 dict(background=Color.from_unit(120)),
                 (200, 200),
-                dict(background=Color.from_unit(120)),
+                dict(background=Color.from_unit(120), profile=None, camera=None),
             ),
         ],
     )
@@ -284,6 +402,7 @@ class TestPysics:
         if with_canvas:
             mocker.patch.object(Canvas, "_init_window")
             clear_mock: MagicMock = mocker.patch.object(Canvas, "_clear_window")
+            mocker.patch.object(Canvas, "_present")
             swap_mock: MagicMock = mocker.patch.object(Canvas, "_swap_buffers")
             canvas = Canvas(200, 200)
 
@@ -308,6 +427,7 @@ class TestPysics:
             glfw_term_mock.assert_called_once()
             assert self._CALLBACK_ITERATION == loop_stop
             assert self._LOOP_ITERATION == loop_iterations
+            assert engine.frame_count == loop_stop
 
     def test_no_loop(self) -> None:
         engine: Pysics = Pysics()
@@ -315,8 +435,180 @@ class TestPysics:
         engine.no_loop()
         assert engine._loop == False
 
+    def test_govern(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(Ellipse, "tessellation", 1.0)
+        canvas_mock: MagicMock = MagicMock()
+        Pysics(canvas_mock)._govern(1.0)
+        levels: tuple[QualityLevel, ...] = (QualityLevel(), QualityLevel(0.5, 0, 0.25))
+        governor: QualityGovernor = QualityGovernor(10.0, levels=levels, window=2)
+        engine: Pysics = Pysics(canvas_mock, governor=governor)
+        assert engine.governor is governor
+        engine._govern(1.0)
+        canvas_mock.set_quality.assert_not_called()
+        engine._govern(1.0)
+        canvas_mock.set_quality.assert_called_once_with(0.5, 0)
+        assert Ellipse.tessellation == 0.25
+
     def test_wait(self) -> None:
         engine: Pysics = Pysics()
         engine._delay = 0.0
         engine.wait(10)
         assert engine._delay == 10
+
+    def test_seed(self) -> None:
+        first: Pysics = Pysics(seed=42)
+        second: Pysics = Pysics(seed=42)
+        assert isinstance(first.rng, np.random.Generator)
+        assert first.rng.random() == second.rng.random()
+
+    def test_track(self) -> None:
+        engine: Pysics = Pysics()
+        solver: ConstraintSolver = ConstraintSolver([[0, 0]])
+        engine.track("cloth", solver)
+        assert engine._tracked == dict(cloth=solver)
+
+        with pytest.raises(TypeError):
+            engine.track("other", object())
+
+    @freeze_time(datetime.fromtimestamp(1660681241.0))
+    def test_snapshot_restore(self, tmp_path: Path) -> None:
+        path: Path = tmp_path / "run.snapshot"
+        engine: Pysics = Pysics(seed=1)
+        solver: ConstraintSolver = ConstraintSolver([[0, 0], [1, 0]])
+        solver.add_constraints(0, 1)
+        engine.track("rope", solver)
+        engine._loop = True
+        engine._delay = 0.5
+        engine._tref = time() - 0.25
+        engine.frame_count = 12
+        engine.snapshot(path)
+        expected: float = engine.rng.random()
+        solver.step(1.0)
+
+        restored_solver: ConstraintSolver = ConstraintSolver([[5, 5]])
+        restored: Pysics = Pysics(seed=2)
+        restored.track("rope", restored_solver)
+        restored.restore(path)
+        assert restored._loop is True
+        assert restored._delay == 0.5
+        assert restored._tref == time() - 0.25
+        assert restored.frame_count == 12
+        assert restored.rng.random() == expected
+        assert restored_solver.positions.tolist() == [[0, 0], [1, 0]]
+        assert restored_solver.pairs.tolist() == [[0, 1]]
+
+    def test_restore_missing(self, tmp_path: Path) -> None:
+        path: Path = tmp_path / "run.snapshot"
+        Pysics().snapshot(path)
+        engine: Pysics = Pysics()
+        engine.track("rope", ConstraintSolver([[0, 0]]))
+
+        with pytest.raises(KeyError):
+            engine.restore(path)
+
+        engine._tracked.clear()
+        engine.restore(path)
+        assert engine._tref is None
+
+    def test_checkpoint_every(self, tmp_path: Path) -> None:
+        directory: Path = tmp_path / "checkpoints"
+        engine: Pysics = Pysics()
+        assert engine.checkpoints() == []
+        engine.checkpoint_every(2, directory, keep=2)
+        assert directory.is_dir()
+
+        for _ in range(9):
+            engine.frame_count += 1
+            engine._auto_checkpoint()
+
+        assert [path.name for path in engine.checkpoints()] == [
+            "checkpoint-0000000002-0000000006.snapshot",
+            "checkpoint-0000000003-0000000008.snapshot",
+        ]
+        engine.checkpoint_every(0, directory)
+        assert engine._checkpoints is None
+        engine._auto_checkpoint()
+
+    def test_checkpoint_after_restore(self, tmp_path: Path) -> None:
+        directory: Path = tmp_path / "checkpoints"
+        engine: Pysics = Pysics()
+        engine.checkpoint_every(2, directory, keep=2)
+
+        for _ in range(8):
+            engine.frame_count += 1
+            engine._auto_checkpoint()
+
+        engine.restore(engine.checkpoints()[0])
+        assert engine.frame_count == 6
+        engine.frame_count = 2
+        engine._auto_checkpoint()
+        assert [path.name for path in engine.checkpoints()] == [
+            "checkpoint-0000000003-0000000008.snapshot",
+            "checkpoint-0000000004-0000000002.snapshot",
+        ]
+
+        # A new run resumes the sequence of the checkpoints left in the directory.
+        other: Pysics = Pysics()
+        other.checkpoint_every(2, directory, keep=2)
+        other.frame_count = 2
+        other._auto_checkpoint()
+        assert [path.name for path in other.checkpoints()] == [
+            "checkpoint-0000000004-0000000002.snapshot",
+            "checkpoint-0000000005-0000000002.snapshot",
+        ]
+
+    @pytest.mark.parametrize(
+        "frames, unread, exp_calls", [(3, 0, 3), (0, 0, 0), (3, 1, 2)]
+    )
+    def test_run_loop_playback(
+        self, frames: int, unread: int, exp_calls: int, mocker: MockerFixture
+    ) -> None:
+        mocker.patch.object(Canvas, "_init_window")
+        mocker.patch.object(Canvas, "_clear_window")
+        mocker.patch.object(Canvas, "_present")
+        mocker.patch.object(Canvas, "_swap_buffers")
+        mocker.patch.object(glfw, "poll_events")
+        mocker.patch.object(glfw, "terminate")
+        iterations: list[int] = []
+        mocker.patch.object(
+            glfw,
+            "window_should_close",
+            lambda _: iterations.append(0) or len(iterations) > 3,
+        )
+        player: MagicMock = MagicMock()
+        player.__len__.return_value = frames
+        # A subscriber has no frame until one is readable.
+        player.current.side_effect = [None] * unread + [
+            dict(frame=i) for i in range(frames)
+        ]
+        received: list[Any] = []
+        engine: Pysics = Pysics(Canvas(200, 200))
+        engine.run_loop(received.append, playback=player)
+        assert received == [dict(frame=i) for i in range(exp_calls)]
+        assert player.advance.call_count == exp_calls
+        assert engine.frame_count == 3
+
+    def test_run_loop_profiler(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(Canvas, "_init_window")
+        mocker.patch.object(Canvas, "_clear_window")
+        mocker.patch.object(Canvas, "_present")
+        mocker.patch.object(Canvas, "_swap_buffers")
+        mocker.patch.object(glfw, "poll_events")
+        mocker.patch.object(glfw, "terminate")
+        iterations: list[int] = []
+        mocker.patch.object(
+            glfw,
+            "window_should_close",
+            lambda _: iterations.append(0) or len(iterations) > 2,
+        )
+        profiler: MagicMock = MagicMock(spec=MemoryProfiler)
+        calls: list[str] = []
+        profiler.begin_frame.side_effect = lambda frame: calls.append(f"begin {frame}")
+        profiler.end_frame.side_effect = lambda: calls.append("end")
+        governor: MagicMock = MagicMock(spec=QualityGovernor)
+        engine: Pysics = Pysics(Canvas(200, 200), governor=governor)
+        engine.run_loop(lambda: calls.append("draw"), profiler=profiler)
+        assert calls == ["begin 0", "draw", "end", "begin 1", "draw", "end"]
+        profiler.stop.assert_called_once()
+        # The traced frames are too slow to feed the governor.
+        governor.record.assert_not_called()
@@ -0,0 +1,125 @@
+from typing import Any, Callable
+import pytest
+from pysics.quality import QualityChange, QualityGovernor, QualityLevel
+
+_LEVELS: tuple[QualityLevel, ...] = (
+    QualityLevel(1.0, 4, 1.0),
+    QualityLevel(1.0, 0, 0.5),
+    QualityLevel(0.5, 0, 0.25),
+)
+
+
+def _governor(**kwargs: Any) -> QualityGovernor:
+    return QualityGovernor(
+        10.0, levels=_LEVELS, window=4, cooldown=8, max_cooldown=20, **kwargs
+    )
+
+
+def _feed(governor: QualityGovernor, frame_time: float, frames: int) -> list[Any]:
+    return [governor.record(frame_time) for _ in range(frames)]
+
+
+@pytest.mark.unit
+class TestQualityGovernor:
+    @pytest.mark.parametrize(
+        "kwargs, expected",
+        [
+            (
+                dict(),
+                dict(
+                    target_fps=(float, 60.0),
+                    levels=(tuple, QualityGovernor.LEVELS),
+                    downgrade=(float, 1.1),
+                    upgrade=(float, 0.7),
+                    cooldown=(int, 120),
+                    max_cooldown=(int, 1920),
+                    index=(int, 0),
+                    history=(list, []),
+                ),
+            ),
+            (
+                dict(target_fps=30.0, levels=_LEVELS, downgrade=1.5, upgrade=0.5),
+                dict(
+                    target_fps=(float, 30.0),
+                    levels=(tuple, _LEVELS),
+                    downgrade=(float, 1.5),
+                    upgrade=(float, 0.5),
+                ),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        kwargs: dict[str, Any],
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        governor: QualityGovernor = QualityGovernor(**kwargs)
+        assert_getattr(governor, expected)
+        assert governor.budget == pytest.approx(1 / governor.target_fps)
+        assert governor.level == governor.levels[0]
+
+    @pytest.mark.parametrize(
+        "kwargs", [dict(levels=[]), dict(upgrade=1.0, downgrade=1.0)]
+    )
+    def test_init_errors(self, kwargs: dict[str, Any]) -> None:
+        with pytest.raises(ValueError):
+            QualityGovernor(**kwargs)
+
+    def test_within_budget(self) -> None:
+        governor: QualityGovernor = _governor()
+        assert _feed(governor, 0.1, 50) == [None] * 50
+        assert governor.index == 0
+
+    def test_downgrade(self) -> None:
+        governor: QualityGovernor = _governor()
+        received: list[QualityChange] = []
+        governor.subscribe(received.append)
+        changes: list[Any] = _feed(governor, 0.2, 4)
+        assert changes[:3] == [None] * 3
+        assert changes[3] == QualityChange(4, _LEVELS[0], _LEVELS[1], 0.2)
+        assert governor.level == _LEVELS[1]
+        assert received == governor.history == [changes[3]]
+
+        # The window restarts after each change.
+        assert _feed(governor, 0.2, 4)[-1].level == _LEVELS[2]
+        # The cheapest level is kept.
+        assert _feed(governor, 0.2, 8) == [None] * 8
+        assert governor.index == 2
+
+    def test_upgrade_cooldown(self) -> None:
+        governor: QualityGovernor = _governor()
+        _feed(governor, 0.2, 4)
+        changes: list[Any] = _feed(governor, 0.05, 8)
+        # Fast enough from the 4th frame, but the cooldown holds the upgrade.
+        assert changes[:7] == [None] * 7
+        assert changes[7].level == _LEVELS[0]
+
+    def test_hysteresis(self) -> None:
+        governor: QualityGovernor = _governor()
+        # Between the upgrade and downgrade ratios, nothing changes.
+        _feed(governor, 0.2, 4)
+        assert _feed(governor, 0.09, 40) == [None] * 40
+        assert governor.index == 1
+
+    def test_oscillation_backoff(self) -> None:
+        governor: QualityGovernor = _governor()
+        _feed(governor, 0.2, 4)
+        _feed(governor, 0.05, 8)
+        assert governor.index == 0
+        # The upgrade is reverted right away: the cooldown doubles.
+        _feed(governor, 0.2, 4)
+        assert governor.cooldown == 16
+        assert _feed(governor, 0.05, 15) == [None] * 15
+        assert governor.record(0.05).level == _LEVELS[0]
+        _feed(governor, 0.2, 4)
+        assert governor.cooldown == 20
+
+    def test_slow_downgrade_keeps_cooldown(self) -> None:
+        governor: QualityGovernor = _governor()
+        _feed(governor, 0.2, 4)
+        _feed(governor, 0.05, 8)
+        _feed(governor, 0.1, 20)
+        _feed(governor, 0.2, 4)
+        assert governor.index == 1
+        assert governor.cooldown == 8
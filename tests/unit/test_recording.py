@@ -0,0 +1,291 @@
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics.recording import (
+    _FOOTER,
+    Player,
+    Recorder,
+    _decode_column,
+    _encode_column,
+    _smallest_int,
+)
+
+_RNG: np.random.Generator = np.random.default_rng(0)
+
+
+def _record(path: Path, frames: int, **kwargs: Any) -> list[np.ndarray]:
+    positions: np.ndarray = _RNG.random((10, 2))
+    recorded: list[np.ndarray] = []
+
+    with Recorder(path, **kwargs) as recorder:
+        for frame in range(frames):
+            positions += 0.01
+            recorder.record(positions=positions, ids=np.arange(10) + frame)
+            recorded.append(positions.copy())
+
+        assert len(recorder) == frames
+
+    return recorded
+
+
+@pytest.mark.unit
+class TestHelpers:
+    @pytest.mark.parametrize(
+        "values, expected",
+        [
+            ([], np.int8),
+            ([-128, 127], np.int8),
+            ([0, 128], np.int16),
+            ([-40000, 0], np.int32),
+            ([2**40], np.int64),
+        ],
+    )
+    def test_smallest_int(self, values: list[int], expected: type) -> None:
+        assert _smallest_int(np.array(values, dtype=np.int64)) == expected
+
+    @pytest.mark.parametrize(
+        "arrays, step, exp_delta",
+        [
+            ([_RNG.random((5, 2)) for _ in range(4)], None, "xor"),
+            ([_RNG.random((5, 2)) for _ in range(4)], 1e-3, "sub"),
+            ([_RNG.random((k, 2)) for k in (1, 3, 0)], None, None),
+            ([_RNG.random((k, 2)) for k in (1, 3, 0)], 0.01, None),
+            ([_RNG.random(3).astype(np.float32) for _ in range(2)], None, "xor"),
+            (
+                [_RNG.integers(0, 255, (3, 4), dtype=np.uint8) for _ in range(3)],
+                0.5,
+                "sub",
+            ),
+            ([np.array([True, False])] * 2, None, None),
+        ],
+    )
+    def test_encode_decode(
+        self, arrays: list[np.ndarray], step: float | None, exp_delta: str | None
+    ) -> None:
+        description, payload = _encode_column(arrays, step, 1)
+        assert description["delta"] == exp_delta
+        assert description["size"] == len(payload)
+        decoded: list[np.ndarray] = _decode_column(description, len(arrays), payload)
+        tolerance: float = step / 2 if arrays[0].dtype.kind == "f" and step else 0.0
+
+        for result, array in zip(decoded, arrays, strict=True):
+            assert result.dtype == array.dtype
+            assert result.shape == array.shape
+            assert np.allclose(result, array, rtol=0, atol=tolerance + 1e-12)
+
+    def test_encode_narrow(self) -> None:
+        arrays: list[np.ndarray] = [np.arange(1000) + k for k in range(8)]
+        description, _ = _encode_column(arrays, None, 1)
+        assert description["stored"] == np.dtype(np.int16).str
+
+
+@pytest.mark.unit
+class TestRecorder:
+    def test_init(self, tmp_path: Path) -> None:
+        with Recorder(tmp_path / "run.rec", chunk_frames=8, precision=0.1) as recorder:
+            assert recorder.chunk_frames == 8
+            assert recorder.precision == 0.1
+            assert recorder.level == 1
+            assert len(recorder) == 0
+
+    def test_record_copy(self, tmp_path: Path) -> None:
+        path: Path = tmp_path / "run.rec"
+        values: np.ndarray = np.zeros(3)
+
+        with Recorder(path) as recorder:
+            recorder.record(values=values, scalar=2.5)
+            values += 1
+
+        with Player(path) as player:
+            assert player[0]["values"].tolist() == [0, 0, 0]
+            assert player[0]["scalar"].tolist() == [2.5]
+
+    def test_column_change(self, tmp_path: Path) -> None:
+        path: Path = tmp_path / "run.rec"
+
+        with Recorder(path) as recorder:
+            recorder.record(a=np.zeros(2))
+            recorder.record(a=np.ones(2))
+            recorder.record(b=np.ones(1))
+
+        with Player(path) as player:
+            assert len(player._index) == 2
+            assert list(player[1]) == ["a"]
+            assert list(player[2]) == ["b"]
+
+    def test_precision(self, tmp_path: Path) -> None:
+        path: Path = tmp_path / "run.rec"
+        lossless: list[np.ndarray] = _record(tmp_path / "exact.rec", 50)
+        quantized: list[np.ndarray] = _record(path, 50, precision=dict(positions=0.01))
+
+        with Player(tmp_path / "exact.rec") as player:
+            for index, positions in enumerate(lossless):
+                assert np.array_equal(player[index]["positions"], positions)
+
+        with Player(path) as player:
+            for index, positions in enumerate(quantized):
+                assert np.allclose(player[index]["positions"], positions, atol=0.005)
+                assert player[index]["ids"].tolist() == list(range(index, index + 10))
+
+        assert path.stat().st_size < (tmp_path / "exact.rec").stat().st_size
+
+    def test_flush_chunk(self, tmp_path: Path) -> None:
+        path: Path = tmp_path / "run.rec"
+
+        with Recorder(path) as recorder:
+            recorder._write_chunk(0, [dict(a=np.zeros(2)), dict(a=np.ones(2))])
+
+            # The chunk is readable before the recorder is closed.
+            with Player(path) as player:
+                assert len(player) == 2
+                assert player[1]["a"].tolist() == [1, 1]
+
+    def test_closed(self, tmp_path: Path) -> None:
+        recorder: Recorder = Recorder(tmp_path / "run.rec")
+        recorder.close()
+        recorder.close()
+
+        with pytest.raises(RuntimeError):
+            recorder.record(a=np.zeros(1))
+
+    def test_write_error(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        mocker.patch.object(Recorder, "_write_chunk", side_effect=OSError)
+        recorder: Recorder = Recorder(tmp_path / "run.rec", chunk_frames=1)
+        recorder.record(a=np.zeros(1))
+        recorder._queue.join = MagicMock()
+
+        with pytest.raises(RuntimeError):
+            recorder.close()
+
+        with pytest.raises(RuntimeError):
+            recorder.record(a=np.zeros(1))
+
+
+@pytest.mark.unit
+class TestPlayer:
+    def test_init(self, tmp_path: Path) -> None:
+        _record(tmp_path / "run.rec", 100, chunk_frames=16)
+
+        with Player(tmp_path / "run.rec", speed=2.0, loop=True) as player:
+            assert player.speed == 2.0
+            assert player.loop is True
+            assert len(player) == 100
+            assert len(player._index) == 7
+            assert player.position == 0
+
+    @pytest.mark.parametrize(
+        "content, message",
+        [
+            (b"", "too short"),
+            (b"PYSR\x01", "too short"),
+            (b"NOPE\x01\x00\x00\x00", "not a recording"),
+        ],
+    )
+    def test_invalid(self, content: bytes, message: str, tmp_path: Path) -> None:
+        path: Path = tmp_path / "run.rec"
+        path.write_bytes(content)
+
+        with pytest.raises(ValueError, match=message):
+            Player(path)
+
+    @pytest.mark.parametrize(
+        "chunk, extra, expected",
+        [(None, 0, 100), (6, 0, 96), (6, 2, 96), (6, -1, 80), (5, 30, 80), (0, 0, 0)],
+    )
+    def test_unclosed(
+        self, chunk: int | None, extra: int, expected: int, tmp_path: Path
+    ) -> None:
+        path: Path = tmp_path / "run.rec"
+        recorded: list[np.ndarray] = _record(path, 100, chunk_frames=16)
+        data: bytes = path.read_bytes()
+        size, _ = _FOOTER.unpack(data[-_FOOTER.size :])
+        end: int = len(data) - _FOOTER.size - size
+
+        if chunk is not None:
+            with Player(path) as player:
+                end = player._index[chunk][2] + extra
+
+        path.write_bytes(data[:end])
+
+        with Player(path) as player:
+            assert len(player) == expected
+
+            if expected:
+                assert np.array_equal(player[-1]["positions"], recorded[expected - 1])
+
+    def test_broken_footer(self, tmp_path: Path) -> None:
+        path: Path = tmp_path / "run.rec"
+        _record(path, 20, chunk_frames=16)
+        data: bytes = path.read_bytes()
+        size, magic = _FOOTER.unpack(data[-_FOOTER.size :])
+        path.write_bytes(data[: -_FOOTER.size - size] + b"{" + _FOOTER.pack(1, magic))
+
+        with Player(path) as player:
+            assert len(player) == 20
+
+    def test_getitem(self, tmp_path: Path) -> None:
+        recorded: list[np.ndarray] = _record(tmp_path / "run.rec", 40, chunk_frames=16)
+
+        with Player(tmp_path / "run.rec") as player:
+            assert np.array_equal(player[-1]["positions"], recorded[-1])
+            assert np.array_equal(player[17]["positions"], recorded[17])
+            assert player._cache[0] == 1
+            assert not player[17]["positions"].flags.writeable
+
+            for index in (40, -41):
+                with pytest.raises(IndexError):
+                    player[index]
+
+    @pytest.mark.parametrize(
+        "speed, loop, start, steps, exp_position, exp_finished",
+        [
+            (1.0, False, 0, 3, 3, False),
+            (1.0, False, 0, 20, 9, True),
+            (0.5, False, 0, 3, 1, False),
+            (4.0, True, 8, 1, 2, False),
+            (-1.0, False, 2, 5, 0, True),
+            (-1.0, True, 1, 2, 9, False),
+        ],
+    )
+    def test_cursor(
+        self,
+        speed: float,
+        loop: bool,
+        start: int,
+        steps: int,
+        exp_position: int,
+        exp_finished: bool,
+        tmp_path: Path,
+    ) -> None:
+        recorded: list[np.ndarray] = _record(tmp_path / "run.rec", 10)
+
+        with Player(tmp_path / "run.rec", speed=speed, loop=loop) as player:
+            player.seek(start)
+
+            for _ in range(steps):
+                player.advance()
+
+            assert player.position == exp_position
+            assert player.finished is exp_finished
+            assert np.array_equal(player.current()["positions"], recorded[exp_position])
+
+    @pytest.mark.parametrize("index, expected", [(-5, 0), (4, 4), (50, 9)])
+    def test_seek(self, index: int, expected: int, tmp_path: Path) -> None:
+        _record(tmp_path / "run.rec", 10)
+
+        with Player(tmp_path / "run.rec") as player:
+            player.seek(index)
+            assert player.position == expected
+
+    def test_empty(self, tmp_path: Path) -> None:
+        Recorder(tmp_path / "run.rec").close()
+
+        with Player(tmp_path / "run.rec", loop=True) as player:
+            assert len(player) == 0
+            assert player.finished
+            player.seek(3)
+            player.advance()
+            assert player.position == 0
@@ -0,0 +1,321 @@
+from copy import deepcopy
+from typing import Any, Callable
+from unittest.mock import MagicMock, call
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics import rigid
+from pysics.rigid import BodyKind, World
+from pysics.types import Color
+
+
+def _ground(world: World) -> int:
+    return world.add_rect(-50, -1, 100, 1, mass=0)
+
+
+@pytest.mark.unit
+class TestWorld:
+    @pytest.mark.parametrize(
+        "kwargs, expected",
+        [
+            (
+                dict(),
+                dict(
+                    gravity=(..., (0.0, -9.81)),
+                    iterations=(..., 8),
+                    sleep_velocity=(..., 0.05),
+                    sleep_time=(..., 0.5),
+                    baumgarte=(..., 0.2),
+                    slop=(..., 0.01),
+                ),
+            ),
+            (
+                dict(gravity=(0, 0), iterations=2, sleep_time=1.0),
+                dict(
+                    gravity=(..., (0, 0)),
+                    iterations=(..., 2),
+                    sleep_time=(..., 1.0),
+                ),
+            ),
+        ],
+    )
+    def test_init(
+        self,
+        kwargs: Any,
+        expected: dict[str, Any],
+        assert_getattr: Callable[..., None],
+    ) -> None:
+        world: World = World(**kwargs)
+        assert_getattr(world, expected)
+        assert len(world) == 0
+
+    def test_add(self) -> None:
+        world: World = World()
+        circle: int = world.add_circle(1, 2, 3, mass=2.0, friction=0.1)
+        box: int = world.add_rect(0, 0, 4, 2, mass=0)
+        assert (circle, box) == (0, 1)
+        assert world.positions.tolist() == [[1, 2], [2, 1]]
+        assert world._kind[:2].tolist() == [BodyKind.CIRCLE, BodyKind.BOX]
+        assert world._half[:2].tolist() == [[3, 3], [2, 1]]
+        assert world._inv_mass[:2].tolist() == [0.5, 0.0]
+        assert world._friction[0] == 0.1
+        assert world.awake.tolist() == [True, False]
+
+    def test_grow(self) -> None:
+        world: World = World()
+
+        for i in range(200):
+            world.add_circle(i, 0, 0.5)
+
+        assert len(world) == 200
+        assert world.positions[:, 0].tolist() == list(range(200))
+
+    @pytest.mark.parametrize(
+        "bodies, expected_normal, expected_depth, expected_feature",
+        [
+            (
+                [("circle", 0, 0, 1), ("circle", 1.5, 0, 1)],
+                [1.0, 0.0],
+                0.5,
+                0,
+            ),
+            (
+                [("rect", 0, 0, 2, 2), ("rect", 1.5, 1.8, 2, 2)],
+                [0.0, 1.0],
+                0.2,
+                1,
+            ),
+            (
+                [("circle", 1, 2.5, 1), ("rect", 0, 0, 2, 2)],
+                [0.0, -1.0],
+                0.5,
+                0,
+            ),
+            (
+                [("rect", 0, 0, 2, 2), ("circle", 1, 2.5, 1)],
+                [0.0, 1.0],
+                0.5,
+                0,
+            ),
+            (
+                [("circle", 1.5, 1, 1), ("rect", 0, 0, 2, 2)],
+                [-1.0, 0.0],
+                1.5,
+                1,
+            ),
+        ],
+    )
+    def test_contacts(
+        self,
+        bodies: list[tuple[Any, ...]],
+        expected_normal: list[float],
+        expected_depth: float,
+        expected_feature: int,
+    ) -> None:
+        world: World = World()
+
+        for kind, *args in bodies:
+            getattr(world, f"add_{kind}")(*args)
+
+        a, b, normal, depth, feature = world._contacts()
+        assert (a.tolist(), b.tolist()) == ([0], [1])
+        assert normal[0].tolist() == pytest.approx(expected_normal)
+        assert depth[0] == pytest.approx(expected_depth)
+        assert feature[0] == expected_feature
+
+    def test_no_contact(self) -> None:
+        world: World = World()
+        world.add_circle(0, 0, 1)
+        world.add_rect(1.8, 1.8, 2, 2)
+        world.add_rect(5, 5, 1, 1)
+        a, *_ = world._contacts()
+        assert len(a) == 0
+
+    def test_resting_circle(self) -> None:
+        world: World = World()
+        _ground(world)
+        ball: int = world.add_circle(0, 3, 0.5)
+
+        for _ in range(240):
+            world.step(1 / 60)
+
+        assert world.positions[ball, 1] == pytest.approx(0.5, abs=world.slop)
+        assert world.awake.tolist() == [False, False]
+
+    def test_stack(self) -> None:
+        world: World = World()
+        _ground(world)
+
+        for i in range(5):
+            world.add_rect(-0.5, i, 1, 1)
+
+        for _ in range(120):
+            world.step(1 / 60)
+
+        heights: np.ndarray = world.positions[1:, 1]
+        assert heights == pytest.approx(np.arange(5) + 0.5, abs=0.05)
+        assert np.abs(world.positions[1:, 0]).max() < 1e-6
+        assert not world.awake.any()
+        assert len(world._cache_keys) == 5
+
+    def test_warm_start(self) -> None:
+        world: World = World(sleep_time=10.0)
+        _ground(world)
+        world.add_rect(-0.5, 0, 1, 1)
+
+        for _ in range(30):
+            world.step(1 / 60)
+
+        impulse: float = world._cache_impulses[0, 0]
+        assert impulse == pytest.approx(9.81 / 60, rel=0.05)
+        world.iterations = 0
+        world.step(1 / 60)
+        assert world.velocities[1].tolist() == pytest.approx([0.0, 0.0], abs=1e-3)
+
+    def test_restitution(self) -> None:
+        world: World = World(gravity=(0, 0))
+        world.add_rect(-5, -1, 10, 1, mass=0)
+        ball: int = world.add_circle(0, 1, 0.5, restitution=1.0)
+        world.velocities[ball] = (0, -5)
+
+        for _ in range(30):
+            world.step(1 / 60)
+
+        assert world.velocities[ball, 1] == pytest.approx(5.0, rel=0.05)
+
+    def test_friction(self) -> None:
+        world: World = World()
+        _ground(world)
+        box: int = world.add_rect(0, 0, 1, 1, friction=0.5)
+        world.velocities[box] = (2, 0)
+
+        for _ in range(60):
+            world.step(1 / 60)
+
+        # mu * g = 4.9 so the box stops in 2 / 4.9 = 0.41 s, at about 0.41 m.
+        assert world.velocities[box, 0] == pytest.approx(0.0, abs=1e-6)
+        assert world.positions[box, 0] == pytest.approx(0.5 + 0.41, abs=0.05)
+
+    def test_wake(self) -> None:
+        world: World = World()
+        _ground(world)
+        box: int = world.add_rect(0, 0, 1, 1)
+
+        for _ in range(60):
+            world.step(1 / 60)
+
+        assert not world.awake[box]
+        world.wake(0)
+        assert not world.awake[0]
+        world.apply_impulse(box, (0, 5))
+        assert world.awake[box]
+        assert world.velocities[box].tolist() == [0, 5]
+
+    def test_wake_on_hit(self) -> None:
+        world: World = World()
+        _ground(world)
+        box: int = world.add_rect(0, 0, 1, 1)
+
+        for _ in range(60):
+            world.step(1 / 60)
+
+        ball: int = world.add_circle(0.5, 3, 0.25)
+        world.velocities[ball] = (0, -10)
+
+        for _ in range(20):
+            world.step(1 / 60)
+            if world.awake[box]:
+                break
+
+        assert world.awake[box]
+
+    def test_wake_on_slow_push(self) -> None:
+        world: World = World(gravity=(0, 0))
+        box: int = world.add_rect(0, 0, 1, 1)
+
+        for _ in range(60):
+            world.step(1 / 60)
+
+        assert not world.awake[box]
+        # Pushed slower than the sleep velocity.
+        pusher: int = world.add_rect(-0.99, 0, 1, 1)
+
+        for _ in range(60):
+            world.apply_impulse(pusher, (0.04, 0))
+            world.step(1 / 60)
+
+        assert world.awake[box]
+        assert world.positions[box, 0] > 0.5 + 0.05
+
+    def test_island_sleep(self) -> None:
+        world: World = World()
+        _ground(world)
+        bottom: int = world.add_rect(-0.5, 0, 1, 1)
+        top: int = world.add_rect(-0.5, 1, 1, 1)
+
+        for _ in range(20):
+            world.step(1 / 60)
+
+        # The bottom box rests but the top one slides on it: neither sleeps.
+        for _ in range(60):
+            world.velocities[top] = (0.3, 0)
+            world.step(1 / 60)
+            assert world.awake[bottom]
+
+        for _ in range(60):
+            world.step(1 / 60)
+
+        assert not world.awake[[bottom, top]].any()
+        assert world._island[bottom] == world._island[top]
+        # Waking a body wakes its island.
+        world.wake(top)
+        assert world.awake[[bottom, top]].all()
+
+    @pytest.mark.parametrize("dt", [0.0, -1.0])
+    def test_step_noop(self, dt: float) -> None:
+        world: World = World()
+        world.step(1 / 60)
+        world.add_circle(0, 0, 1)
+        world.step(dt)
+        assert world.positions[0].tolist() == [0, 0]
+
+    def test_draw(self, mocker: MockerFixture) -> None:
+        circle_mock: MagicMock = mocker.patch.object(rigid, "Circle")
+        rect_mock: MagicMock = mocker.patch.object(rigid, "Rect")
+        world: World = World()
+        world.add_circle(1, 2, 3)
+        world.add_rect(0, 0, 4, 2)
+        world.draw(fill=255, stroke_weight=2)
+        circle_mock.assert_called_once_with(
+            1, 2, 3, fill=255, stroke=None, stroke_weight=2
+        )
+        rect_mock.assert_has_calls(
+            [call(0, 0, 4, 2, fill=255, stroke=None, stroke_weight=2)]
+        )
+
+    def test_state(self) -> None:
+        world: World = World(iterations=4)
+        _ground(world)
+        world.add_circle(0, 2, 0.5)
+        world.add_rect(-0.5, 0, 1, 1)
+
+        for _ in range(30):
+            world.step(1 / 60)
+
+        restored: World = World()
+        restored.set_state(deepcopy(world.get_state()))
+        assert restored.iterations == 4
+        assert len(restored) == 3
+
+        for _ in range(30):
+            world.step(1 / 60)
+            restored.step(1 / 60)
+
+        assert np.array_equal(restored.positions, world.positions)
+        assert restored.add_circle(5, 5, 1) == 3
+        assert len(restored._pos) == 6
+
+    def test_state_empty(self) -> None:
+        restored: World = World()
+        restored.set_state(deepcopy(World().get_state()))
+        assert restored.add_circle(0, 0, 1) == 0
@@ -4,8 +4,16 @@ from unittest.mock import MagicMock
 import pytest
 from pytest_mock import MockerFixture
 from pysics.types import Color, Vertex
-from pysics._wrappers import gl, GL_QUADS, GL_LINE_LOOP, GL_POLYGON
+from pysics._wrappers import (
+    gl,
+    GL_FLOAT,
+    GL_QUADS,
+    GL_LINE_LOOP,
+    GL_POLYGON,
+    GL_TRIANGLE_STRIP,
+)
 from pysics.shapes import BaseShape, Circle, Ellipse, Line, Rect
+from pysics.strokes import tessellate
 
 
 @pytest.mark.unit
@@ -289,6 +297,53 @@ class TestLine:
         gl_end_mock.assert_called_once()
         gl_lw_mock.assert_called_once_with(stroke_weight)
 
+    def test_render_thick(self, mocker: MockerFixture) -> None:
+        gl_mocks: dict[str, MagicMock] = {
+            name: mocker.patch.object(gl, name)
+            for name in ("color_4f", "begin", "line_width", "vertex_pointer")
+        }
+        draw_mock: MagicMock = mocker.patch.object(gl, "draw_arrays")
+        mocker.patch.object(gl, "enable_client_state")
+        mocker.patch.object(gl, "disable_client_state")
+        Line(10, 20, 40, 20, stroke=0, stroke_weight=4)
+        gl_mocks["color_4f"].assert_called_once()
+        gl_mocks["begin"].assert_not_called()
+        gl_mocks["line_width"].assert_not_called()
+        draw_mock.assert_called_once_with(GL_TRIANGLE_STRIP, 0, 8)
+        size, gl_type, _, strip = gl_mocks["vertex_pointer"].call_args.args
+        assert (size, gl_type) == (2, GL_FLOAT)
+        assert strip[[0, 1, 6, 7]].tolist() == [[10, 22], [10, 18], [40, 22], [40, 18]]
+
+    @pytest.mark.parametrize(
+        "vertices, join, expected",
+        [
+            ([(0, 0), (4, 0), (4, 4)], None, "miter"),
+            ([(0, 0), (4, 0), (4, 4)], "round", "round"),
+            ([(1, 1), (1, 1)], None, None),
+        ],
+    )
+    def test_outline_thick(
+        self,
+        vertices: list[Vertex],
+        join: str | None,
+        expected: str | None,
+        mocker: MockerFixture,
+    ) -> None:
+        mocker.patch.object(gl, "color_4f")
+        gl_begin_mock: MagicMock = mocker.patch.object(gl, "begin")
+        gl_pointer_mock: MagicMock = mocker.patch.object(gl, "vertex_pointer")
+        mocker.patch.object(gl, "draw_arrays")
+        mocker.patch.object(gl, "enable_client_state")
+        mocker.patch.object(gl, "disable_client_state")
+        Line.outline(vertices, stroke=255, stroke_weight=3, join=join)
+        gl_begin_mock.assert_not_called()
+
+        if expected:
+            strip: Any = gl_pointer_mock.call_args.args[3]
+            assert strip.tolist() == tessellate(vertices, 3, join=expected).tolist()
+        else:
+            gl_pointer_mock.assert_not_called()
+
 
 @pytest.mark.unit
 class TestEllipse:
@@ -385,6 +440,25 @@ class TestEllipse:
             gl_end_mock.assert_called_once()
             gl_vertex_mock.call_count == shape.segments
 
+    @pytest.mark.parametrize(
+        "tessellation, expected", [(1.0, 50), (0.5, 25), (0.01, 3), (2.0, 100)]
+    )
+    def test_tessellation(
+        self,
+        tessellation: float,
+        expected: int,
+        monkeypatch: pytest.MonkeyPatch,
+        mocker: MockerFixture,
+    ) -> None:
+        monkeypatch.setattr(Ellipse, "tessellation", tessellation)
+        mocker.patch.object(gl, "color_4f")
+        mocker.patch.object(gl, "begin")
+        mocker.patch.object(gl, "end")
+        gl_vertex_mock: MagicMock = mocker.patch.object(gl, "vertex_2f")
+        Circle(10, 20, 40, fill=255)
+        assert gl_vertex_mock.call_count == expected
+        assert gl_vertex_mock.call_args_list[0].args == (50.0, 20.0)
+
 
 @pytest.mark.unit
 class TestCircle:
@@ -0,0 +1,192 @@
+import subprocess
+import sys
+import threading
+from multiprocessing import shared_memory
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics import sharing
+from pysics.recording import Frame
+from pysics.sharing import FramePublisher, FrameSubscriber
+
+_LAYOUT: dict = {"positions": ((100, 2), np.float64), "step": ((), "i8")}
+
+
+def _frame(step: int) -> Frame:
+    return dict(positions=np.full((100, 2), float(step)), step=np.array(step))
+
+
+@pytest.fixture
+def publisher() -> FramePublisher:
+    with FramePublisher(_LAYOUT) as publisher:
+        yield publisher
+
+
+@pytest.mark.unit
+class TestFramePublisher:
+    def test_init(self, publisher: FramePublisher) -> None:
+        assert publisher.layout == {
+            "positions": ((100, 2), "<f8"),
+            "step": ((), "<i8"),
+        }
+        assert len(publisher) == 0
+        assert len(publisher._frames.slots) == 3
+
+    def test_init_error(self) -> None:
+        with pytest.raises(ValueError):
+            FramePublisher(_LAYOUT, slots=1)
+
+    def test_publish(self, publisher: FramePublisher) -> None:
+        for step in range(4):
+            publisher.publish(**_frame(step))
+
+        assert len(publisher) == 4
+        counters: np.ndarray = publisher._frames.counters
+        # The number of frames, then the (even) sequence of each slot.
+        assert counters.tolist() == [4, 8, 4, 6]
+        assert publisher._frames.slots[0]["step"] == 3
+
+    def test_publish_columns(self, publisher: FramePublisher) -> None:
+        with pytest.raises(ValueError):
+            publisher.publish(positions=np.zeros((100, 2)))
+
+    def test_close(self) -> None:
+        publisher: FramePublisher = FramePublisher(_LAYOUT)
+        publisher.close()
+        publisher.close()
+
+        with pytest.raises(FileNotFoundError):
+            FrameSubscriber(publisher.name)
+
+
+@pytest.mark.unit
+class TestFrameSubscriber:
+    def test_init(self, publisher: FramePublisher, mocker: MockerFixture) -> None:
+        unregister: MagicMock = mocker.spy(sharing.resource_tracker, "unregister")
+
+        with FrameSubscriber(publisher.name) as subscriber:
+            # The block of a publisher of this process is tracked once.
+            unregister.assert_not_called()
+            assert subscriber.name == publisher.name
+            assert subscriber.layout == publisher.layout
+            assert subscriber.dropped == 0
+            assert len(subscriber) == 0
+            assert subscriber.current() is None
+
+    def test_init_error(self) -> None:
+        memory: shared_memory.SharedMemory = shared_memory.SharedMemory(
+            create=True, size=64
+        )
+
+        try:
+            with pytest.raises(ValueError):
+                FrameSubscriber(memory.name)
+        finally:
+            memory.close()
+            # The subscriber untracked the block it did not create.
+            shared_memory.resource_tracker.register(memory._name, "shared_memory")
+            memory.unlink()
+
+    def test_current(self, publisher: FramePublisher) -> None:
+        with FrameSubscriber(publisher.name) as subscriber:
+            publisher.publish(**_frame(0))
+            frame: Frame = subscriber.current()
+            assert frame["step"] == 0
+            assert not np.shares_memory(
+                frame["positions"], publisher._frames.slots[0]["positions"]
+            )
+
+            # Without new frame, the last one is kept.
+            subscriber.advance()
+            assert subscriber.current() is frame
+
+            # Only the newest frame is read.
+            for step in range(1, 5):
+                publisher.publish(**_frame(step))
+
+            assert len(subscriber) == 5
+            assert subscriber.current()["step"] == 4
+            assert subscriber.dropped == 3
+
+    def test_torn_frame(self, publisher: FramePublisher) -> None:
+        with FrameSubscriber(publisher.name) as subscriber:
+            publisher.publish(**_frame(0))
+            frame: Frame = subscriber.current()
+            publisher.publish(**_frame(1))
+            # The slot is being written (odd sequence): the frame is skipped.
+            publisher._frames.counters[2] = 3
+            assert subscriber.current() is frame
+            publisher._frames.counters[2] = 4
+            assert subscriber.current()["step"] == 1
+
+    def test_overwritten_while_copied(self, publisher: FramePublisher) -> None:
+        class _Lapped:
+            """An array whose copy lets the publisher lap the ring first."""
+
+            def __init__(self, array: np.ndarray) -> None:
+                self.array: np.ndarray = array
+                self.lapped: bool = False
+
+            def copy(self) -> np.ndarray:
+                if not self.lapped:
+                    self.lapped = True
+
+                    for step in range(1, 4):
+                        publisher.publish(**_frame(step))
+
+                return self.array.copy()
+
+        with FrameSubscriber(publisher.name) as subscriber:
+            publisher.publish(**_frame(0))
+            slot: dict[str, np.ndarray] = subscriber._frames.slots[0]
+            slot["step"] = _Lapped(slot["step"])
+            # The copied frame 0 was overwritten by the frame 3, read again.
+            assert subscriber.current()["step"] == 3
+            assert subscriber.dropped == 3
+
+    def test_concurrent(self, publisher: FramePublisher) -> None:
+        done: threading.Event = threading.Event()
+
+        def produce() -> None:
+            step: int = 0
+
+            while not done.is_set():
+                publisher.publish(**_frame(step))
+                step += 1
+
+        thread: threading.Thread = threading.Thread(target=produce)
+        thread.start()
+
+        try:
+            with FrameSubscriber(publisher.name) as subscriber:
+                steps: list[int] = []
+
+                while len(steps) < 200:
+                    frame: Frame | None = subscriber.current()
+
+                    if frame is not None:
+                        # A frame is never mixed with another one.
+                        assert (frame["positions"] == frame["step"]).all()
+                        steps.append(int(frame["step"]))
+        finally:
+            done.set()
+            thread.join()
+
+        assert steps == sorted(steps)
+
+    def test_other_process(self, publisher: FramePublisher) -> None:
+        publisher.publish(**_frame(7))
+        code: str = (
+            "from pysics.sharing import FrameSubscriber\n"
+            f"with FrameSubscriber({publisher.name!r}) as subscriber:\n"
+            "    print(int(subscriber.current()['step']))\n"
+        )
+        result: subprocess.CompletedProcess = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True
+        )
+        assert result.stdout.strip() == "7"
+        assert result.stderr == ""
+        # The block survives the subscriber process.
+        with FrameSubscriber(publisher.name) as subscriber:
+            assert subscriber.current()["step"] == 7
@@ -0,0 +1,77 @@
+from pathlib import Path
+from typing import Any
+import numpy as np
+import pytest
+from pysics.snapshots import _ALIGNMENT, _align, read_snapshot, write_snapshot
+
+
+@pytest.mark.unit
+class TestSnapshots:
+    @pytest.mark.parametrize(
+        "offset, expected",
+        [(0, 0), (1, _ALIGNMENT), (_ALIGNMENT, _ALIGNMENT), (65, 2 * _ALIGNMENT)],
+    )
+    def test_align(self, offset: int, expected: int) -> None:
+        assert _align(offset) == expected
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        path: Path = tmp_path / "state.snapshot"
+        state: dict[str, Any] = dict(
+            name="sketch",
+            count=np.int64(3),
+            big=2**100,
+            nothing=None,
+            pair=(1.5, 2),
+            nested=dict(
+                positions=np.arange(10.0).reshape(5, 2),
+                flags=np.array([True, False, True]),
+                empty=np.empty((0, 2), dtype=np.uint32),
+                scalar=np.array(7, dtype=np.int8),
+            ),
+            arrays=[np.arange(3, dtype=np.float32), np.ones((2, 2))[:, 0]],
+        )
+        write_snapshot(path, state)
+        restored: dict[str, Any] = read_snapshot(path)
+        assert [p.name for p in tmp_path.iterdir()] == ["state.snapshot"]
+        assert restored["name"] == "sketch"
+        assert restored["count"] == 3
+        assert restored["big"] == 2**100
+        assert restored["nothing"] is None
+        assert restored["pair"] == [1.5, 2]
+
+        for name, array in state["nested"].items():
+            assert restored["nested"][name].dtype == array.dtype
+            assert restored["nested"][name].shape == array.shape
+            assert np.array_equal(restored["nested"][name], array)
+
+        for restored_array, array in zip(restored["arrays"], state["arrays"]):
+            assert np.array_equal(restored_array, array)
+            assert restored_array.dtype == array.dtype
+
+    def test_copy_on_write(self, tmp_path: Path) -> None:
+        path: Path = tmp_path / "state.snapshot"
+        write_snapshot(path, dict(values=np.zeros(1000)))
+        restored: np.ndarray = read_snapshot(path)["values"]
+        assert type(restored) is np.ndarray
+        assert isinstance(restored.base, np.memmap)
+        restored[:] = 1.0
+        assert read_snapshot(path)["values"].sum() == 0.0
+
+    def test_aligned(self, tmp_path: Path) -> None:
+        path: Path = tmp_path / "state.snapshot"
+        write_snapshot(path, dict(a=np.zeros(3, dtype=np.int8), b=np.ones(5)))
+        data: bytes = path.read_bytes()
+        assert len(data) % 8 == 0
+        assert data[-40:] == np.ones(5).tobytes()
+
+    def test_object_array(self, tmp_path: Path) -> None:
+        with pytest.raises(TypeError):
+            write_snapshot(tmp_path / "state", dict(a=np.array([object()])))
+
+    @pytest.mark.parametrize("content", [b"", b"PYSX", b"NOPE" + bytes(12)])
+    def test_invalid(self, content: bytes, tmp_path: Path) -> None:
+        path: Path = tmp_path / "state.snapshot"
+        path.write_bytes(content)
+
+        with pytest.raises(ValueError):
+            read_snapshot(path)
@@ -0,0 +1,170 @@
+from typing import Hashable
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics.shapes import Circle, Ellipse, Line, Rect
+from pysics.spatial import Box, ShapeIndex, bounds_of
+
+
+@pytest.fixture
+def no_render(mocker: MockerFixture) -> None:
+    for shape in (Line, Rect, Ellipse):
+        mocker.patch.object(shape, "_render")
+
+
+def _brute_rect(boxes: dict[Hashable, Box], query: Box) -> set[Hashable]:
+    left, bottom, right, top = query
+    return {
+        item
+        for item, box in boxes.items()
+        if box[0] <= right and box[2] >= left and box[1] <= top and box[3] >= bottom
+    }
+
+
+def _random_boxes(rng: np.random.Generator, n: int) -> dict[Hashable, Box]:
+    corners: np.ndarray = rng.uniform(-500, 500, (n, 2))
+    sizes: np.ndarray = rng.uniform(0, 80, (n, 2))
+    return {
+        i: (*corner.tolist(), *(corner + size).tolist())
+        for i, (corner, size) in enumerate(zip(corners, sizes))
+    }
+
+
+@pytest.mark.unit
+class TestBoundsOf:
+    @pytest.mark.parametrize(
+        "shape, args, expected",
+        [
+            (Circle, (10, 20, 5), (5, 15, 15, 25)),
+            (Ellipse, (10, 20, 5, 8), (5, 12, 15, 28)),
+            (Rect, (10, 20, 30, 40), (10, 20, 40, 60)),
+            (Rect, (10, 20, -5, -10), (5, 10, 10, 20)),
+            (Line, (10, 20, 0, 30), (0, 20, 10, 30)),
+        ],
+    )
+    def test_bounds_of(
+        self, shape: type, args: tuple[float, ...], expected: Box, no_render: None
+    ) -> None:
+        assert bounds_of(shape(*args)) == expected
+
+    def test_unsupported(self) -> None:
+        with pytest.raises(TypeError):
+            bounds_of(object())
+
+
+@pytest.mark.unit
+class TestShapeIndex:
+    def test_init(self) -> None:
+        index: ShapeIndex = ShapeIndex()
+        assert index.cell_size == 64.0
+        assert len(index) == 0
+
+    @pytest.mark.parametrize("cell_size", [0.0, -1.0])
+    def test_init_error(self, cell_size: float) -> None:
+        with pytest.raises(ValueError):
+            ShapeIndex(cell_size)
+
+    def test_insert(self) -> None:
+        index: ShapeIndex = ShapeIndex(10)
+        index.insert("a", (0, 0, 25, 5))
+        assert "a" in index
+        assert index.bounds("a") == (0, 0, 25, 5)
+        assert set(index._cells) == {(0, 0), (1, 0), (2, 0)}
+
+        # Moving within the same cells does not touch them.
+        cells: set[Hashable] = index._cells[(0, 0)]
+        index.insert("a", (1, 1, 26, 6))
+        assert index._cells[(0, 0)] is cells
+        assert index.bounds("a") == (1, 1, 26, 6)
+
+        # The emptied cells are dropped.
+        index.insert("a", (31, 0, 35, 5))
+        assert set(index._cells) == {(3, 0)}
+        assert len(index) == 1
+
+    def test_insert_shape(self, no_render: None) -> None:
+        index: ShapeIndex = ShapeIndex()
+        circle: Circle = Circle(10, 20, 5)
+        index.insert(circle)
+        assert index.bounds(circle) == (5, 15, 15, 25)
+        assert index.query_point(10, 20) == [circle]
+
+    def test_remove(self) -> None:
+        index: ShapeIndex = ShapeIndex(10)
+        index.insert("a", (0, 0, 5, 5))
+        index.insert("b", (0, 0, 15, 5))
+        index.remove("a")
+        assert "a" not in index
+        assert index.query_point(1, 1) == ["b"]
+        index.remove("b")
+        assert index._cells == {}
+
+        with pytest.raises(KeyError):
+            index.remove("b")
+
+    def test_clear(self) -> None:
+        index: ShapeIndex = ShapeIndex()
+        index.insert("a", (0, 0, 5, 5))
+        index.clear()
+        assert len(index) == 0
+        assert index.query_point(1, 1) == []
+
+    def test_query_point(self) -> None:
+        index: ShapeIndex = ShapeIndex(10)
+        index.insert("bottom", (0, 0, 50, 50))
+        index.insert("top", (20, 20, 30, 30))
+        index.insert("away", (-30, -30, -20, -20))
+        assert index.query_point(25, 25) == ["top", "bottom"]
+        assert index.query_point(5, 5) == ["bottom"]
+        assert index.query_point(-25, -25) == ["away"]
+        assert index.query_point(100, 100) == []
+        # Moving an item keeps its rank.
+        index.insert("bottom", (0, 0, 60, 60))
+        assert index.query_point(25, 25) == ["top", "bottom"]
+
+    @pytest.mark.parametrize(
+        "query", [(-100, -100, 100, 100), (0, 0, 1, 1), (-1e6, -1e6, 1e6, 1e6)]
+    )
+    def test_query_rect(self, query: Box) -> None:
+        rng: np.random.Generator = np.random.default_rng(0)
+        boxes: dict[Hashable, Box] = _random_boxes(rng, 500)
+        index: ShapeIndex = ShapeIndex(50)
+
+        for item, box in boxes.items():
+            index.insert(item, box)
+
+        found: list[Hashable] = index.query_rect(*query)
+        assert set(found) == _brute_rect(boxes, query)
+        assert found == sorted(found, reverse=True)
+
+    @pytest.mark.parametrize(
+        "point, k", [((0, 0), 1), ((100, -50), 5), ((3000, 3000), 3), ((0, 0), 600)]
+    )
+    def test_nearest(self, point: tuple[float, float], k: int) -> None:
+        rng: np.random.Generator = np.random.default_rng(1)
+        boxes: dict[Hashable, Box] = _random_boxes(rng, 500)
+        index: ShapeIndex = ShapeIndex(50)
+
+        for item, box in boxes.items():
+            index.insert(item, box)
+
+        x, y = point
+        distances: dict[Hashable, float] = {
+            item: float(
+                np.hypot(max(box[0] - x, 0, x - box[2]), max(box[1] - y, 0, y - box[3]))
+            )
+            for item, box in boxes.items()
+        }
+        found: list[Hashable] = index.nearest(x, y, k)
+        assert len(found) == min(k, len(boxes))
+        assert [distances[item] for item in found] == sorted(distances.values())[:k]
+
+    def test_nearest_edge_cases(self) -> None:
+        index: ShapeIndex = ShapeIndex(10)
+        assert index.nearest(0, 0) == []
+        index.insert("a", (0, 0, 5, 5))
+        index.insert("b", (0, 0, 5, 5))
+        assert index.nearest(1, 1, 0) == []
+        # Ties are broken by the last inserted.
+        assert index.nearest(1, 1) == ["b"]
+        assert index.nearest(100, 1, 2) == ["b", "a"]
@@ -0,0 +1,126 @@
+from typing import Any, Iterator
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics import strokes
+from pysics.strokes import join_strips, stroke_strip, tessellate
+
+_SQUARE: list[tuple[int, int]] = [(0, 0), (10, 0), (10, 10), (0, 10)]
+
+
+@pytest.fixture(autouse=True)
+def clear_strips() -> Iterator[None]:
+    strokes._strips.clear()
+    yield
+    strokes._strips.clear()
+
+
+@pytest.mark.unit
+class TestTessellate:
+    def test_miter(self) -> None:
+        strip: np.ndarray = tessellate(_SQUARE, 2.0)
+        assert strip.dtype == np.float32
+        # Two identical pairs per corner, then the first pair again.
+        assert strip[::2][:-1:2].tolist() == [[1, 1], [9, 1], [9, 9], [1, 9]]
+        assert strip[1::2][:-1:2].tolist() == [[-1, -1], [11, -1], [11, 11], [-1, 11]]
+        assert (strip[-2:] == strip[:2]).all()
+
+    @pytest.mark.parametrize(
+        "points, join, pairs, expected",
+        [
+            # Beveled beyond the miter limit.
+            (
+                [(0, 0), (10, 0), (0, 0)],
+                "miter",
+                2,
+                [[10, 1], [10, -1], [10, -1], [10, 1]],
+            ),
+            (
+                [(0, 0), (10, 0), (10, 10)],
+                "bevel",
+                2,
+                [[10, 1], [10, -1], [9, 0], [11, 0]],
+            ),
+            (
+                [(0, 0), (10, 0), (10, 10)],
+                "round",
+                9,
+                [[10, 1], [10, -1], [9.80491, 0.98079], [10.19509, -0.98079]],
+            ),
+        ],
+    )
+    def test_joins(self, points: Any, join: str, pairs: int, expected: list) -> None:
+        strip: np.ndarray = tessellate(points, 2.0, join=join, closed=False)
+        # The square ends.
+        assert strip[:2] == pytest.approx(np.array([[0, 1], [0, -1]]))
+        # The first two pairs of the corner.
+        assert strip[2 * pairs : 2 * pairs + 4] == pytest.approx(
+            np.array(expected), abs=1e-3
+        )
+
+    def test_round(self) -> None:
+        strip: np.ndarray = tessellate(_SQUARE, 4.0, join="round", segments=6)
+        assert len(strip) == 4 * 7 * 2 + 2
+        # The outer side of each corner stays at the half width.
+        corners: np.ndarray = np.repeat(np.array(_SQUARE), 7, axis=0)
+        outer: np.ndarray = strip[1:-2:2] - corners
+        assert np.hypot(outer[:, 0], outer[:, 1]) == pytest.approx(
+            np.full(28, 2.0), rel=1e-6
+        )
+
+    @pytest.mark.parametrize(
+        "points, closed, length",
+        [
+            ([(0, 0), (10, 0), (10, 0), (10, 10), (0, 0)], True, 3 * 4 + 2),
+            ([(0, 0), (10, 0), (10, 0), (10, 10), (0, 0)], False, 4 * 4),
+            ([(5, 5), (5, 5)], True, 0),
+            ([], False, 0),
+        ],
+    )
+    def test_degenerate(self, points: Any, closed: bool, length: int) -> None:
+        assert tessellate(points, 2.0, closed=closed).shape == (length, 2)
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            tessellate(_SQUARE, 2.0, join="square")
+
+
+@pytest.mark.unit
+class TestStrokeStrip:
+    def test_cached(self, mocker: MockerFixture) -> None:
+        spy: Any = mocker.spy(strokes, "tessellate")
+        strip: np.ndarray = stroke_strip(_SQUARE, 3.0)
+        assert stroke_strip(np.array(_SQUARE, dtype=float), 3.0) is strip
+        assert spy.call_count == 1
+        assert strip.tolist() == tessellate(_SQUARE, 3.0).tolist()
+        assert stroke_strip(_SQUARE, 4.0) is not strip
+        assert stroke_strip(_SQUARE, 3.0, join="bevel") is not strip
+        assert stroke_strip(_SQUARE, 3.0, closed=False) is not strip
+        assert spy.call_count == 4
+
+    def test_evict(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(strokes, "_CACHE_SIZE", 2)
+        first: np.ndarray = stroke_strip(_SQUARE, 2.0)
+        stroke_strip(_SQUARE, 3.0)
+        # Used again, so the least recently used is the second one.
+        stroke_strip(_SQUARE, 2.0)
+        stroke_strip(_SQUARE, 4.0)
+        assert len(strokes._strips) == 2
+        assert stroke_strip(_SQUARE, 2.0) is first
+
+
+@pytest.mark.unit
+class TestJoinStrips:
+    def test_join(self) -> None:
+        first: np.ndarray = np.arange(8, dtype=float).reshape(4, 2)
+        second: np.ndarray = np.arange(8, 12, dtype=np.float32).reshape(2, 2)
+        strip: np.ndarray = join_strips([first, np.empty((0, 2)), second])
+        assert strip.dtype == np.float32
+        assert strip.tolist() == [
+            *([0, 1], [2, 3], [4, 5], [6, 7]),
+            *([6, 7], [8, 9]),
+            *([8, 9], [10, 11]),
+        ]
+
+    def test_join_empty(self) -> None:
+        assert join_strips([]).shape == (0, 2)
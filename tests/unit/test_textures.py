@@ -0,0 +1,337 @@
+from typing import Any
+from unittest.mock import MagicMock, call
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics.types import Color
+from pysics._wrappers import (
+    gl,
+    GL_FLOAT,
+    GL_LINEAR,
+    GL_LUMINANCE,
+    GL_NEAREST,
+    GL_QUADS,
+    GL_RGB,
+    GL_RGBA,
+    GL_TEXTURE_2D,
+    GL_TEXTURE_MAG_FILTER,
+    GL_UNSIGNED_BYTE,
+)
+from pysics.textures import HEAT, Heatmap, Texture, colormap
+
+
+@pytest.fixture
+def gl_mocks(mocker: MockerFixture) -> dict[str, MagicMock]:
+    names: list[str] = [
+        "gen_textures",
+        "delete_textures",
+        "bind_texture",
+        "tex_parameter_i",
+        "tex_image_2d",
+        "tex_sub_image_2d",
+        "tex_coord_2f",
+        "pixel_store_i",
+        "enable",
+        "disable",
+        "color_4f",
+        "begin",
+        "end",
+        "vertex_2f",
+    ]
+    mocks: dict[str, MagicMock] = {
+        name: mocker.patch.object(gl, name) for name in names
+    }
+    mocks["gen_textures"].return_value = 7
+    return mocks
+
+
+@pytest.mark.unit
+class TestTexture:
+    def test_init(self, gl_mocks: dict[str, MagicMock]) -> None:
+        texture: Texture = Texture()
+        assert texture.smooth is False
+        assert texture.shape is None
+        gl_mocks["gen_textures"].assert_not_called()
+
+    @pytest.mark.parametrize(
+        "data, exp_format, exp_type, copied",
+        [
+            (np.zeros((4, 3), dtype=np.float32), GL_LUMINANCE, GL_FLOAT, False),
+            (np.zeros((4, 3, 3), dtype=np.uint8), GL_RGB, GL_UNSIGNED_BYTE, False),
+            (np.zeros((4, 3, 4)), GL_RGBA, GL_FLOAT, True),
+            (np.zeros((4, 3, 1), dtype=np.float32), GL_LUMINANCE, GL_FLOAT, False),
+        ],
+    )
+    def test_update(
+        self,
+        data: np.ndarray,
+        exp_format: int,
+        exp_type: int,
+        copied: bool,
+        gl_mocks: dict[str, MagicMock],
+    ) -> None:
+        texture: Texture = Texture(data)
+        assert texture.shape == (4, 3)
+        gl_mocks["bind_texture"].assert_called_once_with(GL_TEXTURE_2D, 7)
+        *args, pixels = gl_mocks["tex_image_2d"].call_args.args
+        assert args == [GL_TEXTURE_2D, 0, exp_format, 3, 4, 0, exp_format, exp_type]
+        assert np.shares_memory(pixels, data) is not copied
+
+    def test_update_reuse(self, gl_mocks: dict[str, MagicMock]) -> None:
+        texture: Texture = Texture(np.zeros((4, 3), dtype=np.uint8))
+        texture.update(np.ones((4, 3), dtype=np.uint8))
+        gl_mocks["gen_textures"].assert_called_once_with(1)
+        gl_mocks["tex_image_2d"].assert_called_once()
+        *args, _ = gl_mocks["tex_sub_image_2d"].call_args.args
+        assert args == [GL_TEXTURE_2D, 0, 0, 0, 3, 4, GL_LUMINANCE, GL_UNSIGNED_BYTE]
+        texture.update(np.ones((5, 3), dtype=np.uint8))
+        assert gl_mocks["tex_image_2d"].call_count == 2
+        assert texture.shape == (5, 3)
+
+    @pytest.mark.parametrize("shape", [(4,), (4, 3, 2), (2, 2, 2, 2)])
+    def test_update_invalid(
+        self, shape: tuple[int, ...], gl_mocks: dict[str, MagicMock]
+    ) -> None:
+        with pytest.raises(ValueError):
+            Texture(np.zeros(shape))
+
+        gl_mocks["tex_image_2d"].assert_not_called()
+
+    @pytest.mark.parametrize(
+        "kwargs, tint, filtering",
+        [
+            (dict(), Color(), GL_NEAREST),
+            (dict(smooth=True), Color(255, 0, 0), GL_LINEAR),
+        ],
+    )
+    def test_draw(
+        self,
+        kwargs: dict[str, Any],
+        tint: Color,
+        filtering: int,
+        gl_mocks: dict[str, MagicMock],
+    ) -> None:
+        texture: Texture = Texture(np.zeros((2, 2)), **kwargs)
+        texture.draw(10, 20, 30, 40, tint=tint)
+        gl_mocks["enable"].assert_called_once_with(GL_TEXTURE_2D)
+        gl_mocks["disable"].assert_called_once_with(GL_TEXTURE_2D)
+        gl_mocks["tex_parameter_i"].assert_any_call(
+            GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, filtering
+        )
+        gl_mocks["color_4f"].assert_called_once_with(*tint.ratios)
+        gl_mocks["begin"].assert_called_once_with(GL_QUADS)
+        assert gl_mocks["tex_coord_2f"].call_args_list == [
+            call(0, 0),
+            call(1, 0),
+            call(1, 1),
+            call(0, 1),
+        ]
+        assert gl_mocks["vertex_2f"].call_args_list == [
+            call(10, 20),
+            call(40, 20),
+            call(40, 60),
+            call(10, 60),
+        ]
+        gl_mocks["end"].assert_called_once()
+
+    def test_update_region(self, gl_mocks: dict[str, MagicMock]) -> None:
+        texture: Texture = Texture(np.zeros((4, 5, 4), dtype=np.uint8))
+        region: np.ndarray = np.ones((2, 3, 4), dtype=np.uint8)
+        texture.update_region(region, 1, 2)
+        gl_mocks["tex_image_2d"].assert_called_once()
+        *args, pixels = gl_mocks["tex_sub_image_2d"].call_args.args
+        assert args == [GL_TEXTURE_2D, 0, 1, 2, 3, 2, GL_RGBA, GL_UNSIGNED_BYTE]
+        assert pixels is region
+
+    @pytest.mark.parametrize(
+        "data, x, y",
+        [
+            (np.zeros((2, 2, 4), dtype=np.float32), 0, 0),
+            (np.zeros((2, 2), dtype=np.uint8), 0, 0),
+            (np.zeros((2, 2, 4), dtype=np.uint8), 4, 0),
+            (np.zeros((2, 2, 4), dtype=np.uint8), 0, 3),
+            (np.zeros((2, 2, 4), dtype=np.uint8), -1, 0),
+        ],
+    )
+    def test_update_region_invalid(
+        self, data: np.ndarray, x: int, y: int, gl_mocks: dict[str, MagicMock]
+    ) -> None:
+        texture: Texture = Texture(np.zeros((4, 5, 4), dtype=np.uint8))
+
+        with pytest.raises(ValueError):
+            texture.update_region(data, x, y)
+
+        gl_mocks["tex_sub_image_2d"].assert_not_called()
+
+    def test_update_region_empty(self, gl_mocks: dict[str, MagicMock]) -> None:
+        with pytest.raises(RuntimeError):
+            Texture().update_region(np.zeros((1, 1)), 0, 0)
+
+    def test_draw_empty(self, gl_mocks: dict[str, MagicMock]) -> None:
+        with pytest.raises(RuntimeError):
+            Texture().draw(0, 0, 1, 1)
+
+    def test_delete(self, gl_mocks: dict[str, MagicMock]) -> None:
+        texture: Texture = Texture(np.zeros((2, 2)))
+        texture.delete()
+        texture.delete()
+        gl_mocks["delete_textures"].assert_called_once()
+        (ids,) = gl_mocks["delete_textures"].call_args.args
+        assert ids.dtype == np.uint32
+        assert ids.tolist() == [7]
+        assert texture.shape is None
+
+
+@pytest.mark.unit
+class TestColormap:
+    def test_colormap(self) -> None:
+        colors: np.ndarray = colormap(0, Color(255, 0, 0, 0), size=3)
+        assert colors.dtype == np.uint8
+        assert colors.tolist() == [
+            [0, 0, 0, 255],
+            [128, 0, 0, 128],
+            [255, 0, 0, 0],
+        ]
+
+    def test_heat(self) -> None:
+        assert HEAT.shape == (256, 4)
+        assert HEAT[[0, 85, 170, 255], :3].tolist() == [
+            [0, 0, 0],
+            [255, 0, 0],
+            [255, 255, 0],
+            [255, 255, 255],
+        ]
+
+    def test_colormap_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            colormap(Color())
+
+
+@pytest.mark.unit
+class TestHeatmap:
+    @pytest.fixture
+    def gray(self) -> np.ndarray:
+        return colormap(0, 255, size=5)
+
+    def test_init(self, gl_mocks: dict[str, MagicMock]) -> None:
+        heatmap: Heatmap = Heatmap()
+        assert heatmap.colormap is HEAT
+        assert heatmap.value_range is None
+        assert heatmap.texture.smooth is False
+        assert heatmap.shape is None
+        gl_mocks["gen_textures"].assert_not_called()
+
+    def test_update(self, gray: np.ndarray, gl_mocks: dict[str, MagicMock]) -> None:
+        heatmap: Heatmap = Heatmap(
+            np.array([[0.0, 1.0], [2.0, 4.0]]), colormap=gray, smooth=True
+        )
+        assert heatmap.shape == (2, 2)
+        assert heatmap.texture.smooth is True
+        *args, pixels = gl_mocks["tex_image_2d"].call_args.args
+        assert args == [GL_TEXTURE_2D, 0, GL_RGBA, 2, 2, 0, GL_RGBA, GL_UNSIGNED_BYTE]
+        assert pixels[..., 0].tolist() == [[0, 64], [128, 255]]
+
+    def test_update_changed(
+        self, gray: np.ndarray, gl_mocks: dict[str, MagicMock]
+    ) -> None:
+        values: np.ndarray = np.zeros((5, 6))
+        heatmap: Heatmap = Heatmap(values, colormap=gray, value_range=(0.0, 4.0))
+        values[1, 4] = 2.0
+        values[3, 2] = 4.0
+        heatmap.update(values)
+        gl_mocks["tex_image_2d"].assert_called_once()
+        *args, pixels = gl_mocks["tex_sub_image_2d"].call_args.args
+        assert args == [GL_TEXTURE_2D, 0, 2, 1, 3, 3, GL_RGBA, GL_UNSIGNED_BYTE]
+        assert pixels[..., 0].tolist() == [[0, 0, 128], [0, 0, 0], [255, 0, 0]]
+        heatmap.update(values)
+        gl_mocks["tex_sub_image_2d"].assert_called_once()
+
+    @pytest.mark.parametrize("change", ["shape", "range", "colormap"])
+    def test_update_whole(
+        self, change: str, gray: np.ndarray, gl_mocks: dict[str, MagicMock]
+    ) -> None:
+        values: np.ndarray = np.array([[0.0, 1.0], [2.0, 4.0]])
+        heatmap: Heatmap = Heatmap(values, colormap=gray)
+
+        if change == "shape":
+            values = np.zeros((3, 3))
+        elif change == "range":
+            values = values * 2
+        else:
+            heatmap.colormap = colormap(0, 255)
+
+        heatmap.update(values)
+        uploads: int = gl_mocks["tex_image_2d"].call_count
+        uploads += gl_mocks["tex_sub_image_2d"].call_count
+        assert uploads == 2
+        *_, pixels = (
+            gl_mocks["tex_sub_image_2d"].call_args or gl_mocks["tex_image_2d"].call_args
+        ).args
+        assert pixels.shape == (*values.shape, 4)
+
+    def test_update_auto_range(
+        self, gray: np.ndarray, gl_mocks: dict[str, MagicMock]
+    ) -> None:
+        values: np.ndarray = np.array([[0.0, 1.0], [2.0, 4.0]])
+        heatmap: Heatmap = Heatmap(values, colormap=gray)
+        # A change in the fitted range only uploads the changed region.
+        values[0, 1] = 3.0
+        values[1, 1] = 2.0
+        heatmap.update(values)
+        gl_mocks["tex_image_2d"].assert_called_once()
+        *args, pixels = gl_mocks["tex_sub_image_2d"].call_args.args
+        assert args[2:6] == [1, 0, 1, 2]
+        assert pixels[..., 0].tolist() == [[191], [128]]
+        assert heatmap._range == (0.0, 4.0)
+        # A value out of the range grows it and uploads everything.
+        values[0, 0] = -4.0
+        heatmap.update(values)
+        *args, pixels = gl_mocks["tex_sub_image_2d"].call_args.args
+        assert args[2:6] == [0, 0, 2, 2]
+        assert pixels[..., 0].tolist() == [[0, 191], [191, 191]]
+        assert heatmap._range == (-4.0, 4.0)
+
+    def test_update_flat(
+        self, gray: np.ndarray, gl_mocks: dict[str, MagicMock]
+    ) -> None:
+        Heatmap(np.full((2, 2), 3.0), colormap=gray)
+        *_, pixels = gl_mocks["tex_image_2d"].call_args.args
+        assert (pixels[..., 0] == 0).all()
+
+    def test_update_invalid(self, gl_mocks: dict[str, MagicMock]) -> None:
+        with pytest.raises(ValueError):
+            Heatmap(np.zeros(4))
+
+    def test_update_region(
+        self, gray: np.ndarray, gl_mocks: dict[str, MagicMock]
+    ) -> None:
+        heatmap: Heatmap = Heatmap(np.zeros((3, 3)), colormap=gray, value_range=(0, 1))
+        heatmap.update_region(np.array([[1.0, 9.0]]), 1, 2)
+        *args, pixels = gl_mocks["tex_sub_image_2d"].call_args.args
+        assert args[2:6] == [1, 2, 2, 1]
+        assert pixels[..., 0].tolist() == [[255, 255]]
+        # The region is kept: updating with the same values uploads nothing.
+        heatmap.update(np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 1.0, 9.0]]))
+        gl_mocks["tex_sub_image_2d"].assert_called_once()
+
+    def test_update_region_empty(self, gl_mocks: dict[str, MagicMock]) -> None:
+        with pytest.raises(RuntimeError):
+            Heatmap().update_region(np.zeros((1, 1)), 0, 0)
+
+    def test_draw(self, gl_mocks: dict[str, MagicMock], mocker: MockerFixture) -> None:
+        heatmap: Heatmap = Heatmap(np.zeros((2, 2)))
+        draw: MagicMock = mocker.patch.object(heatmap.texture, "draw")
+        heatmap.draw(1, 2, 3, 4, tint=100)
+        draw.assert_called_once_with(1, 2, 3, 4, tint=100)
+
+    def test_delete(self, gl_mocks: dict[str, MagicMock]) -> None:
+        heatmap: Heatmap = Heatmap(np.zeros((2, 2)))
+        heatmap.delete()
+        gl_mocks["delete_textures"].assert_called_once()
+        (ids,) = gl_mocks["delete_textures"].call_args.args
+        assert ids.dtype == np.uint32
+        assert ids.tolist() == [7]
+        assert heatmap.shape is None
+
+        with pytest.raises(RuntimeError):
+            heatmap.update_region(np.zeros((1, 1)), 0, 0)
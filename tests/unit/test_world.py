@@ -0,0 +1,218 @@
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+from pysics.types import Color
+from pysics.world import WorldChunk, WorldStore, write_world
+from pysics._wrappers import gl, GL_TRIANGLES
+
+_CIRCLES: np.ndarray = np.array([[5.0, 5.0, 1.0], [15.0, 5.0, 2.0], [-5.0, 25.0, 1.0]])
+_RECTS: np.ndarray = np.array([[1.0, 1.0, 2.0, 2.0], [31.0, 1.0, 4.0, 2.0]])
+
+
+@pytest.fixture
+def world(tmp_path: Path) -> Path:
+    path: Path = tmp_path / "map.world"
+    write_world(path, 10.0, circles=_CIRCLES, rects=_RECTS)
+    return path
+
+
+@pytest.fixture
+def gl_mocks(mocker: MockerFixture) -> dict[str, MagicMock]:
+    return {
+        name: mocker.patch.object(gl, name)
+        for name in (
+            "color_4f",
+            "enable_client_state",
+            "disable_client_state",
+            "vertex_pointer",
+            "draw_arrays",
+        )
+    }
+
+
+@pytest.mark.unit
+class TestWriteWorld:
+    def test_write(self, tmp_path: Path) -> None:
+        assert write_world(tmp_path / "map.world", 10.0, circles=_CIRCLES) == 3
+        assert write_world(tmp_path / "map.world", 10.0, rects=_RECTS) == 2
+        assert (
+            write_world(tmp_path / "map.world", 10.0, circles=_CIRCLES, rects=_RECTS)
+            == 4
+        )
+
+    def test_write_empty(self, tmp_path: Path) -> None:
+        assert write_world(tmp_path / "map.world", 10.0) == 0
+
+        with WorldStore(tmp_path / "map.world") as store:
+            assert len(store) == 0
+            store.update((-1e6, -1e6, 1e6, 1e6))
+            assert store.resident == []
+
+    @pytest.mark.parametrize(
+        "chunk_size, kwargs",
+        [
+            (0.0, dict()),
+            (10.0, dict(circles=np.zeros((2, 2)))),
+            (10.0, dict(circles=np.zeros(3))),
+            (10.0, dict(rects=np.zeros((2, 3)))),
+        ],
+    )
+    def test_write_invalid(
+        self, chunk_size: float, kwargs: dict[str, Any], tmp_path: Path
+    ) -> None:
+        with pytest.raises(ValueError):
+            write_world(tmp_path / "map.world", chunk_size, **kwargs)
+
+
+@pytest.mark.unit
+class TestWorldChunk:
+    def test_vertices(self) -> None:
+        unit: np.ndarray = np.array(
+            [[1, 0], [0, 1], [-1, 0], [0, -1], [1, 0]], dtype=np.float32
+        )
+        chunk: WorldChunk = WorldChunk(
+            np.array([[5.0, 5.0, 2.0]], dtype=np.float32),
+            np.array([[1.0, 2.0, 3.0, 4.0]], dtype=np.float32),
+            unit,
+        )
+        assert chunk.vertices.dtype == np.float32
+        assert chunk.vertices.tolist() == [
+            *([5, 5], [7, 5], [5, 7]),
+            *([5, 5], [5, 7], [3, 5]),
+            *([5, 5], [3, 5], [5, 3]),
+            *([5, 5], [5, 3], [7, 5]),
+            *([1, 2], [4, 2], [4, 6]),
+            *([1, 2], [4, 6], [1, 6]),
+        ]
+        assert chunk.nbytes == 12 + 16 + 18 * 8
+
+
+@pytest.mark.unit
+class TestWorldStore:
+    def test_init(self, world: Path) -> None:
+        with WorldStore(world, fill=128) as store:
+            assert len(store) == 4
+            assert store.chunk_size == 10.0
+            assert store.budget == 64 << 20
+            assert store.margin == 0.0
+            assert store.fill == Color(128, 128, 128)
+            assert store.resident == []
+            assert store.nbytes == store.loads == store.evictions == 0
+
+    @pytest.mark.parametrize("content", [b"PYSW", b"PYSW\x02\0\0\0\0\0\0\0", b"x" * 64])
+    def test_init_invalid(self, content: bytes, tmp_path: Path) -> None:
+        path: Path = tmp_path / "map.world"
+        path.write_bytes(content)
+
+        with pytest.raises(ValueError):
+            WorldStore(path)
+
+    def test_load(self, world: Path) -> None:
+        with WorldStore(world) as store:
+            chunk: WorldChunk = store.load((1, 0))
+            assert chunk.circles.tolist() == [[15.0, 5.0, 2.0]]
+            assert chunk.rects.shape == (0, 4)
+            assert len(chunk.vertices) == 16 * 3
+            assert store.load((3, 0)).rects.tolist() == [[31.0, 1.0, 4.0, 2.0]]
+            assert store.load((2, 0)) is None
+            assert store.resident == [(1, 0), (3, 0)]
+            assert store.nbytes == chunk.nbytes + store.load((3, 0)).nbytes
+            # Getting a resident chunk makes it the most recently used.
+            assert store.load((1, 0)) is chunk
+            assert store.resident == [(3, 0), (1, 0)]
+            assert store.loads == 2
+
+    @pytest.mark.parametrize(
+        "view, margin, expected",
+        [
+            # The circle of the next chunk reaches into the view.
+            ((1.0, 1.0, 9.0, 9.0), 0.0, [(0, 0), (1, 0)]),
+            ((1.0, 1.0, 2.0, 2.0), 0.0, [(0, 0)]),
+            ((1.0, 1.0, 2.0, 2.0), 20.0, [(-1, 2), (0, 0), (1, 0)]),
+            ((100.0, 100.0, 110.0, 110.0), 0.0, []),
+            ((-1e6, -1e6, 1e6, 1e6), 0.0, [(-1, 2), (0, 0), (1, 0), (3, 0)]),
+        ],
+    )
+    def test_update(
+        self,
+        view: tuple[float, float, float, float],
+        margin: float,
+        expected: list[tuple[int, int]],
+        world: Path,
+    ) -> None:
+        with WorldStore(world, margin=margin) as store:
+            store.update(view)
+            assert sorted(store.resident) == expected
+            assert store.loads == len(expected)
+
+    def test_update_budget(self, world: Path) -> None:
+        with WorldStore(world) as store:
+            store.update((1.0, 1.0, 2.0, 2.0))
+            store.update((31.0, 1.0, 32.0, 2.0))
+            store.update((15.0, 5.0, 16.0, 6.0))
+            assert store.resident == [(0, 0), (3, 0), (1, 0)]
+            store.budget = store.nbytes - 1
+            # The least recently used chunk out of the view goes first.
+            store.update((15.0, 5.0, 16.0, 6.0))
+            assert store.resident == [(3, 0), (1, 0)]
+            assert store.evictions == 1
+            # The chunks in the view stay over the budget.
+            store.budget = 0
+            store.update((15.0, 5.0, 16.0, 6.0))
+            assert store.resident == [(1, 0)]
+            assert store.nbytes == store.load((1, 0)).nbytes
+            assert store.evictions == 2
+
+    def test_draw(self, world: Path, gl_mocks: dict[str, MagicMock]) -> None:
+        with WorldStore(world, fill=Color(255, 0, 0)) as store:
+            store.draw((-1e6, -1e6, 1e6, 1e6))
+            gl_mocks["color_4f"].assert_not_called()
+            store.update((1.0, 1.0, 9.0, 9.0))
+            store.load((3, 0))
+            store.draw((1.0, 1.0, 9.0, 9.0))
+
+        gl_mocks["color_4f"].assert_called_once_with(1.0, 0.0, 0.0, 1.0)
+        # Only the resident chunks in the view are drawn.
+        assert gl_mocks["draw_arrays"].call_args_list == [
+            ((GL_TRIANGLES, 0, 16 * 3 + 6),),
+            ((GL_TRIANGLES, 0, 16 * 3),),
+        ]
+        assert gl_mocks["vertex_pointer"].call_count == 2
+        gl_mocks["disable_client_state"].assert_called_once()
+
+    def test_close(self, world: Path) -> None:
+        store: WorldStore = WorldStore(world)
+        store.update((1.0, 1.0, 9.0, 9.0))
+        store.close()
+        assert store.resident == []
+        assert store.nbytes == 0
+
+    def test_random(self, tmp_path: Path) -> None:
+        rng: np.random.Generator = np.random.default_rng(0)
+        circles: np.ndarray = np.column_stack(
+            [rng.uniform(0, 1000, (2000, 2)), rng.uniform(1, 5, 2000)]
+        )
+        write_world(tmp_path / "map.world", 50.0, circles=circles)
+        view: tuple[float, float, float, float] = (120.0, 300.0, 420.0, 520.0)
+
+        with WorldStore(tmp_path / "map.world") as store:
+            store.update(view)
+            loaded: np.ndarray = np.concatenate(
+                [store.load(chunk).circles for chunk in store.resident]
+            )
+
+        # Every circle overlapping the view is loaded.
+        x, y, radius = circles.T
+        visible: np.ndarray = (
+            (x + radius >= view[0])
+            & (x - radius <= view[2])
+            & (y + radius >= view[1])
+            & (y - radius <= view[3])
+        )
+        assert visible.any()
+        assert {tuple(c) for c in circles[visible].astype(np.float32).tolist()} <= {
+            tuple(c) for c in loaded.tolist()
+        }
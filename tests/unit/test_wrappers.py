@@ -1,9 +1,26 @@
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
 from typing import Any, Callable
+from unittest.mock import MagicMock
 import pytest
+from pytest_mock import MockerFixture
+import OpenGL
 from OpenGL.GL import *
+from pysics import _wrappers
 from pysics._wrappers import gl
 
 
+def _run(code: str, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+    )
+
+
 @pytest.mark.unit
 class TestGLWrapper:
     def test_attrs(self) -> None:
@@ -11,6 +28,7 @@ class TestGLWrapper:
             viewport=glViewport,
             matrix_mode=glMatrixMode,
             load_identity=glLoadIdentity,
+            load_matrix_d=glLoadMatrixd,
             ortho=glOrtho,
             clear=glClear,
             color_3f=glColor3f,
@@ -20,10 +38,255 @@ class TestGLWrapper:
             begin=glBegin,
             end=glEnd,
             flush=glFlush,
+            finish=glFinish,
             vertex_2f=glVertex2f,
             enable=glEnable,
+            disable=glDisable,
             blend_func=glBlendFunc,
+            enable_client_state=glEnableClientState,
+            disable_client_state=glDisableClientState,
+            vertex_pointer=glVertexPointer,
+            color_pointer=glColorPointer,
+            draw_arrays=glDrawArrays,
+            draw_elements=glDrawElements,
+            multi_draw_arrays=glMultiDrawArrays,
+            gen_textures=glGenTextures,
+            delete_textures=glDeleteTextures,
+            bind_texture=glBindTexture,
+            tex_parameter_i=glTexParameteri,
+            tex_image_2d=glTexImage2D,
+            tex_sub_image_2d=glTexSubImage2D,
+            tex_coord_2f=glTexCoord2f,
+            pixel_store_i=glPixelStorei,
+            gen_framebuffers=glGenFramebuffers,
+            delete_framebuffers=glDeleteFramebuffers,
+            bind_framebuffer=glBindFramebuffer,
+            gen_renderbuffers=glGenRenderbuffers,
+            delete_renderbuffers=glDeleteRenderbuffers,
+            bind_renderbuffer=glBindRenderbuffer,
+            renderbuffer_storage=glRenderbufferStorage,
+            renderbuffer_storage_multisample=glRenderbufferStorageMultisample,
+            framebuffer_renderbuffer=glFramebufferRenderbuffer,
+            check_framebuffer_status=glCheckFramebufferStatus,
+            blit_framebuffer=glBlitFramebuffer,
         )
 
         for attr_name, exp_value in attr_mapping.items():
-            assert getattr(gl, attr_name) == exp_value
+            function: Callable[..., Any] = getattr(gl, attr_name)
+            assert getattr(function, "__wrapped__", function) == exp_value
+
+        assert set(attr_mapping) <= set(dir(gl))
+
+    def test_unknown_attr(self) -> None:
+        with pytest.raises(AttributeError):
+            gl.unknown
+
+
+@pytest.mark.unit
+class TestShadowState:
+    @pytest.fixture(autouse=True)
+    def _state(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(gl, "state", {})
+        monkeypatch.setattr(gl, "skipped", 0)
+
+    @pytest.mark.parametrize(
+        "calls, expected",
+        [
+            (
+                [("color_4f", (1, 0, 0, 1)), ("color_4f", (1, 0, 0, 1))],
+                [("color_4f", (1, 0, 0, 1))],
+            ),
+            (
+                [("color_3f", (1, 0, 0)), ("color_4f", (1, 0, 0, 1))],
+                [("color_3f", (1, 0, 0))],
+            ),
+            (
+                [("color_4f", (1, 0, 0, 1)), ("color_4f", (1, 0, 0, 0.5))],
+                [("color_4f", (1, 0, 0, 1)), ("color_4f", (1, 0, 0, 0.5))],
+            ),
+            (
+                [("line_width", (2,)), ("point_size", (2,)), ("line_width", (2,))],
+                [("line_width", (2,)), ("point_size", (2,))],
+            ),
+            (
+                [
+                    ("enable", (GL_BLEND,)),
+                    ("enable", (GL_TEXTURE_2D,)),
+                    ("enable", (GL_BLEND,)),
+                    ("disable", (GL_BLEND,)),
+                    ("disable", (GL_BLEND,)),
+                ],
+                [
+                    ("enable", (GL_BLEND,)),
+                    ("enable", (GL_TEXTURE_2D,)),
+                    ("disable", (GL_BLEND,)),
+                ],
+            ),
+            (
+                [
+                    ("color_4f", (1, 0, 0, 1)),
+                    ("draw_arrays", (GL_LINES, 0, 2)),
+                    ("color_4f", (1, 0, 0, 1)),
+                ],
+                [
+                    ("color_4f", (1, 0, 0, 1)),
+                    ("draw_arrays", (GL_LINES, 0, 2)),
+                    ("color_4f", (1, 0, 0, 1)),
+                ],
+            ),
+        ],
+    )
+    def test_shadow(
+        self,
+        calls: list[tuple[str, tuple[Any, ...]]],
+        expected: list[tuple[str, tuple[Any, ...]]],
+    ) -> None:
+        sent: list[tuple[str, tuple[Any, ...]]] = []
+        functions: dict[str, Callable[..., Any]] = {
+            name: _wrappers._shadow(
+                name, lambda *args, name=name: sent.append((name, args))
+            )
+            for name, _ in calls
+        }
+
+        for name, args in calls:
+            functions[name](*args)
+
+        assert sent == expected
+        assert gl.skipped == len(calls) - len(expected)
+
+    def test_not_shadowed(self) -> None:
+        function: MagicMock = MagicMock()
+        assert _wrappers._shadow("vertex_2f", function) is function
+        assert _wrappers._shadow("line_width", function).__wrapped__ is function
+
+    def test_error(self) -> None:
+        function: MagicMock = MagicMock(side_effect=GLError)
+        line_width: Callable[..., Any] = _wrappers._shadow("line_width", function)
+
+        for _ in range(2):
+            with pytest.raises(GLError):
+                line_width(2)
+
+        assert function.call_count == 2
+
+    def test_invalidate(self) -> None:
+        gl.state.update(color=(1, 0, 0, 1), line_width=(2,))
+        gl.invalidate("color", "blend_func")
+        assert gl.state == dict(line_width=(2,))
+        gl.invalidate()
+        assert gl.state == {}
+
+
+@pytest.mark.unit
+class TestConstants:
+    def test_constants(self) -> None:
+        names: list[str] = [name for name in vars(_wrappers) if name.startswith("GL_")]
+        assert len(names) >= 27
+
+        for name in names:
+            assert getattr(_wrappers, name) == getattr(OpenGL.GL, name)
+
+    def test_other_constant(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delitem(vars(_wrappers), "GL_STENCIL_TEST", raising=False)
+        assert _wrappers.GL_STENCIL_TEST == GL_STENCIL_TEST
+        assert "GL_STENCIL_TEST" in vars(_wrappers)
+
+    def test_unknown_attr(self) -> None:
+        with pytest.raises(AttributeError):
+            _wrappers.glViewport
+
+
+@pytest.mark.unit
+class TestProfile:
+    @pytest.mark.parametrize(
+        "profile, env, expected",
+        [
+            (None, None, "default"),
+            (None, "performance", "performance"),
+            ("debug", "performance", "debug"),
+        ],
+    )
+    def test_get_profile(
+        self,
+        profile: str | None,
+        env: str | None,
+        expected: str,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(_wrappers, "_profile", profile)
+
+        if env is None:
+            monkeypatch.delenv(_wrappers.PROFILE_ENV, raising=False)
+        else:
+            monkeypatch.setenv(_wrappers.PROFILE_ENV, env)
+
+        assert _wrappers.get_profile() == expected
+
+    def test_set_profile(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(_wrappers, "_profile", None)
+        monkeypatch.setattr(_wrappers, "_backend", None)
+        _wrappers.set_profile("performance")
+        assert _wrappers.get_profile() == "performance"
+
+        with pytest.raises(ValueError):
+            _wrappers.set_profile("fast")
+
+    def test_set_profile_loaded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(_wrappers, "_profile", "default")
+        monkeypatch.setattr(_wrappers, "_backend", OpenGL.GL)
+        _wrappers.set_profile("default")
+
+        with pytest.raises(RuntimeError):
+            _wrappers.set_profile("debug")
+
+    def test_load(self, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture) -> None:
+        opengl: SimpleNamespace = SimpleNamespace(ERROR_CHECKING=True)
+        backend: SimpleNamespace = SimpleNamespace()
+        import_mock: MagicMock = mocker.patch.object(
+            _wrappers.importlib,
+            "import_module",
+            side_effect=lambda name: opengl if name == "OpenGL" else backend,
+        )
+        monkeypatch.setattr(_wrappers, "_profile", "performance")
+        monkeypatch.setattr(_wrappers, "_backend", None)
+        assert _wrappers._load() is backend
+        assert _wrappers._load() is backend
+        assert import_mock.call_count == 2
+        assert opengl.ERROR_CHECKING is False
+        assert not hasattr(opengl, "STORE_POINTERS")
+
+    def test_load_bad_profile(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(_wrappers, "_profile", None)
+        monkeypatch.setattr(_wrappers, "_backend", None)
+        monkeypatch.setenv(_wrappers.PROFILE_ENV, "fast")
+
+        with pytest.raises(ValueError):
+            _wrappers._load()
+
+
+@pytest.mark.unit
+class TestLazyImport:
+    def test_no_opengl(self) -> None:
+        result: subprocess.CompletedProcess = _run(
+            "import sys\n"
+            "import pysics.shapes, pysics.batches, pysics.textures\n"
+            "import pysics.constraints, pysics.fluid, pysics.rigid\n"
+            "assert 'OpenGL' not in sys.modules\n"
+        )
+        assert result.returncode == 0, result.stderr
+
+    @pytest.mark.parametrize("profile", ["default", "performance", "debug"])
+    def test_profile_flags(self, profile: str) -> None:
+        # The flags are checked once loaded, since PyOpenGL may override them.
+        result: subprocess.CompletedProcess = _run(
+            "import OpenGL\n"
+            "from pysics._wrappers import _PROFILES, gl\n"
+            "gl.enable\n"
+            f"for flag, value in _PROFILES[{profile!r}].items():\n"
+            "    assert getattr(OpenGL, flag) is value, flag\n"
+            "assert OpenGL.STORE_POINTERS is True\n",
+            PYSICS_PROFILE=profile,
+        )
+        assert result.returncode == 0, result.stderr
+        assert not result.stderr